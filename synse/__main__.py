@@ -10,10 +10,11 @@ Example Usage:
     $ python synse
 """
 
-from synse.factory import make_app
+from synse.factory import SynseHttpProtocol, make_app
 
 app = make_app()
 app.run(
     host='0.0.0.0',
     port=5000,
+    protocol=SynseHttpProtocol,
 )
@@ -0,0 +1,178 @@
+"""Micro-batching of concurrent single-device reads.
+
+Under load, many independent requests to read different devices of the same
+plugin can arrive within a few milliseconds of each other. Rather than each
+becoming its own request to the plugin, reads of a plugin's devices can be
+held for a short window (`read.batch_window`) and then read together, so the
+plugin may be asked for all of them with a single request (see
+`synse.commands.read.read_plugin_devices`). The result for each device is
+handed back to the callers waiting on it.
+
+Batching is off unless a window is configured, since every batched read is
+delayed by up to the window.
+"""
+
+import asyncio
+from collections import OrderedDict
+
+from synse import config
+from synse.i18n import _
+from synse.log import logger
+
+# The batch of reads which is being collected for each plugin, keyed by
+# plugin id.
+_batches = {}
+
+
+def window():
+    """Get the window, in seconds, for which reads are held to be batched.
+
+    Returns:
+        float: The batch window. If this is 0, reads are not batched.
+    """
+    return float(config.options.get('read.batch_window', 0) or 0)
+
+
+class _Batch:
+    """A batch of device reads for a single plugin.
+
+    The batch collects devices to read until its window closes, then reads
+    all of them at once. The read is cancelled if every caller waiting on
+    it has given up on it.
+
+    The devices are read with the strictest maximum reading age of the
+    callers in the batch, so every caller gets readings fresh enough for it.
+
+    Args:
+        plugin_handler (Plugin): The plugin which manages the devices.
+        read: A coroutine function which reads a list of (rack, board, device)
+            and device information targets from the plugin, with a maximum
+            reading age, returning the result of each device keyed by its
+            (rack, board, device).
+        delay (float): The number of seconds to collect reads for.
+    """
+
+    def __init__(self, plugin_handler, read, delay):
+        self.plugin_handler = plugin_handler
+        self.read = read
+        self.loop = asyncio.get_event_loop()
+        self.targets = OrderedDict()
+        self.max_ages = []
+        self.waiters = 0
+        self.task = None
+        self.future = self.loop.create_future()
+        self.handle = self.loop.call_later(delay, self._flush)
+
+    def add(self, target, dev, max_age=None):
+        """Add a device to the batch.
+
+        Args:
+            target (tuple(str, str, str)): The rack, board, and device id of
+                the device.
+            dev (Device): The device information of the device.
+            max_age (float): The maximum age, in seconds, of the readings
+                which the caller will accept, or None if the configured
+                readings cache TTL applies. (default: None)
+        """
+        self.targets[target] = dev
+        if max_age is not None:
+            self.max_ages.append(max_age)
+
+    def _untrack(self):
+        """Stop collecting reads into the batch."""
+        if _batches.get(self.plugin_handler.id()) is self:
+            del _batches[self.plugin_handler.id()]
+
+    def _flush(self):
+        """Close the batch and read its devices."""
+        self._untrack()
+        logger.debug(_('Reading batch of {} devices from plugin {}').format(
+            len(self.targets), self.plugin_handler.id()
+        ))
+        max_age = min(self.max_ages) if self.max_ages else None
+        self.task = asyncio.ensure_future(
+            self.read(self.plugin_handler, list(self.targets.items()), max_age)
+        )
+        self.task.add_done_callback(self._done)
+
+    def _done(self, task):
+        """Hand the result of the batch read to its waiters.
+
+        Args:
+            task (asyncio.Task): The completed read.
+        """
+        if self.future.done():
+            return
+        if task.cancelled():
+            self.future.cancel()
+        elif task.exception() is not None:
+            self.future.set_exception(task.exception())
+        else:
+            self.future.set_result(task.result())
+
+    async def wait(self, target, timeout=None):
+        """Wait for the result of a device in the batch.
+
+        Args:
+            target (tuple(str, str, str)): The rack, board, and device id of
+                the device.
+            timeout (float): The number of seconds to wait for the result.
+                If this is None, wait until the batch is read.
+
+        Returns:
+            The result of the device, as returned by the batch's read.
+
+        Raises:
+            asyncio.TimeoutError: The batch was not read in time.
+        """
+        self.waiters += 1
+        try:
+            results = await asyncio.wait_for(asyncio.shield(self.future), timeout)
+        finally:
+            self.waiters -= 1
+            if self.waiters == 0 and not self.future.done():
+                logger.debug(_('No callers left waiting on batch read of plugin {}, '
+                               'cancelling').format(self.plugin_handler.id()))
+                self._untrack()
+                self.handle.cancel()
+                if self.task is not None:
+                    self.task.cancel()
+                self.future.cancel()
+        return results[target]
+
+
+async def read(plugin_handler, target, dev, read_many, max_age=None, timeout=None):
+    """Read a device along with the other devices of its plugin which are
+    read within the batch window.
+
+    Args:
+        plugin_handler (Plugin): The plugin which manages the device.
+        target (tuple(str, str, str)): The rack, board, and device id of the
+            device.
+        dev (Device): The device information of the device.
+        read_many: A coroutine function which reads a list of (rack, board,
+            device) and device information targets from the plugin, with a
+            maximum reading age, returning the result of each device keyed by
+            its (rack, board, device).
+        max_age (float): The maximum age, in seconds, of the readings which
+            the caller will accept, or None if the configured readings cache
+            TTL applies. (default: None)
+        timeout (float): The number of seconds to wait for the device to be
+            read. If this is None, wait until the batch is read.
+
+    Returns:
+        The result of the device, as returned by `read_many`.
+
+    Raises:
+        asyncio.TimeoutError: The device was not read in time.
+    """
+    plugin_id = plugin_handler.id()
+
+    # A batch started on another event loop will never be read on this
+    # one, so it is not joined.
+    batch = _batches.get(plugin_id)
+    if batch is None or batch.loop is not asyncio.get_event_loop():
+        batch = _batches[plugin_id] = _Batch(plugin_handler, read_many, window())
+
+    batch.add(target, dev, max_age)
+    return await batch.wait(target, timeout)
@@ -1,12 +1,17 @@
 """Synse Server caches and cache utilities."""
 
+import asyncio
+import fnmatch
+import functools
+import time
+
 import aiocache
 import grpc
 
-from synse import config, errors, utils
+from synse import config, errors, response, utils
 from synse.i18n import _
 from synse.log import logger
-from synse.plugin import Plugin, get_plugins, register_plugins
+from synse.plugin import Plugin, reconciler
 from synse.proto import util as putil
 
 # The aiocache configuration
@@ -22,26 +27,492 @@ AIOCACHE = {
 # Synse Server cache namespaces
 NS_TRANSACTION = 'transaction'
 NS_DEVICE_INFO = 'devices'
-NS_PLUGINS = 'plugins'
-NS_SCAN = 'scan'
-NS_INFO = 'info'
 NS_CAPABILITIES = 'capabilities'
 
-# Internal keys into the caches for the data (e.g. dictionaries)
-# being cached.
-DEVICE_INFO_CACHE_KEY = 'meta_cache_key'
-PLUGINS_CACHE_KEY = 'plugins_cache_key'
-SCAN_CACHE_KEY = 'scan_cache_key'
-INFO_CACHE_KEY = 'info_cache_key'
-CAPABILITIES_CACHE_KEY = 'capabilities_cache_key'
-
 # Create caches
 transaction_cache = aiocache.SimpleMemoryCache(namespace=NS_TRANSACTION)
-_device_info_cache = aiocache.SimpleMemoryCache(namespace=NS_DEVICE_INFO)
-_plugins_cache = aiocache.SimpleMemoryCache(namespace=NS_PLUGINS)
-_scan_cache = aiocache.SimpleMemoryCache(namespace=NS_SCAN)
-_info_cache = aiocache.SimpleMemoryCache(namespace=NS_INFO)
-_capabilities_cache = aiocache.SimpleMemoryCache(namespace=NS_CAPABILITIES)
+
+# The in-flight cache rebuilds, keyed by cache namespace. Concurrent requests
+# which miss the same cache share a single rebuild rather than each running
+# their own.
+_rebuilds = {}
+
+# The time (per `time.monotonic`) until which the entries in each meta cache
+# namespace are fresh. Once this passes, an entry is either rebuilt before
+# it is served or, if stale serving is enabled, refreshed in the background.
+_fresh_until = {}
+
+# The last successfully built data for each plugin's partition of the meta
+# caches, keyed by partition namespace. If enabled, this is served when the
+# plugin fails a rebuild.
+_last_known_good = {}
+
+# The most recent readings of each device, keyed by device composite id. Each
+# entry is a tuple of the time (per `time.monotonic`) at which the readings
+# were taken and the readings.
+_readings = {}
+
+# The largest maximum age, in seconds, which readings have been cached for,
+# and the time (per `time.monotonic`) at which readings older than it (or
+# than the readings cache TTL) were last pruned from the readings cache.
+_readings_max_age = 0.0
+_readings_pruned_at = 0.0
+
+# The in-flight device reads, keyed by device composite id. Concurrent reads
+# of the same device share a single read rather than each reading the device.
+_reads = {}
+
+# The freshness states of a meta cache entry (see `_freshness`).
+_FRESH = 'fresh'
+_REFRESH = 'refresh'
+_STALE = 'stale'
+_EXPIRED = 'expired'
+
+
+class _Partition:
+    """The data for a single plugin within a partitioned meta cache.
+
+    Args:
+        plugin_id (str): The id of the plugin the data came from.
+        data: The data provided by the plugin.
+        error (Exception): The error raised by the plugin the last time
+            the partition was rebuilt, if any. If set, the data is either
+            empty or the last known good data for the plugin.
+        fingerprint (str): A fingerprint of the data, used to tell whether
+            it changed between rebuilds.
+    """
+
+    def __init__(self, plugin_id, data, error=None, fingerprint=None):
+        self.plugin_id = plugin_id
+        self.data = data if data is not None else {}
+        self.error = error
+        self.fingerprint = fingerprint
+
+    @property
+    def failed(self):
+        """bool: Whether the partition has no data because the plugin failed."""
+        return self.error is not None and not self.data
+
+
+class _View:
+    """The base for the partitioned meta cache views.
+
+    Each view has a generation, which is bumped whenever its data changes,
+    and caches the encoded JSON response bodies built from the current
+    generation of its data so they are not re-encoded for every request.
+    """
+
+    def __init__(self):
+        self.partitions = {}
+        self.generation = 0
+        self._encoded = {}
+
+    def _changed(self):
+        """Start a new generation of the view, dropping the encodings
+        of the previous one.
+        """
+        self.generation += 1
+        self._encoded = {}
+
+    def encoded(self, key, source, render=None):
+        """Get the encoded JSON response body and its ETag for part of the view.
+
+        Args:
+            key (tuple): The key which identifies the part of the view,
+                e.g. ('scan', rack, board).
+            source: The data from the view which the response is built from.
+            render: A function which builds the response data from the
+                source. If not given, the source is the response data.
+
+        Returns:
+            tuple(bytes, str): The encoded response body and its ETag.
+        """
+        pretty = bool(config.options.get('pretty_json'))
+        entry = self._encoded.get(key)
+
+        # The parts of a view are replaced rather than modified when they
+        # change, so an encoding is only reused for the very same source.
+        if entry is None or entry[0] is not source or entry[1] != pretty:
+            body = response.encode(render(source) if render is not None else source)
+            entry = self._encoded[key] = (source, pretty, body, response.etag(body))
+        return entry[2], entry[3]
+
+
+class _DeviceView(_View):
+    """The device info from all plugins, partitioned by plugin, along with
+    the indexes, scan and info views derived from it.
+
+    When a plugin's partition changes, only the devices and boards which that
+    plugin has (or had) are updated in the indexes and the derived views; the
+    rest is left untouched.
+
+    The indexes and views are replaced rather than modified in place, so one
+    returned to a caller does not change underneath it, and they are all
+    swapped in together, so callers never see them disagree.
+    """
+
+    def __init__(self):
+        super(_DeviceView, self).__init__()
+        self.devices = {}
+        self.plugins = {}
+        self.info = {}
+
+        # The type of each device, keyed by device id composite. The type is
+        # lower-cased so lookups do not depend on casing.
+        self.types = {}
+        # Indexes of the devices (each a map of device id composite to
+        # Device) by their type, the plugin they came from, their info
+        # string, their (rack, board), and their rack and then board.
+        self.by_type = {}
+        self.by_plugin = {}
+        self.by_info = {}
+        self.by_board = {}
+        self.by_rack = {}
+
+        # The scan entry for each board, keyed by (rack, board).
+        self._scan_boards = {}
+        # The scan entry for each device, keyed by device id composite.
+        self._scan_devices = {}
+        # The assembled scan view and the scan entry for each rack. These
+        # are None if they need to be re-assembled.
+        self._scan = None
+        self._scan_racks = None
+
+    def update(self, partition):
+        """Add or replace the partition for a plugin and patch the indexes
+        and derived views with its changes.
+
+        If the plugin's devices are unchanged from its current partition
+        (the same data, or data with the same fingerprint), the current data
+        and everything derived from it are kept as they are.
+
+        Args:
+            partition (_Partition): The device info partition for the plugin.
+
+        Returns:
+            bool: True if the devices changed; False otherwise.
+        """
+        old = self.partitions.get(partition.plugin_id)
+        if old is not None and _unchanged(old, partition):
+            logger.debug(_('Device info unchanged for plugin: {}').format(partition.plugin_id))
+            self.partitions[partition.plugin_id] = _Partition(
+                partition.plugin_id, old.data, partition.error, old.fingerprint,
+            )
+            return False
+
+        self.partitions[partition.plugin_id] = partition
+
+        removed = self._owned(old) if old is not None else []
+        added = [(cid, device, partition.plugin_id) for cid, device in partition.data.items()]
+        self._apply(removed, added)
+        return True
+
+    def remove(self, plugin_id):
+        """Remove the partition for a plugin and patch the indexes and
+        derived views.
+
+        Args:
+            plugin_id (str): The id of the plugin to remove.
+        """
+        old = self.partitions.pop(plugin_id, None)
+        if old is None:
+            return
+        self._apply(self._owned(old), [])
+
+    def scan(self):
+        """Get the scan view of the devices.
+
+        Returns:
+            dict: The scan data for all devices (see `get_scan_cache`).
+        """
+        if self._scan is None:
+            racks = []
+            for rack, board in sorted(self._scan_boards):
+                if not racks or racks[-1]['id'] != rack:
+                    racks.append({'id': rack, 'boards': []})
+                racks[-1]['boards'].append(self._scan_boards[(rack, board)])
+            self._scan = {'racks': racks} if racks else {}
+            self._scan_racks = {r['id']: r for r in racks}
+        return self._scan
+
+    def scan_rack(self, rack):
+        """Get the scan entry for a rack.
+
+        Args:
+            rack (str): The id of the rack.
+
+        Returns:
+            dict: The scan entry for the rack, or None if it is not known.
+        """
+        self.scan()
+        return self._scan_racks.get(rack)
+
+    def scan_board(self, rack, board):
+        """Get the scan entry for a board.
+
+        Args:
+            rack (str): The id of the rack the board is on.
+            board (str): The id of the board.
+
+        Returns:
+            dict: The scan entry for the board, or None if it is not known.
+        """
+        return self._scan_boards.get((rack, board))
+
+    def scan_device(self, cid):
+        """Get the scan entry for a device.
+
+        Args:
+            cid (str): The device id composite of the device.
+
+        Returns:
+            dict: The scan entry for the device, or None if it is not known.
+        """
+        return self._scan_devices.get(cid)
+
+    def _owned(self, partition):
+        """Get the devices in a partition which are currently attributed to
+        the partition's plugin.
+
+        Another plugin may have since provided a device with the same id, in
+        which case it is no longer the partition's to remove.
+
+        Args:
+            partition (_Partition): The partition to get the devices of.
+
+        Returns:
+            list[tuple]: The (id composite, Device, plugin id) of each device.
+        """
+        return [
+            (cid, device, partition.plugin_id) for cid, device in partition.data.items()
+            if self.plugins.get(cid) == partition.plugin_id
+        ]
+
+    def _apply(self, removed, added):
+        """Remove and add devices, then swap in the updated device maps and
+        indexes and patch the derived views.
+
+        Args:
+            removed (list[tuple]): The (id composite, Device, plugin id) of
+                each device to remove.
+            added (list[tuple]): The (id composite, Device, plugin id) of
+                each device to add.
+        """
+        # Adding a device which another plugin currently provides replaces
+        # it, so it has to be removed from the indexes as well.
+        gone = {entry[0] for entry in removed}
+        for cid, __, ___ in added:
+            if cid in self.devices and cid not in gone:
+                removed.append((cid, self.devices[cid], self.plugins[cid]))
+                gone.add(cid)
+
+        devices, plugins, types = dict(self.devices), dict(self.plugins), dict(self.types)
+        for cid, __, ___ in removed:
+            del devices[cid]
+            del plugins[cid]
+            del types[cid]
+        for cid, device, plugin_id in added:
+            devices[cid] = device
+            plugins[cid] = plugin_id
+            types[cid] = _type_key((cid, device, plugin_id))
+
+        by_board = _reindex(self.by_board, _board_key, removed, added)
+        affected = {_board_key(entry) for entry in removed + added}
+
+        by_rack = dict(self.by_rack)
+        for rack, board in affected:
+            boards = by_rack[rack] = dict(by_rack.get(rack, ()))
+            if (rack, board) in by_board:
+                boards[board] = by_board[(rack, board)]
+            else:
+                boards.pop(board, None)
+                if not boards:
+                    del by_rack[rack]
+
+        self.devices, self.plugins, self.types = devices, plugins, types
+        self.by_type = _reindex(self.by_type, _type_key, removed, added)
+        self.by_plugin = _reindex(self.by_plugin, lambda entry: entry[2], removed, added)
+        self.by_info = _reindex(self.by_info, lambda entry: entry[1].info, removed, added)
+        self.by_board, self.by_rack = by_board, by_rack
+        self._patch(affected)
+        self._changed()
+
+    def _patch(self, affected):
+        """Rebuild the derived scan and info views for the given boards.
+
+        Args:
+            affected (set): The (rack, board) keys of the boards to rebuild.
+        """
+        if not affected:
+            return
+
+        info = dict(self.info)
+        scan_devices = dict(self._scan_devices)
+        for rack, board in affected:
+            board_devices = self.by_board.get((rack, board))
+
+            rack_info = info.get(rack)
+            if rack_info is not None:
+                rack_info = dict(rack_info, boards=dict(rack_info['boards']))
+                info[rack] = rack_info
+
+            old = self._scan_boards.pop((rack, board), None)
+            if old is not None:
+                for device in old['devices']:
+                    scan_devices.pop(utils.composite(rack, board, device['id']), None)
+
+            if not board_devices:
+                if rack_info is not None:
+                    rack_info['boards'].pop(board, None)
+                    if not rack_info['boards']:
+                        del info[rack]
+                continue
+
+            scan_board = _build_scan_cache(board_devices)['racks'][0]['boards'][0]
+            self._scan_boards[(rack, board)] = scan_board
+            for device in scan_board['devices']:
+                scan_devices[utils.composite(rack, board, device['id'])] = device
+
+            built = _build_resource_info_cache(board_devices)[rack]
+            if rack_info is None:
+                info[rack] = built
+            else:
+                rack_info['boards'][board] = built['boards'][board]
+
+        self.info = info
+        self._scan_devices = scan_devices
+        self._scan = None
+        self._scan_racks = None
+
+
+def _type_key(entry):
+    """Get the type index key for a device entry.
+
+    Args:
+        entry (tuple): The (id composite, Device, plugin id) of a device.
+
+    Returns:
+        str: The lower-cased type of the device.
+    """
+    return utils.type_from_kind(entry[1].kind).lower()
+
+
+def _board_key(entry):
+    """Get the (rack, board) index key for a device entry.
+
+    Args:
+        entry (tuple): The (id composite, Device, plugin id) of a device.
+
+    Returns:
+        tuple(str, str): The rack and board of the device.
+    """
+    device = entry[1]
+    return device.location.rack, device.location.board
+
+
+def _reindex(index, key, removed, added):
+    """Get a copy of an index with devices removed and added.
+
+    Only the buckets of the index which change are copied, and buckets
+    left empty are dropped.
+
+    Args:
+        index (dict): The index, mapping keys to a map of device id
+            composite to Device.
+        key: A function which gets the index key for a device entry.
+        removed (list[tuple]): The (id composite, Device, plugin id) of
+            each device to remove.
+        added (list[tuple]): The (id composite, Device, plugin id) of
+            each device to add.
+
+    Returns:
+        dict: The updated index.
+    """
+    index = dict(index)
+    copied = set()
+
+    def bucket(k):
+        if k not in copied:
+            index[k] = dict(index.get(k, ()))
+            copied.add(k)
+        return index[k]
+
+    for entry in removed:
+        bucket(key(entry)).pop(entry[0], None)
+    for entry in added:
+        bucket(key(entry))[entry[0]] = entry[1]
+
+    for k in copied:
+        if not index[k]:
+            del index[k]
+    return index
+
+
+def _unchanged(old, new):
+    """Check whether the data in a new partition is the same as the data
+    in the partition it replaces.
+
+    Args:
+        old (_Partition): The current partition.
+        new (_Partition): The new partition.
+
+    Returns:
+        bool: True if the data is unchanged; False otherwise.
+    """
+    if new.data is old.data:
+        return True
+    return new.fingerprint is not None and new.fingerprint == old.fingerprint
+
+
+class _CapabilitiesView(_View):
+    """The device capabilities from all plugins, partitioned by plugin."""
+
+    def __init__(self):
+        super(_CapabilitiesView, self).__init__()
+        # The last capabilities list, with the generation and plugin
+        # ids it was built for.
+        self._list = None
+
+    def update(self, partition):
+        """Add or replace the partition for a plugin.
+
+        Args:
+            partition (_Partition): The capabilities partition for the plugin.
+        """
+        old = self.partitions.get(partition.plugin_id)
+        self.partitions[partition.plugin_id] = partition
+        if old is None or old.data != partition.data:
+            self._changed()
+
+    def remove(self, plugin_id):
+        """Remove the partition for a plugin.
+
+        Args:
+            plugin_id (str): The id of the plugin to remove.
+        """
+        if self.partitions.pop(plugin_id, None) is not None:
+            self._changed()
+
+    def capabilities(self, plugin_ids):
+        """Get the capabilities of the given plugins.
+
+        Args:
+            plugin_ids (list[str]): The ids of the plugins to get the
+                capabilities of, in the order they should be listed.
+
+        Returns:
+            list: The capabilities for each plugin (see `get_capabilities_cache`).
+        """
+        key = (self.generation, tuple(plugin_ids))
+        if self._list is None or self._list[0] != key:
+            partitions = [self.partitions.get(plugin_id) for plugin_id in plugin_ids]
+            self._list = (key, [p.data for p in partitions if p is not None and p.data])
+        return self._list[1]
+
+
+# The partitioned device info and capabilities caches.
+_devices = _DeviceView()
+_capabilities = _CapabilitiesView()
 
 
 def configure_cache():
@@ -64,12 +535,250 @@ async def clear_cache(namespace):
     return await _cache.clear(namespace=namespace)
 
 
+async def _singleflight(namespace, rebuild):
+    """Rebuild the cache with the given namespace, coalescing concurrent
+    rebuilds.
+
+    If a rebuild for the namespace is already in progress, this waits on
+    it and shares its result instead of starting another one. The rebuild
+    is shielded, so a waiter being cancelled (e.g. by a client disconnect)
+    does not cancel the rebuild for the other waiters.
+
+    Args:
+        namespace (str): The namespace of the cache being rebuilt.
+        rebuild: A coroutine function which rebuilds the cache and
+            returns the cached value.
+
+    Returns:
+        The value returned by the rebuild.
+    """
+    flight = _rebuilds.get(namespace)
+    if flight is None or flight.done():
+        flight = _start_rebuild(namespace, rebuild)
+    else:
+        logger.debug(_('Joining in-flight rebuild of cache: {}').format(namespace))
+
+    return await asyncio.shield(flight)
+
+
+def _start_rebuild(namespace, rebuild):
+    """Start a rebuild of the cache with the given namespace and track it
+    as the namespace's in-flight rebuild until it completes.
+
+    Args:
+        namespace (str): The namespace of the cache being rebuilt.
+        rebuild: A coroutine function which rebuilds the cache.
+
+    Returns:
+        asyncio.Task: The task running the rebuild.
+    """
+    logger.debug(_('Starting rebuild of cache: {}').format(namespace))
+    flight = asyncio.ensure_future(rebuild())
+    _rebuilds[namespace] = flight
+
+    def _done(f):
+        if _rebuilds.get(namespace) is f:
+            del _rebuilds[namespace]
+    flight.add_done_callback(_done)
+    return flight
+
+
+def _refresh(namespace, rebuild):
+    """Start a background refresh of the cache with the given namespace,
+    unless a rebuild of it is already in progress.
+
+    Args:
+        namespace (str): The namespace of the cache to refresh.
+        rebuild: A coroutine function which rebuilds the cache.
+    """
+    flight = _rebuilds.get(namespace)
+    if flight is not None and not flight.done():
+        return
+
+    def _done(f):
+        if not f.cancelled() and f.exception() is not None:
+            logger.warning(_('Background refresh of cache {} failed: {}').format(
+                namespace, f.exception()))
+
+    logger.debug(_('Refreshing cache in the background: {}').format(namespace))
+    _start_rebuild(namespace, rebuild).add_done_callback(_done)
+
+
+def _partition_ns(namespace, plugin_id):
+    """Get the namespace for a plugin's partition of a meta cache.
+
+    Args:
+        namespace (str): The namespace of the meta cache.
+        plugin_id (str): The id of the plugin.
+
+    Returns:
+        str: The namespace of the partition.
+    """
+    return '{}/{}'.format(namespace, plugin_id)
+
+
+def _mark_fresh(namespace):
+    """Mark the entry in the meta cache with the given namespace as
+    freshly built.
+
+    Args:
+        namespace (str): The namespace of the cache which was built.
+    """
+    ttl = config.options.get('cache.meta.ttl', None)
+    _fresh_until[namespace] = float('inf') if ttl is None else time.monotonic() + ttl
+
+
+def _freshness(namespace):
+    """Get the freshness of the entry in the meta cache with the given
+    namespace.
+
+    An entry is:
+      - fresh: within its TTL.
+      - refresh: within its TTL, but also within the `cache.meta.refresh_ahead`
+        window before it expires, so it should be refreshed in the background.
+      - stale: past its TTL, but within the `cache.meta.stale_ttl` window after
+        it, so it may be served while it is refreshed in the background.
+      - expired: past its TTL (and stale window); it needs to be rebuilt
+        before it is served.
+
+    Args:
+        namespace (str): The namespace of the cache to check.
+
+    Returns:
+        str: The freshness of the entry.
+    """
+    now = time.monotonic()
+    fresh_until = _fresh_until.get(namespace, 0)
+
+    if now < fresh_until - config.options.get('cache.meta.refresh_ahead', 0):
+        return _FRESH
+    if now < fresh_until:
+        return _REFRESH
+    if now < fresh_until + config.options.get('cache.meta.stale_ttl', 0):
+        return _STALE
+    return _EXPIRED
+
+
+async def _refresh_partitions(namespace, view, rebuild):
+    """Make sure each registered plugin's partition of a meta cache is
+    up to date.
+
+    Missing or expired partitions are rebuilt (concurrently) before this
+    returns. Partitions which are stale or due for refresh-ahead are refreshed
+    in the background. Partitions for plugins which are no longer registered
+    are removed. Each partition is rebuilt independently, so a plugin whose
+    partition is fresh is not sent any requests.
+
+    Args:
+        namespace (str): The namespace of the meta cache.
+        view: The partitioned view of the meta cache.
+        rebuild: A coroutine function which takes a plugin id and a rebuild
+            deadline, and rebuilds the plugin's partition.
+    """
+    deadline = _rebuild_deadline()
+
+    wait = []
+    for plugin_id in list(Plugin.manager.plugins):
+        ns = _partition_ns(namespace, plugin_id)
+        fn = functools.partial(rebuild, plugin_id, deadline)
+
+        state = _freshness(ns) if plugin_id in view.partitions else _EXPIRED
+        if state == _EXPIRED:
+            wait.append(_singleflight(ns, fn))
+        elif state != _FRESH:
+            _refresh(ns, fn)
+
+    if wait:
+        await asyncio.gather(*wait)
+
+    for plugin_id in set(view.partitions) - set(Plugin.manager.plugins):
+        logger.debug(_('Removing cache partition for plugin: {}').format(plugin_id))
+        view.remove(plugin_id)
+        _fresh_until.pop(_partition_ns(namespace, plugin_id), None)
+
+
+def _failed_partition(namespace, plugin_id, ex):
+    """Make the partition for a plugin which failed a rebuild.
+
+    If enabled, the partition holds the last known good data for the plugin.
+
+    Args:
+        namespace (str): The namespace of the meta cache.
+        plugin_id (str): The id of the plugin which failed.
+        ex (Exception): The error raised by the plugin.
+
+    Returns:
+        _Partition: The partition for the plugin.
+    """
+    data = None
+    if config.options.get('cache.meta.last_known_good', False):
+        data = _last_known_good.get(_partition_ns(namespace, plugin_id))
+        if data:
+            logger.warning(_('Using last known good data for plugin: {}').format(plugin_id))
+    return _Partition(plugin_id, data, error=ex)
+
+
+def _check_all_failed(namespace, view, message):
+    """Raise an error if every plugin failed to provide data for a meta cache.
+
+    If all plugins failed (assuming there were any), it is likely that something
+    is mis-configured. The failed partitions are marked as expired so the next
+    request retries them rather than waiting out the TTL.
+
+    Args:
+        namespace (str): The namespace of the meta cache.
+        view: The partitioned view of the meta cache.
+        message (str): The error message, to be formatted with the failures.
+
+    Raises:
+        errors.InternalApiError: All plugins failed.
+    """
+    partitions = list(view.partitions.values())
+    if partitions and all(p.failed for p in partitions):
+        failures = {p.plugin_id: p.error for p in partitions}
+        for plugin_id in failures:
+            _fresh_until.pop(_partition_ns(namespace, plugin_id), None)
+        raise errors.InternalApiError(message.format(failures))
+
+
 async def clear_all_meta_caches():
     """Clear all caches which contain or are derived from meta-information
+    collected from gRPC Metainfo and Capabilities requests.
+    """
+    for namespace, view in ((NS_DEVICE_INFO, _devices), (NS_CAPABILITIES, _capabilities)):
+        for plugin_id in list(view.partitions):
+            view.remove(plugin_id)
+            _fresh_until.pop(_partition_ns(namespace, plugin_id), None)
+
+
+async def refresh_all_meta_caches():
+    """Refresh all caches which contain or are derived from meta-information
     collected from gRPC Metainfo requests.
+
+    If stale serving is enabled (`cache.meta.stale_ttl`), every plugin's
+    device info is refreshed in the background, so the existing entries
+    continue to be served until the refresh completes. Otherwise, the caches
+    are cleared so they are rebuilt on their next request.
     """
-    for ns in [NS_DEVICE_INFO, NS_PLUGINS, NS_INFO, NS_SCAN]:
-        await clear_cache(ns)
+    if not config.options.get('cache.meta.stale_ttl', 0):
+        await clear_all_meta_caches()
+        return
+
+    await reconciler.reconcile()
+
+    # The partitions are not marked as expired, since requests would then
+    # wait on their rebuild rather than being served the existing entries.
+    deadline = _rebuild_deadline()
+    for plugin_id in list(Plugin.manager.plugins):
+        if plugin_id in _devices.partitions:
+            _refresh(
+                _partition_ns(NS_DEVICE_INFO, plugin_id),
+                functools.partial(_rebuild_device_partition, plugin_id, deadline),
+            )
+
+    # Build the partitions of any new plugins and remove those of plugins
+    # which are gone.
+    await _refresh_partitions(NS_DEVICE_INFO, _devices, _rebuild_device_partition)
 
 
 async def get_transaction(transaction_id):
@@ -118,6 +827,208 @@ async def add_transaction(transaction_id, context, plugin_name):
     )
 
 
+class _Read:
+    """A device read which is shared by all concurrent reads of the device.
+
+    The read is cancelled once every caller waiting on it has given up on
+    it, so the plugin is not left working on a read that nobody wants.
+
+    Args:
+        key (str): The composite id of the device being read.
+        read: A coroutine function which reads the device from its plugin.
+        max_age (float): The maximum age, in seconds, of cached readings
+            which the read was started for, or None if the configured
+            readings cache TTL applies. (default: None)
+    """
+
+    def __init__(self, key, read, max_age=None):
+        self.key = key
+        self.max_age = max_age
+        self.loop = asyncio.get_event_loop()
+        self.waiters = 0
+        self.task = asyncio.ensure_future(read())
+        self.task.add_done_callback(self._done)
+
+    async def wait(self, timeout=None):
+        """Wait for the result of the read.
+
+        Args:
+            timeout (float): The number of seconds to wait for the read. If
+                this is None, wait until the read completes.
+
+        Returns:
+            list[synse_grpc.api.Reading]: The readings of the device.
+
+        Raises:
+            asyncio.TimeoutError: The read did not complete in time.
+        """
+        self.waiters += 1
+        try:
+            return await asyncio.wait_for(asyncio.shield(self.task), timeout)
+        finally:
+            self.waiters -= 1
+            if self.waiters == 0 and not self.task.done():
+                logger.debug(_('No callers left waiting on read of {}, cancelling').format(
+                    self.key
+                ))
+                # The task is not done until the cancellation is delivered to
+                # it, so it is untracked now to keep new reads from joining it.
+                if _reads.get(self.key) is self:
+                    del _reads[self.key]
+                self.task.cancel()
+
+    def _done(self, task):
+        """Stop tracking the read as in flight and, if it succeeded, cache
+        its readings.
+
+        Args:
+            task (asyncio.Task): The completed read.
+        """
+        if _reads.get(self.key) is self:
+            del _reads[self.key]
+
+        if not task.cancelled() and task.exception() is None:
+            _put_readings(self.key, task.result(), 0.0, self.max_age)
+
+
+def readings_ttl():
+    """Get the default maximum age, in seconds, of the cached readings
+    served for a device.
+
+    Returns:
+        float: The readings cache TTL.
+    """
+    return float(config.options.get('cache.readings.ttl', 0) or 0)
+
+
+def peek_readings(rack, board, device, max_age=None):
+    """Get the cached readings of a device, if it was read recently enough.
+
+    Args:
+        rack (str): The rack which the device resides on.
+        board (str): The board which the device resides on.
+        device (str): The ID of the device.
+        max_age (float): The maximum age, in seconds, of cached readings
+            which may be served. If this is None, the configured readings
+            cache TTL (`cache.readings.ttl`) is used.
+
+    Returns:
+        tuple(list[synse_grpc.api.Reading], float): The cached readings of
+            the device and their age, in seconds.
+        None: There are no cached readings for the device which are recent
+            enough.
+    """
+    if max_age is None:
+        max_age = readings_ttl()
+    if max_age <= 0:
+        return None
+
+    key = utils.composite(rack, board, device)
+    cached = _readings.get(key)
+    if cached is not None:
+        age = time.monotonic() - cached[0]
+        if age <= max_age:
+            logger.debug(_('Serving cached readings for {} ({:.3f}s old)').format(key, age))
+            return cached[1], age
+    return None
+
+
+def put_readings(rack, board, device, readings, age=0.0, max_age=None):
+    """Cache the readings of a device.
+
+    Args:
+        rack (str): The rack which the device resides on.
+        board (str): The board which the device resides on.
+        device (str): The ID of the device.
+        readings (list[synse_grpc.api.Reading]): The readings of the device.
+        age (float): The age, in seconds, of the readings. (default: 0.0)
+        max_age (float): The maximum age, in seconds, of cached readings
+            which the device was read for. If this is None, the configured
+            readings cache TTL (`cache.readings.ttl`) is used. (default: None)
+    """
+    _put_readings(utils.composite(rack, board, device), readings, age, max_age)
+
+
+def _put_readings(key, readings, age, max_age):
+    """Cache the readings of a device (see `put_readings`).
+
+    Readings which could never be served, since they were read for a
+    maximum age of 0, are not cached. Readings which are older than both
+    the largest maximum age readings have been cached for and the readings
+    cache TTL are pruned from the cache, so it does not keep the readings of
+    devices which are no longer read (e.g. which were removed).
+
+    Args:
+        key (str): The composite id of the device.
+        readings (list[synse_grpc.api.Reading]): The readings of the device.
+        age (float): The age, in seconds, of the readings.
+        max_age (float): The maximum age, in seconds, of cached readings
+            which the device was read for, or None if the configured
+            readings cache TTL applies.
+    """
+    global _readings_max_age, _readings_pruned_at  # pylint: disable=global-statement
+
+    if max_age is None:
+        max_age = readings_ttl()
+    if max_age <= 0:
+        return
+
+    now = time.monotonic()
+    _readings[key] = (now - age, readings)
+    _readings_max_age = max(_readings_max_age, max_age)
+
+    retention = max(_readings_max_age, readings_ttl())
+    if now - _readings_pruned_at >= retention:
+        _readings_pruned_at = now
+        for k, cached in list(_readings.items()):
+            if now - cached[0] > retention:
+                del _readings[k]
+
+
+async def get_readings(rack, board, device, read, max_age=None, timeout=None):
+    """Get the readings of a device.
+
+    If the device was read no more than `max_age` seconds ago, its cached
+    readings are served. Otherwise, the device is read from its plugin. If
+    a read of the device is already in flight, it is shared rather than
+    starting another one.
+
+    Args:
+        rack (str): The rack which the device resides on.
+        board (str): The board which the device resides on.
+        device (str): The ID of the device.
+        read: A coroutine function which reads the device from its plugin.
+        max_age (float): The maximum age, in seconds, of cached readings
+            which may be served. If this is None, the configured readings
+            cache TTL (`cache.readings.ttl`) is used. If this is 0, the
+            device is always read.
+        timeout (float): The number of seconds to wait for the device to
+            be read. If this is None, wait until the read completes.
+
+    Returns:
+        tuple(list[synse_grpc.api.Reading], float): The readings of the
+            device and their age, in seconds.
+
+    Raises:
+        asyncio.TimeoutError: The device was not read in time.
+    """
+    cached = peek_readings(rack, board, device, max_age)
+    if cached is not None:
+        return cached
+
+    key = utils.composite(rack, board, device)
+
+    # A read started on another event loop will never complete on this
+    # one, so it is not joined.
+    flight = _reads.get(key)
+    if flight is None or flight.loop is not asyncio.get_event_loop() or flight.task.done():
+        flight = _reads[key] = _Read(key, read, max_age)
+    else:
+        logger.debug(_('Joining in-flight read of {}').format(key))
+
+    return await flight.wait(timeout), 0.0
+
+
 async def get_device_info(rack, board, device):
     """Get the device information for a device.
 
@@ -137,7 +1048,6 @@ async def get_device_info(rack, board, device):
     """
     cid = utils.composite(rack, board, device)
 
-    # This also builds the plugins cache
     _cache = await get_device_info_cache()
     dev = _cache.get(cid)
 
@@ -149,48 +1059,284 @@ async def get_device_info(rack, board, device):
 
     # If the device exists, it will have come from a plugin, so we should
     # always have the plugin name here.
-    pcache = await _plugins_cache.get(PLUGINS_CACHE_KEY)
-    return pcache.get(cid), dev
+    return _devices.plugins.get(cid), dev
+
+
+async def get_device_type(rack, board, device):
+    """Get the type of a device.
+
+    Args:
+        rack (str): The rack which the device resides on.
+        board (str): The board which the device resides on.
+        device (str): The ID of the device to get the type of.
+
+    Returns:
+        str: The lower-cased type of the device, derived from its kind.
+
+    Raises:
+        errors.DeviceNotFoundError: The given rack-board-device combination
+            does not correspond to a known device.
+    """
+    await get_device_info_cache()
+    _type = _devices.types.get(utils.composite(rack, board, device))
+
+    if _type is None:
+        raise errors.DeviceNotFoundError(
+            _('{} does not correspond with a known device').format(
+                '/'.join([rack, board, device]))
+        )
+    return _type
+
+
+async def get_devices_by_type(device_type):
+    """Get the devices of a given type.
+
+    Args:
+        device_type (str): The type of device to get, e.g. "temperature".
+            Casing does not matter.
+
+    Returns:
+        dict: The matching devices, keyed by device id composite.
+    """
+    await get_device_info_cache()
+    return _devices.by_type.get(device_type.lower(), {})
+
+
+async def get_devices_by_plugin(plugin_id):
+    """Get the devices provided by a given plugin.
+
+    Args:
+        plugin_id (str): The id of the plugin.
+
+    Returns:
+        dict: The plugin's devices, keyed by device id composite.
+    """
+    await get_device_info_cache()
+    return _devices.by_plugin.get(plugin_id, {})
+
+
+async def get_devices_by_info(info):
+    """Get the devices with a given info string.
+
+    Args:
+        info (str): The device info string, e.g. "Rack Temperature Spare".
+
+    Returns:
+        dict: The matching devices, keyed by device id composite.
+    """
+    await get_device_info_cache()
+    return _devices.by_info.get(info, {})
+
+
+async def get_rack_devices(rack):
+    """Get the devices on a given rack.
+
+    Args:
+        rack (str): The id of the rack.
+
+    Returns:
+        dict: The devices on each board of the rack, keyed by board id
+            and then by device id composite.
+    """
+    await get_device_info_cache()
+    return _devices.by_rack.get(rack, {})
+
+
+async def get_board_devices(rack, board):
+    """Get the devices on a given board.
+
+    Args:
+        rack (str): The id of the rack the board is on.
+        board (str): The id of the board.
+
+    Returns:
+        dict: The devices on the board, keyed by device id composite.
+    """
+    await get_device_info_cache()
+    return _devices.by_board.get((rack, board), {})
+
+
+async def select_devices(rack=None, board=None, device_type=None, kind=None, model=None,
+                         info=None):
+    """Get the devices which match all of the given selectors.
+
+    The candidate devices are narrowed down with the most selective device
+    index that applies, and only those are checked against the rest of the
+    selectors, so a selection does not have to look at every device.
+
+    Args:
+        rack (str): The id of the rack the devices are on.
+        board (str): The id of the board the devices are on. This is only
+            used along with the rack.
+        device_type (str): The type of the devices, e.g. "temperature".
+            Casing does not matter.
+        kind (str): The fully qualified kind of the devices, e.g.
+            "vaporio.emulator.temperature".
+        model (str): The model of the devices, as given in their metadata.
+            Casing does not matter.
+        info (str): A pattern (see `fnmatch`) to match the info string of
+            the devices against, e.g. "Rack Temperature *".
+
+    Returns:
+        dict: The matching devices, keyed by device id composite.
+    """
+    devices = await get_device_info_cache()
+
+    if rack is not None and board is not None:
+        devices = _devices.by_board.get((rack, board), {})
+    elif rack is not None:
+        devices = {}
+        for board_devices in _devices.by_rack.get(rack, {}).values():
+            devices.update(board_devices)
+    elif device_type is not None:
+        devices = _devices.by_type.get(device_type.lower(), {})
+    elif info is not None and not any(c in info for c in '*?['):
+        devices = _devices.by_info.get(info, {})
+
+    if device_type is not None:
+        device_type = device_type.lower()
+    if model is not None:
+        model = model.lower()
+
+    return {
+        cid: dev for cid, dev in devices.items()
+        if (device_type is None or _devices.types.get(cid) == device_type) and
+        (kind is None or dev.kind == kind) and
+        (model is None or dev.metadata.get('model', '').lower() == model) and
+        (info is None or fnmatch.fnmatchcase(dev.info, info))
+    }
+
+
+async def get_scan_rack(rack):
+    """Get the scan results for a single rack.
+
+    Args:
+        rack (str): The id of the rack.
+
+    Returns:
+        dict: The scan entry for the rack (see `get_scan_cache`), or
+            None if the rack is not known.
+    """
+    await get_device_info_cache()
+    return _devices.scan_rack(rack)
+
+
+async def get_scan_board(rack, board):
+    """Get the scan results for a single board.
+
+    Args:
+        rack (str): The id of the rack the board is on.
+        board (str): The id of the board.
+
+    Returns:
+        dict: The scan entry for the board (see `get_scan_cache`), or
+            None if the board is not known.
+    """
+    await get_device_info_cache()
+    return _devices.scan_board(rack, board)
+
+
+async def get_scan_device(rack, board, device):
+    """Get the scan results for a single device.
+
+    Args:
+        rack (str): The rack which the device resides on.
+        board (str): The board which the device resides on.
+        device (str): The ID of the device.
+
+    Returns:
+        dict: The scan entry for the device (see `get_scan_cache`), or
+            None if the device is not known.
+    """
+    await get_device_info_cache()
+    return _devices.scan_device(utils.composite(rack, board, device))
+
+
+def encode_device_view(key, source, render=None):
+    """Get the encoded JSON response body and ETag for part of the views
+    derived from the device info cache (e.g. scan or info results).
+
+    The encoding is cached until the device info changes.
+
+    Args:
+        key (tuple): The key which identifies the part of the view,
+            e.g. ('scan', rack, board).
+        source: The data from the view which the response is built from.
+        render: A function which builds the response data from the
+            source. If not given, the source is the response data.
+
+    Returns:
+        tuple(bytes, str): The encoded response body and its ETag.
+    """
+    return _devices.encoded(key, source, render)
+
+
+def encode_capabilities_view(source):
+    """Get the encoded JSON response body and ETag for the capabilities.
+
+    The encoding is cached until the capabilities change.
+
+    Args:
+        source (list): The capabilities, from `get_capabilities_cache`.
+
+    Returns:
+        tuple(bytes, str): The encoded response body and its ETag.
+    """
+    return _capabilities.encoded(('capabilities',), source)
+
+
+async def get_device_info_errors():
+    """Get the errors for plugins which failed to provide device information
+    during the last rebuild of their device info.
+
+    Returns:
+        list[dict]: The error for each plugin which failed or timed out.
+    """
+    return _format_failures({
+        p.plugin_id: p.error for p in _devices.partitions.values() if p.error is not None
+    })
 
 
 async def get_capabilities_cache():
     """Get the cached device capability information for all registered
     plugins, aggregated from the gRPC Capabilities request.
 
-    If the cache does not exist or has surpassed its TTL, it will be
-    rebuilt.
+    The capabilities are cached per plugin. If a plugin's capabilities do not
+    exist or have surpassed their TTL, they will be rebuilt.
 
     Returns:
         list: A list enumerating each plugin's device kinds and their
             corresponding capabilities.
-    """
-    # Get the cache and return it if it exists, otherwise, rebuild.
-    value = await _capabilities_cache.get(CAPABILITIES_CACHE_KEY)
-    if value is not None:
-        return value
 
-    capabilities = await _build_capabilities_cache()
+    Raises:
+        errors.InternalApiError: All plugins failed the capabilities request
+            and there are no last known good capabilities to use.
+    """
+    logger.debug(_('Getting the device capabilities cache'))
 
-    # If the capabilities data is empty when built, we don't want to cache
-    # the empty list, so we will set it to None. Future calls to this function
-    # will then attempt to rebuild the cache.
-    value = capabilities or None
+    await reconciler.ready()
 
-    # Get the cache ttl
-    ttl = config.options.get('cache.meta.ttl', None)
-    await _capabilities_cache.set(CAPABILITIES_CACHE_KEY, value, ttl=ttl)
-
-    return capabilities
+    await _refresh_partitions(NS_CAPABILITIES, _capabilities, _rebuild_capabilities_partition)
+    _check_all_failed(
+        NS_CAPABILITIES, _capabilities,
+        _('Failed to get capabilities for all plugins: {}'),
+    )
+    return _capabilities.capabilities(list(Plugin.manager.plugins))
 
 
 async def get_device_info_cache():
     """Get the cached device information aggregated from the gRPC Devices
     request across all plugins.
 
-    If the cache does not exist or has surpassed its TTL, it will be
-    rebuilt.
+    The device info is cached per plugin, each with its own TTL. Only the
+    plugins whose device info does not exist or has surpassed its TTL are
+    asked for their devices again.
 
-    If there are no registered plugins, it attempts to (re-)register them.
+    If plugins have not yet been registered, this waits for them to be
+    registered first (see `synse.plugin.PluginReconciler.ready`).
+
+    If a plugin's device info is being rebuilt when this is called, the
+    caller waits on the in-flight rebuild instead of starting its own.
 
     The device info cache is a map where the key is the device id composite
     and the value is the Device information provided for that device.
@@ -205,34 +1351,27 @@ async def get_device_info_cache():
     Returns:
         dict: The device info dictionary in which the key is the device id
             and the value is the data associated with that device.
-    """
-    # Get the cache and return it if it exists, otherwise, rebuild.
-    value = await _device_info_cache.get(DEVICE_INFO_CACHE_KEY)
-    if value is not None:
-        return value
-
-    devices, plugins = await _build_device_info_cache()
 
-    # If the device data is empty when built, we don't want to cache an
-    # empty dictionary, so we will set it to None. Future calls to this
-    # function will then attempt to rebuild the cache.
-    devices_value = devices or None
-    plugins_value = plugins or None
-
-    # Get device cache's ttl and update the cache. Use the same ttl for the plugins.
-    # FIXME (etd) - may want to rename the config option
-    ttl = config.options.get('cache.meta.ttl', None)
-    await _device_info_cache.set(DEVICE_INFO_CACHE_KEY, devices_value, ttl=ttl)
-    await _plugins_cache.set(PLUGINS_CACHE_KEY, plugins_value, ttl=ttl)
+    Raises:
+        errors.InternalApiError: All plugins failed the device scan and there
+            is no last known good device info to use.
+    """
+    # Plugins are registered by the plugin reconciler in the background, so
+    # a plugin which was previously down is added back to tracking (and gets
+    # its device info built) on the next reconciliation, without registration
+    # being done here. See: https://github.com/vapor-ware/synse-server/issues/317
+    await reconciler.ready()
 
-    return devices
+    await _refresh_partitions(NS_DEVICE_INFO, _devices, _rebuild_device_partition)
+    _check_all_failed(NS_DEVICE_INFO, _devices, _('Failed to scan all plugins: {}'))
+    return _devices.devices
 
 
 async def get_scan_cache():
     """Get the cached scan results.
 
-    If the scan result cache does not exist or the TTL has expired, the cache
-    will be rebuilt.
+    The scan results are derived from the device info cache, so they are
+    rebuilt along with it (see `get_device_info_cache`).
 
     An example of the scan cache structure:
         {
@@ -263,32 +1402,15 @@ async def get_scan_cache():
     Returns:
         dict: A dictionary containing the scan command result.
     """
-    value = await _scan_cache.get(SCAN_CACHE_KEY)
-    if value is not None:
-        return value
-
-    # If the cache is not found, we will (re)build it from device info cache.
-    _device_info = await get_device_info_cache()
-    scan_cache = _build_scan_cache(_device_info)
-
-    # If the scan data is empty when built, we don't want to cache an empty
-    # dictionary, so we will set it to None. Future calls to get_scan_cache
-    # will then attempt to rebuild the cache.
-    value = scan_cache or None
-
-    # Get the scan cache's ttl and update the cache. This should be the same
-    # ttl that is used by the metainfo cache.
-    ttl = config.options.get('cache.meta.ttl', None)
-    await _scan_cache.set(SCAN_CACHE_KEY, value, ttl=ttl)
-
-    return scan_cache
+    await get_device_info_cache()
+    return _devices.scan()
 
 
 async def get_resource_info_cache():
     """Get the cached resource info.
 
-    If the resource info cache does not exist or the TTL has expired, the
-    cache will be rebuilt.
+    The resource info is derived from the device info cache, so it is
+    rebuilt along with it (see `get_device_info_cache`).
 
     An example of the info cache structure:
         {
@@ -336,158 +1458,152 @@ async def get_resource_info_cache():
     Returns:
         dict: A dictionary containing the info command result.
     """
-    value = await _info_cache.get(INFO_CACHE_KEY)
-    if value is not None:
-        return value
-
-    # If the cache is not found, we will (re)build it from device info cache.
-    _device_info = await get_device_info_cache()
-    info_cache = _build_resource_info_cache(_device_info)
-
-    # If the info data is empty when built, we don't want to cache an empty
-    # dictionary, so we will set it to None. Future calls to get_info_cache
-    # will then attempt to rebuild the cache.
-    value = info_cache or None
+    await get_device_info_cache()
+    return _devices.info
 
-    # Get the info cache's ttl and update the cache. This should be the same
-    # ttl that is used by the metainfo cache.
-    ttl = config.options.get('cache.meta.ttl', None)
-    await _info_cache.set(INFO_CACHE_KEY, value, ttl=ttl)
-
-    return info_cache
 
-
-async def _build_capabilities_cache():
-    """Construct the list that will become the device capabilities cache.
+def _rebuild_deadline():
+    """Get the deadline for a meta info cache rebuild, based on the
+    configured rebuild budget.
 
     Returns:
-        list: A list of dictionaries, where each dictionary corresponds to
-            a registered plugin. The plugin dict will identify the plugin
-            and enumerate the device kinds it supports and the output types
-            supported by those device kinds.
-
-    Raises:
-        errors.InternalApiError: All plugins failed the capabilities request.
+        float: The event loop time by which the rebuild should complete.
     """
-    logger.debug(_('Building the device capabilities cache'))
-    capabilities = []
+    budget = config.options.get('cache.meta.budget', 5)
+    return asyncio.get_event_loop().time() + budget
 
-    # First, we want to iterate through all of the known plugins and use
-    # their clients to get the capability info for each plugin.
-    plugin_count = len(Plugin.manager.plugins)
-    if plugin_count == 0:
-        logger.debug(_('Manager has no plugins - registering plugins'))
-        register_plugins()
-        plugin_count = len(Plugin.manager.plugins)
 
-    logger.debug(_('Plugins to get capabilities for: {}').format(plugin_count))
+def _plugin_timeout(deadline):
+    """Get the timeout for a single plugin request made as part of a
+    rebuild with the given deadline.
 
-    # Track which plugins failed to provide capability info for any reason.
-    failures = {}
+    The timeout is whatever remains of the rebuild budget, capped at the
+    configured gRPC timeout.
 
-    # FIXME (etd): as of pylint 2.1.1, this gets marked with 'not-an-iterable'
-    # It still appears to work just fine, so need to figure out why it is getting
-    # marked as such and what should be done to fix it.
-    async for plugin_id, plugin in get_plugins():  # pylint: disable=not-an-iterable
-        logger.debug('{} - {}'.format(plugin_id, plugin))
-
-        devices = []
+    Args:
+        deadline (float): The event loop time by which the rebuild
+            should complete.
 
-        try:
-            for capability in plugin.client.capabilities():
-                devices.append({
-                    'kind': capability.kind,
-                    'outputs': capability.outputs
-                })
+    Returns:
+        float: The timeout, in seconds, for the plugin request.
+    """
+    remaining = max(deadline - asyncio.get_event_loop().time(), 0)
+    timeout = config.options.get('grpc.timeout', None)
+    if timeout is None:
+        return remaining
+    return min(timeout, remaining)
 
-        except grpc.RpcError as ex:
-            failures[plugin_id] = ex
-            logger.warning(_('Failed to get capability for plugin: {}').format(plugin_id))
-            logger.warning(ex)
-            continue
 
-        capabilities.append({
-            'plugin': plugin.tag,
-            'devices': devices
-        })
+def _format_failures(failures):
+    """Format the per-plugin failures from a cache rebuild for inclusion
+    in a response.
 
-    # If we fail to read from all plugins (assuming there were any), then we
-    # can raise an error since it is likely something is mis-configured.
-    if plugin_count != 0 and plugin_count == len(failures):
-        raise errors.InternalApiError(
-            _('Failed to get capabilities for all plugins: {}').format(failures)
-        )
+    Args:
+        failures (dict): The errors raised by plugin requests, keyed
+            by plugin id.
 
-    return capabilities
+    Returns:
+        list[dict]: The formatted error for each plugin.
+    """
+    formatted = []
+    for plugin_id, ex in failures.items():
+        timed_out = isinstance(ex, asyncio.TimeoutError)
+        formatted.append({
+            'plugin': plugin_id,
+            'error': 'timeout' if timed_out else 'failed',
+            'message': _('plugin did not respond within its deadline') if timed_out else str(ex),
+        })
+    return formatted
 
 
-async def _build_device_info_cache():
-    """Construct the dictionary that will become the device info cache.
+async def _rebuild_capabilities_partition(plugin_id, deadline):
+    """Rebuild a plugin's partition of the device capabilities cache.
 
-    Returns:
-        tuple(dict, dict): A tuple where the first dictionary is the device info
-            dictionary (in which the key is the device id and the value is the
-            data associated with that device), and the second dictionary is the
-            plugins dictionary (in which the device ID is mapped to the name of
-            the plugin which manages it).
+    The partition data is a dictionary which identifies the plugin and
+    enumerates the device kinds it supports and the output types supported
+    by those device kinds.
 
-    Raises:
-        errors.InternalApiError: All plugins failed the device scan.
+    Args:
+        plugin_id (str): The id of the plugin to rebuild the partition for.
+        deadline (float): The event loop time by which the rebuild
+            should complete.
     """
-    logger.debug(_('Building the device cache'))
-    devices, plugins = {}, {}
+    plugin = Plugin.manager.get(plugin_id)
+    if plugin is None:
+        _capabilities.remove(plugin_id)
+        return
 
-    # Register all plugins prior to rebuilding the cache. This ensures that we
-    # are using all possible plugins to get device data. If a plugin was previously
-    # down, this will add it back to tracking before the cache is rebuilt.
-    # See: https://github.com/vapor-ware/synse-server/issues/317
-    logger.debug(_('re-registering plugins prior to cache rebuild'))
-    register_plugins()
-    plugin_count = len(Plugin.manager.plugins)
+    logger.debug(_('Building the device capabilities cache for plugin: {}').format(plugin_id))
+    ns = _partition_ns(NS_CAPABILITIES, plugin_id)
 
-    logger.debug(_('Plugins to scan: {}').format(plugin_count))
+    try:
+        capabilities = await asyncio.wait_for(
+            plugin.client.capabilities(), _plugin_timeout(deadline),
+        )
+    except (grpc.RpcError, errors.PluginCircuitOpenError, asyncio.TimeoutError) as ex:
+        logger.warning(_('Failed to get capability for plugin: {}').format(plugin_id))
+        logger.warning(ex)
+        partition = _failed_partition(NS_CAPABILITIES, plugin_id, ex)
+    else:
+        data = {
+            'plugin': plugin.tag,
+            'devices': [{
+                'kind': capability.kind,
+                'outputs': capability.outputs
+            } for capability in capabilities]
+        }
+        _last_known_good[ns] = data
+        partition = _Partition(plugin_id, data)
 
-    # Track which plugins failed to provide devices for any reason.
-    failures = {}
+    _capabilities.update(partition)
+    _mark_fresh(ns)
 
-    # FIXME (etd): as of pylint 2.1.1, this gets marked with 'not-an-iterable'
-    # It still appears to work just fine, so need to figure out why it is getting
-    # marked as such and what should be done to fix it.
 
-    # We want to iterate through all of the known plugins and
-    # use the associated client to get the device information provided by
-    # that backend.
-    async for plugin_id, plugin in get_plugins():  # pylint: disable=not-an-iterable
-        logger.debug('{} -- {}'.format(plugin_id, plugin))
+async def _rebuild_device_partition(plugin_id, deadline):
+    """Rebuild a plugin's partition of the device info cache.
 
-        try:
-            for device in plugin.client.devices():
-                _id = utils.composite(device.location.rack, device.location.board, device.uid)
-                devices[_id] = device
-                plugins[_id] = plugin_id
-
-        # We do not want to fail the scan if a single plugin fails to provide
-        # device information.
-        #
-        # FIXME (etd): instead of just logging out the errors, we could either:
-        #   - update the response scheme to hold an 'errors' field which will alert
-        #     the user of these partial non-fatal errors.
-        #   - update the API to add a url to check the currently configured plugins
-        #     and their 'health'/'state'.
-        #   - both
-        except grpc.RpcError as ex:
-            failures[plugin_id] = ex
-            logger.warning(_('Failed to get device info for plugin: {}').format(plugin_id))
-            logger.warning(ex)
-
-    # If we fail to read from all plugins (assuming there were any), then we
-    # can raise an error since it is likely something is mis-configured.
-    if plugin_count != 0 and plugin_count == len(failures):
-        raise errors.InternalApiError(
-            _('Failed to scan all plugins: {}').format(failures)
-        )
+    The partition data is a dictionary in which the key is the device id
+    and the value is the data associated with that device. The derived scan
+    and info views are patched with the changes to the partition.
+
+    The plugin request gets a deadline derived from what remains of the
+    rebuild budget, so the rebuild completes in bounded time regardless of
+    how unresponsive the plugin is.
 
-    return devices, plugins
+    Args:
+        plugin_id (str): The id of the plugin to rebuild the partition for.
+        deadline (float): The event loop time by which the rebuild
+            should complete.
+    """
+    plugin = Plugin.manager.get(plugin_id)
+    if plugin is None:
+        _devices.remove(plugin_id)
+        return
+
+    logger.debug(_('Building the device cache for plugin: {}').format(plugin_id))
+    ns = _partition_ns(NS_DEVICE_INFO, plugin_id)
+
+    # We do not want to fail the scan if a single plugin fails to provide
+    # device information. The failure is kept with the partition so it can
+    # be surfaced in the 'errors' section of the scan and info responses.
+    try:
+        devices = await asyncio.wait_for(plugin.client.devices(), _plugin_timeout(deadline))
+    except (grpc.RpcError, errors.PluginCircuitOpenError, asyncio.TimeoutError) as ex:
+        logger.warning(_('Failed to get device info for plugin: {}').format(plugin_id))
+        logger.warning(ex)
+        partition = _failed_partition(NS_DEVICE_INFO, plugin_id, ex)
+    else:
+        data = {}
+        for device in devices:
+            _id = utils.composite(device.location.rack, device.location.board, device.uid)
+            data[_id] = device
+        partition = _Partition(plugin_id, data, fingerprint=putil.devices_fingerprint(devices))
+
+    # If the plugin's devices are unchanged (which is usually the case), the
+    # existing data is kept and nothing derived from it needs to be rebuilt.
+    if _devices.update(partition) and partition.error is None and partition.data:
+        _last_known_good[ns] = partition.data
+    _mark_fresh(ns)
 
 
 def _build_scan_cache(device_info):
@@ -9,12 +9,14 @@ you can simply 'from synse.commands import scan'.
 """
 # pylint: disable=unused-import
 
+from .bulk_read import bulk_read
 from .capabilities import capabilities
 from .config import config
+from .executor import get_executor
 # FIXME (etd) - temporary for autofan support
 from .fan_sensors import fan_sensors
 from .info import info
-from .plugins import get_plugins
+from .plugins import get_plugin_health, get_plugins
 from .read import read
 from .read_cached import read_cached
 from .scan import scan
@@ -0,0 +1,107 @@
+"""Command handler for the bulk `read` route."""
+
+import asyncio
+from collections import OrderedDict
+
+from synse import cache, errors, plugin
+from synse.commands.read import read_plugin_devices
+from synse.i18n import _
+from synse.log import logger
+from synse.scheme.bulk_read import BulkReadResponse
+
+
+async def bulk_read(devices=None, rack=None, board=None, device_type=None, kind=None,
+                    model=None, info=None, deadline=None, max_age=None):
+    """The handler for the Synse Server bulk "read" API command.
+
+    The devices to read are either given explicitly, or are selected by
+    any combination of rack, board, type, kind, model, and info pattern
+    (see `cache.select_devices`). They are grouped by the plugin which manages
+    them and all of them are read concurrently, with each plugin's executor
+    slots bounding the number of reads in flight to it at once. The devices
+    of each plugin are either read individually or with a single request to
+    the plugin, whichever the read planner expects to be cheaper (see
+    `read_plugin_devices`). A failure to read one
+    device does not fail the command; its error is given in the response in
+    place of its readings.
+
+    Args:
+        devices (list[tuple(str, str, str)]): The rack, board, and device id
+            of each device to read. (default: None)
+        rack (str): The rack to read the devices of. (default: None)
+        board (str): The board to read the devices of. (default: None)
+        device_type (str): The type of device to read. (default: None)
+        kind (str): The kind of device to read. (default: None)
+        model (str): The model of device to read. (default: None)
+        info (str): A pattern which the info of the devices to read
+            matches. (default: None)
+        deadline (float): The event loop time by which the request should
+            complete, if it has a deadline. (default: None)
+        max_age (float): The maximum age, in seconds, of cached readings
+            which may be served. If this is None, the configured readings
+            cache TTL applies. (default: None)
+
+    Returns:
+        BulkReadResponse: The bulk "read" response scheme model.
+    """
+    logger.debug(_(
+        'Bulk Read Command (devices: {}, rack: {}, board: {}, type: {}, kind: {}, '
+        'model: {}, info: {})'
+    ).format(devices, rack, board, device_type, kind, model, info))
+
+    if devices is None:
+        selected = await cache.select_devices(
+            rack=rack, board=board, device_type=device_type, kind=kind, model=model, info=info
+        )
+        devices = [
+            (dev.location.rack, dev.location.board, dev.uid)
+            for _cid, dev in sorted(selected.items())
+        ]
+
+    # The result for each device, in the order the devices were given. The
+    # readings fill in the results for the devices that are found.
+    results = OrderedDict()
+
+    # The devices to read, grouped by the id of their managing plugin.
+    groups = OrderedDict()
+    for target in devices:
+        if target in results:
+            continue
+        results[target] = None
+        try:
+            plugin_name, dev = await cache.get_device_info(*target)
+        except errors.DeviceNotFoundError as e:
+            results[target] = e
+            continue
+        groups.setdefault(plugin_name, []).append((target, dev))
+
+    # The plan each plugin's devices were read with.
+    plans = []
+
+    async def read_group(plugin_handler, targets):  # pylint: disable=missing-docstring
+        read_results, plan = await read_plugin_devices(
+            plugin_handler, targets, deadline=deadline, max_age=max_age
+        )
+        results.update(read_results)
+        plans.append(plan)
+
+    reads = []
+    for plugin_name, targets in groups.items():
+        plugin_handler = plugin.get_plugin(plugin_name)
+        if not plugin_handler:
+            err = errors.PluginNotFoundError(
+                _('Unable to find plugin named "{}" to read').format(plugin_name)
+            )
+            for target, _dev in targets:
+                results[target] = err
+            continue
+
+        logger.debug(_('Reading {} devices from plugin {}').format(len(targets), plugin_name))
+        reads.append(read_group(plugin_handler, targets))
+
+    await asyncio.gather(*reads)
+
+    return BulkReadResponse([
+        (rack, board, device, result)
+        for (rack, board, device), result in results.items()
+    ], plans=plans)
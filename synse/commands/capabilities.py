@@ -15,4 +15,7 @@ async def capabilities():
     logger.debug(_('Capabilities Command'))
 
     cache_data = await cache.get_capabilities_cache()
-    return CapabilitiesResponse(data=cache_data)
+    return CapabilitiesResponse(
+        data=cache_data,
+        encoded=cache.encode_capabilities_view(cache_data),
+    )
@@ -0,0 +1,16 @@
+"""Command handler for the `executor` route."""
+
+from synse.i18n import _
+from synse.log import logger
+from synse.proto.executor import executor
+from synse.scheme.executor import ExecutorResponse
+
+
+async def get_executor():
+    """The handler for the Synse Server "executor" API command.
+
+    Returns:
+        ExecutorResponse: The "executor" response scheme model.
+    """
+    logger.debug(_('Executor Command'))
+    return ExecutorResponse(data=executor.stats())
@@ -27,27 +27,36 @@ async def info(rack, board=None, device=None):
     _cache = await cache.get_resource_info_cache()
     r, b, d = get_resources(_cache, rack, board, device)
 
+    # The response is built from the cached rack, board, or device entry.
+    # Its encoding is cached along with the entry, but it can only be used
+    # if there are no plugin errors to add to it.
     if board is not None:
         # We have: rack, board, device
         if device is not None:
-            response = d
+            source, render = d, None
 
         # We have: rack, board
         else:
-            response = {
-                'board': b['board'],
+            source, render = b, lambda entry: {
+                'board': entry['board'],
                 'location': {'rack': r['rack']},
-                'devices': list(b['devices'].keys())
+                'devices': list(entry['devices'].keys())
             }
 
     else:
         # We have: rack
-        response = {
-            'rack': r['rack'],
-            'boards': list(r['boards'].keys())
+        source, render = r, lambda entry: {
+            'rack': entry['rack'],
+            'boards': list(entry['boards'].keys())
         }
 
-    return InfoResponse(response)
+    errs = await cache.get_device_info_errors()
+    encoded = None
+    if not errs:
+        encoded = cache.encode_device_view(('info', rack, board, device), source, render)
+
+    response = render(source) if render is not None else source
+    return InfoResponse(response, errors=errs, encoded=encoded)
 
 
 def get_resources(info_cache, rack=None, board=None, device=None):
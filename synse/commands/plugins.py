@@ -1,12 +1,9 @@
 """Command handler for the `plugins` route."""
 
-import grpc
-
-from synse import plugin, utils
+from synse import errors, health, plugin
 from synse.i18n import _
 from synse.log import logger
-from synse.proto import util
-from synse.scheme.plugins import PluginsResponse
+from synse.scheme.plugins import PluginHealthResponse, PluginsResponse
 
 
 async def get_plugins():
@@ -17,22 +14,23 @@ async def get_plugins():
     """
     logger.debug(_('Plugins Command'))
 
-    # Register plugins. If no plugins exist, this will attempt to register
-    # new ones. If plugins already exist, this will just ensure that all of
-    # the tracked plugins are up to date.
-    plugin.register_plugins()
+    # Plugins are registered by the plugin reconciler in the background, so
+    # this just reads the currently registered plugins. If plugins have not
+    # yet been registered, wait for them to be.
+    await plugin.reconciler.ready()
+
+    # The health of each plugin is served from the health monitor, which
+    # probes the plugins in the background. Any plugin which has not yet been
+    # probed (e.g. it was just registered) is probed now.
+    await health.monitor.ready()
 
-    # We need to collect information from a few sources for each plugin:
-    #  - config (network/address) .. this should be encoded in the plugin model
-    #  - metadata (grpc metadata) .. we need to make a call for this
-    #  - health (grpc health)     .. we need to make a call for this
     plugins = []
 
     # FIXME (etd): as of pylint 2.1.1, this gets marked with 'not-an-iterable'
     # It still appears to work just fine, so need to figure out why it is getting
     # marked as such and what should be done to fix it.
     async for p in plugin.get_plugins():  # pylint: disable=not-an-iterable
-        _plugin = p[1]
+        plugin_id, _plugin = p
         # Get the plugin config and add it to the plugin data
         plugin_data = {
             'tag': _plugin.tag,
@@ -52,34 +50,58 @@ async def get_plugins():
             'network': {
                 'protocol': _plugin.protocol,
                 'address': _plugin.address
-            }
+            },
+            'connectivity': _plugin.client.connectivity(),
+            'circuit': _plugin.client.breaker.to_dict(),
         }
 
-        # Get the plugin health data
-        try:
-            health = _plugin.client.health()
-        except grpc.RpcError as ex:
-            plugin_data['health'] = {
-                'timestamp': utils.rfc3339now(),
-                'status': 'error',
-                'message': str(ex),
-                'checks': []
-            }
-        else:
-            plugin_data['health'] = {
-                'timestamp': health.timestamp,
-                'status': util.plugin_health_status_name(health.status),
-                'message': '',
-                'checks': [
-                    {
-                        'name': check.name,
-                        'status': util.plugin_health_status_name(check.status),
-                        'message': check.message,
-                        'timestamp': check.timestamp,
-                        'type': check.type,
-                    } for check in health.checks]
-            }
+        plugin_data['health'] = _health(plugin_id)
 
         plugins.append(plugin_data)
 
     return PluginsResponse(data=plugins)
+
+
+async def get_plugin_health(plugin_id):
+    """The handler for the Synse Server "plugin health" API command.
+
+    Args:
+        plugin_id (str): The id of the plugin to get the health of.
+
+    Returns:
+        PluginHealthResponse: The "plugin health" response scheme model.
+
+    Raises:
+        errors.PluginNotFoundError: No plugin with the given id is registered.
+    """
+    logger.debug(_('Plugin Health Command (args: {})').format(plugin_id))
+
+    await plugin.reconciler.ready()
+
+    if plugin.get_plugin(plugin_id) is None:
+        raise errors.PluginNotFoundError(
+            _('Unable to find plugin with id: {}').format(plugin_id)
+        )
+
+    await health.monitor.ready()
+
+    data = _health(plugin_id)
+    data['plugin'] = plugin_id
+    return PluginHealthResponse(data=data)
+
+
+def _health(plugin_id):
+    """Get the health of a plugin from the health monitor.
+
+    Args:
+        plugin_id (str): The id of the plugin.
+
+    Returns:
+        dict: The health of the plugin.
+    """
+    state = health.monitor.get(plugin_id)
+    if state is None:
+        # The plugin was registered after the health monitor's last probe
+        # was started, so its health is unknown until the next one.
+        state = health.PluginHealthState()
+    return state.to_dict()
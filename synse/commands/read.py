@@ -1,22 +1,38 @@
 """Command handler for the `read` route."""
 # pylint: disable=line-too-long
 
+import asyncio
+from collections import OrderedDict
+
 import grpc
 from synse_grpc import api
 
-from synse import cache, errors, plugin, utils
+from synse import batcher, cache, config, errors, plugin, utils
+from synse.deadline import remaining
 from synse.i18n import _
 from synse.log import logger
+from synse.planner import DUMP, READ, read_planner
 from synse.scheme import ReadResponse
 
 
-async def read(rack, board, device):
+async def read(rack, board, device, deadline=None, max_age=None):
     """The handler for the Synse Server "read" API command.
 
+    Concurrent reads of the same device share a single read of the device
+    from its plugin. Recent readings of the device may be served from the
+    readings cache instead (see `cache.get_readings`). If read batching is
+    enabled, the device is read along with the other devices of its plugin
+    which are read within the batch window (see `synse.batcher`).
+
     Args:
         rack (str): The rack which the device resides on.
         board (str): The board which the device resides on.
         device (str): The device to read.
+        deadline (float): The event loop time by which the request should
+            complete, if it has a deadline. (default: None)
+        max_age (float): The maximum age, in seconds, of cached readings
+            which may be served. If this is None, the configured readings
+            cache TTL applies. (default: None)
 
     Returns:
         ReadResponse: The "read" response scheme model.
@@ -35,9 +51,62 @@ async def read(rack, board, device):
             _('Unable to find plugin named "{}" to read').format(plugin_name)
         )
 
+    if batcher.window() > 0:
+        read_data, age = await _read_batched(_plugin, dev, rack, board, device, deadline, max_age)
+    else:
+        read_data, age = await read_device(_plugin, dev, rack, board, device, deadline, max_age)
+    return ReadResponse(
+        device=dev,
+        readings=read_data,
+        age=age,
+    )
+
+
+async def read_device(plugin_handler, dev, rack, board, device, deadline=None, max_age=None):
+    """Read a device from its managing plugin.
+
+    Args:
+        plugin_handler (Plugin): The plugin which manages the device.
+        dev (Device): The device information for the device.
+        rack (str): The rack which the device resides on.
+        board (str): The board which the device resides on.
+        device (str): The device to read.
+        deadline (float): The event loop time by which the read should
+            complete, if it has a deadline. (default: None)
+        max_age (float): The maximum age, in seconds, of cached readings
+            which may be served. If this is None, the configured readings
+            cache TTL applies. (default: None)
+
+    Returns:
+        tuple(list[synse_grpc.api.Reading], float): The readings of the
+            device and their age, in seconds.
+
+    Raises:
+        errors.FailedReadCommandError: The device could not be read.
+    """
+    async def read_plugin():  # pylint: disable=missing-docstring
+        loop = asyncio.get_event_loop()
+        start = loop.time()
+        readings = await plugin_handler.client.read(rack, board, device)
+        read_planner.record(plugin_handler.id(), READ, loop.time() - start)
+        return readings
+
+    age = 0.0
     try:
-        # Perform a gRPC read on the device's managing plugin
-        read_data = _plugin.client.read(rack, board, device)
+        # Perform a gRPC read on the device's managing plugin. The read may be
+        # shared with other requests for the device, so it is not bounded by
+        # this request's deadline; only the wait for it is.
+        read_data, age = await cache.get_readings(
+            rack, board, device, read_plugin,
+            max_age=max_age,
+            timeout=remaining(deadline),
+        )
+    except asyncio.TimeoutError as ex:
+        raise errors.FailedReadCommandError(
+            _('Read of {}/{}/{} did not complete before the request deadline').format(
+                rack, board, device
+            )
+        ) from ex
     except grpc.RpcError as ex:
 
         # FIXME (etd) - this isn't the nicest way of doing this check.
@@ -100,7 +169,256 @@ async def read(rack, board, device):
         else:
             raise errors.FailedReadCommandError(str(ex)) from ex
 
-    return ReadResponse(
-        device=dev,
-        readings=read_data
+    return read_data, age
+
+
+async def _read_batched(plugin_handler, dev, rack, board, device, deadline=None, max_age=None):
+    """Read a device from its managing plugin as part of a batch.
+
+    Args:
+        plugin_handler (Plugin): The plugin which manages the device.
+        dev (Device): The device information for the device.
+        rack (str): The rack which the device resides on.
+        board (str): The board which the device resides on.
+        device (str): The device to read.
+        deadline (float): The event loop time by which the read should
+            complete, if it has a deadline. (default: None)
+        max_age (float): The maximum age, in seconds, of cached readings
+            which may be served. If this is None, the configured readings
+            cache TTL applies. (default: None)
+
+    Returns:
+        tuple(list[synse_grpc.api.Reading], float): The readings of the
+            device and their age, in seconds.
+
+    Raises:
+        errors.SynseError: The device could not be read.
+    """
+    cached = cache.peek_readings(rack, board, device, max_age=max_age)
+    if cached is not None:
+        return cached
+
+    try:
+        # The batch is shared with other requests, so it is not bounded by
+        # this request's deadline; only the wait for it is.
+        result = await batcher.read(
+            plugin_handler, (rack, board, device), dev, _read_batch,
+            max_age=max_age, timeout=remaining(deadline),
+        )
+    except asyncio.TimeoutError as ex:
+        raise errors.FailedReadCommandError(
+            _('Read of {}/{}/{} did not complete before the request deadline').format(
+                rack, board, device
+            )
+        ) from ex
+
+    if isinstance(result, errors.SynseError):
+        raise result
+    _dev, read_data, age = result
+    return read_data, age
+
+
+async def _read_batch(plugin_handler, targets, max_age=None):
+    """Read a batch of devices managed by a single plugin.
+
+    The maximum age bounds the readings of a dump of the plugin's readings,
+    as well as those served from the readings cache, so a batch is only
+    dumped when its callers accept readings as old as the dump window.
+
+    Args:
+        plugin_handler (Plugin): The plugin which manages the devices.
+        targets (list[tuple]): The (rack, board, device) and the device
+            information of each device to read.
+        max_age (float): The maximum age, in seconds, of the readings which
+            may be served. If this is None, the configured readings cache
+            TTL applies. (default: None)
+
+    Returns:
+        dict: The result of each device, keyed by its (rack, board, device).
+    """
+    results, _plan = await read_plugin_devices(plugin_handler, targets, max_age=max_age)
+    return results
+
+
+async def read_plugin_devices(plugin_handler, targets, deadline=None, max_age=None):
+    """Read many devices managed by a single plugin, with the cheapest
+    strategy for the plugin.
+
+    A Read request can only be made for a single device, since the readings
+    it returns do not say which device they belong to. The alternative is to
+    ask the plugin for its recent readings (those from the last
+    `read.dump_window` seconds) with a single ReadCached request, which
+    returns each reading along with the routing info of its device. The
+    readings are then split out per device, and those of devices which were
+    not asked for are dropped. The read planner picks between the two (see
+    `synse.planner.ReadPlanner`).
+
+    The age of the readings from the plugin's response is taken from their
+    timestamps, and the planner only dumps them when `max_age` allows
+    readings as old as the dump window. Devices which have no readings in
+    the plugin's response (or whose readings are too old), and all of the
+    devices of a plugin which does not support the ReadCached request, are
+    read individually instead (see `read_device`).
+
+    Args:
+        plugin_handler (Plugin): The plugin which manages the devices.
+        targets (list[tuple]): The (rack, board, device) and the device
+            information of each device to read.
+        deadline (float): The event loop time by which the read should
+            complete, if it has a deadline. (default: None)
+        max_age (float): The maximum age, in seconds, of cached readings
+            which may be served. If this is None, the configured readings
+            cache TTL applies. (default: None)
+
+    Returns:
+        tuple(dict, ReadPlan): The result of each device, keyed by its
+            (rack, board, device), and the plan the devices were read with.
+            The result is either the (Device, readings, age) of the device,
+            or the error raised when reading it.
+    """
+    results = {}
+
+    # Devices with recent enough readings in the readings cache do not need
+    # to be read at all.
+    pending = {}
+    for target, dev in targets:
+        cached = cache.peek_readings(*target, max_age=max_age)
+        if cached is not None:
+            results[target] = (dev, cached[0], cached[1])
+        else:
+            pending[target] = dev
+
+    # Without a maximum age, dumped readings are held to the same bound as
+    # cached ones, so they are no older than a live read would allow.
+    limit = cache.readings_ttl() if max_age is None else max_age
+
+    devices = await cache.get_devices_by_plugin(plugin_handler.id())
+    plan = read_planner.plan(
+        plugin_handler, len(pending), len(devices), cached=len(results), max_age=max_age
     )
+    logger.debug(_('Read plan: {}').format(plan))
+
+    client = plugin_handler.client
+    if plan.strategy == DUMP:
+        try:
+            dumped = await _dump_readings(plugin_handler, pending, deadline)
+        except grpc.RpcError as ex:
+            if not (hasattr(ex, 'code') and ex.code() == grpc.StatusCode.UNIMPLEMENTED):
+                err = errors.FailedReadCommandError(str(ex))
+                results.update({target: err for target in pending})
+                return results, plan
+
+            logger.info(_('Plugin {} does not support reading cached readings, reading '
+                          'its devices individually').format(plugin_handler.id()))
+            client.read_cached_supported = False
+        except errors.PluginCircuitOpenError as ex:
+            results.update({target: ex for target in pending})
+            return results, plan
+        else:
+            for target, readings in dumped.items():
+                age = _readings_age(readings)
+                if age is None or age > limit:
+                    continue
+                cache.put_readings(*target, readings, age=age, max_age=limit)
+                results[target] = (pending.pop(target), readings, age)
+
+    if pending:
+        results.update(await read_devices(
+            plugin_handler, list(pending.items()), deadline=deadline, max_age=max_age
+        ))
+    return results, plan
+
+
+async def read_devices(plugin_handler, targets, deadline=None, max_age=None):
+    """Read many devices managed by a single plugin, with a request for
+    each device.
+
+    The devices are read concurrently. A failure to read one device does
+    not affect the reads of the others.
+
+    Args:
+        plugin_handler (Plugin): The plugin which manages the devices.
+        targets (list[tuple]): The (rack, board, device) and the device
+            information of each device to read.
+        deadline (float): The event loop time by which the reads should
+            complete, if they have a deadline. (default: None)
+        max_age (float): The maximum age, in seconds, of cached readings
+            which may be served. If this is None, the configured readings
+            cache TTL applies. (default: None)
+
+    Returns:
+        dict: The result of each device, keyed by its (rack, board, device).
+            The result is either the (Device, readings, age) of the device,
+            or the error raised when reading it.
+    """
+    logger.debug(_('Reading {} devices of plugin {} individually').format(
+        len(targets), plugin_handler.id()
+    ))
+    results = {}
+
+    async def read_one(target, dev):  # pylint: disable=missing-docstring
+        try:
+            readings, age = await read_device(
+                plugin_handler, dev, *target, deadline=deadline, max_age=max_age
+            )
+        except errors.SynseError as e:
+            results[target] = e
+        else:
+            results[target] = (dev, readings, age)
+
+    await asyncio.gather(*[read_one(target, dev) for target, dev in targets])
+    return results
+
+
+def _readings_age(readings):
+    """Get the age of the readings of a device, from their timestamps.
+
+    Args:
+        readings (list[synse_grpc.api.Reading]): The readings of the device.
+
+    Returns:
+        float: The age, in seconds, of the oldest of the readings.
+        None: The age of one of the readings is not known.
+    """
+    ages = [utils.rfc3339age(reading.timestamp) for reading in readings]
+    if not ages or None in ages:
+        return None
+    return max(ages)
+
+
+async def _dump_readings(plugin_handler, targets, deadline=None):
+    """Get the recent readings of the given devices from a plugin's
+    cached readings.
+
+    Args:
+        plugin_handler (Plugin): The plugin which manages the devices.
+        targets (dict): The devices to get the readings of, keyed by their
+            (rack, board, device).
+        deadline (float): The event loop time by which the request should
+            complete, if it has a deadline. (default: None)
+
+    Returns:
+        dict: The latest reading of each type for each device which has
+            any, keyed by the device's (rack, board, device).
+    """
+    window = config.options.get('read.dump_window', 10)
+    start = utils.rfc3339now(-window) if window else None
+
+    wanted = {utils.composite(*target): target for target in targets}
+
+    # The readings come in the order they were taken, so a later reading of
+    # a type replaces the earlier one.
+    loop = asyncio.get_event_loop()
+    started = loop.time()
+    readings = {}
+    stream = plugin_handler.client.read_cached(start=start, timeout=remaining(deadline))
+    async for reading in stream:
+        if reading is None:
+            break
+        target = wanted.get(utils.composite(reading.rack, reading.board, reading.device))
+        if target is not None:
+            readings.setdefault(target, OrderedDict())[reading.reading.type] = reading.reading
+
+    read_planner.record(plugin_handler.id(), DUMP, loop.time() - started)
+
+    return {target: list(r.values()) for target, r in readings.items()}
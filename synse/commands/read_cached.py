@@ -3,12 +3,13 @@
 import grpc
 
 from synse import cache, errors, plugin
+from synse.deadline import remaining
 from synse.i18n import _
 from synse.log import logger
 from synse.scheme import ReadCachedResponse
 
 
-async def read_cached(start=None, end=None):
+async def read_cached(start=None, end=None, deadline=None):
     """The handler for the Synse Server "readcached" API command.
 
     Args:
@@ -20,6 +21,8 @@ async def read_cached(start=None, end=None):
             which defines an ending bound on the cache data to
             return. If no timestamp is specified, there will not
             be an ending bound. (default: None)
+        deadline (float): The event loop time by which the request should
+            complete, if it has a deadline. (default: None)
 
     Yields:
         ReadCachedResponse: The cached reading from the plugin.
@@ -27,10 +30,8 @@ async def read_cached(start=None, end=None):
     start, end = start or '', end or ''
     logger.debug(_('Read Cached command (start: {}, end: {})').format(start, end))
 
-    # If the plugins have not yet been registered, register them now.
-    if len(plugin.Plugin.manager.plugins) == 0:
-        logger.debug(_('Re-registering plugins'))
-        plugin.register_plugins()
+    # If the plugins have not yet been registered, wait for them to be.
+    await plugin.reconciler.ready()
 
     # For each plugin, we'll want to request a dump of its readings cache.
     async for plugin_name, plugin_handler in plugin.get_plugins():  # pylint: disable=not-an-iterable
@@ -38,7 +39,8 @@ async def read_cached(start=None, end=None):
 
         # Get the cached data from the plugin
         try:
-            for reading in plugin_handler.client.read_cached(start, end):
+            async for reading in plugin_handler.client.read_cached(
+                    start, end, timeout=remaining(deadline)):
                 # If there is no reading, we're done iterating
                 if reading is None:
                     return
@@ -19,47 +19,46 @@ async def scan(rack=None, board=None, force=False):
     """
     logger.debug(_('Scan Command (args: {}, {}, force: {})').format(rack, board, force))
 
+    # Plugins are registered by the plugin reconciler in the background.
+    # If we are forcing re-scan, we will have it re-register plugins now.
+    # This allows us to pick up any dynamically added plugins and clear out
+    # any plugins that were removed. Plugins which previously failed to
+    # register are retried right away, rather than after their backoff.
     if force:
         await cache.clear_all_meta_caches()
-
-    # Plugins are registered on scan. If no plugins exist and a scan is
-    # performed (e.g. on startup), we will find and register plugins.
-    # Additionally, if we are forcing re-scan, we will re-register plugins.
-    # This allows us to pick up any dynamically added plugins and clear out
-    # any plugins that were removed.
-    if len(plugin.Plugin.manager.plugins) == 0 or force:
         logger.debug(_('Re-registering plugins'))
-        plugin.register_plugins()
+        plugin.clear_backoff()
+        await plugin.reconciler.reconcile()
 
     cache_data = await cache.get_scan_cache()
 
-    # Filter the scan results by rack.
+    # Filter the scan results by rack and board. These are looked up in
+    # the cache's indexes rather than by walking the scan results.
     if rack is not None:
         if not cache_data:
             raise errors.FailedScanCommandError(
                 _('Unable to filter by resource - no scan results returned')
             )
 
-        for r in cache_data['racks']:
-            if r['id'] == rack:
-                cache_data = r
-                break
-        else:
+        cache_data = await cache.get_scan_rack(rack)
+        if cache_data is None:
             raise errors.RackNotFoundError(
                 _('Rack "{}" not found in scan results').format(rack)
             )
 
         # Filter the rack results by board.
         if board is not None:
-            for b in cache_data['boards']:
-                if b['id'] == board:
-                    cache_data = b
-                    break
-            else:
+            cache_data = await cache.get_scan_board(rack, board)
+            if cache_data is None:
                 raise errors.BoardNotFoundError(
                     _('Board "{}" not found in scan results').format(board)
                 )
 
+    # The encoded response is cached along with the scan results, but it
+    # can only be used if there are no plugin errors to add to it.
+    errs = await cache.get_device_info_errors()
     return ScanResponse(
-        data=cache_data
+        data=cache_data,
+        errors=errs,
+        encoded=None if errs else cache.encode_device_view(('scan', rack, board), cache_data),
     )
@@ -3,18 +3,21 @@
 import grpc
 
 from synse import cache, errors, plugin
+from synse.deadline import remaining
 from synse.i18n import _
 from synse.log import logger
 from synse.scheme import transaction as scheme
 
 
-async def check_transaction(transaction_id):
+async def check_transaction(transaction_id, deadline=None):
     """The handler for the Synse Server "transaction" API command.
 
     Args:
         transaction_id (str|None): The id of the transaction to check. If
             the ID is None, a list of all transactions currently in the
             cache is returned.
+        deadline (float): The event loop time by which the request should
+            complete, if it has a deadline. (default: None)
 
     Returns:
         TransactionResponse: The "transaction" response scheme model.
@@ -61,7 +64,7 @@ async def check_transaction(transaction_id):
         )
 
     try:
-        resp = _plugin.client.transaction(transaction_id)
+        resp = await _plugin.client.transaction(transaction_id, timeout=remaining(deadline))
     except grpc.RpcError as ex:
         raise errors.FailedTransactionCommandError(str(ex)) from ex
 
@@ -3,13 +3,14 @@
 import grpc
 
 from synse import cache, errors, plugin
+from synse.deadline import remaining
 from synse.i18n import _
 from synse.log import logger
 from synse.proto.client import WriteData
 from synse.scheme.write import WriteResponse
 
 
-async def write(rack, board, device, data):
+async def write(rack, board, device, data, deadline=None):
     """The handler for the Synse Server "write" API command.
 
     Args:
@@ -17,6 +18,8 @@ async def write(rack, board, device, data):
         board (str): The board which the device resides on.
         device (str): The device to write to.
         data (dict): The data to write to the device.
+        deadline (float): The event loop time by which the request should
+            complete, if it has a deadline. (default: None)
 
     Returns:
         WriteResponse: The "write" response scheme model.
@@ -64,7 +67,7 @@ async def write(rack, board, device, data):
 
     # Perform a gRPC write on the device's managing plugin
     try:
-        t = _plugin.client.write(rack, board, device, [wd])
+        t = await _plugin.client.write(rack, board, device, [wd], timeout=remaining(deadline))
     except grpc.RpcError as ex:
         raise errors.FailedWriteCommandError(str(ex)) from ex
 
@@ -11,9 +11,20 @@ scheme = Scheme(
     DictOption('plugin', default={}, scheme=Scheme(
         ListOption('tcp', default=[], member_type=str, bind_env=True),
         ListOption('unix', default=[], member_type=str, bind_env=True),
+        Option('reconcile_interval', default=30, field_type=int),
+        Option('socket_poll_interval', default=5, field_type=int),
+        DictOption('health', scheme=Scheme(
+            Option('interval', default=15, field_type=int),
+        )),
+        DictOption('backoff', scheme=Scheme(
+            Option('initial', default=5, field_type=int),
+            Option('max', default=300, field_type=int),
+        )),
         DictOption('discover', required=False, bind_env=True, scheme=Scheme(
             DictOption('kubernetes', required=False, bind_env=True, scheme=Scheme(
                 Option('namespace', required=False, bind_env=True, field_type=str),
+                Option('watch', required=False, bind_env=True, field_type=bool),
+                Option('resync', required=False, bind_env=True, field_type=int),
                 DictOption('endpoints', required=False, bind_env=True, scheme=Scheme(
                     DictOption('labels', bind_env=True, scheme=None)
                 )),
@@ -22,14 +33,53 @@ scheme = Scheme(
     )),
     DictOption('cache', default=None, scheme=Scheme(
         DictOption('meta', scheme=Scheme(
-            Option('ttl', default=20, field_type=int)
+            Option('ttl', default=20, field_type=int),
+            Option('budget', default=5, field_type=int),
+            Option('stale_ttl', default=0, field_type=int),
+            Option('refresh_ahead', default=0, field_type=int),
+            Option('last_known_good', default=False, field_type=bool),
         )),
         DictOption('transaction', scheme=Scheme(
             Option('ttl', default=300, field_type=int)  # five minutes
-        ))
+        )),
+        DictOption('readings', scheme=Scheme(
+            # Untyped so that fractional seconds can be given.
+            Option('ttl', default=0),
+        )),
+    )),
+    DictOption('read', scheme=Scheme(
+        Option('dump_window', default=10, field_type=int),
+        # Untyped so that a fraction can be given.
+        Option('dump_ratio', default=0.5),
+        Option('dump_min_targets', default=4, field_type=int),
+        # Untyped so that fractional seconds can be given.
+        Option('batch_window', default=0),
+    )),
+    DictOption('deadline', scheme=Scheme(
+        Option('default', default=0, field_type=int),
+        DictOption('routes', default={}, scheme=None),
     )),
     DictOption('grpc', scheme=Scheme(
         Option('timeout', default=3, field_type=int),
+        DictOption('executor', scheme=Scheme(
+            Option('workers', default=32, field_type=int),
+            Option('plugin_limit', default=8, field_type=int),
+            DictOption('plugins', default={}, scheme=None),
+        )),
+        DictOption('channel', scheme=Scheme(
+            Option('pool_size', default=1, field_type=int),
+            Option('keepalive_time', required=False, field_type=int),
+            Option('keepalive_timeout', required=False, field_type=int),
+            Option('keepalive_permit_without_calls', required=False, field_type=bool),
+            Option('max_send_message_length', required=False, field_type=int),
+            Option('max_receive_message_length', required=False, field_type=int),
+            Option('stream_window_size', required=False, field_type=int),
+            Option('bdp_probe', required=False, field_type=bool),
+        )),
+        DictOption('circuit_breaker', scheme=Scheme(
+            Option('threshold', default=5, field_type=int),
+            Option('probe_interval', default=10, field_type=int),
+        )),
         DictOption('tls', required=False, bind_env=True, scheme=Scheme(
             Option('cert', field_type=str)
         ))
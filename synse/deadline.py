@@ -0,0 +1,84 @@
+"""Deadlines for requests made to Synse Server.
+
+A request can say how long it is willing to wait for its response, in
+seconds, with the `X-Synse-Timeout` header or the `timeout` query parameter.
+If it does not, the default configured for its route (or the global default)
+applies, if there is one.
+
+The deadline is carried through the command handling the request into the
+timeout of every plugin request the command makes, so a plugin is never
+kept working on a request that the client has stopped waiting on. Plugin
+requests are still bounded by `grpc.timeout`.
+"""
+
+import asyncio
+import math
+
+from synse import config, errors
+from synse.i18n import _
+
+# The header which sets the deadline for a request.
+HEADER = 'X-Synse-Timeout'
+
+# The query parameter which sets the deadline for a request.
+QUERY_PARAM = 'timeout'
+
+
+def from_request(request, route):
+    """Get the deadline for a request.
+
+    The header takes precedence over the query parameter, which takes
+    precedence over the configured default for the route.
+
+    Args:
+        request (sanic.request.Request): The incoming request.
+        route (str): The name of the route handling the request, which
+            its default deadline is configured under.
+
+    Returns:
+        float: The event loop time by which the request should complete.
+        None: The request has no deadline.
+
+    Raises:
+        errors.InvalidArgumentsError: The timeout given with the request
+            is not a positive number of seconds.
+    """
+    value = request.headers.get(HEADER)
+    if value is None:
+        value = request.raw_args.get(QUERY_PARAM)
+
+    if value is None:
+        routes = config.options.get('deadline.routes', None) or {}
+        timeout = routes.get(route, config.options.get('deadline.default', 0))
+        if not timeout:
+            return None
+    else:
+        try:
+            timeout = float(value)
+        except ValueError:
+            timeout = None
+        if timeout is None or not math.isfinite(timeout) or timeout <= 0:
+            raise errors.InvalidArgumentsError(
+                _('Request timeout must be a positive number of seconds, but was: {}').format(
+                    value
+                )
+            )
+
+    return asyncio.get_event_loop().time() + timeout
+
+
+def remaining(deadline):
+    """Get the time remaining until a deadline.
+
+    Args:
+        deadline (float): The event loop time of the deadline, or None
+            if there is no deadline.
+
+    Returns:
+        float: The number of seconds remaining, which is 0 if the
+            deadline has passed.
+        None: There is no deadline.
+    """
+    if deadline is None:
+        return None
+    return max(deadline - asyncio.get_event_loop().time(), 0)
@@ -1,7 +1,11 @@
 """Service discovery for plugins using Kubernetes."""
 
+import threading
+import time
+
 import kubernetes.client
 import kubernetes.config
+import kubernetes.watch
 
 from synse import config
 from synse.i18n import _
@@ -12,6 +16,9 @@ def discover():
     """Discover plugins for kubernetes based on the kubernetes service
     discovery configuration(s).
 
+    This makes blocking calls to the kubernetes API, so it should be run
+    in an executor rather than on the event loop.
+
     Returns:
         list[str]: A list of host:port addresses for plugins discovered
             via kubernetes.
@@ -40,7 +47,12 @@ def discover():
     # We can support other means later.
     endpoints_cfg = cfg.get('endpoints')
     if endpoints_cfg:
-        addresses.extend(_register_from_endpoints(ns=ns, cfg=endpoints_cfg))
+        # In watch mode, the endpoints are tracked in the background, so all
+        # we need to do here is read the current set of addresses.
+        if cfg.get('watch'):
+            addresses.extend(_watch_endpoints(ns=ns, cfg=endpoints_cfg, resync=cfg.get('resync')))
+        else:
+            addresses.extend(_register_from_endpoints(ns=ns, cfg=endpoints_cfg))
 
     return addresses
 
@@ -76,13 +88,7 @@ def _register_from_endpoints(ns, cfg):
         logger.debug(_('No labels found for kubernetes service discovery via endpoints'))
         return found
 
-    # Each label is specified in the config as a key-value pair. Here, we
-    # want to take each pair and join them into the appropriate label selector
-    # string. For example,
-    #   app: synse
-    #   component: plugin
-    # would become the selector string: 'app=synse,component=plugin'
-    label_selector = ','.join(['{}={}'.format(k, v) for k, v in labels.items()])
+    label_selector = _label_selector(labels)
     logger.debug(_('Using endpoint label selector: {}').format(label_selector))
 
     # Now, we can create a kubernetes client and search for endpoints with
@@ -92,77 +98,325 @@ def _register_from_endpoints(ns, cfg):
 
     endpoints = v1.list_namespaced_endpoints(namespace=ns, label_selector=label_selector)
 
-    # Now we parse out the endpoints to get the routing info to a plugin.
+    for endpoint in endpoints.items:
+        found.extend(_endpoint_addresses(endpoint))
+
+    if not found:
+        logger.debug(
+            _('Did not find any plugins via kubernetes endpoints (labels={})').format(labels)
+        )
+    return found
+
+
+def _label_selector(labels):
+    """Join label key-value pairs into a label selector string.
+
+    For example,
+      app: synse
+      component: plugin
+    would become the selector string: 'app=synse,component=plugin'
+
+    Args:
+        labels (dict): The labels to select by.
+
+    Returns:
+        str: The label selector string.
+    """
+    return ','.join(['{}={}'.format(k, v) for k, v in labels.items()])
+
+
+def _endpoint_addresses(endpoint):
+    """Get the host:port addresses of the plugins behind a kubernetes
+    service endpoint.
+
+    Args:
+        endpoint (kubernetes.client.V1Endpoints): The endpoint.
+
+    Returns:
+        list[str]: The host:port addresses for the plugins.
+    """
+    found = []
+
+    name = endpoint.metadata.name
+    logger.debug(_('Found endpoint with name: {}').format(name))
+
+    # Now we parse out the endpoint to get the routing info to a plugin.
     # There are some assumptions here:
     #  - The port must have the name 'http'
-    for endpoint in endpoints.items:
-        name = endpoint.metadata.name
-        logger.debug(_('Found endpoint with name: {}').format(name))
+    for subset in endpoint.subsets or []:
+        ips = []
+        port = None
 
-        for subset in endpoint.subsets:
-            ips = []
-            port = None
+        addresses = subset.addresses
+        if not addresses:
+            logger.debug(_('No addresses for subset of endpoint - skipping ({})').format(name))
+            continue
 
-            addresses = subset.addresses
-            if not addresses:
-                logger.debug(_('No addresses for subset of endpoint - skipping ({})').format(name))
+        # Iterate over all of the addresses. If there are multiple instances of a plugin
+        # sitting behind a service, e.g. a DaemonSet or Deployment with replica count > 1,
+        # then we will want to reach all of the plugins.
+        for address in addresses:
+            ref = address.target_ref
+            if ref is None:
+                logger.debug(_('Address has no target_ref - skipping ({})').format(address))
                 continue
 
-            # Iterate over all of the addresses. If there are multiple instances of a plugin
-            # sitting behind a service, e.g. a DaemonSet or Deployment with replica count > 1,
-            # then we will want to reach all of the plugins.
-            for address in addresses:
-                ref = address.target_ref
-                if ref is None:
-                    logger.debug(_('Address has no target_ref - skipping ({})').format(address))
-                    continue
+            kind = ref.kind
+            if kind.lower() != 'pod':
+                logger.debug(_('Address is not a pod address - skipping ({})').format(address))
+                continue
 
-                kind = ref.kind
-                if kind.lower() != 'pod':
-                    logger.debug(_('Address is not a pod address - skipping ({})').format(address))
+            ips.append(address.ip)
+
+        # If we don't have any IPs yet, there is no point in getting the port for
+        # for this subset, so just continue.
+        if not ips:
+            logger.debug(_('No ips found for endpoint, will not search for port'))
+            continue
+
+        # Parse the ports. If there is only one port, use that port. Otherwise, use the
+        # port named 'http'.
+        ports = subset.ports
+        if not ports:
+            logger.debug(_('No ports for subset of endpoint - skipping ({})').format(name))
+            continue
+
+        if len(ports) == 1:
+            port = ports[0].port
+        else:
+            # Search for a port with name 'http'
+            for p in ports:
+                if p.name != 'http':
+                    logger.debug(
+                        _('skipping port (want name:http, but found name:{})')
+                        .format(p.name)
+                    )
                     continue
 
-                ips.append(address.ip)
+                port = p.port
+                break
 
-            # If we don't have any IPs yet, there is no point in getting the port for
-            # for this subset, so just continue.
-            if not ips:
-                logger.debug(_('No ips found for endpoint, will not search for port'))
-                continue
+        # If we have addresses and we have a port, we can register those endpoints
+        # as plugins. Otherwise, we move on.
+        if ips and port is not None:
+            for ip in ips:
+                logger.debug(_('found plugin: endpoint.name={}, ip={}, port={}').format(
+                    name, ip, port
+                ))
+                found.append('{}:{}'.format(ip, port))
 
-            # Parse the ports. If there is only one port, use that port. Otherwise, use the
-            # port named 'http'.
-            ports = subset.ports
-            if not ports:
-                logger.debug(_('No ports for subset of endpoint - skipping ({})').format(name))
-                continue
+    return found
+
+
+class EndpointWatcher:
+    """Track the plugin addresses behind kubernetes service endpoints.
+
+    Rather than listing the endpoints every time plugins are registered,
+    the watcher lists them once and then follows the endpoint watch stream
+    in a background thread, applying each event to an in-memory set of
+    addresses. Watches resume from the last seen resourceVersion. A full
+    resync (list) is done periodically and whenever the watch reports that
+    its resourceVersion has expired.
+
+    Args:
+        ns (str): The namespace to watch endpoints in.
+        labels (dict): The labels to select endpoints by.
+        resync (int): The number of seconds between full resyncs.
+    """
+
+    # The number of seconds to wait before retrying after a failed
+    # list or watch.
+    retry_delay = 5
+
+    def __init__(self, ns, labels, resync=300):
+        self.ns = ns
+        self.labels = labels
+        self.label_selector = _label_selector(labels)
+        self.resync_interval = resync
+
+        self.api = None
+        self.resource_version = None
+        self.last_resync = None
+        self.addresses = []
+
+        self._endpoints = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Load the kubernetes config, sync the endpoints, and start
+        following the watch stream in the background.
+
+        This blocks on the kubernetes API, so it must not be called from
+        the event loop (discovery is run in an executor; see
+        `synse.plugin.register_plugins`).
+        """
+        kubernetes.config.load_incluster_config()
+        self.api = kubernetes.client.CoreV1Api()
 
-            if len(ports) == 1:
-                port = ports[0].port
+        try:
+            self.resync()
+        except Exception as e:  # pylint: disable=broad-except
+            logger.error(_('Failed initial sync of kubernetes endpoints: {}').format(e))
+
+        self._thread = threading.Thread(target=self._run, name='k8s-endpoint-watcher')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """Stop following the watch stream.
+
+        The watch in progress (if any) ends at its next event or timeout.
+        """
+        self._stop.set()
+
+    def resync(self):
+        """List all matching endpoints and rebuild the address set from them."""
+        logger.debug(_('Resyncing kubernetes endpoints (selector: {})').format(
+            self.label_selector
+        ))
+        endpoints = self.api.list_namespaced_endpoints(
+            namespace=self.ns,
+            label_selector=self.label_selector,
+        )
+
+        self._endpoints = {
+            endpoint.metadata.name: _endpoint_addresses(endpoint)
+            for endpoint in endpoints.items
+        }
+        self.resource_version = endpoints.metadata.resource_version if endpoints.metadata else None
+        self.last_resync = time.time()
+        self._publish()
+
+    def handle(self, event):
+        """Apply a single watch event to the address set.
+
+        Args:
+            event (dict): The watch event, as yielded by
+                `kubernetes.watch.Watch.stream`.
+        """
+        kind = event.get('type')
+
+        if kind == 'ERROR':
+            raw = event.get('raw_object') or {}
+            # 410 (Gone) means the resourceVersion we are watching from is too
+            # old, so the only way forward is to start over from a fresh list.
+            if raw.get('code') == 410:
+                logger.info(_('Kubernetes endpoint watch expired, resyncing'))
+                self.resync()
             else:
-                # Search for a port with name 'http'
-                for p in ports:
-                    if p.name != 'http':
-                        logger.debug(
-                            _('skipping port (want name:http, but found name:{})')
-                            .format(p.name)
-                        )
-                        continue
-
-                    port = p.port
-                    break
-
-            # If we have addresses and we have a port, we can register those endpoints
-            # as plugins. Otherwise, we move on.
-            if ips and port is not None:
-                for ip in ips:
-                    logger.debug(_('found plugin: endpoint.name={}, ip={}, port={}').format(
-                        name, ip, port
-                    ))
-                    found.append('{}:{}'.format(ip, port))
+                logger.warning(_('Error event from kubernetes endpoint watch: {}').format(raw))
+            return
 
-    if not found:
-        logger.debug(
-            _('Did not find any plugins via kubernetes endpoints (labels={})').format(labels)
+        endpoint = event.get('object')
+        if endpoint is None or endpoint.metadata is None:
+            return
+
+        name = endpoint.metadata.name
+        if kind in ('ADDED', 'MODIFIED'):
+            self._endpoints[name] = _endpoint_addresses(endpoint)
+        elif kind == 'DELETED':
+            self._endpoints.pop(name, None)
+        else:
+            logger.debug(_('Ignoring kubernetes endpoint watch event: {}').format(kind))
+            return
+
+        if endpoint.metadata.resource_version:
+            self.resource_version = endpoint.metadata.resource_version
+        self._publish()
+
+    def watch_once(self):
+        """Follow the endpoint watch stream until the next resync is due."""
+        remaining = self.resync_interval
+        if self.last_resync is not None:
+            remaining -= time.time() - self.last_resync
+
+        kwargs = {
+            'namespace': self.ns,
+            'label_selector': self.label_selector,
+            'timeout_seconds': max(int(remaining), 1),
+        }
+        if self.resource_version:
+            kwargs['resource_version'] = self.resource_version
+
+        watch = kubernetes.watch.Watch()
+        for event in watch.stream(self.api.list_namespaced_endpoints, **kwargs):
+            if self._stop.is_set():
+                watch.stop()
+                break
+            self.handle(event)
+
+    def _due(self):
+        """Check whether a full resync is due."""
+        if self.last_resync is None:
+            return True
+        return time.time() - self.last_resync >= self.resync_interval
+
+    def _run(self):
+        """Follow the watch stream, resyncing periodically, until stopped."""
+        while not self._stop.is_set():
+            try:
+                if self._due():
+                    self.resync()
+                else:
+                    self.watch_once()
+            except Exception as e:  # pylint: disable=broad-except
+                logger.error(_('Failed to watch kubernetes endpoints: {}').format(e))
+                self._stop.wait(self.retry_delay)
+
+    def _publish(self):
+        """Publish a new snapshot of the tracked addresses.
+
+        The snapshot is replaced rather than modified, so readers on other
+        threads always see a consistent list.
+        """
+        addresses = []
+        for found in self._endpoints.values():
+            for address in found:
+                if address not in addresses:
+                    addresses.append(address)
+        self.addresses = addresses
+
+
+# The endpoint watcher used for watch-based discovery. It is created the
+# first time discovery runs in watch mode.
+_watcher = None
+
+
+def _watch_endpoints(ns, cfg, resync=None):
+    """Get the plugin addresses tracked by the endpoint watcher, starting
+    the watcher if it is not yet running for the configured namespace
+    and labels.
+
+    Args:
+        ns (str): The namespace to watch endpoints in.
+        cfg (dict): The configuration for service discovery via
+            kubernetes endpoints.
+        resync (int): The number of seconds between full resyncs.
+
+    Returns:
+        list[str]: The host:port addresses for the plugin endpoints
+            that matched the config.
+
+    Raises:
+        ValueError: The given namespace is empty.
+    """
+    global _watcher  # pylint: disable=global-statement
+
+    if not ns:
+        raise ValueError(
+            'A namespace must be provided for discovery via k8s service endpoints.'
         )
-    return found
+
+    labels = cfg.get('labels')
+    if not labels:
+        logger.debug(_('No labels found for kubernetes service discovery via endpoints'))
+        return []
+
+    if _watcher is None or _watcher.ns != ns or _watcher.labels != labels:
+        if _watcher is not None:
+            _watcher.stop()
+        _watcher = EndpointWatcher(ns, labels, resync=resync or 300)
+        _watcher.start()
+
+    return list(_watcher.addresses)
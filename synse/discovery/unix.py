@@ -0,0 +1,266 @@
+"""Discovery of plugins from the unix sockets in the default socket directory."""
+
+import asyncio
+import ctypes
+import errno
+import os
+import stat
+import struct
+
+from synse.i18n import _
+from synse.log import logger
+
+# inotify flags and event masks (see inotify(7)).
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+
+# The events watched for on the socket directory.
+WATCH_MASK = (
+    IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO |
+    IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+)
+
+# The fixed-size header of an inotify event: wd, mask, cookie, len.
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+def _load_inotify():
+    """Load the inotify functions from libc.
+
+    Returns:
+        ctypes.CDLL: The loaded libc, if it provides inotify.
+        None: inotify is not available on this platform.
+    """
+    try:
+        # The running process is already linked against libc, so its symbols
+        # can be looked up directly rather than having to find the library.
+        libc = ctypes.CDLL(None, use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+def is_socket(path):
+    """Check whether a path is a unix socket.
+
+    Args:
+        path (str): The path to check.
+
+    Returns:
+        bool: True if the path exists and is a socket; False otherwise.
+    """
+    try:
+        return stat.S_ISSOCK(os.stat(path).st_mode)
+    except OSError:
+        return False
+
+
+def list_sockets(path):
+    """List the unix sockets in a directory.
+
+    Args:
+        path (str): The directory to list.
+
+    Returns:
+        list[str]: The paths of the sockets in the directory. If the
+            directory does not exist, this is empty.
+    """
+    try:
+        items = sorted(os.listdir(path))
+    except OSError:
+        return []
+    return [os.path.join(path, item) for item in items if is_socket(os.path.join(path, item))]
+
+
+class SocketDirWatcher:
+    """Track the unix sockets in a directory as they come and go.
+
+    The directory is watched with inotify where it is available, so a
+    socket is picked up as soon as it is created and dropped as soon as it
+    is removed. Where inotify is not available (or the directory does not
+    exist yet), the directory is polled instead.
+
+    The tracked sockets are kept in memory, so callers can get them from
+    `sockets` without touching the filesystem.
+
+    Args:
+        path (str): The directory to watch.
+        on_added: A function called with the path of each socket which
+            appears in the directory.
+        on_removed: A function called with the path of each socket which
+            disappears from the directory.
+        poll_interval (int): The number of seconds between polls of the
+            directory when it is not being watched with inotify.
+    """
+
+    def __init__(self, path, on_added=None, on_removed=None, poll_interval=5):
+        self.path = path
+        self.on_added = on_added
+        self.on_removed = on_removed
+        self.poll_interval = poll_interval
+
+        self.running = False
+        self.inotify = False
+        self.sockets = []
+
+        self._libc = None
+        self._fd = None
+        self._loop = None
+        self._task = None
+
+    def start(self):
+        """Start watching the directory on the running event loop."""
+        if self.running:
+            return
+        self._loop = asyncio.get_event_loop()
+        self.running = True
+        self._task = asyncio.ensure_future(self._run())
+
+    def stop(self):
+        """Stop watching the directory."""
+        self.running = False
+        self._close()
+        # If the loop has since been closed, the task went with it.
+        if self._task is not None and not self._loop.is_closed():
+            self._task.cancel()
+        self._task = None
+
+    def scan(self):
+        """List the directory and reconcile the tracked sockets with it."""
+        self._set(list_sockets(self.path))
+
+    def handle(self, data):
+        """Apply a buffer of inotify events to the tracked sockets.
+
+        Args:
+            data (bytes): The raw events read from the inotify file descriptor.
+        """
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            _wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0').decode()
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped, so the only way to know where we stand
+                # is to list the directory.
+                logger.debug(_('inotify queue overflowed, rescanning {}').format(self.path))
+                self.scan()
+
+            elif mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                # The directory itself went away. Its sockets went with it, and
+                # we go back to polling until it is created again.
+                logger.info(_('Socket directory {} was removed').format(self.path))
+                self._close()
+                self._set([])
+
+            elif mask & (IN_CREATE | IN_MOVED_TO):
+                address = os.path.join(self.path, name)
+                if address not in self.sockets and is_socket(address):
+                    self._set(self.sockets + [address])
+
+            elif mask & (IN_DELETE | IN_MOVED_FROM):
+                address = os.path.join(self.path, name)
+                if address in self.sockets:
+                    self._set([s for s in self.sockets if s != address])
+
+    def _set(self, sockets):
+        """Replace the tracked sockets, notifying of any which were added
+        or removed.
+
+        Args:
+            sockets (list[str]): The sockets now in the directory.
+        """
+        added = [s for s in sockets if s not in self.sockets]
+        removed = [s for s in self.sockets if s not in sockets]
+        self.sockets = list(sockets)
+
+        for address in removed:
+            logger.debug(_('Socket removed: {}').format(address))
+            if self.on_removed is not None:
+                self.on_removed(address)
+        for address in added:
+            logger.debug(_('Socket added: {}').format(address))
+            if self.on_added is not None:
+                self.on_added(address)
+
+    async def _run(self):
+        """Watch the directory until stopped, falling back to polling
+        whenever it can not be watched with inotify.
+        """
+        while self.running:
+            if self._fd is None and not self._watch():
+                self.scan()
+            await asyncio.sleep(self.poll_interval)
+
+    def _watch(self):
+        """Start watching the directory with inotify.
+
+        Returns:
+            bool: True if the directory is being watched; False if it
+                must be polled instead.
+        """
+        if self._libc is None:
+            self._libc = _load_inotify() or False
+        if not self._libc or not os.path.isdir(self.path):
+            return False
+
+        fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            logger.warning(_('Failed to initialize inotify ({}), polling {} instead').format(
+                os.strerror(ctypes.get_errno()), self.path
+            ))
+            self._libc = False
+            return False
+
+        if self._libc.inotify_add_watch(fd, self.path.encode(), WATCH_MASK) < 0:
+            logger.warning(_('Failed to watch {} with inotify ({}), polling instead').format(
+                self.path, os.strerror(ctypes.get_errno())
+            ))
+            os.close(fd)
+            return False
+
+        self._fd = fd
+        self.inotify = True
+        self._loop.add_reader(fd, self._read)
+        logger.info(_('Watching socket directory {} for plugins').format(self.path))
+
+        # Sockets created before the watch was added do not generate events,
+        # so pick them up with a listing.
+        self.scan()
+        return True
+
+    def _read(self):
+        """Read and apply the pending inotify events."""
+        try:
+            data = os.read(self._fd, 4096)
+        except OSError as e:
+            if e.errno in (errno.EAGAIN, errno.EINTR):
+                return
+            logger.error(_('Failed to read inotify events for {}: {}').format(self.path, e))
+            self._close()
+            return
+        self.handle(data)
+
+    def _close(self):
+        """Stop watching the directory with inotify."""
+        if self._fd is None:
+            return
+        if not self._loop.is_closed():
+            self._loop.remove_reader(self._fd)
+        os.close(self._fd)
+        self._fd = None
+        self.inotify = False
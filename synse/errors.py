@@ -23,6 +23,7 @@ INTERNAL_API_FAILURE = 6000
 
 # Plugin related errors
 PLUGIN_STATE_ERROR = 6500
+PLUGIN_CIRCUIT_OPEN = 6501
 
 # Request related errors
 URL_NOT_FOUND = 3000
@@ -228,6 +229,15 @@ class PluginStateError(SynseServerError):
         super(PluginStateError, self).__init__(message, PLUGIN_STATE_ERROR)
 
 
+class PluginCircuitOpenError(SynseServerError):
+    """Error for a request not being issued to a plugin because the
+    plugin's circuit breaker is open.
+    """
+
+    def __init__(self, message):
+        super(PluginCircuitOpenError, self).__init__(message, PLUGIN_CIRCUIT_OPEN)
+
+
 # Create a lookup table that maps the code value to a user-friendly string that
 # describes the code. The string is the lower-cased version of the variable
 # name with underscores replaced with spaces, e.g. SOME_CODE becomes "some code".
@@ -7,11 +7,14 @@ import os
 from sanic import Sanic
 from sanic.exceptions import InvalidUsage, NotFound, ServerError
 from sanic.response import text
+from sanic.server import HttpProtocol
 
 import synse
 from synse import config, errors, utils
-from synse.cache import clear_all_meta_caches, configure_cache
+from synse.cache import configure_cache, refresh_all_meta_caches
+from synse.health import monitor
 from synse.log import LOGGING, logger, setup_logger
+from synse.plugin import reconciler, watch_sockets
 from synse.response import json
 from synse.routes import aliases, base, core
 
@@ -64,6 +67,9 @@ def make_app():
     configure_cache()
 
     # Add background tasks
+    app.add_task(watch_plugin_sockets)
+    app.add_task(periodic_plugin_reconciliation)
+    app.add_task(periodic_health_monitoring)
     app.add_task(periodic_cache_invalidation)
 
     # Log out metadata for Synse Server and the application configuration
@@ -76,19 +82,96 @@ def make_app():
     return app
 
 
+class SynseHttpProtocol(HttpProtocol):
+    """The HTTP protocol which Synse Server is served with.
+
+    Sanic lets a request handler run to completion even if the client
+    disconnects while waiting on it. Here, the handler is cancelled when
+    the connection is lost, which in turn cancels any plugin requests that
+    it still has outstanding.
+    """
+
+    def connection_lost(self, exc):
+        task = self._request_handler_task
+        if task is not None and not task.done():
+            logger.debug('Client disconnected, cancelling request: {}'.format(self.url))
+            task.cancel()
+        super(SynseHttpProtocol, self).connection_lost(exc)
+
+
+async def watch_plugin_sockets():
+    """Watch the default socket directory, so plugins which use it are
+    registered and removed as their sockets come and go.
+    """
+    logger.debug('task [plugin socket watcher]: Watching for plugin sockets')
+    watch_sockets()
+
+
+async def periodic_plugin_reconciliation():
+    """Periodically reconcile the plugins registered with Synse Server with
+    the configured and discovered plugins.
+
+    This keeps plugin registration off of the request path: new plugins are
+    registered and plugins which went away are removed in the background.
+    """
+    interval = config.options.get('plugin.reconcile_interval', 30)
+
+    while True:
+        logger.debug('task [periodic plugin reconciliation]: Registering plugins')
+
+        try:
+            await reconciler.reconcile()
+        except Exception as e:
+            logger.error(
+                'task [periodic plugin reconciliation]: Failed to register plugins, '
+                'will try again in {}s: {}'
+                .format(interval, e)
+            )
+
+        await asyncio.sleep(interval)
+
+
+async def periodic_health_monitoring():
+    """Periodically probe the health of the registered plugins.
+
+    Plugin health is served from the result of the last probe, so requests
+    for it do not each issue a health request to every plugin.
+    """
+    interval = config.options.get('plugin.health.interval', 15)
+
+    while True:
+        logger.debug('task [periodic health monitoring]: Probing plugin health')
+
+        try:
+            await monitor.probe()
+        except Exception as e:
+            logger.error(
+                'task [periodic health monitoring]: Failed to probe plugin health, '
+                'will try again in {}s: {}'
+                .format(interval, e)
+            )
+
+        await asyncio.sleep(interval)
+
+
 async def periodic_cache_invalidation():
-    """Periodically invalidate the caches so they are rebuilt."""
+    """Periodically invalidate the caches so they are rebuilt.
+
+    If stale serving is enabled for the meta caches, they are rebuilt in
+    place rather than cleared, so requests are not left to pay for the
+    rebuild.
+    """
     interval = 3 * 60  # 3 minutes
 
     while True:
         await asyncio.sleep(interval)
-        logger.info('task [periodic cache invalidation]: Clearing device caches')
+        logger.info('task [periodic cache invalidation]: Refreshing device caches')
 
         try:
-            await clear_all_meta_caches()
+            await refresh_all_meta_caches()
         except Exception as e:
             logger.error(
-                'task [periodic cache invalidation]: Failed to clear device caches, '
+                'task [periodic cache invalidation]: Failed to refresh device caches, '
                 'will try again in {}s: {}'
                 .format(interval, e)
             )
@@ -0,0 +1,218 @@
+"""Background monitoring of the health of registered plugins.
+
+Rather than asking every plugin for its health whenever a client asks for
+it, the health monitor probes the plugins in the background on an interval
+(see `synse.factory.periodic_health_monitoring`) and keeps the result of
+the last probe of each, which is what gets served.
+"""
+
+import asyncio
+import time
+
+from synse import config, utils
+from synse.i18n import _
+from synse.log import logger
+from synse.plugin import Plugin
+from synse.proto import util
+
+
+class PluginHealthState:
+    """The state of a plugin's health, as of its last probe."""
+
+    def __init__(self):
+        # The PluginHealth from the last successful probe, and the error
+        # from the last probe, if it failed.
+        self.health = None
+        self.error = None
+
+        # When the plugin was last probed and last probed successfully.
+        self.last_checked = None
+        self.last_ok = None
+
+        # The time, in seconds, that the last probe took.
+        self.latency = None
+
+        # The number of consecutive failed probes and the total number of probes.
+        self.failures = 0
+        self.probes = 0
+
+    def succeeded(self, health, latency):
+        """Record a successful probe.
+
+        Args:
+            health (synse_grpc.api.PluginHealth): The health returned by the plugin.
+            latency (float): The time, in seconds, that the probe took.
+        """
+        self.health = health
+        self.error = None
+        self.last_checked = self.last_ok = utils.rfc3339now()
+        self.latency = latency
+        self.failures = 0
+        self.probes += 1
+
+    def failed(self, error, latency):
+        """Record a failed probe.
+
+        Args:
+            error (Exception): The error raised by the probe.
+            latency (float): The time, in seconds, that the probe took.
+        """
+        self.error = str(error) or _('health check timed out')
+        self.last_checked = utils.rfc3339now()
+        self.latency = latency
+        self.failures += 1
+        self.probes += 1
+
+    def to_dict(self):
+        """Get the health of the plugin in the form served by the API.
+
+        Returns:
+            dict: The plugin health.
+        """
+        if self.probes == 0:
+            data = {
+                'timestamp': utils.rfc3339now(),
+                'status': 'unknown',
+                'message': _('health has not yet been checked'),
+                'checks': [],
+            }
+        elif self.error is not None:
+            data = {
+                'timestamp': self.last_checked,
+                'status': 'error',
+                'message': self.error,
+                'checks': [],
+            }
+        else:
+            data = {
+                'timestamp': self.health.timestamp,
+                'status': util.plugin_health_status_name(self.health.status),
+                'message': '',
+                'checks': [
+                    {
+                        'name': check.name,
+                        'status': util.plugin_health_status_name(check.status),
+                        'message': check.message,
+                        'timestamp': check.timestamp,
+                        'type': check.type,
+                    } for check in self.health.checks]
+            }
+
+        data.update({
+            'last_checked': self.last_checked,
+            'last_ok': self.last_ok,
+            'latency_ms': round(self.latency * 1000, 3) if self.latency is not None else None,
+            'consecutive_failures': self.failures,
+        })
+        return data
+
+
+class PluginHealthMonitor:
+    """The PluginHealthMonitor probes the health of all registered plugins
+    and keeps the state of each as of its last probe.
+
+    Concurrent requests for a probe of the plugins share a single probe.
+    """
+
+    def __init__(self):
+        self.states = {}
+
+        self._probe = None
+        self._loop = None
+
+    def get(self, plugin_id):
+        """Get the health state of a plugin.
+
+        Args:
+            plugin_id (str): The id of the plugin.
+
+        Returns:
+            PluginHealthState: The health state of the plugin.
+            None: The plugin has not been probed.
+        """
+        return self.states.get(plugin_id)
+
+    async def probe(self):
+        """Probe the health of all registered plugins, or wait on the probe
+        which is in flight.
+        """
+        loop = asyncio.get_event_loop()
+
+        # A probe started on another event loop will never complete on
+        # this one, so it is not waited on.
+        if self._probe is None or self._loop is not loop:
+            self._loop = loop
+            self._probe = asyncio.ensure_future(self._run())
+            self._probe.add_done_callback(self._done)
+
+        await asyncio.shield(self._probe)
+
+    async def ready(self):
+        """Wait until all registered plugins have been probed at least once.
+
+        If any registered plugin has not yet been probed (e.g. it was only
+        just registered), this probes the plugins. Otherwise, it returns
+        immediately.
+        """
+        if any(plugin_id not in self.states for plugin_id in Plugin.manager.plugins):
+            await self.probe()
+
+    async def _run(self):
+        """Probe the health of all registered plugins concurrently."""
+        plugins = list(Plugin.manager.plugins.items())
+        timeout = config.options.get('grpc.timeout', None)
+
+        results = await asyncio.gather(*[
+            self._check(plugin_id, p, timeout) for plugin_id, p in plugins
+        ])
+
+        # The states are replaced rather than modified, so a reader always
+        # has a consistent view of them. Plugins which are no longer
+        # registered are dropped.
+        states = dict(results)
+        self.states = {k: v for k, v in states.items() if k in Plugin.manager.plugins}
+
+    async def _check(self, plugin_id, p, timeout):
+        """Probe the health of a single plugin.
+
+        Args:
+            plugin_id (str): The id of the plugin.
+            p (Plugin): The plugin to probe.
+            timeout (float): The deadline, in seconds, for the plugin to respond.
+
+        Returns:
+            tuple(str, PluginHealthState): The id of the plugin and its
+                updated health state.
+        """
+        state = self.states.get(plugin_id) or PluginHealthState()
+
+        start = time.monotonic()
+        try:
+            health = await asyncio.wait_for(p.client.health(), timeout)
+        except Exception as e:  # pylint: disable=broad-except
+            state.failed(e, time.monotonic() - start)
+            logger.debug(_('Health probe failed for plugin {} ({} consecutive): {}').format(
+                plugin_id, state.failures, e
+            ))
+        else:
+            state.succeeded(health, time.monotonic() - start)
+        return plugin_id, state
+
+    def _done(self, flight):
+        """Clear a completed probe so the next request for one starts a
+        new probe.
+
+        Args:
+            flight (asyncio.Future): The completed probe.
+        """
+        if self._probe is flight:
+            self._probe = None
+
+        # Retrieve the error so it is not reported as never retrieved if no
+        # caller is left waiting on the probe. Any that are get it raised.
+        if not flight.cancelled():
+            flight.exception()
+
+
+# The monitor which tracks the health of all registered plugins.
+monitor = PluginHealthMonitor()
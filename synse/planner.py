@@ -0,0 +1,162 @@
+"""Planning of how to read many devices managed by a single plugin.
+
+Many devices of a plugin can either be read with a Read request for each
+device, or with a single ReadCached request which dumps the recent readings
+of all of the plugin's devices (see `synse.commands.read.read_plugin_devices`).
+Which is cheaper depends on how many of the plugin's devices are read: a
+dump of a plugin with hundreds of devices to get one of them wastes the
+plugin's time, while hundreds of Read requests to get most of them wastes
+far more.
+
+The read planner keeps a moving average of the observed latency of each kind
+of request to each plugin, and picks the strategy with the lowest estimated
+cost. Until both latencies have been observed for a plugin, it falls back to
+dumping the plugin's readings when at least `read.dump_ratio` of its devices
+are read. Either way, the readings are only dumped when at least
+`read.dump_min_targets` devices are read, and when the readings it gives,
+which may be up to `read.dump_window` seconds old, are fresh enough. Unless
+a maximum age is given, they must be within the readings cache TTL
+(`cache.readings.ttl`), so with the default TTL of 0 they are never dumped.
+"""
+
+import math
+
+from synse import cache, config
+from synse.proto.executor import executor
+
+# The header of a bulk read response which gives the plan each plugin's
+# devices were read with.
+HEADER = 'X-Synse-Read-Plan'
+
+# The strategies for reading the devices of a plugin.
+READ = 'read'
+DUMP = 'dump'
+
+# The weight given to a new latency observation in the moving average.
+ALPHA = 0.2
+
+
+class ReadPlan:
+    """The plan for reading devices managed by a single plugin.
+
+    Args:
+        plugin_id (str): The id of the plugin.
+        strategy (str): The strategy for reading the devices, either `READ`
+            or `DUMP`.
+        targets (int): The number of devices to read from the plugin.
+        devices (int): The number of devices the plugin manages.
+        cached (int): The number of devices served from the readings cache,
+            which do not need to be read. (default: 0)
+        read_cost (float): The estimated time, in seconds, to read the
+            devices individually, if known. (default: None)
+        dump_cost (float): The estimated time, in seconds, to dump the
+            plugin's readings, if known. (default: None)
+    """
+
+    def __init__(self, plugin_id, strategy, targets, devices, cached=0,
+                 read_cost=None, dump_cost=None):
+        self.plugin_id = plugin_id
+        self.strategy = strategy
+        self.targets = targets
+        self.devices = devices
+        self.cached = cached
+        self.read_cost = read_cost
+        self.dump_cost = dump_cost
+
+    def __str__(self):
+        s = '{} strategy={} targets={} devices={} cached={}'.format(
+            self.plugin_id, self.strategy, self.targets, self.devices, self.cached
+        )
+        if self.read_cost is not None and self.dump_cost is not None:
+            s += ' read_cost={:.3f} dump_cost={:.3f}'.format(self.read_cost, self.dump_cost)
+        return s
+
+
+class ReadPlanner:
+    """The ReadPlanner picks the cheapest strategy for reading devices
+    from a plugin, based on the latencies observed for the plugin.
+    """
+
+    def __init__(self):
+        # The moving average latency, in seconds, of each strategy,
+        # keyed by plugin id.
+        self.latencies = {}
+
+    def record(self, plugin_id, strategy, latency):
+        """Record the latency of a request made to a plugin.
+
+        Args:
+            plugin_id (str): The id of the plugin.
+            strategy (str): The strategy of the request, either `READ`
+                (the request read a single device) or `DUMP`.
+            latency (float): The time, in seconds, that the request took.
+        """
+        latencies = self.latencies.setdefault(plugin_id, {})
+        average = latencies.get(strategy)
+        if average is None:
+            latencies[strategy] = latency
+        else:
+            latencies[strategy] = average + ALPHA * (latency - average)
+
+    def plan(self, plugin_handler, targets, devices, cached=0, max_age=None):
+        """Plan the read of devices from a plugin.
+
+        Reading the devices individually is estimated to cost the average
+        Read latency for each batch of reads the plugin's executor limit
+        allows in flight at once. Dumping the plugin's readings is estimated
+        to cost the average ReadCached latency.
+
+        Args:
+            plugin_handler (Plugin): The plugin which manages the devices.
+            targets (int): The number of devices to read.
+            devices (int): The number of devices the plugin manages.
+            cached (int): The number of devices served from the readings
+                cache, which do not need to be read. (default: 0)
+            max_age (float): The maximum age, in seconds, of the readings
+                which may be served, or None if the configured readings
+                cache TTL applies. (default: None)
+
+        Returns:
+            ReadPlan: The plan for reading the devices.
+        """
+        plugin_id = plugin_handler.id()
+        min_targets = config.options.get('read.dump_min_targets', 4)
+        if (targets < max(min_targets, 2) or not _fresh_enough(max_age) or
+                not plugin_handler.client.read_cached_supported):
+            return ReadPlan(plugin_id, READ, targets, devices, cached)
+
+        latencies = self.latencies.get(plugin_id, {})
+        read_latency = latencies.get(READ)
+        dump_latency = latencies.get(DUMP)
+
+        if read_latency is None or dump_latency is None:
+            ratio = config.options.get('read.dump_ratio', 0.5)
+            strategy = DUMP if targets >= devices * ratio else READ
+            return ReadPlan(plugin_id, strategy, targets, devices, cached)
+
+        limit = max(executor.limit(plugin_handler.client.address), 1)
+        read_cost = math.ceil(targets / limit) * read_latency
+        strategy = DUMP if dump_latency < read_cost else READ
+        return ReadPlan(plugin_id, strategy, targets, devices, cached, read_cost, dump_latency)
+
+
+def _fresh_enough(max_age):
+    """Check whether the readings dumped from a plugin are fresh enough to
+    serve.
+
+    Args:
+        max_age (float): The maximum age, in seconds, of the readings which
+            may be served, or None if the configured readings cache TTL
+            applies.
+
+    Returns:
+        bool: True if the readings may be dumped; False otherwise.
+    """
+    if max_age is None:
+        max_age = cache.readings_ttl()
+    window = config.options.get('read.dump_window', 10)
+    return 0 < window <= max_age
+
+
+# The planner used for all multi-device reads.
+read_planner = ReadPlanner()
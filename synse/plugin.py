@@ -1,21 +1,46 @@
 """Management and access logic for configured plugin backends."""
 
+import asyncio
+import collections
 import os
 import stat
+import time
+
+import grpc
 
 from synse import config, const, errors
-from synse.discovery import kubernetes
+from synse.discovery import kubernetes, unix
 from synse.i18n import _
 from synse.log import logger
 from synse.proto import client
 
 
+# Addresses which failed to register, mapped to a tuple of the number of
+# consecutive failures and the time (per `time.monotonic`) before which
+# registration of the address is not retried.
+_backoff = {}
+
+# The number of seconds to wait before each retry of the registration of a
+# plugin for a new socket. The socket appears when the plugin binds it, which
+# is before the plugin is listening on it, so the first attempts may fail.
+_SOCKET_RETRY_DELAYS = (0.05, 0.1, 0.25, 0.5, 1)
+
+# Registrations which are in flight, mapped to a tuple of the event loop and
+# the future for the registration, keyed by address, so that concurrent
+# registrations of the same address share a single attempt.
+_registering = {}
+
+
 class PluginManager:
     """Manager for all registered background plugins.
 
     Only a single instance of the PluginManager should be used. It is
     accessible from the `manager` class member of any instance of the
     `Plugin` class.
+
+    The `plugins` dictionary is replaced rather than modified when plugins
+    are added or removed, so a caller holding on to it has a consistent
+    snapshot of the registered plugins, even while registration runs.
     """
 
     def __init__(self):
@@ -76,7 +101,9 @@ class PluginManager:
                 _('Plugin ("{}") already exists in the manager').format(plugin_id)
             )
 
-        self.plugins[plugin_id] = plugin
+        plugins = dict(self.plugins)
+        plugins[plugin_id] = plugin
+        self.plugins = plugins
 
     def remove(self, plugin_id):
         """Remove the plugin from the manager.
@@ -93,7 +120,10 @@ class PluginManager:
                 .format(plugin_id)
             )
         else:
-            del self.plugins[plugin_id]
+            plugins = dict(self.plugins)
+            plugin = plugins.pop(plugin_id)
+            self.plugins = plugins
+            plugin.client.close()
 
     def purge(self, ids):
         """Remove all of the specified Plugins from the manager.
@@ -101,9 +131,10 @@ class PluginManager:
         Args:
             ids (list[str]): The ids of the Plugins to remove.
         """
-        for plugin_id in ids:
-            if plugin_id in self.plugins:
-                del self.plugins[plugin_id]
+        purged = [v for k, v in self.plugins.items() if k in ids]
+        self.plugins = {k: v for k, v in self.plugins.items() if k not in ids}
+        for plugin in purged:
+            plugin.client.close()
         logger.debug(_('PluginManager purged plugins: {}').format(ids))
 
 
@@ -113,6 +144,8 @@ class Plugin:
     for communicating with the plugin via the Synse gRPC API.
 
     On initialization, all Plugin instances are registered with the PluginManager.
+    From then until they are removed from the manager, the connectivity of
+    their client's channel is tracked.
 
     Args:
         metadata (Metadata): The gRPC Metadata data for the Plugin.
@@ -136,8 +169,10 @@ class Plugin:
         self.address = address
         self.protocol = plugin_client.type
 
-        # Register this instance with the manager.
+        # Register this instance with the manager, and start tracking the
+        # connectivity of its channel.
         self.manager.add(self)
+        self.client.watch()
 
     def __str__(self):
         return '<Plugin ({}): {}@{}>'.format(self.tag, self.protocol, self.address)
@@ -179,7 +214,121 @@ async def get_plugins():
         yield k, v
 
 
-def register_plugins():
+async def fan_out(fn, timeout=None):
+    """Issue a request to all registered plugins concurrently.
+
+    A failure (or timeout) for one plugin does not affect the requests
+    to the others. The results from all of the plugins that responded are
+    collected, along with the errors for all of the plugins that did not.
+
+    Args:
+        fn: A function which takes a Plugin and returns an awaitable for the
+            request to issue to it, e.g. `lambda p: p.client.devices()`.
+        timeout (float): The deadline, in seconds, for each plugin to respond.
+            If None, no deadline is applied on top of the gRPC timeout.
+
+    Returns:
+        tuple(dict, dict): A tuple where the first dictionary maps the plugin
+            id to the result of its request, and the second dictionary maps
+            the plugin id to the error raised by its request. Both are ordered
+            the same as the plugins in the manager.
+    """
+    plugins = list(Plugin.manager.plugins.items())
+
+    async def call(plugin_id, plugin):
+        try:
+            return plugin_id, await asyncio.wait_for(fn(plugin), timeout), None
+        except (grpc.RpcError, errors.PluginCircuitOpenError, asyncio.TimeoutError) as e:
+            return plugin_id, None, e
+
+    results, failures = {}, {}
+    for plugin_id, result, err in await asyncio.gather(*[call(k, v) for k, v in plugins]):
+        if err is None:
+            results[plugin_id] = result
+        else:
+            failures[plugin_id] = err
+
+    return results, failures
+
+
+class PluginReconciler:
+    """The PluginReconciler owns plugin registration, keeping the
+    PluginManager in sync with the configured and discovered plugins.
+
+    Registration is run in the background on an interval (see
+    `synse.factory.periodic_plugin_reconciliation`) and on demand (see
+    `reconcile`), so request handlers can just read the manager's plugins
+    rather than doing registration themselves. Concurrent requests for a
+    registration pass share a single pass.
+    """
+
+    def __init__(self):
+        # The number of registration passes which completed and failed.
+        self.passes = 0
+        self.failures = 0
+
+        self._pass = None
+        self._loop = None
+
+    async def reconcile(self):
+        """Run a registration pass, or wait on the one which is in flight.
+
+        Raises:
+            Exception: The registration pass failed.
+        """
+        loop = asyncio.get_event_loop()
+
+        # A pass started on another event loop will never complete on
+        # this one, so it is not waited on.
+        if self._pass is None or self._loop is not loop:
+            self._loop = loop
+            self._pass = asyncio.ensure_future(self._run())
+            self._pass.add_done_callback(self._done)
+
+        await asyncio.shield(self._pass)
+
+    async def ready(self):
+        """Wait until plugins have been registered at least once.
+
+        If no registration pass has completed yet, this waits on one,
+        starting it if need be. Otherwise, it returns immediately.
+
+        Raises:
+            Exception: The registration pass failed.
+        """
+        if self.passes == 0:
+            await self.reconcile()
+
+    async def _run(self):
+        """Run a single registration pass."""
+        try:
+            await register_plugins()
+        except Exception:
+            self.failures += 1
+            raise
+        self.passes += 1
+
+    def _done(self, flight):
+        """Clear a completed registration pass so the next request for
+        one starts a new pass.
+
+        Args:
+            flight (asyncio.Future): The completed pass.
+        """
+        if self._pass is flight:
+            self._pass = None
+
+        # Retrieve the error so it is not reported as never retrieved if no
+        # caller is left waiting on the pass. Any that are get it raised.
+        if not flight.cancelled():
+            flight.exception()
+
+
+# The reconciler which owns the registration of plugins with the manager.
+reconciler = PluginReconciler()
+
+
+async def register_plugins():
     """Register all of the configured plugins.
 
     Plugins can either use a unix socket or TCP for communication. Unix
@@ -190,21 +339,23 @@ def register_plugins():
     Upon initialization, the Plugin instances are automatically registered
     with the PluginManager.
     """
+    # Only plugins which were registered before the pass started may be
+    # purged by it. Others may be registered while the pass is running (e.g.
+    # by the socket watcher), after the pass looked for them.
+    known = set(Plugin.manager.plugins)
+
     # Register plugins from local config (file, env)
-    unix = register_unix()
-    tcp = register_tcp()
-
-    # Get addresses of plugins to register via service discovery
-    discovered = []
-    addresses = kubernetes.discover()
-    for address in addresses:
-        plugin_id = register_plugin(address, 'tcp')
-        if plugin_id is None:
-            logger.error(_('Failed to register plugin with address: {}').format(address))
-            continue
-        discovered.append(plugin_id)
+    unix = await register_unix()
+    tcp = await register_tcp()
 
-    diff = set(Plugin.manager.plugins) - set(unix + tcp + discovered)
+    # Get addresses of plugins to register via service discovery. Discovery
+    # makes blocking calls to the kubernetes API (loading its config, listing
+    # endpoints, and starting the endpoint watcher), so it is run off of the
+    # event loop.
+    addresses = await asyncio.get_event_loop().run_in_executor(None, kubernetes.discover)
+    discovered = await _register_all(addresses, 'tcp')
+
+    diff = known - set(unix + tcp + discovered)
 
     # Now that we have found all current plugins, we will want to clear out
     # any old plugins which may no longer be present.
@@ -214,12 +365,50 @@ def register_plugins():
     logger.debug(_('Plugin registration complete'))
 
 
-def register_plugin(address, protocol):
+async def register_plugin(address, protocol):
     """Register a plugin. If a plugin with the given address already exists,
     it will not be re-registered, but its ID will still be returned.
 
     If a plugin fails to register, None is returned.
 
+    If the address is already being registered (e.g. by the socket watcher
+    while a registration pass is running), this waits on that registration
+    rather than starting another.
+
+    Args:
+        address (str): The address of the plugin to register.
+        protocol (str): The protocol that the plugin uses. This should
+            be one of 'unix', 'tcp'.
+
+    Returns:
+        str: The ID of the plugin that was registered.
+        None: The given address failed to resolve, so no plugin
+            was registered.
+
+    Raises:
+        ValueError: An invalid protocol is specified. The protocol must
+            be one of: 'unix', 'tcp'
+    """
+    loop = asyncio.get_event_loop()
+
+    # A registration started on another event loop will never complete on
+    # this one, so it is not waited on.
+    entry = _registering.get(address)
+    if entry is None or entry[0] is not loop:
+        flight = asyncio.ensure_future(_register_plugin(address, protocol))
+        entry = _registering[address] = (loop, flight)
+
+        def done(f):
+            if _registering.get(address, (None, None))[1] is f:
+                del _registering[address]
+        flight.add_done_callback(done)
+
+    return await asyncio.shield(entry[1])
+
+
+async def _register_plugin(address, protocol):
+    """Register a plugin at the given address (see `register_plugin`).
+
     Args:
         address (str): The address of the plugin to register.
         protocol (str): The protocol that the plugin uses. This should
@@ -240,6 +429,13 @@ def register_plugin(address, protocol):
         logger.debug(_('{} is already registered').format(plugin))
         return plugin.id()
 
+    # If the address recently failed to register, do not retry it until its
+    # backoff has passed, so an unreachable plugin does not cost a timeout
+    # on every registration pass.
+    if _backing_off(address):
+        logger.debug(_('Not retrying registration of {} until its backoff passes').format(address))
+        return None
+
     # The client does not exist, so we must register it. This means we need to
     # connect with it to (a) make sure its reachable, and (b) get its metadata
     # in order to properly create a new Plugin model for it.
@@ -250,35 +446,111 @@ def register_plugin(address, protocol):
     else:
         raise ValueError(_('Invalid protocol specified for registration: {}').format(protocol))
 
+    # Unless the plugin is registered, its client is closed so a plugin which
+    # keeps failing to register does not leave a client behind on every try.
+    registered = False
     try:
-        status = plugin_client.test()
-        if not status.ok:
-            logger.warning(_('gRPC Test response was not OK: {}').format(address))
+        try:
+            status = await plugin_client.test()
+            if not status.ok:
+                logger.warning(_('gRPC Test response was not OK: {}').format(address))
+                _registration_failed(address)
+                return None
+        except Exception as e:
+            logger.warning(_('Failed to reach plugin at address {}: {}').format(address, e))
+            _registration_failed(address)
             return None
-    except Exception as e:
-        logger.warning(_('Failed to reach plugin at address {}: {}').format(address, e))
-        return None
 
-    # If we made it here, we were successful in establishing communication
-    # with the plugin. Now, we should get its metainfo and create a Plugin
-    # instance with it.
-    try:
-        meta = plugin_client.metainfo()
-    except Exception as e:
-        logger.warning(_('Failed to get plugin metadata at address {}: {}').format(address, e))
-        return None
+        # If we made it here, we were successful in establishing communication
+        # with the plugin. Now, we should get its metainfo and create a Plugin
+        # instance with it.
+        try:
+            meta = await plugin_client.metainfo()
+        except Exception as e:
+            logger.warning(_('Failed to get plugin metadata at address {}: {}').format(address, e))
+            _registration_failed(address)
+            return None
 
-    plugin = Plugin(
-        metadata=meta,
-        address=address,
-        plugin_client=plugin_client
-    )
+        _backoff.pop(address, None)
+        plugin = Plugin(
+            metadata=meta,
+            address=address,
+            plugin_client=plugin_client
+        )
+        registered = True
+    finally:
+        if not registered:
+            plugin_client.close()
 
     logger.debug(_('Registered new plugin: {}').format(plugin))
     return plugin.id()
 
 
-def register_tcp():
+async def _register_all(addresses, protocol):
+    """Register plugins at the given addresses concurrently.
+
+    Args:
+        addresses (list[str]): The addresses of the plugins to register.
+        protocol (str): The protocol that the plugins use. This should
+            be one of 'unix', 'tcp'.
+
+    Returns:
+        list[str]: The ids of all plugins that were registered, in the
+            order of their addresses.
+    """
+    # Each address is only registered once, in case it is listed more than once.
+    addresses = list(collections.OrderedDict.fromkeys(addresses))
+
+    ids = await asyncio.gather(*[register_plugin(address, protocol) for address in addresses])
+
+    registered = []
+    for address, plugin_id in zip(addresses, ids):
+        if plugin_id is None:
+            logger.error(_('Failed to register plugin with address: {}').format(address))
+            continue
+        registered.append(plugin_id)
+    return registered
+
+
+def _backing_off(address):
+    """Check whether registration of an address is being backed off.
+
+    Args:
+        address (str): The address of the plugin.
+
+    Returns:
+        bool: True if registration should not be retried yet; False otherwise.
+    """
+    entry = _backoff.get(address)
+    return entry is not None and time.monotonic() < entry[1]
+
+
+def _registration_failed(address):
+    """Back off registration of an address which failed to register.
+
+    The backoff starts at `plugin.backoff.initial` seconds and doubles with
+    each consecutive failure, up to `plugin.backoff.max` seconds.
+
+    Args:
+        address (str): The address of the plugin.
+    """
+    failures = _backoff.get(address, (0, None))[0] + 1
+    delay = min(
+        config.options.get('plugin.backoff.initial', 5) * 2 ** (failures - 1),
+        config.options.get('plugin.backoff.max', 300),
+    )
+    logger.debug(_('Backing off registration of {} for {}s').format(address, delay))
+    _backoff[address] = (failures, time.monotonic() + delay)
+
+
+def clear_backoff():
+    """Clear the registration backoff of all addresses, so that they are
+    retried on the next registration pass.
+    """
+    _backoff.clear()
+
+
+async def register_tcp():
     """Register the plugins that use TCP for communication.
 
     Return:
@@ -292,18 +564,13 @@ def register_tcp():
         return registered
 
     logger.debug(_('TCP plugin configuration: {}').format(configured))
-    for address in configured:
-        plugin_id = register_plugin(address, 'tcp')
-        if plugin_id is None:
-            logger.error(_('Failed to register plugin with address: {}').format(address))
-            continue
-        registered.append(plugin_id)
+    registered = await _register_all(configured, 'tcp')
 
     logger.info('Registered tcp plugins: {}'.format(registered))
     return registered
 
 
-def register_unix():
+async def register_unix():
     """Register the plugins that use a unix socket for communication.
 
     Unix plugins can be configured in a variety of ways:
@@ -325,7 +592,17 @@ def register_unix():
         logger.info(_('No plugin configurations for unix'))
 
     logger.debug(_('unix plugin configuration: {}').format(configured))
+    addresses = []
     for address in configured:
+        # Sockets in the default socket directory are tracked by the socket
+        # watcher (if it is running), so there is no need to check them on disk.
+        if socket_watcher.running and os.path.dirname(address) == socket_watcher.path:
+            if address not in socket_watcher.sockets:
+                logger.error(_('Socket {} not found').format(address))
+                continue
+            addresses.append(address)
+            continue
+
         # The config here should be the path the the unix socket, which is our address.
         # First, check that the socket exists and that the address is a socket file.
         if not os.path.exists(address):
@@ -336,15 +613,22 @@ def register_unix():
             logger.error(_('{} is not a socket').format(address))
             continue
 
-        plugin_id = register_plugin(address, 'unix')
-        if plugin_id is None:
-            logger.error(_('Failed to register plugin with address: {}').format(address))
-            continue
-        registered.append(plugin_id)
+        addresses.append(address)
+
+    registered = await _register_all(addresses, 'unix')
 
     # Now, go through the default socket directory and pick up any sockets that
-    # may be set for automatic registration.
-    if not os.path.exists(const.SOCKET_DIR):
+    # may be set for automatic registration. If the socket watcher is running,
+    # it already knows which sockets are there.
+    if socket_watcher.running:
+        addresses = list(socket_watcher.sockets)
+        for plugin_id in await _register_all(addresses, 'unix'):
+            if plugin_id not in registered:
+                registered.append(plugin_id)
+        for address in addresses:
+            _add_unix_config(address)
+
+    elif not os.path.exists(const.SOCKET_DIR):
         logger.debug(
             _('No default socket path found, no plugins will be registered from {}')
             .format(const.SOCKET_DIR)
@@ -355,6 +639,7 @@ def register_unix():
             .format(const.SOCKET_DIR)
         )
 
+        addresses = []
         for item in os.listdir(const.SOCKET_DIR):
             logger.debug('  {}'.format(item))
             address = os.path.join(const.SOCKET_DIR, item)
@@ -364,18 +649,117 @@ def register_unix():
                 logger.debug(_('{} is not a socket - skipping').format(address))
                 continue
 
-            plugin_id = register_plugin(address, 'unix')
-            if plugin_id is None:
-                logger.error(_('Failed to register plugin with address: {}').format(address))
-                continue
-            registered.append(plugin_id)
+            addresses.append(address)
+
+        for plugin_id in await _register_all(addresses, 'unix'):
+            if plugin_id not in registered:
+                registered.append(plugin_id)
 
-            # We want the plugins registered from this default directory to
-            # be surfaced in the config, so we will add it there.
-            if config.options.get('plugin.unix') is None:
-                config.options.set('plugin.unix', [address])
-            else:
-                config.options.get('plugin.unix').append(address)
+        for address in addresses:
+            _add_unix_config(address)
 
     logger.info('Registered unix plugins: {}'.format(registered))
     return registered
+
+
+def _add_unix_config(address):
+    """Add a plugin registered from the default socket directory to the
+    plugin.unix config, if it is not already there.
+
+    We want the plugins registered from the default directory to be
+    surfaced in the config, so they are added there.
+
+    Args:
+        address (str): The address of the plugin's socket.
+    """
+    if Plugin.manager.get_by_address(address) is None:
+        return
+    if config.options.get('plugin.unix') is None:
+        config.options.set('plugin.unix', [address])
+    elif address not in config.options.get('plugin.unix'):
+        config.options.get('plugin.unix').append(address)
+
+
+async def _register_socket(address):
+    """Register the plugin for a socket which appeared in the default
+    socket directory.
+
+    The socket appears as soon as the plugin binds it, which is usually
+    before the plugin is listening on it, so a failed registration is
+    retried a few times after short delays (`_SOCKET_RETRY_DELAYS`). Only
+    the last failure puts the address into backoff.
+
+    Args:
+        address (str): The address of the plugin's socket.
+    """
+    delays = list(_SOCKET_RETRY_DELAYS)
+    while True:
+        try:
+            plugin_id = await register_plugin(address, 'unix')
+        except Exception as e:  # pylint: disable=broad-except
+            logger.error(_('Failed to register plugin with address {}: {}').format(address, e))
+            return
+
+        if plugin_id is not None:
+            break
+
+        # Stop retrying if the socket has gone away in the meantime.
+        if not delays or address not in socket_watcher.sockets:
+            logger.error(_('Failed to register plugin with address: {}').format(address))
+            return
+
+        logger.debug(_('Plugin at new socket {} is not ready yet, retrying registration')
+                     .format(address))
+        _backoff.pop(address, None)
+        await asyncio.sleep(delays.pop(0))
+
+    _add_unix_config(address)
+    logger.info(_('Registered unix plugin from new socket: {}').format(plugin_id))
+
+
+def _socket_added(address):
+    """Register the plugin for a new socket in the default socket directory.
+
+    A new socket is a new plugin process, so any backoff from a previous
+    plugin at the same address does not apply to it.
+
+    Args:
+        address (str): The address of the plugin's socket.
+    """
+    _backoff.pop(address, None)
+    asyncio.ensure_future(_register_socket(address))
+
+
+def _socket_removed(address):
+    """Remove the plugin for a socket which disappeared from the default
+    socket directory.
+
+    Args:
+        address (str): The address of the plugin's socket.
+    """
+    _backoff.pop(address, None)
+    plugin = Plugin.manager.get_by_address(address)
+    if plugin is not None:
+        logger.info(_('Socket removed, removing plugin: {}').format(plugin))
+        Plugin.manager.remove(plugin.id())
+
+
+# The watcher which tracks the sockets in the default socket directory,
+# registering and removing their plugins as they come and go.
+socket_watcher = unix.SocketDirWatcher(
+    const.SOCKET_DIR,
+    on_added=_socket_added,
+    on_removed=_socket_removed,
+)
+
+
+def watch_sockets():
+    """Start watching the default socket directory for plugin sockets.
+
+    Once the watcher is running, plugins are registered as soon as their
+    socket appears and removed as soon as it disappears, and `register_unix`
+    gets the sockets in the directory from the watcher rather than from disk.
+    """
+    socket_watcher.path = const.SOCKET_DIR
+    socket_watcher.poll_interval = config.options.get('plugin.socket_poll_interval', 5)
+    socket_watcher.start()
@@ -0,0 +1,205 @@
+"""Circuit breaking for plugin gRPC requests.
+
+Each plugin client has a circuit breaker which tracks the outcome of the
+requests made to its plugin. While the plugin is healthy the circuit is
+closed and requests go through as normal. Once enough consecutive
+requests fail, the circuit opens and requests are rejected without being
+issued, so a struggling plugin is not piled on while it recovers. After
+the probe interval, the circuit is half-open: a single probe request is
+let through, and its outcome decides whether the circuit closes again or
+goes back to being open.
+"""
+
+import asyncio
+import contextlib
+import time
+
+import grpc
+
+from synse import config, errors
+from synse.i18n import _
+from synse.log import logger
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+# The gRPC status codes which indicate that the plugin could not service a
+# request at all. Any other status (e.g. NOT_FOUND) is an answer from the
+# plugin, so it counts as the plugin being up.
+_FAILURE_CODES = (
+    grpc.StatusCode.UNAVAILABLE,
+    grpc.StatusCode.DEADLINE_EXCEEDED,
+    grpc.StatusCode.RESOURCE_EXHAUSTED,
+    grpc.StatusCode.INTERNAL,
+    grpc.StatusCode.UNKNOWN,
+)
+
+
+def is_failure(exc):
+    """Check whether an error from a plugin request counts against the
+    plugin's circuit.
+
+    Args:
+        exc (Exception): The error raised by the request.
+
+    Returns:
+        bool: True if the error counts as a failure; False otherwise.
+    """
+    if isinstance(exc, grpc.RpcError):
+        code = getattr(exc, 'code', None)
+        return code is None or code() in _FAILURE_CODES
+    return True
+
+
+def _is_deadline_exceeded(exc):
+    """Check whether an error from a plugin request is the request
+    running out of time.
+
+    Args:
+        exc (Exception): The error raised by the request.
+
+    Returns:
+        bool: True if the request's deadline was exceeded; False otherwise.
+    """
+    code = getattr(exc, 'code', None)
+    return isinstance(exc, grpc.RpcError) and code is not None and \
+        code() == grpc.StatusCode.DEADLINE_EXCEEDED
+
+
+class CircuitBreaker:
+    """A closed/open/half-open circuit breaker for the requests to a
+    single plugin.
+
+    Args:
+        address (str): The address of the plugin.
+        threshold (int): The number of consecutive failed requests which
+            open the circuit. If this is 0, the circuit never opens.
+        probe_interval (float): The number of seconds the circuit stays
+            open before a probe request is let through.
+    """
+
+    def __init__(self, address, threshold=None, probe_interval=None):
+        self.address = address
+        self.threshold = threshold if threshold is not None else config.options.get(
+            'grpc.circuit_breaker.threshold', 5
+        )
+        self.probe_interval = probe_interval if probe_interval is not None else \
+            config.options.get('grpc.circuit_breaker.probe_interval', 10)
+
+        self.state = CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.opened_at = None
+
+        self._probing = False
+
+    @property
+    def enabled(self):
+        """bool: Whether the circuit can open at all."""
+        return self.threshold > 0
+
+    def allow(self):
+        """Check whether a request may be issued to the plugin.
+
+        If the circuit is open and the probe interval has elapsed, the
+        circuit becomes half-open and the caller gets to issue the probe.
+
+        Raises:
+            errors.PluginCircuitOpenError: The circuit is open, or it is
+                half-open and the probe is already in flight.
+        """
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.probe_interval:
+            logger.info(_('Circuit for plugin {} is half-open, probing').format(self.address))
+            self.state = HALF_OPEN
+
+        if self.state == CLOSED:
+            return
+
+        if self.state == HALF_OPEN and not self._probing:
+            self._probing = True
+            return
+
+        raise errors.PluginCircuitOpenError(
+            _('Circuit for plugin {} is open after {} consecutive failures').format(
+                self.address, self.failures
+            )
+        )
+
+    def succeeded(self):
+        """Record a request which the plugin serviced."""
+        if self.state != CLOSED:
+            logger.info(_('Circuit for plugin {} closed').format(self.address))
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def failed(self):
+        """Record a request which the plugin failed to service."""
+        self.failures += 1
+        self._probing = False
+
+        if self.state == HALF_OPEN or (
+                self.state == CLOSED and self.enabled and self.failures >= self.threshold):
+            if self.state == CLOSED:
+                self.trips += 1
+                logger.warning(
+                    _('Circuit for plugin {} opened after {} consecutive failures').format(
+                        self.address, self.failures
+                    )
+                )
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+    def abandoned(self):
+        """Record a request which ended without an outcome (e.g. it was
+        cancelled by the caller), so a probe in flight can be retried.
+        """
+        self._probing = False
+
+    @contextlib.contextmanager
+    def guard(self, bounded=False):
+        """A context manager which checks that a request may be issued and
+        records its outcome.
+
+        Args:
+            bounded (bool): Whether the request's timeout was cut short by
+                the caller's deadline. If so, the request running out of
+                time is not held against the plugin.
+
+        Raises:
+            errors.PluginCircuitOpenError: The request may not be issued.
+        """
+        self.allow()
+        try:
+            yield
+        except asyncio.CancelledError:
+            self.abandoned()
+            raise
+        except Exception as e:
+            if bounded and _is_deadline_exceeded(e):
+                self.abandoned()
+            elif is_failure(e):
+                self.failed()
+            else:
+                self.succeeded()
+            raise
+        except BaseException:
+            self.abandoned()
+            raise
+        else:
+            self.succeeded()
+
+    def to_dict(self):
+        """Get a summary of the circuit's state.
+
+        Returns:
+            dict: The state of the circuit, its consecutive failures, and
+                the number of times it has opened.
+        """
+        return {
+            'state': self.state,
+            'consecutive_failures': self.failures,
+            'trips': self.trips,
+        }
@@ -0,0 +1,135 @@
+"""Creation of the gRPC channels used to communicate with plugins.
+
+All plugin channels are made by a single channel factory, so the TLS
+credentials are loaded from disk once rather than for every plugin, and
+every channel is tuned with the same HTTP/2 options from the configuration.
+
+Each plugin client can hold a pool of channels to its plugin. A single
+HTTP/2 connection caps the throughput of concurrent requests to a plugin,
+so with a pool the requests are spread across several connections.
+"""
+
+import os
+
+import grpc
+
+from synse import config
+from synse.i18n import _
+from synse.log import logger
+
+# The channel configuration options and the gRPC channel arguments that they
+# set, along with the factor to scale the configured value by for the
+# argument (e.g. seconds to milliseconds).
+_CHANNEL_ARGS = (
+    ('keepalive_time', 'grpc.keepalive_time_ms', 1000),
+    ('keepalive_timeout', 'grpc.keepalive_timeout_ms', 1000),
+    ('keepalive_permit_without_calls', 'grpc.keepalive_permit_without_calls', None),
+    ('max_send_message_length', 'grpc.max_send_message_length', None),
+    ('max_receive_message_length', 'grpc.max_receive_message_length', None),
+    ('stream_window_size', 'grpc.http2.lookahead_bytes', None),
+    ('bdp_probe', 'grpc.http2.bdp_probe', None),
+)
+
+# The channel argument which sets the channels in a pool apart. gRPC shares
+# the underlying connection between channels to the same target with the
+# same arguments, so without it, a pool would still use a single connection.
+_POOL_INDEX_ARG = 'synse.channel_pool_index'
+
+
+class ChannelFactory:
+    """The ChannelFactory makes the gRPC channels to plugins.
+
+    The TLS credentials are loaded the first time a secure channel is
+    made and reused after that. They are only loaded again if the
+    configured cert, or the cert file itself, changes.
+    """
+
+    def __init__(self):
+        self._creds = None
+        self._creds_key = None
+
+    def credentials(self):
+        """Get the credentials for secure channels to plugins.
+
+        Returns:
+            grpc.ChannelCredentials: The channel credentials, if TLS is
+                enabled for gRPC.
+            None: TLS is not enabled for gRPC.
+        """
+        # FIXME (etd) - we'll probably want to support using a CA here?
+        if not config.options.get('grpc.tls', None):
+            return None
+
+        cert = config.options.get('grpc.tls.cert')
+        key = (cert, os.stat(cert).st_mtime)
+        if key != self._creds_key:
+            logger.info(_('TLS enabled for gRPC'))
+            logger.info(_('Using cert file: {}').format(cert))
+            with open(cert, 'rb') as f:
+                plugin_cert = f.read()
+
+            self._creds = grpc.ssl_channel_credentials(root_certificates=plugin_cert)
+            self._creds_key = key
+        return self._creds
+
+    @staticmethod
+    def options():
+        """Get the gRPC channel arguments set by the configuration.
+
+        Returns:
+            list[tuple]: The channel arguments.
+        """
+        options = []
+        for name, arg, scale in _CHANNEL_ARGS:
+            value = config.options.get('grpc.channel.{}'.format(name), None)
+            if value is None:
+                continue
+            if isinstance(value, bool):
+                value = int(value)
+            elif scale is not None:
+                value = int(value * scale)
+            options.append((arg, value))
+        return options
+
+    @staticmethod
+    def pool_size():
+        """Get the number of channels to open to each plugin.
+
+        Returns:
+            int: The channel pool size.
+        """
+        return max(config.options.get('grpc.channel.pool_size', 1), 1)
+
+    def make(self, target, index=0):
+        """Make a channel to a plugin.
+
+        Args:
+            target (str): The gRPC target address of the plugin.
+            index (int): The index of the channel in the plugin's pool.
+
+        Returns:
+            grpc.Channel: The channel to the plugin.
+        """
+        options = self.options()
+        if index:
+            options.append((_POOL_INDEX_ARG, index))
+
+        creds = self.credentials()
+        if creds is not None:
+            return grpc.secure_channel(target, creds, options=options or None)
+        return grpc.insecure_channel(target, options=options or None)
+
+    def pool(self, target):
+        """Make the pool of channels to a plugin.
+
+        Args:
+            target (str): The gRPC target address of the plugin.
+
+        Returns:
+            list[grpc.Channel]: The channels to the plugin.
+        """
+        return [self.make(target, i) for i in range(self.pool_size())]
+
+
+# The factory which makes all of the channels to plugins.
+factory = ChannelFactory()
@@ -1,5 +1,7 @@
 """Synse Server Python client for communicating to plugins via the gRPC API."""
 
+import asyncio
+import functools
 import os
 
 import grpc
@@ -9,6 +11,133 @@ from synse import config
 from synse.const import SOCKET_DIR
 from synse.i18n import _
 from synse.log import logger
+from synse.proto import channel
+from synse.proto.breaker import CircuitBreaker
+from synse.proto.executor import executor
+
+# Sentinel used to mark the end of a streamed gRPC response.
+_STREAM_END = object()
+
+# The channel connectivity states in which a plugin is known to be
+# unreachable, so requests to it fail fast rather than waiting to time out.
+_DOWN = (grpc.ChannelConnectivity.TRANSIENT_FAILURE, grpc.ChannelConnectivity.SHUTDOWN)
+
+# The channel connectivity states from most to least usable. A channel which
+# has not reported its state yet (None) may still be usable.
+_STATE_RANKS = [
+    grpc.ChannelConnectivity.READY,
+    grpc.ChannelConnectivity.IDLE,
+    grpc.ChannelConnectivity.CONNECTING,
+    None,
+    grpc.ChannelConnectivity.TRANSIENT_FAILURE,
+    grpc.ChannelConnectivity.SHUTDOWN,
+]
+
+
+class PluginUnavailableError(grpc.RpcError):
+    """A request was not issued to a plugin because its channel is known
+    to be down.
+
+    This is a gRPC error with the UNAVAILABLE status code, so it is handled
+    the same way as any other failed plugin request.
+
+    Args:
+        address (str): The address of the plugin.
+        state (grpc.ChannelConnectivity): The state of the plugin's channel.
+    """
+
+    def __init__(self, address, state):
+        super(PluginUnavailableError, self).__init__()
+        self.address = address
+        self.state = state
+
+    def code(self):  # pylint: disable=no-self-use
+        """Get the status code of the error."""
+        return grpc.StatusCode.UNAVAILABLE
+
+    def details(self):
+        """Get the details of the error."""
+        return _('Plugin at {} is unavailable (channel state: {})').format(
+            self.address, _state_name(self.state)
+        )
+
+    def __str__(self):
+        return self.details()
+
+
+def _state_name(state):
+    """Get the name of a channel connectivity state.
+
+    Args:
+        state (grpc.ChannelConnectivity): The connectivity state.
+
+    Returns:
+        str: The lower-cased name of the state, or 'unknown' if the
+            state is not known.
+    """
+    if state is None:
+        return 'unknown'
+    return state.name.lower()
+
+
+def _rpc_timeout(timeout=None):
+    """Get the timeout for a plugin request.
+
+    Requests are bounded by the configured gRPC timeout. If the caller has
+    a deadline which leaves less time than that, it bounds the request
+    instead.
+
+    Args:
+        timeout (float): The time remaining until the caller's deadline,
+            if it has one.
+
+    Returns:
+        tuple(float, bool): The timeout for the request, and whether it
+            was cut short by the caller's deadline.
+    """
+    configured = config.options.get('grpc.timeout', None)
+    if timeout is None or (configured is not None and timeout >= configured):
+        return configured, False
+    return timeout, True
+
+
+def _wrap_future(call, loop):
+    """Wrap a gRPC future so that it can be awaited from the event loop.
+
+    gRPC resolves its futures from its own polling thread, so the result
+    is handed back to the loop thread-safely.
+
+    Args:
+        call (grpc.Future): The gRPC future for an in-flight call.
+        loop (asyncio.AbstractEventLoop): The loop to resolve the result on.
+
+    Returns:
+        asyncio.Future: A future which resolves with the result of the call.
+    """
+    fut = loop.create_future()
+
+    def _resolve(f):
+        if fut.done():
+            return
+        if f.cancelled():
+            fut.cancel()
+            return
+        exc = f.exception()
+        if exc is not None:
+            fut.set_exception(exc)
+        else:
+            fut.set_result(f.result())
+
+    def _on_done(f):
+        try:
+            loop.call_soon_threadsafe(_resolve, f)
+        except RuntimeError:
+            # The loop was closed before the call completed; there is
+            # nobody left to hand the result to.
+            pass
+
+    call.add_done_callback(_on_done)
+    return fut
 
 
 class WriteData:
@@ -56,6 +185,15 @@ class PluginClient:
     There should be one instance of a `PluginClient` for every plugin
     that is registered with Sysnse Server.
 
+    All of the API methods are coroutines, so issuing a request to a plugin
+    never blocks the event loop. Unary requests are awaited via gRPC futures,
+    and streamed responses are drained in the plugin executor's thread pool.
+    Every request holds a slot in the plugin executor for its duration, so
+    the number of concurrent requests to each plugin is bounded, and goes
+    through the client's circuit breaker, so requests to a plugin which
+    keeps failing are rejected until it recovers. Requests are spread
+    round-robin across the client's pool of channels to the plugin.
+
     This class is a base class and should not be initialized directly.
 
     Args:
@@ -67,7 +205,24 @@ class PluginClient:
     def __init__(self, address):
         self.address = address
         self.channel = None
-        self.grpc = None
+        self.channels = []
+        self.stubs = []
+        self._next = 0
+
+        # The last known connectivity state of the plugin's channels and the
+        # number of times it has changed, once the channels are being watched.
+        self.state = None
+        self.state_changes = 0
+        self._states = []
+        self._callbacks = []
+        self._watching = False
+
+        # The circuit breaker guarding the requests made to the plugin.
+        self.breaker = CircuitBreaker(address)
+
+        # Whether the plugin supports the ReadCached request. This is only
+        # known to be False once the plugin has rejected one as unimplemented.
+        self.read_cached_supported = True
 
         self.make_stub()
 
@@ -78,29 +233,289 @@ class PluginClient:
         raise NotImplementedError('Subclasses must implement their own address formatting.')
 
     def make_channel(self):
-        """Make the channel for the grpc client stub."""
-        # If Synse Server is configured to communicate with the plugin using
-        # TLS, set up a secure channel, otherwise use an insecure channel.
-        # FIXME (etd) - we'll probably want to support using a CA here?
-        if config.options.get('grpc.tls'):
-            logger.info(_('TLS enabled for gRPC'))
-
-            cert = config.options.get('grpc.tls.cert')
-            logger.info(_('Using cert file: {}').format(cert))
-            with open(cert, 'rb') as f:
-                plugin_cert = f.read()
-
-            creds = grpc.ssl_channel_credentials(root_certificates=plugin_cert)
-            self.channel = grpc.secure_channel(self._fmt_address(), creds)
-        else:
-            self.channel = grpc.insecure_channel(self._fmt_address())
+        """Make the pool of channels to the plugin.
+
+        The first channel in the pool is also available as `channel`.
+        """
+        self.channels = channel.factory.pool(self._fmt_address())
+        self.channel = self.channels[0]
+        self._states = [None] * len(self.channels)
 
     def make_stub(self):
-        """Create the gRPC client stub to communicate with the plugin."""
+        """Create the gRPC client stubs to communicate with the plugin,
+        one for each channel in the pool.
+        """
         self.make_channel()
-        self.grpc = synse_grpc.grpc.PluginStub(self.channel)
+        self.stubs = [synse_grpc.grpc.PluginStub(c) for c in self.channels]
+
+    @property
+    def grpc(self):
+        """synse_grpc.grpc.PluginStub: The stub for the next channel in the
+        pool. Each access moves on to the next channel, so requests are
+        spread across the pool round-robin.
+        """
+        stub = self.stubs[self._next % len(self.stubs)]
+        self._next += 1
+        return stub
 
-    def test(self):
+    def watch(self):
+        """Start tracking the connectivity state of the channels.
+
+        The channels are asked to connect (and to stay connected), and every
+        change of their state is recorded as it happens, so a plugin which
+        goes down is known to be down without a request having to time out
+        first.
+        """
+        if self._watching:
+            return
+        self._watching = True
+        self._callbacks = [
+            functools.partial(self._on_channel_state_change, i) for i in range(len(self.channels))
+        ]
+        for c, callback in zip(self.channels, self._callbacks):
+            c.subscribe(callback, try_to_connect=True)
+
+    def close(self):
+        """Stop tracking the connectivity state of the channels, and close
+        them.
+
+        Channels can only be closed explicitly with grpcio 1.12+; with older
+        versions, they are released once the client is no longer referenced.
+        """
+        if self._watching:
+            self._watching = False
+            for c, callback in zip(self.channels, self._callbacks):
+                c.unsubscribe(callback)
+
+        for c in self.channels:
+            if hasattr(c, 'close'):
+                c.close()
+
+    def _on_channel_state_change(self, index, state):
+        """Record a change in the connectivity state of one of the channels.
+
+        The state of the plugin is the best state of any of its channels,
+        since a request can be issued so long as one channel is usable.
+
+        This is called from gRPC's connectivity polling thread.
+
+        Args:
+            index (int): The index of the channel in the pool.
+            state (grpc.ChannelConnectivity): The new state of the channel.
+        """
+        self._states[index] = state
+        self._on_state_change(min(self._states, key=_STATE_RANKS.index))
+
+    def _on_state_change(self, state):
+        """Record a change in the plugin's connectivity state.
+
+        Args:
+            state (grpc.ChannelConnectivity): The new state of the plugin.
+        """
+        if state == self.state:
+            return
+        if self.state is not None:
+            self.state_changes += 1
+        logger.debug(_('Plugin channel {} is {}').format(self.address, _state_name(state)))
+        self.state = state
+
+    @property
+    def available(self):
+        """bool: Whether the plugin may be reachable. This is False only
+        when the channel is known to be down.
+        """
+        return self.state not in _DOWN
+
+    def connectivity(self):
+        """Get a summary of the channel's connectivity.
+
+        Returns:
+            dict: The state of the plugin's channels, the number of times it
+                changed, and the number of channels in the pool.
+        """
+        return {
+            'state': _state_name(self.state),
+            'state_changes': self.state_changes,
+            'channels': len(self.channels),
+        }
+
+    def _check_available(self):
+        """Fail fast if the plugin's channel is known to be down.
+
+        Raises:
+            PluginUnavailableError: The channel is known to be down.
+        """
+        state = self.state
+        if state in _DOWN:
+            raise PluginUnavailableError(self.address, state)
+
+    async def _unary(self, rpc, request, fail_fast=True, timeout=None):
+        """Issue a unary-unary gRPC request without blocking the event loop.
+
+        If the awaiting task is cancelled, the underlying gRPC call is
+        cancelled as well.
+
+        Args:
+            rpc: The gRPC stub method to call.
+            request: The request message.
+            fail_fast (bool): Fail immediately, without issuing the request,
+                if the plugin's channel is known to be down or its circuit
+                is open.
+            timeout (float): The time remaining until the caller's deadline,
+                if it has one.
+
+        Returns:
+            The response message.
+
+        Raises:
+            PluginUnavailableError: The plugin's channel is known to be down.
+            errors.PluginCircuitOpenError: The plugin's circuit is open.
+        """
+        timeout, bounded = _rpc_timeout(timeout)
+        if not fail_fast:
+            return await self._unary_call(rpc, request, timeout)
+
+        self._check_available()
+        with self.breaker.guard(bounded):
+            return await self._unary_call(rpc, request, timeout)
+
+    async def _unary_call(self, rpc, request, timeout):
+        """Issue a unary-unary gRPC request, holding a slot in the plugin
+        executor for its duration.
+
+        Args:
+            rpc: The gRPC stub method to call.
+            request: The request message.
+            timeout (float): The timeout for the request.
+
+        Returns:
+            The response message.
+        """
+        async with executor.slot(self.address):
+            call = rpc.future(request, timeout=timeout)
+            try:
+                return await _wrap_future(call, asyncio.get_event_loop())
+            except asyncio.CancelledError:
+                call.cancel()
+                raise
+
+    async def _collect(self, rpc, request, timeout=None):
+        """Issue a unary-stream gRPC request and collect all of its responses.
+
+        The synchronous stub can only be iterated by blocking, so the stream
+        is drained in the plugin executor to keep the event loop free.
+
+        Args:
+            rpc: The gRPC stub method to call.
+            request: The request message.
+            timeout (float): The time remaining until the caller's deadline,
+                if it has one.
+
+        Returns:
+            list: All of the messages streamed back for the request.
+
+        Raises:
+            PluginUnavailableError: The plugin's channel is known to be down.
+            errors.PluginCircuitOpenError: The plugin's circuit is open.
+        """
+        self._check_available()
+
+        timeout, bounded = _rpc_timeout(timeout)
+        with self.breaker.guard(bounded):
+            async with executor.slot(self.address):
+                call = rpc(request, timeout=timeout)
+                try:
+                    return await executor.submit(list, call)
+                except asyncio.CancelledError:
+                    call.cancel()
+                    raise
+
+    async def _stream(self, rpc, request, timeout=None):
+        """Issue a unary-stream gRPC request and yield its responses as
+        they arrive.
+
+        The stream is drained in the plugin executor into a queue, which is
+        handed back to the event loop one message at a time. The executor
+        slot and the circuit breaker guard for the request are held until
+        the stream is drained, not until the consumer is done with it, so a
+        slow consumer does not hold up other requests to the plugin. If the
+        consumer stops iterating before the stream is exhausted, the gRPC
+        call is cancelled.
+
+        Args:
+            rpc: The gRPC stub method to call.
+            request: The request message.
+            timeout (float): The time remaining until the caller's deadline,
+                if it has one.
+
+        Yields:
+            The messages streamed back for the request.
+
+        Raises:
+            PluginUnavailableError: The plugin's channel is known to be down.
+            errors.PluginCircuitOpenError: The plugin's circuit is open.
+        """
+        self._check_available()
+
+        loop = asyncio.get_event_loop()
+        queue = asyncio.Queue(loop=loop)
+        timeout, bounded = _rpc_timeout(timeout)
+
+        # The gRPC call, once it is issued, and whether the consumer has
+        # stopped iterating.
+        state = {'call': None, 'abandoned': False}
+
+        def drain(call):
+            for item in call:
+                loop.call_soon_threadsafe(queue.put_nowait, (item, None))
+
+        async def run():
+            try:
+                with self.breaker.guard(bounded):
+                    async with executor.slot(self.address):
+                        call = state['call'] = rpc(request, timeout=timeout)
+                        try:
+                            await executor.submit(drain, call)
+                        except Exception:
+                            # The call failing because the consumer cancelled
+                            # it is not held against the plugin.
+                            if state['abandoned']:
+                                raise asyncio.CancelledError()
+                            raise
+            except BaseException as e:
+                queue.put_nowait((_STREAM_END, e))
+                raise
+            else:
+                queue.put_nowait((_STREAM_END, None))
+
+        def retrieve(task):
+            # The error is raised to the consumer from the queue, if it is
+            # still iterating, so it is not reported as never retrieved.
+            if not task.cancelled():
+                task.exception()
+
+        task = asyncio.ensure_future(run())
+        task.add_done_callback(retrieve)
+
+        finished = False
+        try:
+            while True:
+                item, err = await queue.get()
+                if item is _STREAM_END:
+                    finished = True
+                    if err is not None:
+                        raise err
+                    break
+                yield item
+        finally:
+            if not finished:
+                state['abandoned'] = True
+                if state['call'] is not None:
+                    state['call'].cancel()
+                else:
+                    task.cancel()
+
+    async def test(self):
         """Test that the plugin is reachable
 
         Returns:
@@ -111,13 +526,16 @@ class PluginClient:
         logger.debug(_('Issuing gRPC test request'))
 
         req = synse_grpc.api.Empty()
-        timeout = config.options.get('grpc.timeout', None)
-        resp = self.grpc.Test(req, timeout=timeout)
-        return resp
+        return await self._unary(self.grpc.Test, req)
 
-    def health(self):
+    async def health(self):
         """Get the health of the plugin.
 
+        The health request is issued even if the plugin's channel is known
+        to be down or its circuit is open, and its outcome does not count
+        against the circuit. It is made periodically by the health monitor,
+        so it also serves to find out when the plugin comes back.
+
         Returns:
             synse_grpc.api.PluginHealth: The snapshot of the plugin's
                 health at the time the request was made.
@@ -125,11 +543,9 @@ class PluginClient:
         logger.debug(_('Issuing gRPC health request'))
 
         req = synse_grpc.api.Empty()
-        timeout = config.options.get('grpc.timeout', None)
-        resp = self.grpc.Health(req, timeout=timeout)
-        return resp
+        return await self._unary(self.grpc.Health, req, fail_fast=False)
 
-    def metainfo(self):
+    async def metainfo(self):
         """Get the plugin metainfo.
 
         Returns:
@@ -138,11 +554,9 @@ class PluginClient:
         logger.debug(_('Issuing gRPC metainfo request'))
 
         req = synse_grpc.api.Empty()
-        timeout = config.options.get('grpc.timeout', None)
-        resp = self.grpc.Metainfo(req, timeout=timeout)
-        return resp
+        return await self._unary(self.grpc.Metainfo, req)
 
-    def capabilities(self):
+    async def capabilities(self):
         """Get the plugin device capabilities.
 
         Returns:
@@ -152,11 +566,9 @@ class PluginClient:
         logger.debug(_('Issuing gRPC capabilities request'))
 
         req = synse_grpc.api.Empty()
-        timeout = config.options.get('grpc.timeout', None)
-        resp = [c for c in self.grpc.Capabilities(req, timeout=timeout)]
-        return resp
+        return await self._collect(self.grpc.Capabilities, req)
 
-    def devices(self, rack=None, board=None):
+    async def devices(self, rack=None, board=None):
         """Get all device information from a plugin.
 
         Args:
@@ -179,18 +591,17 @@ class PluginClient:
             board=board
         )
 
-        timeout = config.options.get('grpc.timeout', None)
-        resp = [r for r in self.grpc.Devices(req, timeout=timeout)]
-
-        return resp
+        return await self._collect(self.grpc.Devices, req)
 
-    def read(self, rack, board, device):
+    async def read(self, rack, board, device, timeout=None):
         """Get a reading from the specified device.
 
         Args:
             rack (str): The rack which the device resides on.
             board (str): The board which the device resides on.
             device (str): The identifier for the device to read.
+            timeout (float): The time remaining until the caller's deadline,
+                if it has one. (default: None)
 
         Returns:
             list[synse_grpc.api.Reading]: The reading responses for the
@@ -204,12 +615,9 @@ class PluginClient:
             rack=rack,
         )
 
-        timeout = config.options.get('grpc.timeout', None)
-        resp = [r for r in self.grpc.Read(req, timeout=timeout)]
-
-        return resp
+        return await self._collect(self.grpc.Read, req, timeout=timeout)
 
-    def read_cached(self, start=None, end=None):
+    async def read_cached(self, start=None, end=None, timeout=None):
         """Get the cached readings from a plugin. If caching readings
         is disabled for the plugin, this will get a dump of the current
         reading state.
@@ -223,6 +631,8 @@ class PluginClient:
                 which defines an ending bound on the cache data to
                 return. If no timestamp is specified, there will not
                 be an ending bound. (default: None)
+            timeout (float): The time remaining until the caller's deadline,
+                if it has one. (default: None)
 
         Yields:
             synse_grpc.api.DeviceReading: A cached reading value
@@ -235,11 +645,10 @@ class PluginClient:
             end=end or '',
         )
 
-        timeout = config.options.get('grpc.timeout', None)
-        for reading in self.grpc.ReadCached(bounds, timeout=timeout):
+        async for reading in self._stream(self.grpc.ReadCached, bounds, timeout=timeout):
             yield reading
 
-    def write(self, rack, board, device, data):
+    async def write(self, rack, board, device, data, timeout=None):
         """Write data to the specified device.
 
         Args:
@@ -247,6 +656,8 @@ class PluginClient:
             board (str): The board which the device resides on.
             device (str): The identifier for the device to write to.
             data (list[WriteData]): The data to write to the device.
+            timeout (float): The time remaining until the caller's deadline,
+                if it has one. (default: None)
 
         Returns:
             synse_grpc.api.Transactions: The transactions that can be used
@@ -263,15 +674,15 @@ class PluginClient:
             data=[d.to_grpc() for d in data]
         )
 
-        timeout = config.options.get('grpc.timeout', None)
-        resp = self.grpc.Write(req, timeout=timeout)
-        return resp
+        return await self._unary(self.grpc.Write, req, timeout=timeout)
 
-    def transaction(self, transaction_id):
+    async def transaction(self, transaction_id, timeout=None):
         """Check the state of a write transaction.
 
         Args:
             transaction_id (str): The ID of the transaction to check.
+            timeout (float): The time remaining until the caller's deadline,
+                if it has one. (default: None)
 
         Returns:
             list[synse_grpc.api.WriteResponse]: The WriteResponse detailing the
@@ -283,9 +694,7 @@ class PluginClient:
             id=transaction_id
         )
 
-        timeout = config.options.get('grpc.timeout', None)
-        resp = [r for r in self.grpc.Transaction(req, timeout=timeout)]
-        return resp
+        return await self._collect(self.grpc.Transaction, req, timeout=timeout)
 
 
 class PluginTCPClient(PluginClient):
@@ -0,0 +1,229 @@
+"""Bounded execution of plugin gRPC requests.
+
+Requests to plugins are limited both globally and per-plugin. The global
+limit keeps Synse Server from overwhelming itself, while the per-plugin
+limit protects plugins (e.g. ones backed by slow i2c buses) which can only
+service a few requests at a time. Any request that has to block on the
+synchronous gRPC API is run in a bounded thread pool so the event loop is
+never blocked.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from synse import config
+from synse.i18n import _
+from synse.log import logger
+
+
+class _Limiter:
+    """A concurrency limit along with counters describing its usage.
+
+    Args:
+        limit (int): The maximum number of concurrent requests.
+        loop (asyncio.AbstractEventLoop): The loop the limiter is used on.
+    """
+
+    def __init__(self, limit, loop):
+        self.limit = limit
+        self.semaphore = asyncio.Semaphore(limit, loop=loop)
+        self.active = 0
+        self.waiting = 0
+        self.completed = 0
+        self.failed = 0
+
+    async def acquire(self):
+        """Acquire a slot, waiting for one to become available if needed."""
+        self.waiting += 1
+        try:
+            await self.semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.active += 1
+
+    def release(self, failed=False):
+        """Release a previously acquired slot.
+
+        Args:
+            failed (bool): Whether the request made with the slot failed.
+        """
+        self.active -= 1
+        if failed:
+            self.failed += 1
+        else:
+            self.completed += 1
+        self.semaphore.release()
+
+    def to_dict(self):
+        """Get a summary of the limiter's state.
+
+        Returns:
+            dict: The limit and usage counters for the limiter.
+        """
+        return {
+            'limit': self.limit,
+            'active': self.active,
+            'waiting': self.waiting,
+            'completed': self.completed,
+            'failed': self.failed,
+        }
+
+
+class _Slot:
+    """An async context manager which holds a global and a per-plugin
+    slot for the duration of a plugin request.
+
+    Args:
+        limiters (tuple[_Limiter]): The limiters to acquire, in order.
+    """
+
+    def __init__(self, limiters):
+        self.limiters = limiters
+        self.acquired = []
+
+    async def __aenter__(self):
+        try:
+            for limiter in self.limiters:
+                await limiter.acquire()
+                self.acquired.append(limiter)
+        except BaseException:
+            self._release(failed=True)
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._release(failed=exc_type is not None)
+
+    def _release(self, failed):
+        while self.acquired:
+            self.acquired.pop().release(failed)
+
+
+class PluginExecutor:
+    """The PluginExecutor bounds the concurrency of requests issued
+    to plugins and runs blocking gRPC work in a managed thread pool.
+
+    The executor is configured lazily from the `grpc.executor` config
+    on first use. Its limits are bound to the event loop which is running
+    at that time.
+    """
+
+    def __init__(self):
+        self.loop = None
+        self.pool = None
+        self.workers = None
+        self.plugin_limit = None
+        self.overrides = {}
+
+        self._global = None
+        self._plugins = {}
+
+    def _setup(self):
+        """Set up (or re-set up) the executor if it is not yet bound to
+        the running event loop.
+        """
+        loop = asyncio.get_event_loop()
+        if loop is self.loop:
+            return
+
+        workers = config.options.get('grpc.executor.workers', 32)
+        if self.pool is None or workers != self.workers:
+            if self.pool is not None:
+                self.pool.shutdown(wait=False)
+            self.pool = ThreadPoolExecutor(max_workers=workers)
+
+        self.loop = loop
+        self.workers = workers
+        self.plugin_limit = config.options.get('grpc.executor.plugin_limit', 8)
+        self.overrides = config.options.get('grpc.executor.plugins') or {}
+
+        self._global = _Limiter(workers, loop)
+        self._plugins = {}
+
+        logger.debug(
+            _('Plugin executor configured (workers: {}, per-plugin limit: {}, overrides: {})')
+            .format(self.workers, self.plugin_limit, self.overrides)
+        )
+
+    def _limiter(self, address):
+        """Get the limiter for the plugin at the given address, creating
+        it if it does not yet exist.
+
+        Args:
+            address (str): The address of the plugin.
+
+        Returns:
+            _Limiter: The limiter for the plugin.
+        """
+        limiter = self._plugins.get(address)
+        if limiter is None:
+            limit = int(self.overrides.get(address, self.plugin_limit))
+            limiter = self._plugins[address] = _Limiter(limit, self.loop)
+        return limiter
+
+    def slot(self, address):
+        """Get a slot for issuing a request to the plugin at the given address.
+
+        The slot should be used as an async context manager; it is held for
+        the duration of the `async with` block, e.g.
+
+            async with executor.slot(address):
+                ...
+
+        Args:
+            address (str): The address of the plugin.
+
+        Returns:
+            _Slot: The async context manager which holds the slot.
+        """
+        self._setup()
+        return _Slot((self._global, self._limiter(address)))
+
+    def limit(self, address):
+        """Get the number of requests which may be in flight to the plugin
+        at the given address at once.
+
+        Args:
+            address (str): The address of the plugin.
+
+        Returns:
+            int: The plugin's concurrency limit.
+        """
+        self._setup()
+        return self._limiter(address).limit
+
+    async def submit(self, fn, *args, **kwargs):
+        """Run a blocking function in the executor's thread pool.
+
+        This does not acquire a slot; it should be called from within
+        one (see `slot`).
+
+        Args:
+            fn: The blocking function to run.
+            *args: Positional arguments for the function.
+            **kwargs: Keyword arguments for the function.
+
+        Returns:
+            The return value of the function.
+        """
+        self._setup()
+        return await self.loop.run_in_executor(self.pool, functools.partial(fn, *args, **kwargs))
+
+    def stats(self):
+        """Get a summary of the executor's configuration and usage.
+
+        Returns:
+            dict: The executor state.
+        """
+        self._setup()
+        return {
+            'workers': self.workers,
+            'plugin_limit': self.plugin_limit,
+            'global': self._global.to_dict(),
+            'plugins': {k: v.to_dict() for k, v in self._plugins.items()},
+        }
+
+
+# The executor used for all plugin requests.
+executor = PluginExecutor()
@@ -1,5 +1,7 @@
 """Utilities around the Synse Server gRPC API."""
 
+import hashlib
+
 from synse_grpc import api
 
 
@@ -83,3 +85,33 @@ def output_to_dict(output):
             'symbol': output.unit.symbol,
         },
     }
+
+
+def devices_fingerprint(devices):
+    """Get a fingerprint for a set of Devices, e.g. from a plugin's
+    Devices response.
+
+    The fingerprint does not depend on the order of the devices, nor on
+    their timestamps (which plugins set to the time of the request), so it
+    only changes when the devices themselves change.
+
+    Args:
+        devices (list[Device]): The Devices to fingerprint.
+
+    Returns:
+        str: The fingerprint of the devices.
+    """
+    encoded = []
+    for device in devices:
+        timestamp = device.timestamp
+        device.ClearField('timestamp')
+        try:
+            encoded.append(device.SerializeToString(deterministic=True))
+        finally:
+            device.timestamp = timestamp
+
+    digest = hashlib.sha1()
+    for data in sorted(encoded):
+        digest.update(len(data).to_bytes(4, 'big'))
+        digest.update(data)
+    return digest.hexdigest()
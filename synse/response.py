@@ -1,7 +1,11 @@
 """Utilities and helpers for application endpoint responses."""
 
+import hashlib
+
 import ujson
+from sanic.response import HTTPResponse
 from sanic.response import json as sjson
+from sanic.response import json_dumps
 
 from synse import config
 
@@ -47,3 +51,76 @@ def json(body, **kwargs):
     if config.options.get('pretty_json'):
         return sjson(body, indent=2, dumps=_dumps, **kwargs)
     return sjson(body, **kwargs)
+
+
+def encode(body):
+    """Encode data as the body of a JSON response.
+
+    The encoding is the same as the body of a response created with `json`.
+
+    Args:
+        body (dict): The data to encode.
+
+    Returns:
+        bytes: The encoded JSON.
+    """
+    if config.options.get('pretty_json'):
+        return _dumps(body, indent=2).encode('utf-8')
+    return json_dumps(body).encode('utf-8')
+
+
+def etag(body):
+    """Create an entity tag for an encoded response body.
+
+    Args:
+        body (bytes): The encoded response body.
+
+    Returns:
+        str: The (strong) entity tag for the body.
+    """
+    return '"{}"'.format(hashlib.sha1(body).hexdigest())
+
+
+def _etag_matches(if_none_match, tag):
+    """Check whether the value of an If-None-Match header matches an entity tag.
+
+    Args:
+        if_none_match (str): The value of the If-None-Match header, if any.
+        tag (str): The entity tag of the current response.
+
+    Returns:
+        bool: True if the header matches the tag; False otherwise.
+    """
+    if not if_none_match:
+        return False
+
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        # If-None-Match uses weak comparison, so the weakness
+        # indicator is ignored.
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate in ('*', tag):
+            return True
+    return False
+
+
+def json_encoded(body, tag, request=None):
+    """Create a JSON `HTTPResponse` for an endpoint from an already encoded
+    body, tagged with its ETag.
+
+    If the request has an If-None-Match header matching the tag, the
+    response is a 304 (Not Modified) without a body instead.
+
+    Args:
+        body (bytes): The encoded JSON body (see `encode`).
+        tag (str): The entity tag for the body (see `etag`).
+        request (sanic.request.Request): The incoming request.
+
+    Returns:
+        sanic.HTTPResponse: The Sanic endpoint response.
+    """
+    headers = {'ETag': tag}
+    if request is not None and _etag_matches(request.headers.get('If-None-Match'), tag):
+        return HTTPResponse(status=304, headers=headers)
+    return HTTPResponse(body_bytes=body, headers=headers, content_type='application/json')
@@ -4,7 +4,7 @@
 from sanic import Blueprint
 from sanic.response import stream
 
-from synse import commands, errors, validate
+from synse import commands, deadline, errors, validate
 from synse.i18n import _
 from synse.log import logger
 from synse.response import json
@@ -53,14 +53,20 @@ async def scan_route(request, rack=None, board=None):
     logger.debug(_('Forcing re-scan? {}').format(force))
 
     response = await commands.scan(rack=rack, board=board, force=force)
-    return response.to_json()
+    return response.to_json(request)
 
 
 @bp.route('/read/<rack>/<board>/<device>')
-@validate.no_query_params()
 async def read_route(request, rack, board, device):
     """Read data from a known device.
 
+    Supported Query Parameters:
+        max_age: The maximum age, in seconds, of readings which may be
+            served from the readings cache. If 0, the device is always
+            read. If not given, the configured `cache.readings.ttl` is used.
+        timeout: The number of seconds to wait for the reading. This can
+            also be set with the X-Synse-Timeout header.
+
     Args:
         request (sanic.request.Request): The incoming request.
         rack (str): The identifier of the rack which the device resides on.
@@ -70,7 +76,76 @@ async def read_route(request, rack, board, device):
     Returns:
         sanic.response.HTTPResponse: The endpoint response.
     """
-    response = await commands.read(rack, board, device)
+    qparams = validate.validate_query_params(
+        request.raw_args, 'max_age', deadline.QUERY_PARAM
+    )
+
+    response = await commands.read(
+        rack, board, device,
+        deadline=deadline.from_request(request, 'read'),
+        max_age=validate.validate_max_age(qparams.get('max_age')),
+    )
+    return response.to_json()
+
+
+@bp.route('/read', methods=['GET', 'POST'])
+async def bulk_read_route(request):
+    """Read data from many known devices in a single request.
+
+    The devices to read can be selected by any of the 'rack', 'board',
+    'type', 'kind', 'model', and 'info' selectors, given as query parameters
+    for a GET or as fields of the JSON POSTed. A board can only be selected
+    along with its rack, and 'info' is a pattern which may contain shell-style
+    wildcards. Alternatively, the JSON POSTed can list the devices to read
+    in a 'devices' field, where each device is an object with 'rack',
+    'board', and 'device' fields.
+
+    Supported Query Parameters:
+        max_age: The maximum age, in seconds, of readings which may be
+            served from the readings cache. If 0, the devices are always
+            read. If not given, the configured `cache.readings.ttl` is used.
+        timeout: The number of seconds to wait for the readings. This can
+            also be set with the X-Synse-Timeout header.
+
+    Args:
+        request (sanic.request.Request): The incoming request.
+
+    Returns:
+        sanic.response.HTTPResponse: The endpoint response.
+    """
+    if request.method == 'GET':
+        qparams = validate.validate_query_params(
+            request.raw_args, 'max_age', deadline.QUERY_PARAM, *validate.BULK_READ_SELECTORS
+        )
+        data = {k: v for k, v in qparams.items() if k in validate.BULK_READ_SELECTORS}
+
+    else:
+        qparams = validate.validate_query_params(
+            request.raw_args, 'max_age', deadline.QUERY_PARAM
+        )
+
+        try:
+            data = request.json
+        except Exception as e:
+            raise errors.InvalidJsonError(
+                _('Invalid JSON specified: {}').format(request.body)
+            ) from e
+
+    logger.debug(_('Bulk read route: selection: {}').format(data))
+
+    devices, selectors = validate.validate_bulk_read(data)
+
+    response = await commands.bulk_read(
+        devices=devices,
+        rack=selectors.get('rack'),
+        board=selectors.get('board'),
+        device_type=selectors.get('type'),
+        kind=selectors.get('kind'),
+        model=selectors.get('model'),
+        info=selectors.get('info'),
+        deadline=deadline.from_request(request, 'bulk_read'),
+        max_age=validate.validate_max_age(qparams.get('max_age')),
+    )
     return response.to_json()
 
 
@@ -85,26 +160,34 @@ async def read_cached_route(request):
         end: An RFC3339 or RFC3339Nano formatted timestamp which specifies an
             ending bound on the cache data to return. If no timestamp is
             specified, there will not be an ending bound.
+        timeout: The number of seconds to wait for the cached readings. This
+            can also be set with the X-Synse-Timeout header.
     """
-    qparams = validate.validate_query_params(request.raw_args, 'start', 'end')
+    qparams = validate.validate_query_params(
+        request.raw_args, 'start', 'end', deadline.QUERY_PARAM
+    )
     start, end = qparams.get('start'), qparams.get('end')
+    request_deadline = deadline.from_request(request, 'readcached')
 
     # define the streaming function
     async def response_streamer(response):
-        async for reading in commands.read_cached(start, end):  # pylint: disable=not-an-iterable
+        async for reading in commands.read_cached(start, end, request_deadline):  # pylint: disable=not-an-iterable
             await response.write(reading.dump())
 
     return stream(response_streamer, content_type='application/json')
 
 
 @bp.route('/write/<rack>/<board>/<device>', methods=['POST'])
-@validate.no_query_params()
 async def write_route(request, rack, board, device):
     """Write data to a known device.
 
     The data POSTed here should be JSON with an 'action' field  and 'raw'
     field, if applicable. If no data is posted, the write will fail.
 
+    Supported Query Parameters:
+        timeout: The number of seconds to wait for the write to be issued.
+            This can also be set with the X-Synse-Timeout header.
+
     Args:
         request (sanic.request.Request): The incoming request.
         rack (str): The identifier of the rack which the device resides on.
@@ -114,6 +197,8 @@ async def write_route(request, rack, board, device):
     Returns:
         sanic.response.HTTPResponse: The endpoint response.
     """
+    validate.validate_query_params(request.raw_args, deadline.QUERY_PARAM)
+
     try:
         data = request.json
     except Exception as e:
@@ -130,16 +215,22 @@ async def write_route(request, rack, board, device):
             _('Invalid data POSTed for write. Must contain "action" and/or "raw"')
         )
 
-    response = await commands.write(rack, board, device, data)
+    response = await commands.write(
+        rack, board, device, data,
+        deadline=deadline.from_request(request, 'write'),
+    )
     return response.to_json()
 
 
 @bp.route('/transaction')
 @bp.route('/transaction/<transaction_id>')
-@validate.no_query_params()
 async def transaction_route(request, transaction_id=None):
     """Check the status of a write transaction.
 
+    Supported Query Parameters:
+        timeout: The number of seconds to wait for the transaction status.
+            This can also be set with the X-Synse-Timeout header.
+
     Args:
         request (sanic.request.Request): The incoming request.
         transaction_id (str): The ID of the transaction to check.
@@ -147,7 +238,12 @@ async def transaction_route(request, transaction_id=None):
     Returns:
         sanic.response.HTTPResponse: The endpoint response.
     """
-    response = await commands.check_transaction(transaction_id)
+    validate.validate_query_params(request.raw_args, deadline.QUERY_PARAM)
+
+    response = await commands.check_transaction(
+        transaction_id,
+        deadline=deadline.from_request(request, 'transaction'),
+    )
     return response.to_json()
 
 
@@ -168,7 +264,7 @@ async def info_route(request, rack, board=None, device=None):
         sanic.response.HTTPResponse: The endpoint response.
     """
     response = await commands.info(rack, board, device)
-    return response.to_json()
+    return response.to_json(request)
 
 
 @bp.route('/config')
@@ -198,6 +294,38 @@ async def plugins_route(request):
         sanic.response.HTTPResponse: The endpoint response.
     """
     response = await commands.get_plugins()
+    return response.to_json(request)
+
+
+@bp.route('/plugins/<plugin_id:path>/health')
+@validate.no_query_params()
+async def plugin_health_route(request, plugin_id):
+    """Get the health of a plugin, as of the health monitor's last probe.
+
+    Args:
+        request (sanic.request.Request): The incoming request.
+        plugin_id (str): The id of the plugin to get the health of.
+
+    Returns:
+        sanic.response.HTTPResponse: The endpoint response.
+    """
+    response = await commands.get_plugin_health(plugin_id)
+    return response.to_json()
+
+
+@bp.route('/executor')
+@validate.no_query_params()
+async def executor_route(request):
+    """Get the limits and current usage of the executor which bounds
+    concurrent requests to plugins.
+
+    Args:
+        request (sanic.request.Request): The incoming request.
+
+    Returns:
+        sanic.response.HTTPResponse: The endpoint response.
+    """
+    response = await commands.get_executor()
     return response.to_json()
 
 
@@ -213,7 +341,7 @@ async def capabilities_route(request):
         sanic.response.HTTPResponse: The endpoint response.
     """
     response = await commands.capabilities()
-    return response.to_json()
+    return response.to_json(request)
 
 
 # FIXME (etd) -- this is a temporary route that is being used for auto-fan for demo/
@@ -5,6 +5,7 @@ response schemes.
 """
 # pylint: disable=unused-import
 
+from .bulk_read import BulkReadResponse
 from .config import ConfigResponse
 from .info import InfoResponse
 from .read import ReadResponse
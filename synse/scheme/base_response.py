@@ -1,6 +1,6 @@
 """Base response model for all Synse Server response schemes."""
 
-from synse.response import json
+from synse.response import encode, etag, json, json_encoded
 
 
 class SynseResponse:
@@ -10,15 +10,35 @@ class SynseResponse:
     It defines a `data` member which holds the response data that will
     be returned. Additionally, it provides a `to_json` method which
     converts the data to a JSON response.
+
+    Responses which are `conditional` are tagged with an ETag, and answer
+    requests with a matching If-None-Match header with a 304. If the
+    response data has already been encoded (e.g. it is cached), the encoded
+    body and its ETag can be given as `encoded` to skip re-encoding it.
     """
 
     data = {}
+    conditional = False
+    encoded = None
 
-    def to_json(self):
+    def to_json(self, request=None):
         """Convert the response scheme data to JSON.
 
+        Args:
+            request (sanic.request.Request): The incoming request. This is
+                used to check the If-None-Match header of conditional
+                responses.
+
         Returns:
             sanic.HTTPResponse: The Sanic endpoint response with the given
                 body encoded as JSON.
         """
-        return json(self.data)
+        if not self.conditional:
+            return json(self.data)
+
+        if self.encoded is not None:
+            body, tag = self.encoded
+        else:
+            body = encode(self.data)
+            tag = etag(body)
+        return json_encoded(body, tag, request)
@@ -0,0 +1,131 @@
+"""Response scheme for the bulk `read` endpoint."""
+
+from synse import errors
+from synse.planner import HEADER
+from synse.scheme.base_response import SynseResponse
+from synse.scheme.read import ReadResponse
+
+
+class BulkReadResponse(SynseResponse):
+    """A BulkReadResponse is the response data for a Synse bulk 'read' command.
+
+    Each device that was read has the same fields as a `ReadResponse`,
+    along with its routing info. Each device that could not be read has
+    the error for it instead. The plan each plugin's devices were read with
+    is given in the X-Synse-Read-Plan header of the response.
+
+    Response Example:
+        {
+          "devices": [
+            {
+              "location": {
+                "rack": "rack-1",
+                "board": "vec",
+                "device": "12ea5644d052c6bf1bca3c9864fd8a44"
+              },
+              "kind": "temperature",
+              "data": [
+                {
+                  "info": "",
+                  "type": "temperature",
+                  "value": 123,
+                  "unit": {
+                    "symbol": "C",
+                    "name": "degrees celsius"
+                  },
+                  "timestamp": "2017-11-10 09:08:07"
+                }
+              ],
+              "age": 0.0
+            },
+            {
+              "location": {
+                "rack": "rack-1",
+                "board": "vec",
+                "device": "34c226b1afadaae5f172a4e1763fd1a6"
+              },
+              "error": {
+                "http_code": 500,
+                "error_id": 5001,
+                "description": "failed read command",
+                "context": "Read of rack-1/vec/34c226b1afadaae5f172a4e1763fd1a6 ..."
+              }
+            }
+          ],
+          "read": 1,
+          "failed": 1
+        }
+
+    Args:
+        results (list[tuple]): The (rack, board, device, result) of each
+            device, where the result is either the (Device, readings, age)
+            of the device, or the error raised when reading it.
+        plans (list[ReadPlan]): The plan each plugin's devices were read
+            with. (default: None)
+    """
+
+    def __init__(self, results, plans=None):
+        self.results = results
+        self.plans = plans or []
+
+        devices = [
+            self._format(rack, board, device, result)
+            for rack, board, device, result in results
+        ]
+        failed = len([d for d in devices if 'error' in d])
+
+        self.data = {
+            'devices': devices,
+            'read': len(devices) - failed,
+            'failed': failed,
+        }
+
+    def to_json(self, request=None):
+        """Convert the response scheme data to JSON, with the read plans
+        in the response headers.
+
+        Args:
+            request (sanic.request.Request): The incoming request.
+
+        Returns:
+            sanic.HTTPResponse: The Sanic endpoint response with the given
+                body encoded as JSON.
+        """
+        response = super(BulkReadResponse, self).to_json(request)
+        if self.plans:
+            response.headers[HEADER] = ', '.join(str(plan) for plan in self.plans)
+        return response
+
+    @staticmethod
+    def _format(rack, board, device, result):
+        """Format the result for a single device.
+
+        Args:
+            rack (str): The rack which the device resides on.
+            board (str): The board which the device resides on.
+            device (str): The id of the device.
+            result: The (Device, readings, age) of the device, or the error
+                raised when reading it.
+
+        Returns:
+            dict: The formatted result for the device.
+        """
+        data = {
+            'location': {
+                'rack': rack,
+                'board': board,
+                'device': device,
+            },
+        }
+
+        if isinstance(result, errors.SynseError):
+            data['error'] = {
+                'http_code': getattr(result, 'status_code', 500),
+                'error_id': result.error_id,
+                'description': errors.codes[result.error_id],
+                'context': str(result),
+            }
+        else:
+            dev, readings, age = result
+            data.update(ReadResponse(dev, readings, age).data)
+        return data
@@ -24,7 +24,12 @@ class CapabilitiesResponse(SynseResponse):
     Args:
         data (list): List of dictionaries containing the device kinds and the outputs
             that each kind supports for every registered plugin.
+        encoded (tuple(bytes, str)): The cached encoding of the data and
+            its ETag, if any.
     """
 
-    def __init__(self, data):
+    conditional = True
+
+    def __init__(self, data, encoded=None):
         self.data = data
+        self.encoded = encoded
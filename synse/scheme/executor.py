@@ -0,0 +1,39 @@
+"""Response scheme for the `executor` endpoint."""
+
+from synse.scheme.base_response import SynseResponse
+
+
+class ExecutorResponse(SynseResponse):
+    """An ExecutorResponse is the response data for the Synse 'executor' command.
+
+    It describes the configured limits of the plugin executor and how much
+    of each limit is currently in use.
+
+    Response Example:
+        {
+          "workers": 32,
+          "plugin_limit": 8,
+          "global": {
+            "limit": 32,
+            "active": 2,
+            "waiting": 0,
+            "completed": 1024,
+            "failed": 3
+          },
+          "plugins": {
+            "emulator-plugin:5001": {
+              "limit": 8,
+              "active": 2,
+              "waiting": 0,
+              "completed": 1024,
+              "failed": 3
+            }
+          }
+        }
+
+    Args:
+        data (dict): The state of the plugin executor.
+    """
+
+    def __init__(self, data):
+        self.data = data
@@ -67,7 +67,26 @@ class InfoResponse(SynseResponse):
             }
           ]
         }
+
+    If any plugins failed or timed out while the device info was being
+    collected, an "errors" section listing them is included (see the
+    ScanResponse).
+
+    Args:
+        data (dict): The info data, retrieved from the info cache.
+        errors (list[dict]): The errors for plugins which failed to
+            provide device info.
+        encoded (tuple(bytes, str)): The cached encoding of the data and
+            its ETag, if any. This is not used if there are errors.
     """
 
-    def __init__(self, data):
+    conditional = True
+
+    def __init__(self, data, errors=None, encoded=None):
         self.data = data
+        self.encoded = encoded
+        if errors:
+            self.encoded = None
+            # Copy the data so the errors are not added to the cached info data.
+            self.data = dict(data)
+            self.data['errors'] = errors
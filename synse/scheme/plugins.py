@@ -13,6 +13,16 @@ class PluginsResponse(SynseResponse):
               "protocol":"tcp",
               "address":"emulator-plugin:5001"
             },
+            "connectivity":{
+              "state":"ready",
+              "state_changes":2,
+              "channels":1
+            },
+            "circuit":{
+              "state":"closed",
+              "consecutive_failures":0,
+              "trips":0
+            },
             "name":"emulator plugin",
             "maintainer":"vaporio",
             "tag":"vaporio\/emulator-plugin",
@@ -45,7 +55,11 @@ class PluginsResponse(SynseResponse):
                   "timestamp":"",
                   "type":"periodic"
                 }
-              ]
+              ],
+              "last_checked":"2018-06-14T16:45:50.245596Z",
+              "last_ok":"2018-06-14T16:45:50.245596Z",
+              "latency_ms":1.274,
+              "consecutive_failures":0
             }
           }
         ]
@@ -57,3 +71,36 @@ class PluginsResponse(SynseResponse):
 
     def __init__(self, data):
         self.data = data
+
+
+class PluginHealthResponse(SynseResponse):
+    """A PluginHealthResponse is the response data for the Synse 'plugin health'
+    command.
+
+    Response Example:
+        {
+          "plugin": "vaporio\/emulator-plugin+tcp@emulator-plugin:5001",
+          "timestamp": "2018-06-14T16:45:50.245596Z",
+          "status": "ok",
+          "message": "",
+          "checks": [
+            {
+              "name": "read buffer health",
+              "status": "ok",
+              "message": "",
+              "timestamp": "",
+              "type": "periodic"
+            }
+          ],
+          "last_checked": "2018-06-14T16:45:50.245596Z",
+          "last_ok": "2018-06-14T16:45:50.245596Z",
+          "latency_ms": 1.274,
+          "consecutive_failures": 0
+        }
+
+    Args:
+        data (dict): The health of the plugin, as of its last probe.
+    """
+
+    def __init__(self, data):
+        self.data = data
@@ -32,16 +32,20 @@ class ReadResponse(SynseResponse):
               },
               "timestamp": "2017-11-10 09:08:07"
             }
-          ]
+          ],
+          "age": 0.0
         }
 
     Args:
         device (Device): The device that is being read.
         readings (list[Reading]): A list of reading values returned
             from the plugin.
+        age (float): The age of the readings, in seconds. Readings
+            served from the readings cache may be up to a few seconds
+            old. (default: None)
     """
 
-    def __init__(self, device, readings):
+    def __init__(self, device, readings, age=None):
         self.device = device
         self.readings = readings
 
@@ -49,6 +53,8 @@ class ReadResponse(SynseResponse):
             'kind': device.kind,
             'data': self.format_readings()
         }
+        if age is not None:
+            self.data['age'] = round(age, 3)
 
     def format_readings(self):
         """Format the instance's readings to the read response scheme.
@@ -56,9 +56,33 @@ class ScanResponse(SynseResponse):
           ]
         }
 
+    If any plugins failed or timed out while the device info was being
+    collected, an "errors" section listing them is included alongside the
+    scan data from the plugins that did respond, e.g.
+
+        "errors": [
+          {
+            "plugin": "vaporio/emulator-plugin+tcp@localhost:5001",
+            "error": "timeout",
+            "message": "plugin did not respond within its deadline"
+          }
+        ]
+
     Args:
         data (dict): The scan data, retrieved from the scan cache.
+        errors (list[dict]): The errors for plugins which failed to
+            provide device info.
+        encoded (tuple(bytes, str)): The cached encoding of the data and
+            its ETag, if any. This is not used if there are errors.
     """
 
-    def __init__(self, data):
+    conditional = True
+
+    def __init__(self, data, errors=None, encoded=None):
         self.data = data
+        self.encoded = encoded
+        if errors:
+            self.encoded = None
+            # Copy the data so the errors are not added to the cached scan data.
+            self.data = dict(data or {})
+            self.data['errors'] = errors
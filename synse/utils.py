@@ -1,21 +1,65 @@
 """Synse Server utility and convenience methods."""
 
 import datetime
+import re
 
+# An RFC3339 timestamp, with optional fractional seconds of any precision.
+_RFC3339 = re.compile(
+    r'^(\d{4}-\d{2}-\d{2})[Tt ](\d{2}:\d{2}:\d{2})(?:\.(\d+))?'
+    r'(?:([Zz])|([+-])(\d{2}):(\d{2}))$'
+)
 
-def rfc3339now():
+
+def rfc3339now(offset=0):
     """Create an RFC3339 formatted timestamp for the current UTC time.
 
     See Also:
         https://stackoverflow.com/a/8556555
 
+    Args:
+        offset (float): The number of seconds to offset the timestamp from
+            the current time by. (default: 0)
+
     Returns:
         str: The RFC3339 formatted timestamp.
     """
     now = datetime.datetime.utcnow()
+    if offset:
+        now += datetime.timedelta(seconds=offset)
     return now.isoformat('T') + 'Z'
 
 
+def rfc3339age(timestamp):
+    """Get the age of an RFC3339 formatted timestamp.
+
+    Args:
+        timestamp (str): The RFC3339 formatted timestamp.
+
+    Returns:
+        float: The number of seconds since the time of the timestamp. This
+            is 0 if the timestamp is in the future.
+        None: The timestamp could not be parsed.
+    """
+    match = _RFC3339.match(timestamp or '')
+    if match is None:
+        return None
+
+    date, time, fraction, utc, sign, hours, minutes = match.groups()
+    try:
+        then = datetime.datetime.strptime(date + 'T' + time, '%Y-%m-%dT%H:%M:%S')
+    except ValueError:
+        return None
+
+    if fraction:
+        then += datetime.timedelta(microseconds=int(fraction[:6].ljust(6, '0')))
+    if not utc:
+        offset = datetime.timedelta(hours=int(hours), minutes=int(minutes))
+        then -= offset if sign == '+' else -offset
+
+    age = (datetime.datetime.utcnow() - then).total_seconds()
+    return max(age, 0.0)
+
+
 def composite(rack, board, device):
     """Create a composite string out of a rack, board, and device.
 
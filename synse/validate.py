@@ -1,10 +1,14 @@
 """Synse Server utility and convenience methods."""
 
+import math
 from functools import wraps
 
 from synse import cache, errors
 from synse.i18n import _
 
+# The fields which select the devices to read for a bulk read.
+BULK_READ_SELECTORS = ('rack', 'board', 'type', 'kind', 'model', 'info')
+
 
 async def validate_device_type(device_type, rack, board, device):
     """Validate that the device associated with the given routing info
@@ -24,10 +28,9 @@ async def validate_device_type(device_type, rack, board, device):
         errors.InvalidDeviceType: The device does not match the given type.
         errors.DeviceNotFoundError: The specified device is not found.
     """
-    __, device = await cache.get_device_info(rack, board, device)  # pylint: disable=unused-variable
-
-    # The type of a device should be the last element in it's kind namespace.
-    _type = device.kind.split('.')[-1].lower()
+    # The type of a device is the last element in its kind namespace; the
+    # cache indexes it (lower-cased) when the device info is built.
+    _type = await cache.get_device_type(rack, board, device)
     if _type not in [t.lower() for t in device_type]:
         raise errors.InvalidDeviceType(
             _('Device ({}) is not a supported type {}').format(_type, device_type)
@@ -64,6 +67,110 @@ def validate_query_params(raw_args, *valid_params):
     return params
 
 
+def validate_max_age(value):
+    """Validate the `max_age` query parameter of a read request.
+
+    Args:
+        value (str): The value of the query parameter, or None if it was
+            not given.
+
+    Returns:
+        float: The maximum age, in seconds, of readings which may be served
+            from the readings cache.
+        None: No maximum age was given.
+
+    Raises:
+        errors.InvalidArgumentsError: The value is not a non-negative
+            number of seconds.
+    """
+    if value is None:
+        return None
+    try:
+        max_age = float(value)
+    except ValueError:
+        max_age = None
+    if max_age is None or not math.isfinite(max_age) or max_age < 0:
+        raise errors.InvalidArgumentsError(
+            _('max_age must be a non-negative number of seconds, but was: {}').format(value)
+        )
+    return max_age
+
+
+def validate_bulk_read(data):
+    """Validate the JSON POSTed to the bulk read endpoint.
+
+    The JSON must either list the devices to read in its 'devices' field,
+    or select the devices to read with any of the fields in
+    `BULK_READ_SELECTORS`, but not both.
+
+    Args:
+        data (dict): The POSTed JSON, or the query parameters of a GET.
+
+    Returns:
+        tuple(list, dict): The rack, board, and device id of each listed
+            device, or None if the devices are selected instead, and the
+            selectors which were given.
+
+    Raises:
+        errors.InvalidArgumentsError: The POSTed JSON is not a valid bulk
+            read request.
+    """
+    if not isinstance(data, dict):
+        raise errors.InvalidArgumentsError(
+            _('Invalid data for bulk read. Must be a JSON object')
+        )
+
+    unknown = [k for k in data if k != 'devices' and k not in BULK_READ_SELECTORS]
+    if unknown:
+        raise errors.InvalidArgumentsError(
+            _('Invalid fields for bulk read: {}').format(unknown)
+        )
+
+    selectors = {k: v for k, v in data.items() if k != 'devices' and v is not None}
+    for k, v in selectors.items():
+        if not isinstance(v, str) or not v:
+            raise errors.InvalidArgumentsError(
+                _('Bulk read "{}" must be a non-empty string, but was: {}').format(k, v)
+            )
+
+    if 'devices' not in data:
+        if not selectors:
+            raise errors.InvalidArgumentsError(
+                _('Invalid data for bulk read. Must contain "devices" or at least '
+                  'one of {}').format(BULK_READ_SELECTORS)
+            )
+        if 'board' in selectors and 'rack' not in selectors:
+            raise errors.InvalidArgumentsError(
+                _('Bulk read "board" can only be given along with "rack"')
+            )
+        return None, selectors
+
+    if selectors:
+        raise errors.InvalidArgumentsError(
+            _('Bulk read "devices" can not be given along with any of {}').format(
+                BULK_READ_SELECTORS
+            )
+        )
+
+    devices = data['devices']
+    if not isinstance(devices, list):
+        raise errors.InvalidArgumentsError(
+            _('Bulk read "devices" must be a list, but was: {}').format(devices)
+        )
+
+    targets = []
+    for device in devices:
+        if not isinstance(device, dict) or not all(
+                isinstance(device.get(k), str) and device.get(k)
+                for k in ('rack', 'board', 'device')):
+            raise errors.InvalidArgumentsError(
+                _('Bulk read devices must have a "rack", "board", and "device", '
+                  'but got: {}').format(device)
+            )
+        targets.append((device['rack'], device['board'], device['device']))
+    return targets, {}
+
+
 def no_query_params():
     """Decorator to validate that the incoming request has no query parameters.
 
@@ -23,8 +23,13 @@ def test_config_endpoint_ok(app):
     assert data['locale'] == 'en_US'
     assert data['pretty_json'] is True
     assert data['logging'] == 'info'
-    assert data['cache'] == {'meta': {'ttl': 20}, 'transaction': {'ttl': 300}}
-    assert data['grpc'] == {'timeout': 3}
+    assert data['cache'] == {'meta': {'ttl': 20, 'budget': 5, 'stale_ttl': 0, 'refresh_ahead': 0, 'last_known_good': False}, 'transaction': {'ttl': 300}, 'readings': {'ttl': 0}}
+    assert data['grpc'] == {
+        'timeout': 3,
+        'executor': {'workers': 32, 'plugin_limit': 8, 'plugins': {}},
+        'channel': {'pool_size': 1},
+        'circuit_breaker': {'threshold': 5, 'probe_interval': 10},
+    }
 
 
 def test_config_endpoint_post_not_allowed(app):
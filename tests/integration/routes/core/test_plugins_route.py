@@ -52,3 +52,18 @@ def test_plugins_endpoint_options_not_allowed(app):
     """Invalid request: OPTIONS"""
     _, response = app.test_client.options(plugins_url)
     assert response.status == 405
+
+
+def test_plugin_health_endpoint_not_found(app):
+    """Get the health of a plugin which is not registered."""
+    _, response = app.test_client.get(plugins_url + '/vaporio/test-plugin+tcp@localhost:5001/health')
+    assert response.status == 404
+
+    data = ujson.loads(response.text)
+    assert data['error_id'] == 4003
+
+
+def test_plugin_health_endpoint_post_not_allowed(app):
+    """Invalid request: POST"""
+    _, response = app.test_client.post(plugins_url + '/vaporio/test-plugin+tcp@localhost:5001/health')
+    assert response.status == 405
@@ -53,3 +53,44 @@ def test_read_endpoint_options_not_allowed(app):
     """Invalid request: OPTIONS"""
     _, response = app.test_client.options(invalid_read_url)
     assert response.status == 405
+
+
+bulk_read_url = '/synse/{}/read'.format(__api_version__)
+
+
+def test_bulk_read_endpoint_unknown_device(app):
+    """Test a bulk read of an unknown device, which gets an error for
+    the device rather than for the request.
+    """
+    _, response = app.test_client.post(bulk_read_url, json={'devices': [
+        {'rack': 'invalid-rack', 'board': 'invalid-board', 'device': 'invalid-device'}
+    ]})
+    assert response.status == 200
+
+    data = response.json
+    assert data['read'] == 0
+    assert data['failed'] == 1
+    assert data['devices'][0]['location'] == {
+        'rack': 'invalid-rack',
+        'board': 'invalid-board',
+        'device': 'invalid-device',
+    }
+    assert data['devices'][0]['error']['error_id'] == errors.DEVICE_NOT_FOUND
+
+
+def test_bulk_read_endpoint_invalid(app):
+    """Test a bulk read with invalid data POSTed."""
+    _, response = app.test_client.post(bulk_read_url, json={'board': 'vec'})
+    utils.test_error_json(response, errors.INVALID_ARGUMENTS, 400)
+
+
+def test_bulk_read_endpoint_get_invalid(app):
+    """Test a bulk read with no devices selected by query parameters."""
+    _, response = app.test_client.get(bulk_read_url)
+    utils.test_error_json(response, errors.INVALID_ARGUMENTS, 400)
+
+
+def test_bulk_read_endpoint_put_not_allowed(app):
+    """Invalid request: PUT"""
+    _, response = app.test_client.put(bulk_read_url)
+    assert response.status == 405
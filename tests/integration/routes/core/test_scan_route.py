@@ -25,6 +25,18 @@ def test_scan_endpoint_ok(app):
     assert data == {}
 
 
+def test_scan_endpoint_not_modified(app):
+    """Test getting a scan response which the client already has."""
+    _, response = app.test_client.get(scan_url)
+    assert response.status == 200
+    etag = response.headers['ETag']
+
+    _, response = app.test_client.get(scan_url, headers={'If-None-Match': etag})
+    assert response.status == 304
+    assert response.headers['ETag'] == etag
+    assert response.text == ''
+
+
 def test_scan_endpoint_post_not_allowed(app):
     """Invalid request: POST"""
     _, response = app.test_client.post(scan_url)
@@ -0,0 +1,229 @@
+"""Test the 'synse.commands.bulk_read' Synse Server module."""
+# pylint: disable=redefined-outer-name,unused-argument,line-too-long
+
+import asyncio
+import os
+import shutil
+
+import asynctest
+import grpc
+import pytest
+from synse_grpc import api
+
+import synse.cache
+from synse import config, errors, plugin, utils
+from synse.commands.bulk_read import bulk_read
+from synse.planner import DUMP, READ
+from synse.proto.client import PluginClient, PluginUnixClient
+from synse.scheme.bulk_read import BulkReadResponse
+
+PLUGIN_ID = 'vaporio/foo+unix@tmp/foo'
+
+
+def make_device(rack, board, device, kind='temperature'):
+    """Make the device information for a test device."""
+    return api.Device(
+        timestamp='october',
+        uid=device,
+        kind=kind,
+        plugin='foo',
+        location=api.Location(rack=rack, board=board),
+        output=[
+            api.Output(
+                type='temperature',
+                unit=api.Unit(name='celsius', symbol='C'),
+            )
+        ]
+    )
+
+
+DEVICES = {
+    'rack-1-vec-1': make_device('rack-1', 'vec', '1'),
+    'rack-1-vec-2': make_device('rack-1', 'vec', '2', kind='led'),
+    'rack-1-vec-3': make_device('rack-1', 'vec', '3'),
+}
+
+
+async def mockgetdeviceinfo(rack, board, device):
+    """Mock method to monkeypatch the get_device_info method."""
+    dev = DEVICES.get('-'.join([rack, board, device]))
+    if dev is None:
+        raise errors.DeviceNotFoundError('{}/{}/{} not found'.format(rack, board, device))
+    return PLUGIN_ID, dev
+
+
+async def mockread(self, rack, board, device, timeout=None):
+    """Mock method to monkeypatch the client read method."""
+    if device == '3':
+        raise grpc.RpcError('failed')
+    return [api.Reading(timestamp='october', type='temperature', int64_value=int(device))]
+
+
+@pytest.fixture()
+def setup():
+    """Fixture to setup/teardown the test data directory."""
+    if not os.path.isdir('tmp'):
+        os.makedirs('tmp')
+    open('tmp/foo', 'w').close()
+
+    yield
+
+    if os.path.isdir('tmp'):
+        shutil.rmtree('tmp')
+
+
+@pytest.fixture()
+def mock_cache(monkeypatch):
+    """Fixture to monkeypatch the device cache lookups."""
+    monkeypatch.setattr(synse.cache, 'get_device_info', asynctest.CoroutineMock(
+        synse.cache.get_device_info, side_effect=mockgetdeviceinfo
+    ))
+    monkeypatch.setattr(synse.cache, 'select_devices', asynctest.CoroutineMock(
+        synse.cache.select_devices, return_value=DEVICES
+    ))
+
+    # The plugin manages more devices than are read, so that they are read
+    # individually unless a test says otherwise.
+    monkeypatch.setattr(synse.cache, 'get_devices_by_plugin', asynctest.CoroutineMock(
+        synse.cache.get_devices_by_plugin, return_value={str(i): None for i in range(10)}
+    ))
+
+
+@pytest.fixture()
+def mock_client_read(monkeypatch):
+    """Fixture to monkeypatch the grpc client's read method."""
+    monkeypatch.setattr(PluginClient, 'read', mockread)
+
+
+@pytest.fixture()
+def make_plugin(setup):
+    """Fixture to create and register a plugin for testing."""
+    if PLUGIN_ID not in plugin.Plugin.manager.plugins:
+        plugin.Plugin(
+            metadata=api.Metadata(name='foo', tag='vaporio/foo'),
+            address='tmp/foo',
+            plugin_client=PluginUnixClient('tmp/foo')
+        )
+
+    yield
+
+    if PLUGIN_ID in plugin.Plugin.manager.plugins:
+        del plugin.Plugin.manager.plugins[PLUGIN_ID]
+
+
+def _values(resp):
+    """Get the reading value (or error id) for each device in a response."""
+    return [
+        (d['location']['device'], d['error']['error_id'] if 'error' in d else d['data'][0]['value'])
+        for d in resp.data['devices']
+    ]
+
+
+@pytest.mark.asyncio
+async def test_bulk_read_devices(mock_cache, mock_client_read, make_plugin):
+    """Read a list of devices, with per-device errors."""
+
+    resp = await bulk_read(devices=[
+        ('rack-1', 'vec', '2'),
+        ('rack-1', 'vec', '1'),
+        ('rack-1', 'vec', '3'),
+        ('rack-1', 'vec', '4'),
+    ])
+
+    assert isinstance(resp, BulkReadResponse)
+    assert _values(resp) == [
+        ('2', 2),
+        ('1', 1),
+        ('3', errors.FAILED_READ_COMMAND),
+        ('4', errors.DEVICE_NOT_FOUND),
+    ]
+    assert resp.data['read'] == 2
+    assert resp.data['failed'] == 2
+
+    assert len(resp.plans) == 1
+    assert resp.plans[0].strategy == READ
+    assert resp.plans[0].targets == 3
+
+
+@pytest.mark.asyncio
+async def test_bulk_read_devices_duplicate(mock_cache, mock_client_read, make_plugin):
+    """A device listed more than once is only read once."""
+
+    resp = await bulk_read(devices=[('rack-1', 'vec', '1'), ('rack-1', 'vec', '1')])
+    assert _values(resp) == [('1', 1)]
+
+
+@pytest.mark.asyncio
+async def test_bulk_read_devices_concurrent(mock_cache, make_plugin, monkeypatch):
+    """The devices are read concurrently."""
+    in_flight = []
+    event = asyncio.Event()
+
+    async def _read(self, rack, board, device, timeout=None):
+        in_flight.append(device)
+        if len(in_flight) == 2:
+            event.set()
+        await event.wait()
+        return [api.Reading(timestamp='october', type='temperature', int64_value=1)]
+
+    monkeypatch.setattr(PluginClient, 'read', _read)
+
+    resp = await asyncio.wait_for(
+        bulk_read(devices=[('rack-1', 'vec', '1'), ('rack-1', 'vec', '2')]), 1
+    )
+    assert resp.data['read'] == 2
+
+
+@pytest.mark.asyncio
+async def test_bulk_read_no_plugin(mock_cache, mock_client_read):
+    """Every device of a plugin which is not registered gets an error."""
+
+    resp = await bulk_read(devices=[('rack-1', 'vec', '1'), ('rack-1', 'vec', '2')])
+    assert _values(resp) == [
+        ('1', errors.PLUGIN_NOT_FOUND),
+        ('2', errors.PLUGIN_NOT_FOUND),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_bulk_read_selected(mock_cache, mock_client_read, make_plugin):
+    """Read the selected devices, ordered by device id composite."""
+
+    resp = await bulk_read(device_type='temperature', model='x')
+    assert _values(resp) == [('1', 1), ('2', 2), ('3', errors.FAILED_READ_COMMAND)]
+    synse.cache.select_devices.assert_called_once_with(
+        rack=None, board=None, device_type='temperature', kind=None, model='x', info=None
+    )
+
+
+@pytest.mark.asyncio
+async def test_bulk_read_board(mock_cache, mock_client_read, make_plugin, monkeypatch):
+    """The devices of a board are read from the plugin with a single request."""
+
+    async def _read_cached(self, start=None, end=None, timeout=None):
+        for device in ('1', '2'):
+            yield api.DeviceReading(
+                rack='rack-1', board='vec', device=device,
+                reading=api.Reading(timestamp=utils.rfc3339now(), type='temperature', int64_value=5),
+            )
+
+    monkeypatch.setattr(PluginClient, 'read_cached', _read_cached)
+    synse.cache.get_devices_by_plugin.return_value = DEVICES
+    config.options.set('read.dump_min_targets', 2)
+    config.options.set('cache.readings.ttl', 10)
+
+    resp = await bulk_read(rack='rack-1', board='vec')
+
+    # device 3 has no reading in the plugin's response, so it is read by itself
+    assert _values(resp) == [('1', 5), ('2', 5), ('3', errors.FAILED_READ_COMMAND)]
+    assert [p.strategy for p in resp.plans] == [DUMP]
+
+
+@pytest.mark.asyncio
+async def test_bulk_read_none_selected(mock_cache, mock_client_read, make_plugin):
+    """Nothing is read when no devices are selected."""
+    synse.cache.select_devices.return_value = {}
+
+    resp = await bulk_read(rack='rack-2', board='vec')
+    assert resp.data == {'devices': [], 'read': 0, 'failed': 0}
+    assert resp.plans == []
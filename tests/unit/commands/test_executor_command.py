@@ -0,0 +1,21 @@
+"""Test the 'synse.commands.executor' Synse Server module."""
+
+import pytest
+
+from synse import config
+from synse.commands import get_executor
+from synse.scheme.executor import ExecutorResponse
+
+
+@pytest.mark.asyncio
+async def test_executor_command():
+    """Get an executor response."""
+    config.options.set('grpc.executor.workers', 4)
+    config.options.set('grpc.executor.plugin_limit', 2)
+
+    c = await get_executor()
+    assert isinstance(c, ExecutorResponse)
+    assert c.data['workers'] == 4
+    assert c.data['plugin_limit'] == 2
+    assert c.data['global']['limit'] == 4
+    assert c.data['plugins'] == {}
@@ -0,0 +1,108 @@
+"""Test the 'synse.commands.fan_sensors' Synse Server module."""
+# pylint: disable=redefined-outer-name,unused-argument
+
+import importlib
+
+import asynctest
+import pytest
+from synse_grpc import api
+
+import synse.cache
+from synse import errors
+from synse.commands.fan_sensors import _translate_device_info, fan_sensors
+from synse.scheme.bulk_read import BulkReadResponse
+
+# The command module, which is shadowed by the command of the same name in
+# the `synse.commands` package.
+fan_sensors_module = importlib.import_module('synse.commands.fan_sensors')
+
+
+def make_device(device, output, model, kind=None):
+    """Make the device information for a test device."""
+    return api.Device(
+        uid=device,
+        kind=kind or output,
+        metadata=dict(model=model),
+        location=api.Location(rack='rack-1', board='vec'),
+        output=[api.Output(name=output, type=output)],
+    )
+
+
+@pytest.mark.parametrize(
+    'info,expected', [
+        ('Rack Temperature 0 Front', 'thermistor_0'),
+        ('Rack Temperature 11 Back', 'thermistor_11'),
+        ('Rack Temperature 12 Back', None),
+        ('Rack Temperature 1', None),
+        ('Rack Differential Pressure Bottom', 'differential_pressure_0'),
+        ('Rack Differential Pressure Middle', 'differential_pressure_1'),
+        ('Rack Differential Pressure Top', 'differential_pressure_2'),
+        ('Rack Differential Pressure', None),
+    ]
+)
+def test_translate_device_info(info, expected):
+    """Translate the device info of fan sensors to their field."""
+    assert _translate_device_info(info) == expected
+
+
+@pytest.mark.asyncio
+async def test_fan_sensors(monkeypatch):
+    """Read the fan sensors in a single bulk read."""
+
+    thermistor = make_device('1', 'temperature', 'MAX11610')
+    pressure = make_device('2', 'pressure', 'SDP610')
+
+    async def _select(model=None):
+        return {
+            'max11610': {'rack-1-vec-1': thermistor},
+            'sdp610': {'rack-1-vec-2': pressure},
+        }[model]
+
+    async def _scan_device(rack, board, device):
+        return {'id': device, 'info': {
+            '1': 'Rack Temperature 3 Front',
+            '2': 'Rack Differential Pressure Top',
+        }[device]}
+
+    bulk_read = asynctest.CoroutineMock(return_value=BulkReadResponse([
+        ('rack-1', 'vec', '1', (thermistor, [api.Reading(type='temperature', float64_value=20.5)], 0)),
+        ('rack-1', 'vec', '2', (pressure, [api.Reading(type='pressure', int64_value=-3)], 0)),
+        ('rack-1', 'vec', '3', errors.FailedReadCommandError('failed')),
+    ]))
+
+    monkeypatch.setattr(synse.cache, 'select_devices', _select)
+    monkeypatch.setattr(synse.cache, 'get_scan_device', _scan_device)
+    monkeypatch.setattr(fan_sensors_module, 'bulk_read', bulk_read)
+
+    result = await fan_sensors()
+
+    bulk_read.assert_called_once_with(devices=[('rack-1', 'vec', '1'), ('rack-1', 'vec', '2')])
+
+    rack = result['racks']['rack-1']
+    assert list(rack)[:2] == ['differential_pressure_2', 'thermistor_3']
+    assert rack['thermistor_3'] == 20.5
+    assert rack['differential_pressure_2'] == -3
+    assert {'start_time', 'end_time', 'read_time'} <= set(rack)
+
+
+@pytest.mark.asyncio
+async def test_fan_sensors_output_name(monkeypatch):
+    """Fan sensors are found by their output name, not their kind."""
+
+    thermistor = make_device('1', 'temperature', 'MAX11610', kind='vaporio.i2c.thermistor')
+    humidity = make_device('2', 'humidity', 'MAX11610')
+
+    async def _select(model=None):
+        return {
+            'max11610': {'rack-1-vec-1': thermistor, 'rack-1-vec-2': humidity},
+            'sdp610': {},
+        }[model]
+
+    bulk_read = asynctest.CoroutineMock(return_value=BulkReadResponse([]))
+
+    monkeypatch.setattr(synse.cache, 'select_devices', _select)
+    monkeypatch.setattr(fan_sensors_module, 'bulk_read', bulk_read)
+
+    await fan_sensors()
+
+    bulk_read.assert_called_once_with(devices=[('rack-1', 'vec', '1')])
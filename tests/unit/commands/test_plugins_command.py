@@ -7,10 +7,10 @@ import shutil
 import pytest
 from synse_grpc import api
 
-from synse import config, plugin
-from synse.commands.plugins import get_plugins
+from synse import config, errors, health, plugin
+from synse.commands.plugins import get_plugin_health, get_plugins
 from synse.proto import client
-from synse.scheme.plugins import PluginsResponse
+from synse.scheme.plugins import PluginHealthResponse, PluginsResponse
 
 
 @pytest.fixture()
@@ -38,7 +38,7 @@ def disable_register():
     # not found to be 'active' any longer, where 'active' is defined as
     # being present/absent from the expected directory. In some test setups,
     # the plugins won't be in standard places so we disable registration.
-    def passthru():
+    async def passthru():
         """Passthrough function for testing."""
 
     plugin.register_plugins = passthru
@@ -109,3 +109,42 @@ async def test_plugins_command_plugin(mock_plugin, disable_register, cleanup):
     assert p['health']['checks'] == []
     assert p['health']['status'] == 'error'
     assert 'Connect Failed' in p['health']['message']
+
+
+@pytest.mark.asyncio
+async def test_plugins_command_from_monitor(mock_plugin, disable_register, cleanup):
+    """Plugin health is served from the health monitor without probing the plugin."""
+    state = health.PluginHealthState()
+    state.succeeded(api.PluginHealth(timestamp='now', status=api.PluginHealth.OK), 0.002)
+    health.monitor.states = {mock_plugin.id(): state}
+
+    c = await get_plugins()
+    assert len(c.data) == 1
+    assert c.data[0]['health']['status'] == 'ok'
+    assert c.data[0]['health']['timestamp'] == 'now'
+    assert c.data[0]['health']['latency_ms'] == 2
+    assert c.data[0]['health']['consecutive_failures'] == 0
+    assert set(c.data[0]['connectivity']) == {'state', 'state_changes', 'channels'}
+    assert c.data[0]['circuit'] == {'state': 'closed', 'consecutive_failures': 0, 'trips': 0}
+
+
+@pytest.mark.asyncio
+async def test_plugin_health_command(mock_plugin, disable_register, cleanup):
+    """Get the health of a single plugin."""
+    state = health.PluginHealthState()
+    state.failed(ValueError('unreachable'), 0.25)
+    health.monitor.states = {mock_plugin.id(): state}
+
+    c = await get_plugin_health(mock_plugin.id())
+    assert isinstance(c, PluginHealthResponse)
+    assert c.data['plugin'] == mock_plugin.id()
+    assert c.data['status'] == 'error'
+    assert c.data['message'] == 'unreachable'
+    assert c.data['consecutive_failures'] == 1
+
+
+@pytest.mark.asyncio
+async def test_plugin_health_command_not_found(disable_register):
+    """Get the health of a plugin which is not registered."""
+    with pytest.raises(errors.PluginNotFoundError):
+        await get_plugin_health('vaporio/test-plug+tcp@localhost:9999')
@@ -83,6 +83,10 @@ def add_plugin():
         ),
     )
 
+    # The plugin stands in for one found by a registration pass; without
+    # this, waiting on the first pass would purge it from the manager.
+    plugin.reconciler.passes = 1
+
     yield
 
     plugin.Plugin.manager.remove(p.id())
@@ -124,7 +128,7 @@ async def test_read_cached_no_data(monkeypatch, add_plugin):
     """Read the plugin cache(s) when there is no data in the cache to get."""
 
     # monkeypatch the read_cached method so it yields no readings
-    def _mock(*args, **kwargs):
+    async def _mock(*args, **kwargs):
         yield
     monkeypatch.setattr(PluginClient, 'read_cached', _mock)
 
@@ -138,7 +142,7 @@ async def test_read_cached_command(monkeypatch, patch_get_device_info, add_plugi
     """Read a plugin cache for an existing plugin."""
 
     # monkeypatch the read_cached method so it yields some data
-    def _mock(*args, **kwargs):
+    async def _mock(*args, **kwargs):
         readings = [
             api.DeviceReading(
                 rack='rack',
@@ -197,9 +201,10 @@ async def test_read_cached_command_2(monkeypatch, patch_get_device_info, clear_m
             address='localhost:5002',
         ),
     )
+    plugin.reconciler.passes = 1
 
     # monkeypatch the read_cached method so it yields some data
-    def _mock(*args, **kwargs):
+    async def _mock(*args, **kwargs):
         readings = [
             api.DeviceReading(
                 rack='rack',
@@ -243,7 +248,7 @@ async def test_read_cached_command_no_device(monkeypatch, add_plugin):
     """Read a plugin cache for an existing plugin."""
 
     # monkeypatch the read_cached method so it yields some data
-    def _mock_read(*args, **kwargs):
+    async def _mock_read(*args, **kwargs):
         yield api.DeviceReading(
             rack='rack',
             board='board',
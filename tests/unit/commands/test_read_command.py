@@ -1,6 +1,7 @@
 """Test the 'synse.commands.read' Synse Server module."""
 # pylint: disable=redefined-outer-name,unused-argument,line-too-long
 
+import asyncio
 import os
 import shutil
 
@@ -10,8 +11,9 @@ import pytest
 from synse_grpc import api
 
 import synse.cache
-from synse import errors, plugin, utils
-from synse.commands.read import read
+from synse import config, errors, plugin, utils
+from synse.planner import DUMP, READ, read_planner
+from synse.commands.read import read, read_plugin_devices
 from synse.proto.client import PluginClient, PluginUnixClient
 from synse.scheme.read import ReadResponse
 
@@ -64,7 +66,7 @@ def mockgetdevicemeta(rack, board, device):
     )
 
 
-def mockread(self, rack, board, device):
+async def mockread(self, rack, board, device, timeout=None):
     """Mock method to monkeypatch the client read method."""
     return [api.Reading(
         timestamp='october',
@@ -73,12 +75,12 @@ def mockread(self, rack, board, device):
     )]
 
 
-def mockreadfail(self, rack, board, device):
+async def mockreadfail(self, rack, board, device, timeout=None):
     """Mock method to monkeypatch the client read method to fail."""
     raise grpc.RpcError()
 
 
-def patch_client_read_error(self, rack, board, device):
+async def patch_client_read_error(self, rack, board, device, timeout=None):
     """Patch the grpc client's read method to raise a gRPC error indicative of
     the "no readings found" case."""
     e = grpc.RpcError()
@@ -204,7 +206,8 @@ async def test_read_command_grpc_err_no_reading(mock_get_device_info, mock_clien
                     'symbol': 'C'
                 }
             }
-        ]
+        ],
+        'age': 0.0,
     }
 
 
@@ -228,5 +231,346 @@ async def test_read_command(mock_get_device_info, mock_client_read, make_plugin)
                     'symbol': 'C'
                 }
             }
-        ]
+        ],
+        'age': 0.0,
     }
+
+
+def make_target(device):
+    """Make a (rack, board, device) target and its device info for a test device."""
+    return ('rack-1', 'vec', device), mockgetdevicemeta('rack-1', 'vec', device)[1]
+
+
+def make_dump(*devices, age=2):
+    """Make a mock of the grpc client's read cached method which returns
+    readings, taken `age` seconds ago, for the given devices.
+    """
+    async def _read_cached(self, start=None, end=None, timeout=None):
+        for value, device in enumerate(devices):
+            yield api.DeviceReading(
+                rack='rack-1', board='vec', device=device,
+                reading=api.Reading(
+                    timestamp=utils.rfc3339now(-age) if age is not None else 'october',
+                    type='temperature',
+                    int64_value=value,
+                ),
+            )
+    return _read_cached
+
+
+@pytest.fixture()
+def mock_plugin_devices(monkeypatch):
+    """Fixture to monkeypatch the lookup of the devices of a plugin, which
+    has few enough devices that a pair of them may be dumped, and whose
+    readings may be served as old as the dump window.
+    """
+    config.options.set('read.dump_min_targets', 2)
+    config.options.set('cache.readings.ttl', 10)
+    monkeypatch.setattr(synse.cache, 'get_devices_by_plugin', asynctest.CoroutineMock(
+        synse.cache.get_devices_by_plugin, return_value={'rack-1-vec-1': None, 'rack-1-vec-2': None}
+    ))
+
+
+@pytest.mark.asyncio
+async def test_read_plugin_devices(make_plugin, mock_plugin_devices, monkeypatch):
+    """Read the devices of a plugin with a single request."""
+    read = asynctest.CoroutineMock()
+    monkeypatch.setattr(PluginClient, 'read', read)
+    monkeypatch.setattr(PluginClient, 'read_cached', make_dump('1', 'other', '2', '1'))
+
+    _plugin = plugin.get_plugin('vaporio/foo+unix@tmp/foo')
+    results, plan = await read_plugin_devices(_plugin, [make_target('1'), make_target('2')])
+
+    assert sorted(results) == [('rack-1', 'vec', '1'), ('rack-1', 'vec', '2')]
+    dev, readings, age = results[('rack-1', 'vec', '1')]
+    assert dev.kind == 'thermistor'
+    assert [r.int64_value for r in readings] == [3]
+    assert age == pytest.approx(2, abs=0.5)
+    assert [r.int64_value for r in results[('rack-1', 'vec', '2')][1]] == [2]
+    assert read.call_count == 0
+    assert plan.strategy == DUMP
+    assert plan.targets == 2
+    assert plan.devices == 2
+
+    # the latency of the request is recorded for planning
+    assert DUMP in read_planner.latencies['vaporio/foo+unix@tmp/foo']
+
+    # the readings are cached with their age
+    cached, age = synse.cache.peek_readings('rack-1', 'vec', '2', max_age=10)
+    assert cached == results[('rack-1', 'vec', '2')][1]
+    assert age == pytest.approx(2, abs=0.5)
+    assert synse.cache.peek_readings('rack-1', 'vec', '2', max_age=1) is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('max_age', [0, 5])
+async def test_read_plugin_devices_max_age(make_plugin, mock_plugin_devices, monkeypatch, max_age):
+    """Readings are not dumped when they may be older than the maximum age."""
+    read_cached = asynctest.MagicMock()
+    monkeypatch.setattr(PluginClient, 'read', mockread)
+    monkeypatch.setattr(PluginClient, 'read_cached', read_cached)
+
+    _plugin = plugin.get_plugin('vaporio/foo+unix@tmp/foo')
+    results, _ = await read_plugin_devices(
+        _plugin, [make_target('1'), make_target('2')], max_age=max_age
+    )
+
+    assert all(r[1][0].int64_value == 10 for r in results.values())
+    assert read_cached.call_count == 0
+
+
+@pytest.mark.asyncio
+async def test_read_plugin_devices_default_ttl(make_plugin, mock_plugin_devices, monkeypatch):
+    """Without a maximum age, the default readings cache TTL of 0 reads the
+    devices live rather than dumping readings which may be seconds old."""
+    config.options.set('cache.readings.ttl', 0)
+    read_cached = asynctest.MagicMock()
+    monkeypatch.setattr(PluginClient, 'read', mockread)
+    monkeypatch.setattr(PluginClient, 'read_cached', read_cached)
+
+    _plugin = plugin.get_plugin('vaporio/foo+unix@tmp/foo')
+    results, plan = await read_plugin_devices(_plugin, [make_target('1'), make_target('2')])
+
+    assert all(r[1][0].int64_value == 10 for r in results.values())
+    assert all(r[2] == 0.0 for r in results.values())
+    assert read_cached.call_count == 0
+    assert plan.strategy == READ
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('max_age,age', [(10, 20), (None, 8)])
+async def test_read_plugin_devices_stale_ttl(make_plugin, mock_plugin_devices, monkeypatch, max_age, age):
+    """Dumped readings older than the maximum age, or the readings cache TTL
+    when none is given, are not served."""
+    config.options.set('read.dump_window', 5)
+    config.options.set('cache.readings.ttl', 5)
+    monkeypatch.setattr(PluginClient, 'read', mockread)
+    monkeypatch.setattr(PluginClient, 'read_cached', make_dump('1', '2', age=age))
+
+    _plugin = plugin.get_plugin('vaporio/foo+unix@tmp/foo')
+    results, plan = await read_plugin_devices(
+        _plugin, [make_target('1'), make_target('2')], max_age=max_age
+    )
+
+    assert plan.strategy == DUMP
+    assert all(r[1][0].int64_value == 10 for r in results.values())
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('age', [20, None])
+async def test_read_plugin_devices_stale(make_plugin, mock_plugin_devices, monkeypatch, age):
+    """Dumped readings which are too old, or of unknown age, are not served."""
+    monkeypatch.setattr(PluginClient, 'read', mockread)
+    monkeypatch.setattr(PluginClient, 'read_cached', make_dump('1', '2', age=age))
+
+    _plugin = plugin.get_plugin('vaporio/foo+unix@tmp/foo')
+    results, _ = await read_plugin_devices(
+        _plugin, [make_target('1'), make_target('2')], max_age=10
+    )
+
+    assert all(r[1][0].int64_value == 10 for r in results.values())
+    assert all(r[2] == 0.0 for r in results.values())
+
+
+@pytest.mark.asyncio
+async def test_read_plugin_devices_missing(make_plugin, mock_plugin_devices, monkeypatch):
+    """Devices without readings from the plugin are read individually."""
+    monkeypatch.setattr(PluginClient, 'read', mockread)
+    monkeypatch.setattr(PluginClient, 'read_cached', make_dump('1'))
+
+    _plugin = plugin.get_plugin('vaporio/foo+unix@tmp/foo')
+    results, plan = await read_plugin_devices(_plugin, [make_target('1'), make_target('2')])
+
+    assert results[('rack-1', 'vec', '1')][1][0].int64_value == 0
+    assert results[('rack-1', 'vec', '2')][1][0].int64_value == 10
+
+
+@pytest.mark.asyncio
+async def test_read_plugin_devices_cached(make_plugin, mock_plugin_devices, monkeypatch):
+    """Devices with recent readings in the readings cache are not read."""
+    read_cached = asynctest.MagicMock()
+    monkeypatch.setattr(PluginClient, 'read', mockread)
+    monkeypatch.setattr(PluginClient, 'read_cached', read_cached)
+    synse.cache.put_readings('rack-1', 'vec', '1', ['cached'])
+
+    _plugin = plugin.get_plugin('vaporio/foo+unix@tmp/foo')
+    results, plan = await read_plugin_devices(
+        _plugin, [make_target('1'), make_target('2')], max_age=10
+    )
+
+    assert results[('rack-1', 'vec', '1')][1] == ['cached']
+    assert results[('rack-1', 'vec', '2')][1][0].int64_value == 10
+    assert read_cached.call_count == 0
+    assert plan.strategy == READ
+    assert plan.cached == 1
+
+
+@pytest.mark.asyncio
+async def test_read_plugin_devices_unimplemented(make_plugin, mock_plugin_devices, monkeypatch):
+    """A plugin which does not support ReadCached has its devices read individually."""
+    async def _read_cached(self, start=None, end=None, timeout=None):
+        e = grpc.RpcError()
+        e.code = lambda: grpc.StatusCode.UNIMPLEMENTED
+        raise e
+        yield  # pylint: disable=unreachable
+
+    monkeypatch.setattr(PluginClient, 'read', mockread)
+    monkeypatch.setattr(PluginClient, 'read_cached', _read_cached)
+
+    _plugin = plugin.get_plugin('vaporio/foo+unix@tmp/foo')
+    results, plan = await read_plugin_devices(_plugin, [make_target('1'), make_target('2')])
+
+    assert len(results) == 2
+    assert all(r[1][0].int64_value == 10 for r in results.values())
+    assert _plugin.client.read_cached_supported is False
+
+
+@pytest.mark.asyncio
+async def test_read_plugin_devices_error(make_plugin, mock_plugin_devices, monkeypatch):
+    """A failed request for the plugin's readings fails every device."""
+    async def _read_cached(self, start=None, end=None, timeout=None):
+        e = grpc.RpcError()
+        e.code = lambda: grpc.StatusCode.UNAVAILABLE
+        raise e
+        yield  # pylint: disable=unreachable
+
+    read = asynctest.CoroutineMock()
+    monkeypatch.setattr(PluginClient, 'read', read)
+    monkeypatch.setattr(PluginClient, 'read_cached', _read_cached)
+
+    _plugin = plugin.get_plugin('vaporio/foo+unix@tmp/foo')
+    results, plan = await read_plugin_devices(_plugin, [make_target('1'), make_target('2')])
+
+    assert all(isinstance(r, errors.FailedReadCommandError) for r in results.values())
+    assert _plugin.client.read_cached_supported is True
+    assert read.call_count == 0
+
+
+@pytest.mark.asyncio
+async def test_read_plugin_devices_single(make_plugin, mock_plugin_devices, monkeypatch):
+    """A single device is read individually."""
+    read_cached = asynctest.MagicMock()
+    monkeypatch.setattr(PluginClient, 'read', mockread)
+    monkeypatch.setattr(PluginClient, 'read_cached', read_cached)
+
+    _plugin = plugin.get_plugin('vaporio/foo+unix@tmp/foo')
+    results, plan = await read_plugin_devices(_plugin, [make_target('1')])
+
+    assert results[('rack-1', 'vec', '1')][1][0].int64_value == 10
+    assert read_cached.call_count == 0
+
+
+@pytest.mark.asyncio
+async def test_read_plugin_devices_few(make_plugin, mock_plugin_devices, monkeypatch):
+    """A small share of a plugin's devices is read individually."""
+    read_cached = asynctest.MagicMock()
+    monkeypatch.setattr(PluginClient, 'read', mockread)
+    monkeypatch.setattr(PluginClient, 'read_cached', read_cached)
+    synse.cache.get_devices_by_plugin.return_value = {str(i): None for i in range(10)}
+
+    _plugin = plugin.get_plugin('vaporio/foo+unix@tmp/foo')
+    results, plan = await read_plugin_devices(_plugin, [make_target('1'), make_target('2')])
+
+    assert len(results) == 2
+    assert read_cached.call_count == 0
+    assert plan.strategy == READ
+
+    # the latency of the reads is recorded for planning
+    assert READ in read_planner.latencies['vaporio/foo+unix@tmp/foo']
+
+
+@pytest.mark.asyncio
+async def test_read_plugin_devices_planned(make_plugin, mock_plugin_devices, monkeypatch):
+    """Once the latencies of a plugin are known, they drive the plan."""
+    read_cached = asynctest.MagicMock()
+    monkeypatch.setattr(PluginClient, 'read', mockread)
+    monkeypatch.setattr(PluginClient, 'read_cached', read_cached)
+
+    # dumping the plugin's readings is slow, so the devices are read
+    # individually even though they are all of the plugin's devices
+    read_planner.record('vaporio/foo+unix@tmp/foo', READ, 0.01)
+    read_planner.record('vaporio/foo+unix@tmp/foo', DUMP, 5)
+
+    _plugin = plugin.get_plugin('vaporio/foo+unix@tmp/foo')
+    results, plan = await read_plugin_devices(_plugin, [make_target('1'), make_target('2')])
+
+    assert len(results) == 2
+    assert read_cached.call_count == 0
+    assert plan.strategy == READ
+    assert plan.dump_cost == 5
+
+
+def mock_batch_reads(monkeypatch):
+    """Monkeypatch the grpc client's read and read cached methods, recording
+    the devices read and the dumps made.
+    """
+    dump = make_dump('1', '2')
+    reads, dumps = [], []
+
+    def read_cached(self, start=None, end=None, timeout=None):
+        dumps.append(start)
+        return dump(self, start, end, timeout)
+
+    async def client_read(self, rack, board, device, timeout=None):
+        reads.append(device)
+        return await mockread(self, rack, board, device, timeout)
+
+    monkeypatch.setattr(PluginClient, 'read', client_read)
+    monkeypatch.setattr(PluginClient, 'read_cached', read_cached)
+    return reads, dumps
+
+
+@pytest.mark.asyncio
+async def test_read_command_batched(mock_get_device_info, make_plugin, mock_plugin_devices, monkeypatch):
+    """Concurrent reads of a plugin's devices are batched into a single request."""
+    config.options.set('read.batch_window', 0.01)
+    reads, dumps = mock_batch_reads(monkeypatch)
+
+    one, two = await asyncio.gather(
+        read('rack-1', 'vec', '1'),
+        read('rack-1', 'vec', '2', max_age=10),
+    )
+
+    assert one.data['data'][0]['value'] == 0
+    assert two.data['data'][0]['value'] == 1
+    assert one.data['age'] == pytest.approx(2, abs=0.5)
+    assert len(dumps) == 1
+    assert reads == []
+
+
+@pytest.mark.asyncio
+async def test_read_command_batched_fresh(mock_get_device_info, make_plugin, mock_plugin_devices, monkeypatch):
+    """A batch with a caller which needs fresher readings than a dump gives is read live."""
+    config.options.set('read.batch_window', 0.01)
+    reads, dumps = mock_batch_reads(monkeypatch)
+
+    one, two = await asyncio.gather(
+        read('rack-1', 'vec', '1'),
+        read('rack-1', 'vec', '2', max_age=0),
+    )
+
+    assert one.data['data'][0]['value'] == 10
+    assert two.data['age'] == 0.0
+    assert dumps == []
+    assert sorted(reads) == ['1', '2']
+
+
+@pytest.mark.asyncio
+async def test_read_command_batched_error(mock_get_device_info, mock_client_read_fail, make_plugin, mock_plugin_devices):
+    """The error reading a device in a batch is raised for it."""
+    config.options.set('read.batch_window', 0.01)
+
+    with pytest.raises(errors.FailedReadCommandError):
+        await read('rack-1', 'vec', '1')
+
+
+@pytest.mark.asyncio
+async def test_read_command_batched_cached(mock_get_device_info, make_plugin, monkeypatch):
+    """Recent readings in the readings cache are served without batching."""
+    config.options.set('read.batch_window', 10)
+    synse.cache.put_readings(
+        'rack-1', 'vec', '1', [api.Reading(type='temperature', int64_value=3)], max_age=10
+    )
+
+    resp = await asyncio.wait_for(read('rack-1', 'vec', '1', max_age=10), 1)
+    assert resp.data['data'][0]['value'] == 3
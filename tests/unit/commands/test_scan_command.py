@@ -39,7 +39,20 @@ def mockreturn():
     }
 
 
-def mockregister():
+def mockrack(rack):
+    """Mock method for looking up a single rack's scan results."""
+    return next((r for r in mockreturn()['racks'] if r['id'] == rack), None)
+
+
+def mockboard(rack, board):
+    """Mock method for looking up a single board's scan results."""
+    r = mockrack(rack)
+    if r is None:
+        return None
+    return next((b for b in r['boards'] if b['id'] == board), None)
+
+
+async def mockregister():
     """Mock method to ignore side effects of calling `register_plugins`."""
     return True
 
@@ -49,6 +62,10 @@ def mock_scan(monkeypatch):
     """Fixture to monkeypatch the underlying Synse cache lookup."""
     mock = asynctest.CoroutineMock(synse.cache.get_scan_cache, side_effect=mockreturn)
     monkeypatch.setattr(synse.cache, 'get_scan_cache', mock)
+    monkeypatch.setattr(synse.cache, 'get_scan_rack', asynctest.CoroutineMock(
+        synse.cache.get_scan_rack, side_effect=mockrack))
+    monkeypatch.setattr(synse.cache, 'get_scan_board', asynctest.CoroutineMock(
+        synse.cache.get_scan_board, side_effect=mockboard))
     return mock_scan
 
 
@@ -113,3 +130,18 @@ async def test_scan_command_forced(mock_scan, mock_register):
 
     assert isinstance(resp, ScanResponse)
     assert resp.data == mockreturn()
+
+
+@pytest.mark.asyncio
+async def test_scan_command_plugin_errors(mock_scan, mock_register, monkeypatch):
+    """Get a ScanResponse which includes errors for plugins that failed."""
+
+    errs = [{'plugin': 'foo', 'error': 'timeout', 'message': 'test'}]
+    mock = asynctest.CoroutineMock(synse.cache.get_device_info_errors, return_value=errs)
+    monkeypatch.setattr(synse.cache, 'get_device_info_errors', mock)
+
+    resp = await scan()
+
+    assert isinstance(resp, ScanResponse)
+    assert resp.data['racks'] == mockreturn()['racks']
+    assert resp.data['errors'] == errs
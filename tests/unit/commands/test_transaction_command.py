@@ -28,7 +28,7 @@ def mockgettransaction(transaction):
     }
 
 
-def mockchecktransaction(self, transaction_id):
+async def mockchecktransaction(self, transaction_id, timeout=None):
     """Mock method to monkeypatch the client check_transaction method."""
     return [api.WriteResponse(
         created='october',
@@ -38,7 +38,7 @@ def mockchecktransaction(self, transaction_id):
     )]
 
 
-def mockchecktransactionfail(self, transaction_id):
+async def mockchecktransactionfail(self, transaction_id, timeout=None):
     """Mock method to monkeypatch the client check_transaction method to fail."""
     raise grpc.RpcError()
 
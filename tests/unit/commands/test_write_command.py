@@ -69,7 +69,7 @@ def mocktransactionadd(tid, ctx, name):
     return False
 
 
-def mockwrite(self, rack, board, device, data):
+async def mockwrite(self, rack, board, device, data, timeout=None):
     """Mock method to monkeypatch the client write method."""
     return api.Transactions(
         transactions={
@@ -81,7 +81,7 @@ def mockwrite(self, rack, board, device, data):
     )
 
 
-def mockwritefail(self, rack, board, device, data):
+async def mockwritefail(self, rack, board, device, data, timeout=None):
     """Mock method to monkeypatch the client write method to fail."""
     raise grpc.RpcError()
 
@@ -5,7 +5,7 @@ import os
 import bison
 import pytest
 
-from synse import cache, config, const, plugin
+from synse import batcher, cache, config, const, health, planner, plugin
 
 
 @pytest.fixture(autouse=True)
@@ -23,7 +23,21 @@ def reset_state():
     config.options.auto_env = True
 
     # reset managed plugins
+    for p in plugin.Plugin.manager.plugins.values():
+        p.client.close()
     plugin.Plugin.manager.plugins = {}
+    plugin.reconciler.passes = 0
+    plugin.reconciler.failures = 0
+    plugin.clear_backoff()
+    plugin.socket_watcher.stop()
+    plugin.socket_watcher.sockets = []
+    health.monitor.states = {}
+    planner.read_planner.latencies = {}
+    cache._readings.clear()
+    cache._readings_max_age = 0.0
+    cache._readings_pruned_at = 0.0
+    cache._reads.clear()
+    batcher._batches.clear()
 
     # clear the environment
     for k, _ in os.environ.items():
@@ -37,5 +51,6 @@ def reset_state():
 @pytest.fixture()
 async def clear_caches():
     """Fixture to clear all caches before a test starts."""
+    cache._rebuilds.clear()
     await cache.clear_all_meta_caches()
     await cache.clear_cache(cache.NS_TRANSACTION)
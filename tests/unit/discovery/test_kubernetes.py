@@ -609,3 +609,243 @@ def test_multiple_endpoints():
         cfg={'labels': {'foo': 'bar'}}
     )
     assert res == ['127.0.0.1:7766', '128.0.0.1:7755']
+
+
+def make_endpoint(name, ip, port, resource_version=None):
+    """Helper to make an endpoint for a single plugin pod."""
+    return kubernetes.client.V1Endpoints(
+        metadata=kubernetes.client.V1ObjectMeta(
+            name=name,
+            resource_version=resource_version,
+        ),
+        subsets=[
+            kubernetes.client.V1EndpointSubset(
+                addresses=[
+                    kubernetes.client.V1EndpointAddress(
+                        ip=ip,
+                        target_ref=kubernetes.client.V1ObjectReference(
+                            kind='Pod',
+                            name='{}-pod'.format(name),
+                            namespace='default'
+                        )
+                    )
+                ],
+                ports=[
+                    kubernetes.client.V1EndpointPort(
+                        name='http',
+                        port=port,
+                        protocol='TCP'
+                    )
+                ]
+            )
+        ]
+    )
+
+
+class FakeCoreV1Api:
+    """A fake API server which lists the endpoints it holds."""
+
+    def __init__(self, endpoints=None, resource_version='10'):
+        self.endpoints = endpoints or []
+        self.resource_version = resource_version
+        self.lists = 0
+
+    def list_namespaced_endpoints(self, *args, **kwargs):
+        self.lists += 1
+        return kubernetes.client.V1EndpointsList(
+            metadata=kubernetes.client.V1ListMeta(resource_version=self.resource_version),
+            items=list(self.endpoints),
+        )
+
+
+class FakeWatch:
+    """A fake watch which streams a fixed set of events."""
+
+    events = []
+    calls = []
+
+    def stream(self, func, **kwargs):
+        FakeWatch.calls.append(kwargs)
+        for event in FakeWatch.events:
+            yield event
+
+    def stop(self):
+        pass
+
+
+@pytest.fixture()
+def fake_watch(monkeypatch):
+    """Fixture to replace the kubernetes watch with a fake one."""
+    FakeWatch.events = []
+    FakeWatch.calls = []
+    monkeypatch.setattr(k8s.kubernetes.watch, 'Watch', FakeWatch)
+    yield FakeWatch
+
+
+@pytest.fixture()
+def reset_watcher():
+    """Fixture to stop and clear the module's endpoint watcher."""
+    yield
+    if k8s._watcher is not None:
+        k8s._watcher.stop()
+    k8s._watcher = None
+
+
+def new_watcher(api):
+    """Helper to make an endpoint watcher backed by the given fake API."""
+    watcher = k8s.EndpointWatcher('default', {'foo': 'bar'}, resync=300)
+    watcher.api = api
+    return watcher
+
+
+def test_watcher_resync():
+    """Resync the watcher against the listed endpoints."""
+
+    api = FakeCoreV1Api([
+        make_endpoint('ep-1', '10.0.0.1', 5001),
+        make_endpoint('ep-2', '10.0.0.2', 5001),
+    ], resource_version='42')
+    watcher = new_watcher(api)
+
+    watcher.resync()
+    assert watcher.addresses == ['10.0.0.1:5001', '10.0.0.2:5001']
+    assert watcher.resource_version == '42'
+    assert watcher.last_resync is not None
+    assert watcher.label_selector == 'foo=bar'
+
+
+def test_watcher_handle_events():
+    """Apply added, modified, and deleted events to the address set."""
+
+    watcher = new_watcher(FakeCoreV1Api([make_endpoint('ep-1', '10.0.0.1', 5001)]))
+    watcher.resync()
+
+    watcher.handle({'type': 'ADDED', 'object': make_endpoint('ep-2', '10.0.0.2', 5001, '11')})
+    assert watcher.addresses == ['10.0.0.1:5001', '10.0.0.2:5001']
+    assert watcher.resource_version == '11'
+
+    watcher.handle({'type': 'MODIFIED', 'object': make_endpoint('ep-1', '10.0.0.3', 5001, '12')})
+    assert sorted(watcher.addresses) == ['10.0.0.2:5001', '10.0.0.3:5001']
+    assert watcher.resource_version == '12'
+
+    watcher.handle({'type': 'DELETED', 'object': make_endpoint('ep-2', '10.0.0.2', 5001, '13')})
+    assert watcher.addresses == ['10.0.0.3:5001']
+    assert watcher.resource_version == '13'
+
+
+def test_watcher_handle_snapshot():
+    """Events replace the published address list rather than modifying it."""
+
+    watcher = new_watcher(FakeCoreV1Api([make_endpoint('ep-1', '10.0.0.1', 5001)]))
+    watcher.resync()
+
+    before = watcher.addresses
+    watcher.handle({'type': 'ADDED', 'object': make_endpoint('ep-2', '10.0.0.2', 5001, '11')})
+    assert before == ['10.0.0.1:5001']
+    assert watcher.addresses is not before
+
+
+def test_watcher_handle_expired():
+    """A 410 error event resyncs the watcher from a fresh list."""
+
+    api = FakeCoreV1Api([make_endpoint('ep-1', '10.0.0.1', 5001)], resource_version='5')
+    watcher = new_watcher(api)
+    watcher.resync()
+
+    api.endpoints = [make_endpoint('ep-2', '10.0.0.2', 5001)]
+    api.resource_version = '50'
+    watcher.handle({'type': 'ERROR', 'raw_object': {'code': 410, 'reason': 'Gone'}})
+
+    assert api.lists == 2
+    assert watcher.addresses == ['10.0.0.2:5001']
+    assert watcher.resource_version == '50'
+
+
+def test_watcher_handle_other_error():
+    """A non-410 error event does not change the address set."""
+
+    api = FakeCoreV1Api([make_endpoint('ep-1', '10.0.0.1', 5001)])
+    watcher = new_watcher(api)
+    watcher.resync()
+
+    watcher.handle({'type': 'ERROR', 'raw_object': {'code': 500}})
+    assert api.lists == 1
+    assert watcher.addresses == ['10.0.0.1:5001']
+
+
+def test_watcher_watch_once_resumes(fake_watch):
+    """The watch resumes from the last seen resource version."""
+
+    watcher = new_watcher(FakeCoreV1Api([], resource_version='7'))
+    watcher.resync()
+
+    fake_watch.events = [
+        {'type': 'ADDED', 'object': make_endpoint('ep-1', '10.0.0.1', 5001, '8')},
+    ]
+    watcher.watch_once()
+    assert watcher.addresses == ['10.0.0.1:5001']
+    assert fake_watch.calls[-1]['resource_version'] == '7'
+    assert fake_watch.calls[-1]['label_selector'] == 'foo=bar'
+    assert 0 < fake_watch.calls[-1]['timeout_seconds'] <= 300
+
+    fake_watch.events = []
+    watcher.watch_once()
+    assert fake_watch.calls[-1]['resource_version'] == '8'
+
+
+def test_watcher_due():
+    """A resync is due before the first sync and after the resync interval."""
+
+    watcher = new_watcher(FakeCoreV1Api())
+    assert watcher._due()
+
+    watcher.resync()
+    assert not watcher._due()
+
+    watcher.last_resync -= 301
+    assert watcher._due()
+
+
+def test_discover_watch(fake_watch, reset_watcher):
+    """Discover plugins in watch mode from the watcher's address set."""
+
+    api = FakeCoreV1Api([make_endpoint('ep-1', '10.0.0.1', 5001)])
+    k8s.kubernetes.config.load_incluster_config = lambda: None
+    k8s.kubernetes.client.CoreV1Api = lambda: api
+
+    config.options.set('plugin.discover.kubernetes.watch', True)
+    config.options.set('plugin.discover.kubernetes.endpoints.labels', {'foo': 'bar'})
+
+    res = k8s.discover()
+    assert res == ['10.0.0.1:5001']
+
+    # subsequent discovery reads from the in-memory set rather than
+    # listing the endpoints again.
+    watcher = k8s._watcher
+    k8s.discover()
+    assert k8s._watcher is watcher
+    assert api.lists >= 1
+
+
+def test_discover_watch_labels_changed(fake_watch, reset_watcher):
+    """Changing the labels in watch mode restarts the watcher."""
+
+    k8s.kubernetes.config.load_incluster_config = lambda: None
+    k8s.kubernetes.client.CoreV1Api = FakeCoreV1Api
+
+    config.options.set('plugin.discover.kubernetes.watch', True)
+    config.options.set('plugin.discover.kubernetes.endpoints.labels', {'foo': 'bar'})
+    k8s.discover()
+    first = k8s._watcher
+
+    config.options.set('plugin.discover.kubernetes.endpoints.labels', {'foo': 'baz'})
+    k8s.discover()
+    assert k8s._watcher is not first
+    assert first._stop.is_set()
+
+
+def test_watch_endpoints_no_labels(reset_watcher):
+    """No watcher is started when there are no labels to select by."""
+
+    assert k8s._watch_endpoints('default', {}) == []
+    assert k8s._watcher is None
@@ -0,0 +1,231 @@
+"""Test the 'synse.discovery.unix' Synse Server module."""
+# pylint: disable=redefined-outer-name,unused-argument,missing-docstring
+
+import asyncio
+import os
+import shutil
+import socket
+import tempfile
+
+import pytest
+
+from synse.discovery import unix
+
+
+@pytest.fixture()
+def sockdir():
+    """Fixture for a short-pathed directory to create sockets in."""
+    path = tempfile.mkdtemp(prefix='socks')
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+@pytest.fixture()
+def watcher(sockdir):
+    """Fixture for a socket directory watcher which records its callbacks."""
+    added, removed = [], []
+    w = unix.SocketDirWatcher(
+        sockdir,
+        on_added=added.append,
+        on_removed=removed.append,
+        poll_interval=0.01,
+    )
+    w.added = added
+    w.removed = removed
+    yield w
+    w.stop()
+
+
+def make_socket(path):
+    """Helper to create a unix socket at the given path."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(path)
+    return sock
+
+
+def make_event(mask, name=''):
+    """Helper to pack a raw inotify event."""
+    raw = name.encode()
+    if raw:
+        raw += b'\0' * (16 - len(raw) % 16)
+    return unix._EVENT_HEADER.pack(1, mask, 0, len(raw)) + raw
+
+
+async def wait_for(condition, timeout=2):
+    """Helper to wait for a condition to become true."""
+    deadline = asyncio.get_event_loop().time() + timeout
+    while not condition():
+        if asyncio.get_event_loop().time() > deadline:
+            raise AssertionError('timed out waiting for condition')
+        await asyncio.sleep(0.01)
+
+
+async def stop(w):
+    """Helper to stop a watcher and let its task finish."""
+    w.stop()
+    await asyncio.sleep(0)
+
+
+def test_is_socket(sockdir):
+    """Check whether paths are sockets."""
+    path = os.path.join(sockdir, 'plugin')
+    make_socket(path)
+    open(os.path.join(sockdir, 'file'), 'w').close()
+
+    assert unix.is_socket(path)
+    assert not unix.is_socket(os.path.join(sockdir, 'file'))
+    assert not unix.is_socket(os.path.join(sockdir, 'missing'))
+
+
+def test_list_sockets(sockdir):
+    """List only the sockets in a directory."""
+    make_socket(os.path.join(sockdir, 'b'))
+    make_socket(os.path.join(sockdir, 'a'))
+    open(os.path.join(sockdir, 'file'), 'w').close()
+
+    assert unix.list_sockets(sockdir) == [
+        os.path.join(sockdir, 'a'),
+        os.path.join(sockdir, 'b'),
+    ]
+
+
+def test_list_sockets_no_dir(sockdir):
+    """List sockets in a directory which does not exist."""
+    assert unix.list_sockets(os.path.join(sockdir, 'missing')) == []
+
+
+def test_scan(watcher, sockdir):
+    """Scan the directory and notify of the added and removed sockets."""
+    a = os.path.join(sockdir, 'a')
+    b = os.path.join(sockdir, 'b')
+    make_socket(a)
+
+    watcher.scan()
+    assert watcher.sockets == [a]
+    assert watcher.added == [a]
+
+    os.remove(a)
+    make_socket(b)
+
+    watcher.scan()
+    assert watcher.sockets == [b]
+    assert watcher.added == [a, b]
+    assert watcher.removed == [a]
+
+
+def test_handle_create_delete(watcher, sockdir):
+    """Apply create and delete events."""
+    path = os.path.join(sockdir, 'plugin')
+    make_socket(path)
+
+    watcher.handle(make_event(unix.IN_CREATE, 'plugin'))
+    assert watcher.sockets == [path]
+    assert watcher.added == [path]
+
+    # a duplicate event does not notify again
+    watcher.handle(make_event(unix.IN_CREATE, 'plugin'))
+    assert watcher.added == [path]
+
+    watcher.handle(make_event(unix.IN_DELETE, 'plugin'))
+    assert watcher.sockets == []
+    assert watcher.removed == [path]
+
+
+def test_handle_create_not_socket(watcher, sockdir):
+    """Files which are not sockets are not tracked."""
+    open(os.path.join(sockdir, 'file'), 'w').close()
+
+    watcher.handle(make_event(unix.IN_CREATE, 'file'))
+    assert watcher.sockets == []
+    assert watcher.added == []
+
+
+def test_handle_moved(watcher, sockdir):
+    """Apply moved to and moved from events in the same buffer."""
+    path = os.path.join(sockdir, 'plugin')
+    make_socket(path)
+
+    watcher.handle(make_event(unix.IN_MOVED_TO, 'plugin') + make_event(unix.IN_MOVED_FROM, 'plugin'))
+    assert watcher.sockets == []
+    assert watcher.added == [path]
+    assert watcher.removed == [path]
+
+
+def test_handle_overflow(watcher, sockdir):
+    """An overflowed event queue rescans the directory."""
+    path = os.path.join(sockdir, 'plugin')
+    make_socket(path)
+
+    watcher.handle(make_event(unix.IN_Q_OVERFLOW))
+    assert watcher.sockets == [path]
+
+
+def test_handle_dir_removed(watcher, sockdir):
+    """Removing the directory drops all of its sockets."""
+    path = os.path.join(sockdir, 'plugin')
+    make_socket(path)
+    watcher.scan()
+
+    watcher.handle(make_event(unix.IN_DELETE_SELF))
+    assert watcher.sockets == []
+    assert watcher.removed == [path]
+
+
+@pytest.mark.asyncio
+async def test_watch_inotify(watcher, sockdir):
+    """Sockets are tracked as they are created and removed."""
+    if unix._load_inotify() is None:
+        pytest.skip('inotify is not available')
+
+    existing = os.path.join(sockdir, 'existing')
+    make_socket(existing)
+
+    watcher.start()
+    await wait_for(lambda: watcher.sockets == [existing])
+    assert watcher.inotify
+
+    path = os.path.join(sockdir, 'plugin')
+    make_socket(path)
+    await wait_for(lambda: path in watcher.sockets)
+
+    os.remove(path)
+    await wait_for(lambda: path not in watcher.sockets)
+    assert watcher.removed == [path]
+
+    await stop(watcher)
+
+
+@pytest.mark.asyncio
+async def test_watch_poll_fallback(watcher, sockdir, monkeypatch):
+    """Sockets are tracked by polling when inotify is not available."""
+    monkeypatch.setattr(unix, '_load_inotify', lambda: None)
+
+    watcher.start()
+    path = os.path.join(sockdir, 'plugin')
+    make_socket(path)
+
+    await wait_for(lambda: watcher.sockets == [path])
+    assert not watcher.inotify
+
+    os.remove(path)
+    await wait_for(lambda: watcher.sockets == [])
+
+    await stop(watcher)
+
+
+@pytest.mark.asyncio
+async def test_watch_dir_created_later(sockdir):
+    """The directory is watched once it is created."""
+    path = os.path.join(sockdir, 'later')
+    w = unix.SocketDirWatcher(path, poll_interval=0.01)
+    w.start()
+    try:
+        await asyncio.sleep(0.02)
+        assert w.sockets == []
+
+        os.mkdir(path)
+        sock = os.path.join(path, 'plugin')
+        make_socket(sock)
+        await wait_for(lambda: w.sockets == [sock])
+    finally:
+        await stop(w)
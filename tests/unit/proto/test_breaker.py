@@ -0,0 +1,137 @@
+"""Test the 'synse.proto.breaker' Synse Server module."""
+# pylint: disable=redefined-outer-name,unused-argument
+
+import asyncio
+
+import grpc
+import pytest
+
+from synse import config, errors
+from synse.proto import breaker
+
+
+class MockRpcError(grpc.RpcError):
+    """A gRPC error with a status code."""
+
+    def __init__(self, code):
+        super(MockRpcError, self).__init__()
+        self._code = code
+
+    def code(self):
+        return self._code
+
+
+def fail(b, exc=None):
+    """Helper to record a failed request through the breaker."""
+    with pytest.raises(Exception):
+        with b.guard():
+            raise exc or MockRpcError(grpc.StatusCode.UNAVAILABLE)
+
+
+def test_breaker_from_config():
+    """The breaker is configured from the config by default."""
+    config.options.set('grpc.circuit_breaker.threshold', 2)
+    config.options.set('grpc.circuit_breaker.probe_interval', 7)
+
+    b = breaker.CircuitBreaker('localhost:5001')
+    assert b.threshold == 2
+    assert b.probe_interval == 7
+    assert b.state == breaker.CLOSED
+
+
+def test_is_failure():
+    """Only errors where the plugin could not service the request are failures."""
+    assert breaker.is_failure(MockRpcError(grpc.StatusCode.UNAVAILABLE))
+    assert breaker.is_failure(MockRpcError(grpc.StatusCode.DEADLINE_EXCEEDED))
+    assert breaker.is_failure(grpc.RpcError())
+    assert breaker.is_failure(ValueError())
+    assert not breaker.is_failure(MockRpcError(grpc.StatusCode.NOT_FOUND))
+
+
+def test_breaker_opens():
+    """The circuit opens after the threshold of consecutive failures."""
+    b = breaker.CircuitBreaker('localhost:5001', threshold=3, probe_interval=60)
+
+    fail(b)
+    fail(b)
+    assert b.state == breaker.CLOSED
+
+    fail(b)
+    assert b.state == breaker.OPEN
+    assert b.to_dict() == {'state': 'open', 'consecutive_failures': 3, 'trips': 1}
+
+    with pytest.raises(errors.PluginCircuitOpenError) as e:
+        with b.guard():
+            pass
+    assert e.value.error_id == errors.PLUGIN_CIRCUIT_OPEN
+
+
+def test_breaker_success_resets():
+    """A successful request resets the consecutive failures."""
+    b = breaker.CircuitBreaker('localhost:5001', threshold=2, probe_interval=60)
+
+    fail(b)
+    with b.guard():
+        pass
+    fail(b)
+    assert b.state == breaker.CLOSED
+    assert b.failures == 1
+
+    # an error returned by the plugin is not a failure
+    with pytest.raises(grpc.RpcError):
+        with b.guard():
+            raise MockRpcError(grpc.StatusCode.NOT_FOUND)
+    assert b.failures == 0
+
+
+def test_breaker_disabled():
+    """A threshold of 0 never opens the circuit."""
+    b = breaker.CircuitBreaker('localhost:5001', threshold=0, probe_interval=60)
+
+    for _ in range(10):
+        fail(b)
+    assert b.state == breaker.CLOSED
+
+
+def test_breaker_half_open_closes():
+    """A successful probe closes the circuit."""
+    b = breaker.CircuitBreaker('localhost:5001', threshold=1, probe_interval=0)
+
+    fail(b)
+    assert b.state == breaker.OPEN
+
+    with b.guard():
+        assert b.state == breaker.HALF_OPEN
+
+        # only the single probe is let through
+        with pytest.raises(errors.PluginCircuitOpenError):
+            b.allow()
+
+    assert b.state == breaker.CLOSED
+    assert b.to_dict() == {'state': 'closed', 'consecutive_failures': 0, 'trips': 1}
+
+
+def test_breaker_half_open_reopens():
+    """A failed probe opens the circuit again."""
+    b = breaker.CircuitBreaker('localhost:5001', threshold=1, probe_interval=0)
+
+    fail(b)
+    fail(b)
+    assert b.state == breaker.OPEN
+    assert b.failures == 2
+    assert b.trips == 1
+
+
+def test_breaker_half_open_abandoned():
+    """A cancelled probe lets another probe through."""
+    b = breaker.CircuitBreaker('localhost:5001', threshold=1, probe_interval=0)
+
+    fail(b)
+    with pytest.raises(asyncio.CancelledError):
+        with b.guard():
+            raise asyncio.CancelledError()
+    assert b.state == breaker.HALF_OPEN
+
+    with b.guard():
+        pass
+    assert b.state == breaker.CLOSED
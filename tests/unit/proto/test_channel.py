@@ -0,0 +1,94 @@
+"""Test the 'synse.proto.channel' Synse Server module."""
+# pylint: disable=redefined-outer-name,unused-argument
+
+import os
+
+import grpc
+import pytest
+
+from synse import config
+from synse.proto import channel
+
+
+@pytest.fixture()
+def cert():
+    """Fixture to configure a TLS cert for gRPC."""
+    crt = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'test_data', 'test.crt')
+    config.options.set('grpc.tls.cert', crt)
+    return crt
+
+
+def test_credentials_no_tls():
+    """No credentials are loaded when TLS is not configured."""
+    assert channel.ChannelFactory().credentials() is None
+
+
+def test_credentials_loaded_once(cert, mocker):
+    """The credentials are loaded once and reused."""
+    load = mocker.spy(grpc, 'ssl_channel_credentials')
+
+    f = channel.ChannelFactory()
+    creds = f.credentials()
+    assert isinstance(creds, grpc.ChannelCredentials)
+    assert f.credentials() is creds
+
+    f.make('localhost:5001')
+    f.pool('localhost:5002')
+    assert load.call_count == 1
+
+
+def test_credentials_reloaded_on_change(cert, mocker):
+    """The credentials are loaded again when the cert file changes."""
+    load = mocker.spy(grpc, 'ssl_channel_credentials')
+
+    f = channel.ChannelFactory()
+    f.credentials()
+
+    st = os.stat(cert)
+    os.utime(cert, (st.st_atime, st.st_mtime + 1))
+    try:
+        f.credentials()
+    finally:
+        os.utime(cert, (st.st_atime, st.st_mtime))
+    assert load.call_count == 2
+
+
+def test_options_default():
+    """No channel arguments are set by default."""
+    assert channel.ChannelFactory.options() == []
+    assert channel.ChannelFactory.pool_size() == 1
+
+
+def test_options():
+    """Channel arguments are set from the config."""
+    config.options.set('grpc.channel.keepalive_time', 30)
+    config.options.set('grpc.channel.keepalive_timeout', 5)
+    config.options.set('grpc.channel.keepalive_permit_without_calls', True)
+    config.options.set('grpc.channel.max_receive_message_length', 8388608)
+    config.options.set('grpc.channel.stream_window_size', 1048576)
+    config.options.set('grpc.channel.bdp_probe', False)
+
+    assert channel.ChannelFactory.options() == [
+        ('grpc.keepalive_time_ms', 30000),
+        ('grpc.keepalive_timeout_ms', 5000),
+        ('grpc.keepalive_permit_without_calls', 1),
+        ('grpc.max_receive_message_length', 8388608),
+        ('grpc.http2.lookahead_bytes', 1048576),
+        ('grpc.http2.bdp_probe', 0),
+    ]
+
+
+def test_pool():
+    """Make a pool of channels to a plugin."""
+    config.options.set('grpc.channel.pool_size', 3)
+
+    pool = channel.ChannelFactory().pool('localhost:5001')
+    assert len(pool) == 3
+    assert all(isinstance(c, grpc.Channel) for c in pool)
+    assert len(set(pool)) == 3
+
+
+def test_pool_size_minimum():
+    """A pool always has at least one channel."""
+    config.options.set('grpc.channel.pool_size', 0)
+    assert channel.ChannelFactory.pool_size() == 1
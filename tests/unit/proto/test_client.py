@@ -1,18 +1,32 @@
 """Test the 'synse.proto.client' Synse Server module."""
 # pylint: disable=redefined-outer-name,unused-argument
 
+import asyncio
+import concurrent.futures
 import os
 
 import grpc
 import pytest
 import synse_grpc
 
-from synse import config
-from synse.proto import client
+from synse import config, errors
+from synse.proto import breaker, client
+from synse.proto.executor import executor
 
 # --- Mock Methods ---
 
 
+def unary(fn):
+    """Make a mock gRPC unary-unary stub method out of a mock function,
+    allowing the call to be issued as a future."""
+    def future(req, timeout):
+        f = concurrent.futures.Future()
+        f.set_result(fn(req, timeout))
+        return f
+    fn.future = future
+    return fn
+
+
 def mock_read(req, timeout):
     """Mock the internal read call."""
     return [
@@ -172,113 +186,256 @@ def test_client_init():
     assert isinstance(c.grpc, synse_grpc.grpc.PluginStub)
 
 
-def test_client_read():
+@pytest.mark.asyncio
+async def test_client_read():
     """Test reading via the client."""
 
     c = client.PluginUnixClient('foo/bar/test.sock')
     c.grpc.Read = mock_read
 
-    resp = c.read('rack-1', 'vec', '12345')
+    resp = await c.read('rack-1', 'vec', '12345')
 
     assert isinstance(resp, list)
     assert len(resp) == 1
     assert isinstance(resp[0], synse_grpc.api.Reading)
 
 
-def test_client_read_cached():
+@pytest.mark.asyncio
+async def test_client_read_cached():
     """Test reading plugin cache via the client."""
 
     c = client.PluginUnixClient('foo/bar/test.sock')
     c.grpc.ReadCached = mock_read_cached
 
-    resp = [x for x in c.read_cached()]
+    resp = [x async for x in c.read_cached()]
 
     assert len(resp) == 1
     assert isinstance(resp[0], synse_grpc.api.DeviceReading)
 
 
-def test_client_write():
+@pytest.mark.asyncio
+async def test_client_write():
     """Test writing via the client."""
 
     c = client.PluginUnixClient('foo/bar/test.sock')
-    c.grpc.Write = mock_write
+    c.grpc.Write = unary(mock_write)
 
-    resp = c.write('rack-1', 'vec', '12345', [client.WriteData()])
+    resp = await c.write('rack-1', 'vec', '12345', [client.WriteData()])
 
     assert isinstance(resp, synse_grpc.api.Transactions)
 
 
-def test_client_devices():
+@pytest.mark.asyncio
+async def test_client_devices():
     """Test getting device info via the client."""
 
     c = client.PluginUnixClient('foo/bar/test.sock')
     c.grpc.Devices = mock_device_info
 
-    resp = c.devices()
+    resp = await c.devices()
 
     assert isinstance(resp, list)
     assert len(resp) == 1
     assert isinstance(resp[0], synse_grpc.api.Device)
 
 
-def test_client_transaction():
+@pytest.mark.asyncio
+async def test_client_transaction():
     """Test checking a transaction via the client."""
 
     c = client.PluginUnixClient('foo/bar/test.sock')
     c.grpc.Transaction = mock_transaction
 
-    resp = c.transaction('abcdef')
+    resp = await c.transaction('abcdef')
 
     assert isinstance(resp, list)
     assert isinstance(resp[0], synse_grpc.api.WriteResponse)
 
 
-def test_client_test():
+@pytest.mark.asyncio
+async def test_client_test():
     """Test that a plugin is reachable."""
 
     c = client.PluginUnixClient('foo/bar/test.sock')
-    c.grpc.Test = mock_test
+    c.grpc.Test = unary(mock_test)
 
-    resp = c.test()
+    resp = await c.test()
 
     assert isinstance(resp, synse_grpc.api.Status)
 
 
-def test_client_health():
+@pytest.mark.asyncio
+async def test_client_health():
     """Test getting plugin health via the client."""
 
     c = client.PluginUnixClient('foo/bar/test.sock')
-    c.grpc.Health = mock_health
+    c.grpc.Health = unary(mock_health)
 
-    resp = c.health()
+    resp = await c.health()
 
     assert isinstance(resp, synse_grpc.api.PluginHealth)
 
 
-def test_client_metainfo():
+@pytest.mark.asyncio
+async def test_client_metainfo():
     """Test getting plugin metainfo via the client."""
 
     c = client.PluginUnixClient('foo/bar/test.sock')
-    c.grpc.Metainfo = mock_metainfo
+    c.grpc.Metainfo = unary(mock_metainfo)
 
-    resp = c.metainfo()
+    resp = await c.metainfo()
 
     assert isinstance(resp, synse_grpc.api.Metadata)
 
 
-def test_client_capabilities():
+@pytest.mark.asyncio
+async def test_client_capabilities():
     """Test getting plugin capabilities via the client."""
 
     c = client.PluginUnixClient('foo/bar/test.sock')
     c.grpc.Capabilities = mock_capabilities
 
-    resp = c.capabilities()
+    resp = await c.capabilities()
 
     assert isinstance(resp, list)
     assert len(resp) == 1
     assert isinstance(resp[0], synse_grpc.api.DeviceCapability)
 
 
+@pytest.mark.asyncio
+async def test_client_unary_error():
+    """An error from a unary gRPC call is raised when awaited."""
+
+    def _fail(req, timeout):
+        raise grpc.RpcError()
+
+    c = client.PluginUnixClient('foo/bar/test.sock')
+    c.grpc.Test = unary(_fail)
+
+    with pytest.raises(grpc.RpcError):
+        await c.test()
+
+
+@pytest.mark.asyncio
+async def test_client_unary_cancelled():
+    """Cancelling the awaiting task cancels the underlying gRPC call."""
+
+    pending = concurrent.futures.Future()
+
+    def _test(req, timeout):
+        """Mock test call which never completes."""
+    _test.future = lambda req, timeout: pending
+
+    c = client.PluginUnixClient('foo/bar/test.sock')
+    c.grpc.Test = _test
+
+    task = asyncio.ensure_future(c.test())
+    await asyncio.sleep(0)
+    task.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert pending.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_client_read_cached_error():
+    """An error partway through a streamed response is raised to the consumer."""
+
+    def _stream(req, timeout):
+        yield from mock_read_cached(req, timeout)
+        raise grpc.RpcError()
+
+    c = client.PluginUnixClient('foo/bar/test.sock')
+    c.grpc.ReadCached = _stream
+
+    resp = []
+    with pytest.raises(grpc.RpcError):
+        async for x in c.read_cached():
+            resp.append(x)
+    assert len(resp) == 1
+
+
+class MockStream:
+    """A mock gRPC response stream which can be cancelled."""
+
+    def __init__(self, items):
+        self.items = iter(items)
+        self.cancelled = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.cancelled:
+            raise grpc.RpcError()
+        return next(self.items)
+
+    def cancel(self):
+        self.cancelled = True
+
+
+@pytest.mark.asyncio
+async def test_client_stream_releases_slot():
+    """The executor slot of a streamed request is released once the stream
+    is drained, not once the consumer is done with it."""
+
+    c = client.PluginUnixClient('foo/bar/test.sock')
+    c.grpc.ReadCached = lambda req, timeout: MockStream(mock_read_cached(req, timeout) * 3)
+
+    stream = c.read_cached()
+    resp = [await stream.__anext__()]
+
+    # Let the stream drain while the consumer holds on to it.
+    for _ in range(10):
+        await asyncio.sleep(0.01)
+        if executor.stats()['plugins'][c.address]['active'] == 0:
+            break
+    stats = executor.stats()['plugins'][c.address]
+    assert stats['active'] == 0
+    assert stats['completed'] == 1
+
+    resp.extend([x async for x in stream])
+    assert len(resp) == 3
+    assert c.breaker.state == breaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_client_stream_abandoned():
+    """A streamed request the consumer stops iterating is cancelled without
+    being counted against the plugin."""
+
+    started = asyncio.Event()
+    release = concurrent.futures.Future()
+    loop = asyncio.get_event_loop()
+
+    class SlowStream(MockStream):
+        def __next__(self):
+            loop.call_soon_threadsafe(started.set)
+            release.result()
+            return super().__next__()
+
+    call = SlowStream(mock_read_cached(None, None))
+    c = client.PluginUnixClient('foo/bar/test.sock')
+    c.grpc.ReadCached = lambda req, timeout: call
+
+    stream = c.read_cached()
+    task = asyncio.ensure_future(stream.__anext__())
+    await started.wait()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    release.set_result(None)
+
+    for _ in range(10):
+        await asyncio.sleep(0.01)
+        if executor.stats()['plugins'][c.address]['active'] == 0:
+            break
+    assert call.cancelled
+    assert executor.stats()['plugins'][c.address]['active'] == 0
+    assert c.breaker.failures == 0
+
+
 def test_make_channel_insecure():
     """Test making the grpc channel for the plugin client.
     In this case, the channel will be insecure (no TLS configured).
@@ -299,3 +456,216 @@ def test_make_channel_secure():
     c = client.PluginTCPClient('localhost')
     assert c.channel is not None
     assert c.channel._channel.target() == b'localhost'
+
+
+def test_client_state_changes():
+    """Record changes of the channel's connectivity state."""
+
+    c = client.PluginUnixClient('foo/bar/test.sock')
+    assert c.state is None
+    assert c.available
+    assert c.connectivity() == {'state': 'unknown', 'state_changes': 0, 'channels': 1}
+
+    # the initial state is not a change
+    c._on_state_change(grpc.ChannelConnectivity.IDLE)
+    c._on_state_change(grpc.ChannelConnectivity.IDLE)
+    assert c.connectivity() == {'state': 'idle', 'state_changes': 0, 'channels': 1}
+
+    c._on_state_change(grpc.ChannelConnectivity.CONNECTING)
+    c._on_state_change(grpc.ChannelConnectivity.READY)
+    assert c.connectivity() == {'state': 'ready', 'state_changes': 2, 'channels': 1}
+    assert c.available
+
+    c._on_state_change(grpc.ChannelConnectivity.TRANSIENT_FAILURE)
+    assert c.connectivity() == {'state': 'transient_failure', 'state_changes': 3, 'channels': 1}
+    assert not c.available
+
+
+@pytest.mark.asyncio
+async def test_client_fail_fast():
+    """Requests fail fast when the channel is known to be down."""
+
+    calls = []
+
+    def _read(req, timeout):
+        calls.append(req)
+        return mock_read(req, timeout)
+
+    def _write(req, timeout):
+        calls.append(req)
+        return mock_write(req, timeout)
+
+    c = client.PluginUnixClient('foo/bar/test.sock')
+    c.grpc.Read = _read
+    c.grpc.Write = unary(_write)
+    c._on_state_change(grpc.ChannelConnectivity.TRANSIENT_FAILURE)
+
+    with pytest.raises(client.PluginUnavailableError) as e:
+        await c.read('rack-1', 'vec', '12345')
+    assert e.value.code() == grpc.StatusCode.UNAVAILABLE
+    assert 'transient_failure' in str(e.value)
+
+    with pytest.raises(grpc.RpcError):
+        await c.write('rack-1', 'vec', '12345', [client.WriteData()])
+
+    with pytest.raises(grpc.RpcError):
+        [x async for x in c.read_cached()]
+    assert calls == []
+
+    # once the channel recovers, requests are issued again
+    c._on_state_change(grpc.ChannelConnectivity.READY)
+    resp = await c.read('rack-1', 'vec', '12345')
+    assert len(resp) == 1
+
+
+@pytest.mark.asyncio
+async def test_client_health_not_fail_fast():
+    """Health requests are issued even when the channel is known to be down."""
+
+    c = client.PluginUnixClient('foo/bar/test.sock')
+    c.grpc.Health = unary(mock_health)
+    c._on_state_change(grpc.ChannelConnectivity.TRANSIENT_FAILURE)
+
+    resp = await c.health()
+    assert isinstance(resp, synse_grpc.api.PluginHealth)
+
+
+@pytest.mark.asyncio
+async def test_client_circuit_breaker():
+    """Requests are rejected while the plugin's circuit is open."""
+
+    calls = []
+
+    def _test(req, timeout):
+        calls.append(req)
+        raise grpc.RpcError()
+
+    config.options.set('grpc.circuit_breaker.threshold', 2)
+    config.options.set('grpc.circuit_breaker.probe_interval', 60)
+
+    c = client.PluginUnixClient('foo/bar/test.sock')
+    c.grpc.Test = unary(_test)
+    c.grpc.Health = unary(mock_health)
+
+    for _ in range(2):
+        with pytest.raises(grpc.RpcError):
+            await c.test()
+
+    with pytest.raises(errors.PluginCircuitOpenError):
+        await c.test()
+    with pytest.raises(errors.PluginCircuitOpenError):
+        await c.devices()
+    with pytest.raises(errors.PluginCircuitOpenError):
+        [x async for x in c.read_cached()]
+    assert len(calls) == 2
+
+    # health requests are not subject to the circuit
+    resp = await c.health()
+    assert isinstance(resp, synse_grpc.api.PluginHealth)
+    assert c.breaker.state == 'open'
+
+
+def test_client_channel_pool():
+    """Requests are spread round-robin across the pool of channels."""
+    config.options.set('grpc.channel.pool_size', 3)
+
+    c = client.PluginTCPClient('localhost:5999')
+    assert len(c.channels) == 3
+    assert len(c.stubs) == 3
+    assert c.channel is c.channels[0]
+    assert c.connectivity()['channels'] == 3
+
+    assert [c.grpc for _ in range(4)] == c.stubs + c.stubs[:1]
+
+
+def test_client_channel_pool_state():
+    """The state of the plugin is the best state of any of its channels."""
+    config.options.set('grpc.channel.pool_size', 2)
+
+    c = client.PluginTCPClient('localhost:5999')
+
+    c._on_channel_state_change(0, grpc.ChannelConnectivity.TRANSIENT_FAILURE)
+    assert c.state is None
+    assert c.available
+
+    c._on_channel_state_change(1, grpc.ChannelConnectivity.TRANSIENT_FAILURE)
+    assert c.state == grpc.ChannelConnectivity.TRANSIENT_FAILURE
+    assert not c.available
+
+    c._on_channel_state_change(0, grpc.ChannelConnectivity.READY)
+    assert c.state == grpc.ChannelConnectivity.READY
+    assert c.state_changes == 1
+
+
+@pytest.mark.asyncio
+async def test_client_timeout():
+    """Requests are bounded by the caller's deadline and the configured timeout."""
+
+    timeouts = []
+
+    def _read(req, timeout):
+        timeouts.append(timeout)
+        return mock_read(req, timeout)
+
+    config.options.set('grpc.timeout', 3)
+
+    c = client.PluginUnixClient('foo/bar/test.sock')
+    c.grpc.Read = _read
+
+    await c.read('rack-1', 'vec', '12345')
+    await c.read('rack-1', 'vec', '12345', timeout=1.5)
+    await c.read('rack-1', 'vec', '12345', timeout=10)
+    assert timeouts == [3, 1.5, 3]
+
+
+@pytest.mark.asyncio
+async def test_client_deadline_not_held_against_plugin():
+    """Running out of a caller's shortened deadline does not trip the circuit."""
+
+    class DeadlineExceeded(grpc.RpcError):
+        def code(self):
+            return grpc.StatusCode.DEADLINE_EXCEEDED
+
+    def _write(req, timeout):
+        raise DeadlineExceeded()
+
+    config.options.set('grpc.timeout', 3)
+    config.options.set('grpc.circuit_breaker.threshold', 1)
+
+    c = client.PluginUnixClient('foo/bar/test.sock')
+    c.grpc.Write = unary(_write)
+
+    with pytest.raises(grpc.RpcError):
+        await c.write('rack-1', 'vec', '12345', [client.WriteData()], timeout=0.5)
+    assert c.breaker.state == breaker.CLOSED
+
+    with pytest.raises(grpc.RpcError):
+        await c.write('rack-1', 'vec', '12345', [client.WriteData()])
+    assert c.breaker.state == 'open'
+
+
+def test_client_watch():
+    """Watch the connectivity of the channel until closed."""
+
+    c = client.PluginTCPClient('localhost:5999')
+
+    c.watch()
+    c.watch()
+    assert c._watching
+
+    c.close()
+    c.close()
+    assert not c._watching
+
+
+def test_client_watch_pool():
+    """Watch the connectivity of every channel in the pool."""
+    config.options.set('grpc.channel.pool_size', 2)
+
+    c = client.PluginTCPClient('localhost:5999')
+
+    c.watch()
+    assert len(c._callbacks) == 2
+
+    c.close()
+    assert not c._watching
@@ -0,0 +1,129 @@
+"""Test the 'synse.proto.executor' Synse Server module."""
+# pylint: disable=redefined-outer-name,unused-argument
+
+import asyncio
+import threading
+
+import pytest
+
+from synse import config
+from synse.proto.executor import PluginExecutor
+
+
+@pytest.fixture()
+def limits():
+    """Fixture to configure small executor limits for testing."""
+    config.options.set('grpc.executor.workers', 4)
+    config.options.set('grpc.executor.plugin_limit', 2)
+    config.options.set('grpc.executor.plugins', {'slow': 1})
+
+
+@pytest.mark.asyncio
+async def test_executor_setup(limits):
+    """The executor is configured from the config on first use."""
+    e = PluginExecutor()
+    assert e.loop is None
+
+    stats = e.stats()
+    assert e.loop is asyncio.get_event_loop()
+    assert stats['workers'] == 4
+    assert stats['plugin_limit'] == 2
+    assert stats['global']['limit'] == 4
+    assert stats['plugins'] == {}
+
+
+@pytest.mark.asyncio
+async def test_executor_submit(limits):
+    """Blocking functions are run off of the event loop thread."""
+    e = PluginExecutor()
+
+    tid = await e.submit(threading.get_ident)
+    assert tid != threading.get_ident()
+
+
+@pytest.mark.asyncio
+async def test_executor_slot_counts(limits):
+    """Slots are tracked per plugin and globally."""
+    e = PluginExecutor()
+
+    async with e.slot('foo'):
+        stats = e.stats()
+        assert stats['global']['active'] == 1
+        assert stats['plugins']['foo']['active'] == 1
+        assert stats['plugins']['foo']['limit'] == 2
+
+    with pytest.raises(ValueError):
+        async with e.slot('foo'):
+            raise ValueError('test error')
+
+    stats = e.stats()
+    assert stats['global']['active'] == 0
+    assert stats['plugins']['foo'] == {
+        'limit': 2,
+        'active': 0,
+        'waiting': 0,
+        'completed': 1,
+        'failed': 1,
+    }
+
+
+@pytest.mark.asyncio
+async def test_executor_plugin_limit(limits):
+    """Requests beyond a plugin's limit wait for a free slot, while other
+    plugins are not affected."""
+    e = PluginExecutor()
+    release = asyncio.Event()
+
+    async def hold(address):
+        async with e.slot(address):
+            await release.wait()
+
+    tasks = [asyncio.ensure_future(hold('slow')) for _ in range(3)]
+    await asyncio.sleep(0)
+
+    stats = e.stats()
+    assert stats['plugins']['slow']['limit'] == 1
+    assert stats['plugins']['slow']['active'] == 1
+    assert stats['plugins']['slow']['waiting'] == 2
+
+    # a different plugin can still get a slot
+    async with e.slot('other'):
+        assert e.stats()['plugins']['other']['active'] == 1
+
+    release.set()
+    await asyncio.gather(*tasks)
+
+    stats = e.stats()
+    assert stats['plugins']['slow']['active'] == 0
+    assert stats['plugins']['slow']['completed'] == 3
+
+
+@pytest.mark.asyncio
+async def test_executor_global_limit(limits):
+    """Requests beyond the global limit wait for a free slot."""
+    e = PluginExecutor()
+    release = asyncio.Event()
+
+    async def hold(address):
+        async with e.slot(address):
+            await release.wait()
+
+    tasks = [asyncio.ensure_future(hold(str(i))) for i in range(5)]
+    await asyncio.sleep(0)
+
+    stats = e.stats()
+    assert stats['global']['active'] == 4
+    assert stats['global']['waiting'] == 1
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert e.stats()['global']['completed'] == 5
+
+
+@pytest.mark.asyncio
+async def test_executor_limit(limits):
+    """Get the concurrency limit of a plugin."""
+    e = PluginExecutor()
+
+    assert e.limit('fast') == 2
+    assert e.limit('slow') == 1
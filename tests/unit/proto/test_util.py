@@ -130,3 +130,37 @@ def test_output_to_dict():
             'symbol': 'C',
         }
     }
+
+
+def test_devices_fingerprint():
+    """Fingerprint a set of devices."""
+
+    devices = [
+        api.Device(timestamp='1', uid='1', kind='temperature', location=api.Location(rack='r', board='b')),
+        api.Device(timestamp='1', uid='2', kind='led', location=api.Location(rack='r', board='b')),
+    ]
+    fingerprint = util.devices_fingerprint(devices)
+
+    # the timestamps are unchanged by fingerprinting
+    assert [d.timestamp for d in devices] == ['1', '1']
+
+    # the fingerprint does not depend on order or timestamps
+    reordered = [
+        api.Device(timestamp='2', uid='2', kind='led', location=api.Location(rack='r', board='b')),
+        api.Device(timestamp='2', uid='1', kind='temperature', location=api.Location(rack='r', board='b')),
+    ]
+    assert util.devices_fingerprint(reordered) == fingerprint
+
+    # the fingerprint changes when the devices change
+    changed = [
+        api.Device(timestamp='1', uid='1', kind='temperature', location=api.Location(rack='r', board='b')),
+        api.Device(timestamp='1', uid='2', kind='led', location=api.Location(rack='r', board='c')),
+    ]
+    assert util.devices_fingerprint(changed) != fingerprint
+    assert util.devices_fingerprint(devices[:1]) != fingerprint
+
+
+def test_devices_fingerprint_empty():
+    """Fingerprint an empty set of devices."""
+
+    assert util.devices_fingerprint([]) == util.devices_fingerprint([])
@@ -0,0 +1,142 @@
+"""Test the 'synse.routes.core' Synse Server module's bulk read route."""
+# pylint: disable=redefined-outer-name,unused-argument
+
+import asynctest
+import pytest
+from sanic.response import HTTPResponse
+
+import synse.commands
+from synse import errors
+from synse.routes.core import bulk_read_route
+from synse.scheme.base_response import SynseResponse
+from tests import utils
+
+
+def mockreturn(devices=None, rack=None, board=None, device_type=None, kind=None, model=None,
+               info=None, deadline=None, max_age=None):
+    """Mock method that will be used in monkeypatching the command."""
+    r = SynseResponse()
+    r.data = {'devices': []}
+    return r
+
+
+@pytest.fixture()
+def mock_bulk_read(monkeypatch):
+    """Fixture to monkeypatch the underlying Synse command."""
+    mock = asynctest.CoroutineMock(synse.commands.bulk_read, side_effect=mockreturn)
+    monkeypatch.setattr(synse.commands, 'bulk_read', mock)
+    return mock_bulk_read
+
+
+@pytest.mark.asyncio
+async def test_synse_bulk_read_route_devices(mock_bulk_read, no_pretty_json):
+    """Test a successful bulk read of a list of devices."""
+
+    data = {
+        'devices': [
+            {'rack': 'rack-1', 'board': 'vec', 'device': '1'},
+            {'rack': 'rack-1', 'board': 'vec', 'device': '2'},
+        ]
+    }
+
+    result = await bulk_read_route(utils.make_request('/synse/read', data))
+
+    assert isinstance(result, HTTPResponse)
+    assert result.body == b'{"devices":[]}'
+    assert result.status == 200
+
+    _, kwargs = synse.commands.bulk_read.call_args
+    assert kwargs['devices'] == [('rack-1', 'vec', '1'), ('rack-1', 'vec', '2')]
+    assert kwargs['rack'] is None
+    assert kwargs['board'] is None
+    assert kwargs['device_type'] is None
+
+
+@pytest.mark.asyncio
+async def test_synse_bulk_read_route_selectors(mock_bulk_read, no_pretty_json):
+    """Test a successful bulk read of selected devices."""
+
+    data = {'rack': 'rack-1', 'board': 'vec', 'type': 'temperature', 'kind': 'foo.temperature'}
+
+    result = await bulk_read_route(
+        utils.make_request('/synse/read?max_age=1&timeout=5', data)
+    )
+    assert result.status == 200
+
+    _, kwargs = synse.commands.bulk_read.call_args
+    assert kwargs['devices'] is None
+    assert kwargs['rack'] == 'rack-1'
+    assert kwargs['board'] == 'vec'
+    assert kwargs['device_type'] == 'temperature'
+    assert kwargs['kind'] == 'foo.temperature'
+    assert kwargs['max_age'] == 1.0
+    assert kwargs['deadline'] is not None
+
+
+@pytest.mark.asyncio
+async def test_synse_bulk_read_route_get(mock_bulk_read, no_pretty_json):
+    """Test a successful bulk read of devices selected with query parameters."""
+
+    r = utils.make_request('/synse/read?type=temperature&model=max11610&info=Rack*&max_age=0')
+    r.method = 'GET'
+
+    result = await bulk_read_route(r)
+    assert result.status == 200
+
+    _, kwargs = synse.commands.bulk_read.call_args
+    assert kwargs['devices'] is None
+    assert kwargs['rack'] is None
+    assert kwargs['device_type'] == 'temperature'
+    assert kwargs['kind'] is None
+    assert kwargs['model'] == 'max11610'
+    assert kwargs['info'] == 'Rack*'
+    assert kwargs['max_age'] == 0.0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('url', ['/synse/read', '/synse/read?devices=1', '/synse/read?board=vec'])
+async def test_synse_bulk_read_route_get_bad_param(mock_bulk_read, no_pretty_json, url):
+    """A GET must select the devices with the supported query parameters."""
+
+    r = utils.make_request(url)
+    r.method = 'GET'
+
+    with pytest.raises(errors.InvalidArgumentsError):
+        await bulk_read_route(r)
+
+
+@pytest.mark.asyncio
+async def test_synse_bulk_read_route_bad_json(mock_bulk_read, no_pretty_json):
+    """Bulk read when invalid JSON is posted."""
+
+    r = utils.make_request('/synse/read')
+    r.body = '{{/.'
+
+    with pytest.raises(errors.InvalidJsonError):
+        await bulk_read_route(r)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    'data', [
+        {},
+        {'board': 'vec'},
+        {'devices': [], 'rack': 'rack-1'},
+        {'devices': [{'rack': 'rack-1', 'board': 'vec'}]},
+    ]
+)
+async def test_synse_bulk_read_route_bad_data(mock_bulk_read, no_pretty_json, data):
+    """Bulk read when invalid data is posted."""
+
+    with pytest.raises(errors.InvalidArgumentsError):
+        await bulk_read_route(utils.make_request('/synse/read', data))
+
+
+@pytest.mark.asyncio
+async def test_synse_bulk_read_route_bad_param(mock_bulk_read, no_pretty_json):
+    """Query parameters other than the max age and timeout are not supported."""
+
+    with pytest.raises(errors.InvalidArgumentsError):
+        await bulk_read_route(
+            utils.make_request('/synse/read?foo=bar', {'rack': 'rack-1'})
+        )
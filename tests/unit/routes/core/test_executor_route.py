@@ -0,0 +1,37 @@
+"""Test the 'synse.routes.core' Synse Server module's executor route."""
+# pylint: disable=redefined-outer-name,unused-argument
+
+import asynctest
+import pytest
+from sanic.response import HTTPResponse
+
+import synse.commands
+from synse.routes.core import executor_route
+from synse.scheme.base_response import SynseResponse
+from tests import utils
+
+
+def mockreturn():
+    """Mock method that will be used in monkeypatching the command."""
+    r = SynseResponse()
+    r.data = {'workers': 1}
+    return r
+
+
+@pytest.fixture()
+def mock_executor(monkeypatch):
+    """Fixture to monkeypatch the underlying Synse command."""
+    mock = asynctest.CoroutineMock(synse.commands.get_executor, side_effect=mockreturn)
+    monkeypatch.setattr(synse.commands, 'get_executor', mock)
+    return mock_executor
+
+
+@pytest.mark.asyncio
+async def test_synse_executor_route(mock_executor, no_pretty_json):
+    """Test successfully getting the executor state."""
+
+    result = await executor_route(utils.make_request('/synse/executor'))
+
+    assert isinstance(result, HTTPResponse)
+    assert result.body == b'{"workers":1}'
+    assert result.status == 200
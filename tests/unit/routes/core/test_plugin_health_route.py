@@ -0,0 +1,40 @@
+"""Test the 'synse.routes.core' Synse Server module's plugin health route."""
+# pylint: disable=redefined-outer-name,unused-argument
+
+import asynctest
+import pytest
+from sanic.response import HTTPResponse
+
+import synse.commands
+from synse.routes.core import plugin_health_route
+from synse.scheme.base_response import SynseResponse
+from tests import utils
+
+
+def mockreturn(plugin_id):
+    """Mock method that will be used in monkeypatching the command."""
+    r = SynseResponse()
+    r.data = {'plugin': plugin_id}
+    return r
+
+
+@pytest.fixture()
+def mock_plugin_health(monkeypatch):
+    """Fixture to monkeypatch the underlying Synse command."""
+    mock = asynctest.CoroutineMock(synse.commands.get_plugin_health, side_effect=mockreturn)
+    monkeypatch.setattr(synse.commands, 'get_plugin_health', mock)
+    return mock_plugin_health
+
+
+@pytest.mark.asyncio
+async def test_synse_plugin_health_route(mock_plugin_health, no_pretty_json):
+    """Test successfully getting the health of a plugin."""
+
+    result = await plugin_health_route(
+        utils.make_request('/synse/plugins/vaporio/test+tcp@localhost:5001/health'),
+        'vaporio/test+tcp@localhost:5001'
+    )
+
+    assert isinstance(result, HTTPResponse)
+    assert result.body == b'{"plugin":"vaporio\\/test+tcp@localhost:5001"}'
+    assert result.status == 200
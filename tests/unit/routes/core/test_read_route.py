@@ -6,12 +6,13 @@ import pytest
 from sanic.response import HTTPResponse
 
 import synse.commands
+from synse import errors
 from synse.routes.core import read_route
 from synse.scheme.base_response import SynseResponse
 from tests import utils
 
 
-def mockreturn(rack, board, device):
+def mockreturn(rack, board, device, deadline=None, max_age=None):
     """Mock method that will be used in monkeypatching the command."""
     r = SynseResponse()
     r.data = {'value': 1}
@@ -38,3 +39,54 @@ async def test_synse_read_route(mock_read, no_pretty_json):
     assert isinstance(result, HTTPResponse)
     assert result.body == b'{"value":1}'
     assert result.status == 200
+
+
+@pytest.mark.asyncio
+async def test_synse_read_route_deadline(mock_read, no_pretty_json):
+    """The request deadline is passed to the read command."""
+
+    result = await read_route(
+        utils.make_request('/synse/read?timeout=5'),
+        'rack-1', 'vec', '123456'
+    )
+    assert result.status == 200
+
+    _, kwargs = synse.commands.read.call_args
+    assert kwargs['deadline'] is not None
+
+
+@pytest.mark.asyncio
+async def test_synse_read_route_max_age(mock_read, no_pretty_json):
+    """The max age is passed to the read command."""
+
+    result = await read_route(
+        utils.make_request('/synse/read?max_age=0.5'),
+        'rack-1', 'vec', '123456'
+    )
+    assert result.status == 200
+
+    _, kwargs = synse.commands.read.call_args
+    assert kwargs['max_age'] == 0.5
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('max_age', ['-1', 'foo', 'inf'])
+async def test_synse_read_route_bad_max_age(mock_read, no_pretty_json, max_age):
+    """An invalid max age is rejected."""
+
+    with pytest.raises(errors.InvalidArgumentsError):
+        await read_route(
+            utils.make_request('/synse/read?max_age={}'.format(max_age)),
+            'rack-1', 'vec', '123456'
+        )
+
+
+@pytest.mark.asyncio
+async def test_synse_read_route_bad_param(mock_read, no_pretty_json):
+    """Query parameters other than the timeout are not supported."""
+
+    with pytest.raises(errors.InvalidArgumentsError):
+        await read_route(
+            utils.make_request('/synse/read?foo=bar'),
+            'rack-1', 'vec', '123456'
+        )
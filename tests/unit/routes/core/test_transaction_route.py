@@ -11,7 +11,7 @@ from synse.scheme.base_response import SynseResponse
 from tests import utils
 
 
-def mockreturn(transaction):
+def mockreturn(transaction, deadline=None):
     """Mock method that will be used in monkeypatching the command."""
     r = SynseResponse()
     r.data = {'id': transaction}
@@ -12,7 +12,7 @@ from synse.scheme.base_response import SynseResponse
 from tests import utils
 
 
-def mockreturn(rack, board, device, data):
+def mockreturn(rack, board, device, data, deadline=None):
     """Mock method that will be used in monkeypatching the command."""
     r = SynseResponse()
     r.data = {'r': rack, 'b': board, 'd': device}
@@ -0,0 +1,80 @@
+"""Test the 'synse.scheme.bulk_read' Synse Server module."""
+
+from synse_grpc import api
+
+from synse import errors
+from synse.planner import DUMP, ReadPlan
+from synse.scheme.bulk_read import BulkReadResponse
+
+
+def test_bulk_read_scheme():
+    """Test that the bulk read scheme matches the expected."""
+
+    dev = api.Device(
+        kind='thermistor',
+        output=[
+            api.Output(
+                type='temperature',
+                unit=api.Unit(name='celsius', symbol='C'),
+            )
+        ]
+    )
+    reading = api.Reading(timestamp='november', type='temperature', int64_value=10)
+
+    response_scheme = BulkReadResponse([
+        ('rack-1', 'vec', '1', (dev, [reading], 1.23456)),
+        ('rack-1', 'vec', '2', errors.DeviceNotFoundError('not found')),
+    ])
+
+    assert response_scheme.data == {
+        'devices': [
+            {
+                'location': {'rack': 'rack-1', 'board': 'vec', 'device': '1'},
+                'kind': 'thermistor',
+                'data': [
+                    {
+                        'value': 10,
+                        'timestamp': 'november',
+                        'unit': {'symbol': 'C', 'name': 'celsius'},
+                        'type': 'temperature',
+                        'info': '',
+                    }
+                ],
+                'age': 1.235,
+            },
+            {
+                'location': {'rack': 'rack-1', 'board': 'vec', 'device': '2'},
+                'error': {
+                    'http_code': 404,
+                    'error_id': errors.DEVICE_NOT_FOUND,
+                    'description': 'device not found',
+                    'context': 'not found',
+                },
+            },
+        ],
+        'read': 1,
+        'failed': 1,
+    }
+
+
+def test_bulk_read_scheme_plans(no_pretty_json):
+    """The read plans are given in the response headers."""
+
+    response_scheme = BulkReadResponse([], plans=[
+        ReadPlan('vaporio/foo+unix@tmp/foo', DUMP, 12, 20),
+        ReadPlan('vaporio/bar+tcp@localhost:5001', 'read', 2, 20, 1, 0.0123, 0.1),
+    ])
+
+    resp = response_scheme.to_json()
+    assert resp.headers['X-Synse-Read-Plan'] == (
+        'vaporio/foo+unix@tmp/foo strategy=dump targets=12 devices=20 cached=0, '
+        'vaporio/bar+tcp@localhost:5001 strategy=read targets=2 devices=20 cached=1 '
+        'read_cost=0.012 dump_cost=0.100'
+    )
+
+
+def test_bulk_read_scheme_no_plans(no_pretty_json):
+    """There is no read plan header when nothing was read."""
+
+    resp = BulkReadResponse([]).to_json()
+    assert 'X-Synse-Read-Plan' not in resp.headers
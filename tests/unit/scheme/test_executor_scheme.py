@@ -0,0 +1,16 @@
+"""Test the 'synse.scheme.executor' Synse Server module."""
+
+from synse.scheme.executor import ExecutorResponse
+
+
+def test_executor_scheme():
+    """Test that the executor scheme matches the expected."""
+    data = {
+        'workers': 32,
+        'plugin_limit': 8,
+        'global': {'limit': 32, 'active': 0, 'waiting': 0, 'completed': 0, 'failed': 0},
+        'plugins': {},
+    }
+    response_scheme = ExecutorResponse(data=data)
+
+    assert response_scheme.data == data
@@ -23,3 +23,13 @@ def test_plugins_scheme():
     assert response_scheme.data[0]['name'] == 'foo'
     assert response_scheme.data[0]['network'] == 'unix'
     assert response_scheme.data[0]['address'] == '/tmp/foo'
+
+
+def test_plugins_scheme_to_json():
+    """Test that the plugins scheme is not converted to a conditional response,
+    since its plugin health changes with every health check."""
+
+    resp = PluginsResponse(data=[]).to_json()
+
+    assert resp.status == 200
+    assert 'ETag' not in resp.headers
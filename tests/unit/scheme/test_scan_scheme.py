@@ -1,6 +1,8 @@
 """Test the 'synse.scheme.scan' Synse Server module."""
+# pylint: disable=unused-argument
 
 from synse.scheme.scan import ScanResponse
+from tests import utils
 
 
 def test_scan_scheme():
@@ -20,3 +22,44 @@ def test_scan_scheme():
 
     # the scan response just takes in whatever data it is given.
     assert response_scheme.data == data
+
+
+def test_scan_scheme_errors():
+    """Test that the scan scheme includes plugin errors, without modifying the given data."""
+
+    data = {'racks': []}
+    errs = [{'plugin': 'foo', 'error': 'timeout', 'message': 'test'}]
+
+    response_scheme = ScanResponse(data, errors=errs)
+
+    assert response_scheme.data == {'racks': [], 'errors': errs}
+    assert data == {'racks': []}
+
+
+def test_scan_scheme_to_json(no_pretty_json):
+    """Test that the scan scheme is converted to a conditional response."""
+
+    response_scheme = ScanResponse({'racks': []})
+    resp = response_scheme.to_json()
+
+    assert resp.status == 200
+    assert resp.body == b'{"racks":[]}'
+    assert 'ETag' in resp.headers
+
+    r = utils.make_request('/synse/scan', headers={'If-None-Match': resp.headers['ETag']})
+    assert response_scheme.to_json(r).status == 304
+
+
+def test_scan_scheme_to_json_encoded():
+    """Test that the scan scheme uses a given encoding, unless there are errors."""
+
+    encoded = (b'{"racks":["cached"]}', '"abc"')
+
+    resp = ScanResponse({'racks': []}, encoded=encoded).to_json()
+    assert resp.body == b'{"racks":["cached"]}'
+    assert resp.headers['ETag'] == '"abc"'
+
+    errs = [{'plugin': 'foo', 'error': 'timeout', 'message': 'test'}]
+    resp = ScanResponse({'racks': []}, errors=errs, encoded=encoded).to_json()
+    assert resp.body != b'{"racks":["cached"]}'
+    assert resp.headers['ETag'] != '"abc"'
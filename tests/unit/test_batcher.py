@@ -0,0 +1,131 @@
+"""Test the 'synse.batcher' Synse Server module."""
+# pylint: disable=redefined-outer-name
+
+import asyncio
+
+import asynctest
+import pytest
+
+from synse import batcher, config
+
+
+class MockPlugin:
+    """A mock plugin."""
+
+    @staticmethod
+    def id():
+        """Get the id of the plugin."""
+        return 'vaporio/foo+unix@tmp/foo'
+
+
+@pytest.fixture()
+def window():
+    """Fixture to enable read batching."""
+    config.options.set('read.batch_window', 0.01)
+
+
+async def read_many(plugin_handler, targets, max_age):
+    """Mock batch read, which gives each device its id as its result."""
+    return {target: target[2] for target, _dev in targets}
+
+
+def test_window_default():
+    """Batching is disabled by default."""
+    assert batcher.window() == 0
+
+
+def test_window():
+    """Get the configured batch window."""
+    config.options.set('read.batch_window', 0.005)
+    assert batcher.window() == 0.005
+
+
+@pytest.mark.asyncio
+async def test_read_batched(window):
+    """Reads within the window are read together."""
+    mock = asynctest.CoroutineMock(side_effect=read_many)
+    p = MockPlugin()
+
+    results = await asyncio.gather(
+        batcher.read(p, ('rack-1', 'vec', '1'), 'dev-1', mock),
+        batcher.read(p, ('rack-1', 'vec', '2'), 'dev-2', mock),
+        batcher.read(p, ('rack-1', 'vec', '1'), 'dev-1', mock),
+    )
+
+    assert results == ['1', '2', '1']
+    assert mock.call_count == 1
+    args, _ = mock.call_args
+    assert args[0] is p
+    assert sorted(args[1]) == [
+        (('rack-1', 'vec', '1'), 'dev-1'),
+        (('rack-1', 'vec', '2'), 'dev-2'),
+    ]
+    assert args[2] is None
+    assert batcher._batches == {}
+
+    # a read after the window closed starts a new batch
+    assert await batcher.read(p, ('rack-1', 'vec', '3'), 'dev-3', mock) == '3'
+    assert mock.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_read_batched_max_age(window):
+    """A batch is read with the strictest maximum age of its callers."""
+    mock = asynctest.CoroutineMock(side_effect=read_many)
+    p = MockPlugin()
+
+    await asyncio.gather(
+        batcher.read(p, ('rack-1', 'vec', '1'), 'dev-1', mock, max_age=30),
+        batcher.read(p, ('rack-1', 'vec', '2'), 'dev-2', mock),
+        batcher.read(p, ('rack-1', 'vec', '3'), 'dev-3', mock, max_age=5),
+    )
+
+    args, _ = mock.call_args
+    assert args[2] == 5
+
+
+@pytest.mark.asyncio
+async def test_read_batched_error(window):
+    """An error reading the batch is raised to every waiter."""
+    mock = asynctest.CoroutineMock(side_effect=ValueError)
+    p = MockPlugin()
+
+    results = await asyncio.gather(
+        batcher.read(p, ('rack-1', 'vec', '1'), 'dev-1', mock),
+        batcher.read(p, ('rack-1', 'vec', '2'), 'dev-2', mock),
+        return_exceptions=True,
+    )
+    assert all(isinstance(r, ValueError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_read_batched_timeout():
+    """A batch is cancelled once every waiter has timed out."""
+    config.options.set('read.batch_window', 10)
+    mock = asynctest.CoroutineMock(side_effect=read_many)
+    p = MockPlugin()
+
+    with pytest.raises(asyncio.TimeoutError):
+        await batcher.read(p, ('rack-1', 'vec', '1'), 'dev-1', mock, timeout=0.01)
+
+    assert batcher._batches == {}
+    await asyncio.sleep(0.02)
+    assert mock.call_count == 0
+
+
+@pytest.mark.asyncio
+async def test_read_batched_timeout_read(window):
+    """The read of a batch is cancelled once every waiter has timed out."""
+    cancelled = asyncio.Event()
+
+    async def _read_many(plugin_handler, targets, max_age):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(asyncio.TimeoutError):
+        await batcher.read(MockPlugin(), ('rack-1', 'vec', '1'), 'dev-1', _read_many, timeout=0.05)
+
+    await asyncio.wait_for(cancelled.wait(), 1)
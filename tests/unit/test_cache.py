@@ -1,15 +1,22 @@
 """Test the 'synse.cache' Synse Server module."""
 # pylint: disable=redefined-outer-name,unused-argument,line-too-long
 
+import asyncio
+import time
+
 import aiocache
 import asynctest
 import grpc
 import pytest
+import ujson
 from synse_grpc import api
 
-from synse import cache, errors, plugin
+from synse import cache, config, errors, plugin
 from synse.proto import client
 
+# The namespace of the device info cache partition for the 'vaporio/foo' test plugin.
+FOO_DEVICES_NS = 'devices/vaporio/foo+tcp@localhost:9999'
+
 # -- Helper Methods ---
 
 
@@ -51,19 +58,19 @@ def mock_get_device_info_cache():
     }
 
 
-def mock_client_devices(rack=None, board=None):
+async def mock_client_devices(rack=None, board=None):
     """Mock method for the gRPC client's devices method."""
     # reuse the Device defined above
     mir = mock_get_device_info_cache()['rack-1-vec-12345']
     return [mir]
 
 
-def mock_client_device_info_empty(rack=None, board=None):
+async def mock_client_device_info_empty(rack=None, board=None):
     """Mock method for the gRPC client's Devices method that contains empty Device list."""
     return []
 
 
-def mock_client_device_info_fail(rack=None, board=None):
+async def mock_client_device_info_fail(rack=None, board=None):
     """Mock method for the gRPC client's Devices method that is intended to fail."""
     raise grpc.RpcError()
 
@@ -82,9 +89,24 @@ def patch_device_info(monkeypatch):
 def patch_register_plugins(monkeypatch):
     """Fixture to monkeypatch the register_plugins method, so it does nothing, as
     plugins are manually registered for test cases."""
-    def do_nothing():
+    async def do_nothing():
         pass
-    monkeypatch.setattr(cache, 'register_plugins', do_nothing)
+    monkeypatch.setattr(plugin, 'register_plugins', do_nothing)
+
+
+@pytest.fixture()
+def foo_plugin():
+    """Fixture to create and register a plugin which provides a single device."""
+    p = plugin.Plugin(
+        metadata=api.Metadata(
+            name='foo',
+            tag='vaporio/foo'
+        ),
+        address='localhost:9999',
+        plugin_client=client.PluginTCPClient('localhost:9999')
+    )
+    p.client.devices = mock_client_devices
+    return p
 
 
 @pytest.fixture()
@@ -130,30 +152,31 @@ async def test_clear_cache():
 
 
 @pytest.mark.asyncio
-async def test_clear_all_meta_caches():
+async def test_clear_all_meta_caches(patch_register_plugins, foo_plugin, clear_caches):
     """Clear all meta-info caches."""
 
-    meta = aiocache.SimpleMemoryCache(namespace=cache.NS_DEVICE_INFO)
-    scan = aiocache.SimpleMemoryCache(namespace=cache.NS_SCAN)
-    info = aiocache.SimpleMemoryCache(namespace=cache.NS_INFO)
+    async def capabilities():
+        return [api.DeviceCapability(kind='temperature', outputs=['temperature'])]
+    foo_plugin.client.capabilities = capabilities
+
     other = aiocache.SimpleMemoryCache(namespace='other')
+    assert await other.set('key', 'value')
 
-    # first, populate the test caches
-    for c in [meta, scan, info, other]:
-        ok = await c.set('key', 'value')
-        assert ok
+    # first, populate the meta caches
+    assert await cache.get_device_info_cache()
+    assert await cache.get_capabilities_cache()
 
     # clear the meta caches
     await cache.clear_all_meta_caches()
 
-    # now, the meta caches should be empty, but the other cache
-    # should not be affected.
-    for c in [meta, scan, info]:
-        val = await c.get('key')
-        assert val is None
+    # now, the meta caches should be empty and expired, but the other
+    # cache should not be affected.
+    for namespace, view in [(cache.NS_DEVICE_INFO, cache._devices),
+                            (cache.NS_CAPABILITIES, cache._capabilities)]:
+        assert view.partitions == {}
+        assert cache._freshness(cache._partition_ns(namespace, foo_plugin.id())) == cache._EXPIRED
 
-    val = await other.get('key')
-    assert val == 'value'
+    assert await other.get('key') == 'value'
 
 
 @pytest.mark.asyncio
@@ -227,11 +250,187 @@ async def test_add_transaction_existing(clear_caches):
     }
 
 
+@pytest.mark.asyncio
+async def test_get_readings_coalesced():
+    """Concurrent reads of a device share a single read."""
+    event = asyncio.Event()
+    read = asynctest.CoroutineMock()
+
+    async def _read():
+        await read()
+        await event.wait()
+        return ['reading']
+
+    tasks = [
+        asyncio.ensure_future(cache.get_readings('rack-1', 'vec', '123', _read, max_age=0))
+        for _ in range(3)
+    ]
+    await asyncio.sleep(0)
+    assert len(cache._reads) == 1
+
+    event.set()
+    results = await asyncio.gather(*tasks)
+
+    assert results == [(['reading'], 0.0)] * 3
+    assert read.call_count == 1
+    assert cache._reads == {}
+
+
+@pytest.mark.asyncio
+async def test_get_readings_cached():
+    """Readings no older than the max age are served from the cache."""
+    read = asynctest.CoroutineMock(return_value=['reading'])
+
+    readings, age = await cache.get_readings('rack-1', 'vec', '123', read, max_age=10)
+    assert readings == ['reading']
+    assert age == 0.0
+
+    readings, age = await cache.get_readings('rack-1', 'vec', '123', read, max_age=10)
+    assert readings == ['reading']
+    assert 0 <= age <= 10
+    assert read.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_get_readings_expired():
+    """Readings older than the max age are not served from the cache."""
+    read = asynctest.CoroutineMock(return_value=['new'])
+    cache._readings['rack-1-vec-123'] = (time.monotonic() - 5, ['old'])
+
+    readings, age = await cache.get_readings('rack-1', 'vec', '123', read, max_age=1)
+    assert readings == ['new']
+    assert age == 0.0
+    assert read.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_get_readings_max_age_zero():
+    """A max age of 0 always reads the device."""
+    read = asynctest.CoroutineMock(return_value=['new'])
+    cache._readings['rack-1-vec-123'] = (time.monotonic(), ['old'])
+
+    readings, _ = await cache.get_readings('rack-1', 'vec', '123', read, max_age=0)
+    assert readings == ['new']
+    assert read.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_get_readings_configured_ttl():
+    """Without a max age, the configured readings cache TTL is used."""
+    config.options.set('cache.readings.ttl', 0.5)
+    read = asynctest.CoroutineMock(return_value=['new'])
+    cache._readings['rack-1-vec-123'] = (time.monotonic(), ['old'])
+
+    readings, _ = await cache.get_readings('rack-1', 'vec', '123', read)
+    assert readings == ['old']
+    assert read.call_count == 0
+
+
+@pytest.mark.asyncio
+async def test_get_readings_error_not_cached():
+    """A failed read is raised to every caller and is not cached."""
+    read = asynctest.CoroutineMock(side_effect=ValueError('failed'))
+
+    with pytest.raises(ValueError):
+        await cache.get_readings('rack-1', 'vec', '123', read, max_age=10)
+
+    assert cache._readings == {}
+    assert cache._reads == {}
+
+
+def test_peek_readings():
+    """Peek at the cached readings of a device."""
+    assert cache.peek_readings('rack-1', 'vec', '123', max_age=10) is None
+
+    cache.put_readings('rack-1', 'vec', '123', ['reading'], max_age=10)
+
+    readings, age = cache.peek_readings('rack-1', 'vec', '123', max_age=10)
+    assert readings == ['reading']
+    assert 0 <= age <= 10
+
+    assert cache.peek_readings('rack-1', 'vec', '123', max_age=0) is None
+    assert cache.peek_readings('rack-1', 'vec', '123') is None
+
+
+def test_put_readings_age():
+    """Cache readings which were taken some time ago."""
+    cache.put_readings('rack-1', 'vec', '123', ['reading'], age=5, max_age=10)
+
+    _, age = cache.peek_readings('rack-1', 'vec', '123', max_age=10)
+    assert 5 <= age < 6
+    assert cache.peek_readings('rack-1', 'vec', '123', max_age=4) is None
+
+
+def test_put_readings_not_served():
+    """Readings which could never be served are not cached."""
+    cache.put_readings('rack-1', 'vec', '123', ['reading'])
+    cache.put_readings('rack-1', 'vec', '456', ['reading'], max_age=0)
+
+    assert cache._readings == {}
+
+
+def test_put_readings_pruned():
+    """Readings older than any maximum age readings are cached for are pruned."""
+    cache.put_readings('rack-1', 'vec', '123', ['reading'], max_age=5)
+    cache.put_readings('rack-1', 'vec', '456', ['reading'], age=10, max_age=5)
+    cache._readings_pruned_at = 0.0
+
+    cache.put_readings('rack-1', 'vec', '789', ['reading'], age=3, max_age=2)
+    assert sorted(cache._readings) == ['rack-1-vec-123', 'rack-1-vec-789']
+
+
+@pytest.mark.asyncio
+async def test_get_readings_not_served():
+    """The readings of a device read for a max age of 0 are not cached."""
+    read = asynctest.CoroutineMock(return_value=['new'])
+
+    await cache.get_readings('rack-1', 'vec', '123', read, max_age=0)
+    assert cache._readings == {}
+
+
+@pytest.mark.asyncio
+async def test_get_readings_timeout_cancels():
+    """A read is cancelled once every caller waiting on it has timed out."""
+    event = asyncio.Event()
+
+    async def _read():
+        await event.wait()
+        return ['reading']
+
+    with pytest.raises(asyncio.TimeoutError):
+        await cache.get_readings('rack-1', 'vec', '123', _read, max_age=0, timeout=0.01)
+
+    await asyncio.sleep(0)
+    assert cache._reads == {}
+    assert cache._readings == {}
+
+
+@pytest.mark.asyncio
+async def test_get_readings_timeout_other_waiter():
+    """A read is not cancelled while a caller is still waiting on it."""
+    event = asyncio.Event()
+
+    async def _read():
+        await event.wait()
+        return ['reading']
+
+    waiting = asyncio.ensure_future(
+        cache.get_readings('rack-1', 'vec', '123', _read, max_age=0)
+    )
+    await asyncio.sleep(0)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await cache.get_readings('rack-1', 'vec', '123', _read, max_age=0, timeout=0.01)
+
+    event.set()
+    assert await waiting == (['reading'], 0.0)
+
+
 @pytest.mark.asyncio
 async def test_get_device_meta_ok(patch_device_info, clear_caches):
     """Get device info."""
     # add a plugin record to for the device
-    await cache._plugins_cache.set(cache.PLUGINS_CACHE_KEY, {'rack-1-vec-12345': 'test-plugin'})
+    cache._devices.plugins = {'rack-1-vec-12345': 'test-plugin'}
 
     plugin_name, dev = await cache.get_device_info('rack-1', 'vec', '12345')
     assert plugin_name == 'test-plugin'
@@ -372,6 +571,60 @@ async def test_get_device_info_cache_partial_failure(patch_register_plugins, plu
     assert isinstance(meta, dict)
     assert len(meta) == 1  # two plugins registered, but only one successful
 
+    errs = await cache.get_device_info_errors()
+    assert errs == [{
+        'plugin': 'vaporio/bar+tcp@localhost:9998',
+        'error': 'failed',
+        'message': str(grpc.RpcError()),
+    }]
+
+
+@pytest.mark.asyncio
+async def test_get_device_info_cache_budget_exceeded(patch_register_plugins, plugin_context, clear_caches):
+    """Get the device info cache when a plugin does not respond within the rebuild budget."""
+
+    async def hang(rack=None, board=None):
+        await asyncio.sleep(10)
+
+    p = plugin.Plugin(
+        metadata=api.Metadata(
+            name='foo',
+            tag='vaporio/foo'
+        ),
+        address='localhost:9999',
+        plugin_client=client.PluginTCPClient('localhost:9999')
+    )
+    p.client.devices = mock_client_devices
+
+    p = plugin.Plugin(
+        metadata=api.Metadata(
+            name='bar',
+            tag='vaporio/bar'
+        ),
+        address='localhost:9998',
+        plugin_client=client.PluginTCPClient('localhost:9998')
+    )
+    p.client.devices = hang
+
+    config.options.set('cache.meta.budget', 10)
+    config.options.set('grpc.timeout', 0.1)
+
+    meta = await cache.get_device_info_cache()
+    assert len(meta) == 1
+
+    errs = await cache.get_device_info_errors()
+    assert len(errs) == 1
+    assert errs[0]['plugin'] == 'vaporio/bar+tcp@localhost:9998'
+    assert errs[0]['error'] == 'timeout'
+
+
+@pytest.mark.asyncio
+async def test_get_device_info_errors_none(clear_caches):
+    """Get the device info errors when the cache has not been built."""
+
+    errs = await cache.get_device_info_errors()
+    assert errs == []
+
 
 @pytest.mark.asyncio
 async def test_get_device_info_cache_no_plugins(clear_caches, plugin_context):
@@ -382,7 +635,280 @@ async def test_get_device_info_cache_no_plugins(clear_caches, plugin_context):
 
 
 @pytest.mark.asyncio
-async def test_get_scan_cache_ok(patch_device_info, clear_caches):
+async def test_get_device_info_cache_concurrent(patch_register_plugins, plugin_context, clear_caches):
+    """Concurrently get the device info cache when it needs to be rebuilt. Only
+    a single rebuild should happen, with all callers sharing its result."""
+
+    calls = []
+
+    async def devices(rack=None, board=None):
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return await mock_client_devices()
+
+    p = plugin.Plugin(
+        metadata=api.Metadata(
+            name='foo',
+            tag='vaporio/foo'
+        ),
+        address='localhost:9999',
+        plugin_client=client.PluginTCPClient('localhost:9999')
+    )
+    p.client.devices = devices
+
+    results = await asyncio.gather(
+        cache.get_device_info_cache(),
+        cache.get_device_info_cache(),
+        cache.get_scan_cache(),
+        cache.get_resource_info_cache(),
+    )
+
+    assert len(calls) == 1
+    assert results[0] is results[1]
+    assert 'rack-1-vec-12345' in results[0]
+    validate_scan_cache(results[2], 'rack-1', 'vec', '12345')
+    assert 'rack-1' in results[3]
+    assert cache._rebuilds == {}
+
+
+@pytest.mark.asyncio
+async def test_get_device_info_cache_concurrent_failure(patch_register_plugins, plugin_context, clear_caches):
+    """Concurrently get the device info cache when the rebuild fails. All
+    callers should get the error, and a subsequent call should rebuild again."""
+
+    calls = []
+
+    async def devices(rack=None, board=None):
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        raise grpc.RpcError()
+
+    p = plugin.Plugin(
+        metadata=api.Metadata(
+            name='foo',
+            tag='vaporio/foo'
+        ),
+        address='localhost:9999',
+        plugin_client=client.PluginTCPClient('localhost:9999')
+    )
+    p.client.devices = devices
+
+    results = await asyncio.gather(
+        cache.get_device_info_cache(),
+        cache.get_device_info_cache(),
+        return_exceptions=True,
+    )
+
+    assert len(calls) == 1
+    for r in results:
+        assert isinstance(r, errors.InternalApiError)
+
+    with pytest.raises(errors.InternalApiError):
+        await cache.get_device_info_cache()
+    assert len(calls) == 2
+
+
+def make_versioned_plugin(versions):
+    """Helper to create a plugin whose devices come from a list of device
+    uids, where the last list in `versions` is the current one."""
+    p = plugin.Plugin(
+        metadata=api.Metadata(
+            name='foo',
+            tag='vaporio/foo'
+        ),
+        address='localhost:9999',
+        plugin_client=client.PluginTCPClient('localhost:9999')
+    )
+
+    async def devices(rack=None, board=None):
+        uids = versions[-1]
+        if uids is None:
+            raise grpc.RpcError()
+        return [make_device_info_response('rack-1', 'vec', uid) for uid in uids]
+
+    p.client.devices = devices
+    return p
+
+
+@pytest.mark.asyncio
+async def test_get_device_info_cache_expired(patch_register_plugins, plugin_context, clear_caches):
+    """Get the device info cache when it is expired and stale serving is disabled."""
+
+    versions = [['1']]
+    make_versioned_plugin(versions)
+
+    meta = await cache.get_device_info_cache()
+    assert list(meta.keys()) == ['rack-1-vec-1']
+
+    versions.append(['2'])
+    cache._fresh_until[FOO_DEVICES_NS] = 0
+
+    meta = await cache.get_device_info_cache()
+    assert list(meta.keys()) == ['rack-1-vec-2']
+
+
+@pytest.mark.asyncio
+async def test_get_device_info_cache_stale_while_revalidate(patch_register_plugins, plugin_context, clear_caches):
+    """Get the device info cache when it is expired and stale serving is enabled."""
+    config.options.set('cache.meta.stale_ttl', 60)
+
+    versions = [['1']]
+    make_versioned_plugin(versions)
+
+    meta = await cache.get_device_info_cache()
+    assert list(meta.keys()) == ['rack-1-vec-1']
+
+    versions.append(['2'])
+    cache._fresh_until[FOO_DEVICES_NS] = time.monotonic() - 1
+
+    # the stale entry is served, and a refresh is started
+    meta = await cache.get_device_info_cache()
+    assert list(meta.keys()) == ['rack-1-vec-1']
+    assert FOO_DEVICES_NS in cache._rebuilds
+
+    await cache._rebuilds[FOO_DEVICES_NS]
+
+    meta = await cache.get_device_info_cache()
+    assert list(meta.keys()) == ['rack-1-vec-2']
+
+
+@pytest.mark.asyncio
+async def test_get_scan_cache_after_device_info_refresh(patch_register_plugins, plugin_context, clear_caches):
+    """The scan cache is rebuilt once the device info it was built from is refreshed."""
+
+    versions = [['1']]
+    make_versioned_plugin(versions)
+
+    scan_cache = await cache.get_scan_cache()
+    validate_scan_cache(scan_cache, 'rack-1', 'vec', '1')
+
+    versions.append(['2'])
+    cache._fresh_until[FOO_DEVICES_NS] = 0
+    await cache.get_device_info_cache()
+
+    scan_cache = await cache.get_scan_cache()
+    validate_scan_cache(scan_cache, 'rack-1', 'vec', '2')
+
+
+@pytest.mark.asyncio
+async def test_get_device_info_cache_refresh_ahead(patch_register_plugins, plugin_context, clear_caches):
+    """Get the device info cache when it is within the refresh-ahead window."""
+    config.options.set('cache.meta.ttl', 20)
+    config.options.set('cache.meta.refresh_ahead', 5)
+
+    versions = [['1']]
+    make_versioned_plugin(versions)
+
+    meta = await cache.get_device_info_cache()
+    assert list(meta.keys()) == ['rack-1-vec-1']
+
+    versions.append(['2'])
+    cache._fresh_until[FOO_DEVICES_NS] = time.monotonic() + 2
+
+    # the entry is fresh, so it is served, but a refresh is started
+    meta = await cache.get_device_info_cache()
+    assert list(meta.keys()) == ['rack-1-vec-1']
+
+    await cache._rebuilds[FOO_DEVICES_NS]
+
+    meta = await cache.get_device_info_cache()
+    assert list(meta.keys()) == ['rack-1-vec-2']
+
+
+@pytest.mark.asyncio
+async def test_get_device_info_cache_last_known_good(patch_register_plugins, plugin_context, clear_caches, monkeypatch):
+    """Get the device info cache when all plugins fail and there is last known good data."""
+    monkeypatch.setattr(cache, '_last_known_good', {})
+    config.options.set('cache.meta.last_known_good', True)
+
+    versions = [['1']]
+    make_versioned_plugin(versions)
+
+    meta = await cache.get_device_info_cache()
+    assert list(meta.keys()) == ['rack-1-vec-1']
+
+    versions.append(None)
+    await cache.clear_all_meta_caches()
+
+    meta = await cache.get_device_info_cache()
+    assert list(meta.keys()) == ['rack-1-vec-1']
+
+    errs = await cache.get_device_info_errors()
+    assert len(errs) == 1
+    assert errs[0]['plugin'] == 'vaporio/foo+tcp@localhost:9999'
+
+
+@pytest.mark.asyncio
+async def test_get_device_info_cache_last_known_good_disabled(patch_register_plugins, plugin_context, clear_caches, monkeypatch):
+    """Get the device info cache when all plugins fail and last known good serving is disabled."""
+    monkeypatch.setattr(cache, '_last_known_good', {})
+
+    versions = [['1']]
+    make_versioned_plugin(versions)
+
+    await cache.get_device_info_cache()
+
+    versions.append(None)
+    await cache.clear_all_meta_caches()
+
+    with pytest.raises(errors.InternalApiError):
+        await cache.get_device_info_cache()
+
+
+@pytest.mark.asyncio
+async def test_refresh_all_meta_caches(patch_register_plugins, plugin_context, clear_caches):
+    """Refresh the meta caches when stale serving is disabled; they are cleared."""
+
+    versions = [['1']]
+    make_versioned_plugin(versions)
+
+    await cache.get_device_info_cache()
+    await cache.refresh_all_meta_caches()
+
+    assert cache._devices.devices == {}
+
+
+@pytest.mark.asyncio
+async def test_refresh_all_meta_caches_stale(patch_register_plugins, plugin_context, clear_caches):
+    """Refresh the meta caches when stale serving is enabled; they are rebuilt in place."""
+    config.options.set('cache.meta.stale_ttl', 60)
+
+    versions = [['1']]
+    make_versioned_plugin(versions)
+
+    await cache.get_device_info_cache()
+
+    versions.append(['2'])
+    await cache.refresh_all_meta_caches()
+
+    # the existing entries are still served while the refresh is in flight
+    assert FOO_DEVICES_NS in cache._rebuilds
+    assert cache._freshness(FOO_DEVICES_NS) != cache._EXPIRED
+    assert list(cache._devices.devices.keys()) == ['rack-1-vec-1']
+
+    await asyncio.gather(*cache._rebuilds.values())
+    assert list(cache._devices.devices.keys()) == ['rack-1-vec-2']
+
+
+@pytest.mark.asyncio
+async def test_singleflight_waiter_cancelled(clear_caches):
+    """Cancelling one waiter on a rebuild does not cancel the rebuild for the others."""
+
+    async def rebuild():
+        await asyncio.sleep(0.05)
+        return 'value'
+
+    first = asyncio.ensure_future(cache._singleflight('test', rebuild))
+    second = asyncio.ensure_future(cache._singleflight('test', rebuild))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    assert await second == 'value'
+    assert first.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_get_scan_cache_ok(patch_register_plugins, foo_plugin, clear_caches):
     """Get the scan cache."""
 
     scan_cache = await cache.get_scan_cache()
@@ -416,7 +942,7 @@ async def test_get_scan_cache_empty(plugin_context, clear_caches):
 
 
 @pytest.mark.asyncio
-async def test_get_scan_cache_exist(patch_device_info, clear_caches):
+async def test_get_scan_cache_exist(patch_register_plugins, foo_plugin, clear_caches):
     """Get the existing scan cache."""
 
     # similar to test_get_device_info_cache_exist(),
@@ -430,7 +956,7 @@ async def test_get_scan_cache_exist(patch_device_info, clear_caches):
 
 
 @pytest.mark.asyncio
-async def test_get_resource_info_cache_ok(patch_device_info, clear_caches):
+async def test_get_resource_info_cache_ok(patch_register_plugins, foo_plugin, clear_caches):
     """Get the resource info cache."""
 
     info_cache = await cache.get_resource_info_cache()
@@ -464,7 +990,7 @@ async def test_get_resource_info_cache_empty(plugin_context, clear_caches):
 
 
 @pytest.mark.asyncio
-async def test_get_resource_info_cache_exist(patch_device_info, clear_caches):
+async def test_get_resource_info_cache_exist(patch_register_plugins, foo_plugin, clear_caches):
     """Get the existing info cache."""
 
     # similar to test_get_device_info_cache_exist(),
@@ -477,6 +1003,406 @@ async def test_get_resource_info_cache_exist(patch_device_info, clear_caches):
     validate_info_cache(second_info_cache, 'rack-1', 'vec', '12345')
 
 
+@pytest.mark.asyncio
+async def test_get_device_info_cache_partition_refresh(patch_register_plugins, plugin_context, clear_caches):
+    """Only the plugin whose device info partition expired is asked for its devices again,
+    and only its boards are rebuilt in the scan and info views."""
+
+    calls = {'foo': 0, 'bar': 0}
+
+    def make(name, address, board):
+        p = plugin.Plugin(
+            metadata=api.Metadata(name=name, tag='vaporio/' + name),
+            address=address,
+            plugin_client=client.PluginTCPClient(address)
+        )
+
+        async def devices(rack=None, board_=None):
+            calls[name] += 1
+            return [make_device_info_response('rack-1', board, str(calls[name]))]
+        p.client.devices = devices
+        return p
+
+    make('foo', 'localhost:9999', 'board-foo')
+    make('bar', 'localhost:9998', 'board-bar')
+
+    await cache.get_device_info_cache()
+    assert calls == {'foo': 1, 'bar': 1}
+
+    scan_before = await cache.get_scan_cache()
+    info_before = await cache.get_resource_info_cache()
+    bar_board = scan_before['racks'][0]['boards'][0]
+    assert bar_board['id'] == 'board-bar'
+
+    # expire only the foo plugin's partition
+    cache._fresh_until[FOO_DEVICES_NS] = 0
+
+    meta = await cache.get_device_info_cache()
+    assert calls == {'foo': 2, 'bar': 1}
+    assert sorted(meta.keys()) == ['rack-1-board-bar-1', 'rack-1-board-foo-2']
+
+    scan_after = await cache.get_scan_cache()
+    info_after = await cache.get_resource_info_cache()
+
+    # the bar board was not rebuilt
+    assert scan_after['racks'][0]['boards'][0] is bar_board
+    assert info_after['rack-1']['boards']['board-bar'] is info_before['rack-1']['boards']['board-bar']
+
+    # the foo board was rebuilt, without modifying the previous views
+    assert scan_after['racks'][0]['boards'][1]['devices'][0]['id'] == '2'
+    assert scan_before['racks'][0]['boards'][1]['devices'][0]['id'] == '1'
+    assert list(info_after['rack-1']['boards']['board-foo']['devices']) == ['2']
+    assert list(info_before['rack-1']['boards']['board-foo']['devices']) == ['1']
+
+
+@pytest.mark.asyncio
+async def test_get_device_info_cache_plugin_removed(patch_register_plugins, foo_plugin, clear_caches):
+    """A plugin's devices are removed from the caches once it is no longer registered."""
+
+    meta = await cache.get_device_info_cache()
+    assert len(meta) == 1
+
+    plugin.Plugin.manager.remove(foo_plugin.id())
+
+    meta = await cache.get_device_info_cache()
+    assert meta == {}
+    assert await cache.get_scan_cache() == {}
+    assert await cache.get_resource_info_cache() == {}
+    assert cache._devices.partitions == {}
+
+
+@pytest.mark.asyncio
+async def test_get_capabilities_cache_partition_refresh(patch_register_plugins, plugin_context, clear_caches):
+    """Only the plugin whose capabilities partition expired is asked for its capabilities again."""
+
+    calls = []
+
+    for name, address in [('foo', 'localhost:9999'), ('bar', 'localhost:9998')]:
+        p = plugin.Plugin(
+            metadata=api.Metadata(name=name, tag='vaporio/' + name),
+            address=address,
+            plugin_client=client.PluginTCPClient(address)
+        )
+
+        async def capabilities(name=name):
+            calls.append(name)
+            return [api.DeviceCapability(kind='temperature', outputs=['temperature'])]
+        p.client.capabilities = capabilities
+
+    caps = await cache.get_capabilities_cache()
+    assert [c['plugin'] for c in caps] == ['vaporio/foo', 'vaporio/bar']
+    assert sorted(calls) == ['bar', 'foo']
+
+    cache._fresh_until['capabilities/vaporio/bar+tcp@localhost:9998'] = 0
+
+    caps = await cache.get_capabilities_cache()
+    assert [c['plugin'] for c in caps] == ['vaporio/foo', 'vaporio/bar']
+    assert sorted(calls) == ['bar', 'bar', 'foo']
+
+
+@pytest.mark.asyncio
+async def test_get_device_info_cache_unchanged(patch_register_plugins, foo_plugin, clear_caches):
+    """Rebuilding a plugin's device info that has not changed keeps the existing views."""
+
+    meta = await cache.get_device_info_cache()
+    scan_cache = await cache.get_scan_cache()
+    info_cache = await cache.get_resource_info_cache()
+
+    cache._fresh_until[FOO_DEVICES_NS] = 0
+
+    assert await cache.get_device_info_cache() is meta
+    assert await cache.get_scan_cache() is scan_cache
+    assert await cache.get_resource_info_cache() is info_cache
+
+
+def test_device_view_update_unchanged():
+    """Update a partition in the device view with unchanged devices."""
+
+    view = cache._DeviceView()
+    data = {'rack-1-vec-1': make_device_info_response('rack-1', 'vec', '1')}
+
+    assert view.update(cache._Partition('foo', data, fingerprint='abc'))
+    scan_cache = view.scan()
+
+    # same fingerprint, different data object
+    assert not view.update(cache._Partition('foo', dict(data), fingerprint='abc'))
+    assert view.scan() is scan_cache
+    assert view.partitions['foo'].data is data
+
+    # same data object (e.g. last known good), with an error
+    assert not view.update(cache._Partition('foo', data, error=ValueError()))
+    assert view.scan() is scan_cache
+    assert view.partitions['foo'].error is not None
+    assert view.partitions['foo'].fingerprint == 'abc'
+
+    # different fingerprint
+    assert view.update(cache._Partition('foo', dict(data), fingerprint='def'))
+    assert view.scan() is not scan_cache
+
+
+def test_device_view_update_remove():
+    """Update and remove partitions in the device view."""
+
+    view = cache._DeviceView()
+    view.update(cache._Partition('foo', {
+        'rack-1-vec-1': make_device_info_response('rack-1', 'vec', '1'),
+        'rack-2-vec-2': make_device_info_response('rack-2', 'vec', '2'),
+    }))
+    view.update(cache._Partition('bar', {
+        'rack-1-vec-3': make_device_info_response('rack-1', 'vec', '3'),
+    }))
+
+    assert view.plugins == {'rack-1-vec-1': 'foo', 'rack-2-vec-2': 'foo', 'rack-1-vec-3': 'bar'}
+    assert [r['id'] for r in view.scan()['racks']] == ['rack-1', 'rack-2']
+    assert sorted(view.info['rack-1']['boards']['vec']['devices']) == ['1', '3']
+
+    # move the foo plugin's devices off of rack-2
+    view.update(cache._Partition('foo', {
+        'rack-1-vec-1': make_device_info_response('rack-1', 'vec', '1'),
+    }))
+    assert [r['id'] for r in view.scan()['racks']] == ['rack-1']
+    assert 'rack-2' not in view.info
+    assert 'rack-2-vec-2' not in view.devices
+
+    view.remove('foo')
+    assert view.plugins == {'rack-1-vec-3': 'bar'}
+    assert [d['id'] for d in view.scan()['racks'][0]['boards'][0]['devices']] == ['3']
+    assert list(view.info['rack-1']['boards']['vec']['devices']) == ['3']
+
+    view.remove('bar')
+    assert view.devices == {}
+    assert view.scan() == {}
+    assert view.info == {}
+
+
+def test_device_view_indexes():
+    """Maintain the device view's indexes as partitions change."""
+
+    led = make_device_info_response('rack-1', 'vec', '2')
+    led.kind = 'foo.LED'
+    led.info = 'front led'
+
+    view = cache._DeviceView()
+    view.update(cache._Partition('foo', {
+        'rack-1-vec-1': make_device_info_response('rack-1', 'vec', '1'),
+        'rack-1-vec-2': led,
+        'rack-2-vec-3': make_device_info_response('rack-2', 'vec', '3'),
+    }))
+    view.update(cache._Partition('bar', {
+        'rack-1-board-4': make_device_info_response('rack-1', 'board', '4'),
+    }))
+
+    assert view.types['rack-1-vec-2'] == 'led'
+    assert sorted(view.by_type) == ['led', 'thermistor']
+    assert sorted(view.by_type['thermistor']) == ['rack-1-board-4', 'rack-1-vec-1', 'rack-2-vec-3']
+    assert sorted(view.by_plugin['foo']) == ['rack-1-vec-1', 'rack-1-vec-2', 'rack-2-vec-3']
+    assert list(view.by_plugin['bar']) == ['rack-1-board-4']
+    assert list(view.by_info['front led']) == ['rack-1-vec-2']
+    assert sorted(view.by_board[('rack-1', 'vec')]) == ['rack-1-vec-1', 'rack-1-vec-2']
+    assert sorted(view.by_rack['rack-1']) == ['board', 'vec']
+    assert view.by_rack['rack-1']['vec'] is view.by_board[('rack-1', 'vec')]
+
+    assert view.scan_rack('rack-2') == view.scan()['racks'][1]
+    assert view.scan_rack('rack-3') is None
+    assert view.scan_board('rack-1', 'board')['devices'][0]['id'] == '4'
+    assert view.scan_board('rack-1', 'foo') is None
+    assert view.scan_device('rack-1-vec-2')['type'] == 'LED'
+    assert view.scan_device('rack-1-vec-5') is None
+
+    # indexes are replaced, not modified in place
+    by_type = view.by_type
+    thermistors = by_type['thermistor']
+
+    view.update(cache._Partition('foo', {
+        'rack-1-vec-1': make_device_info_response('rack-1', 'vec', '1'),
+    }))
+    assert 'led' not in view.by_type
+    assert sorted(view.by_type['thermistor']) == ['rack-1-board-4', 'rack-1-vec-1']
+    assert 'front led' not in view.by_info
+    assert 'rack-2' not in view.by_rack
+    assert view.scan_device('rack-2-vec-3') is None
+    assert sorted(by_type) == ['led', 'thermistor']
+    assert len(thermistors) == 3
+
+    view.remove('bar')
+    assert list(view.by_plugin) == ['foo']
+    assert list(view.by_rack['rack-1']) == ['vec']
+    assert view.scan_board('rack-1', 'board') is None
+
+    view.remove('foo')
+    assert view.types == {}
+    assert view.by_type == {}
+    assert view.by_plugin == {}
+    assert view.by_info == {}
+    assert view.by_board == {}
+    assert view.by_rack == {}
+
+
+def test_device_view_indexes_replaced_device():
+    """Index a device which replaces another plugin's device with the same id."""
+
+    view = cache._DeviceView()
+    view.update(cache._Partition('foo', {
+        'rack-1-vec-1': make_device_info_response('rack-1', 'vec', '1'),
+    }))
+
+    led = make_device_info_response('rack-1', 'vec', '1')
+    led.kind = 'led'
+    view.update(cache._Partition('bar', {'rack-1-vec-1': led}))
+
+    assert view.plugins == {'rack-1-vec-1': 'bar'}
+    assert 'foo' not in view.by_plugin
+    assert list(view.by_type) == ['led']
+
+    # removing the replaced plugin leaves the device
+    view.remove('foo')
+    assert view.by_type['led'] == {'rack-1-vec-1': led}
+
+
+@pytest.mark.asyncio
+async def test_get_device_index_lookups(patch_register_plugins, foo_plugin, clear_caches):
+    """Look up devices via the device cache's indexes."""
+
+    meta = await cache.get_device_info_cache()
+    cid = 'rack-1-vec-12345'
+
+    assert await cache.get_device_type('rack-1', 'vec', '12345') == 'thermistor'
+    assert await cache.get_devices_by_type('THERMISTOR') == {cid: meta[cid]}
+    assert await cache.get_devices_by_type('led') == {}
+    assert await cache.get_devices_by_plugin('vaporio/foo+tcp@localhost:9999') == {cid: meta[cid]}
+    assert await cache.get_devices_by_info('bar') == {cid: meta[cid]}
+    assert await cache.get_rack_devices('rack-1') == {'vec': {cid: meta[cid]}}
+    assert await cache.get_board_devices('rack-1', 'vec') == {cid: meta[cid]}
+    assert await cache.get_board_devices('rack-1', 'foo') == {}
+    assert (await cache.get_scan_rack('rack-1'))['id'] == 'rack-1'
+    assert (await cache.get_scan_board('rack-1', 'vec'))['id'] == 'vec'
+    assert (await cache.get_scan_device('rack-1', 'vec', '12345'))['id'] == '12345'
+
+    with pytest.raises(errors.DeviceNotFoundError):
+        await cache.get_device_type('rack-1', 'vec', '1')
+
+
+
+@pytest.fixture()
+def device_view(monkeypatch):
+    """Fixture to replace the device view with one of a few test devices."""
+    led = make_device_info_response('rack-1', 'vec', '2')
+    led.kind = 'foo.LED'
+    led.info = 'front led'
+    led.metadata['model'] = 'LED-1'
+
+    thermistor = make_device_info_response('rack-2', 'vec', '4')
+    thermistor.info = 'Rack Temperature 1 Top'
+
+    view = cache._DeviceView()
+    view.update(cache._Partition('foo', {
+        'rack-1-vec-1': make_device_info_response('rack-1', 'vec', '1'),
+        'rack-1-vec-2': led,
+        'rack-1-board-3': make_device_info_response('rack-1', 'board', '3'),
+        'rack-2-vec-4': thermistor,
+    }))
+
+    monkeypatch.setattr(cache, '_devices', view)
+    monkeypatch.setattr(cache, 'get_device_info_cache', asynctest.CoroutineMock(
+        cache.get_device_info_cache, return_value=view.devices
+    ))
+    return view
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    'selectors,expected', [
+        ({}, ['rack-1-board-3', 'rack-1-vec-1', 'rack-1-vec-2', 'rack-2-vec-4']),
+        ({'rack': 'rack-1'}, ['rack-1-board-3', 'rack-1-vec-1', 'rack-1-vec-2']),
+        ({'rack': 'rack-1', 'board': 'vec'}, ['rack-1-vec-1', 'rack-1-vec-2']),
+        ({'rack': 'rack-3'}, []),
+        ({'device_type': 'LED'}, ['rack-1-vec-2']),
+        ({'device_type': 'thermistor', 'rack': 'rack-1', 'board': 'vec'}, ['rack-1-vec-1']),
+        ({'kind': 'foo.LED'}, ['rack-1-vec-2']),
+        ({'kind': 'led'}, []),
+        ({'model': 'led-1'}, ['rack-1-vec-2']),
+        ({'model': 'test', 'rack': 'rack-1'}, ['rack-1-board-3', 'rack-1-vec-1']),
+        ({'info': 'front led'}, ['rack-1-vec-2']),
+        ({'info': 'Rack Temperature *'}, ['rack-2-vec-4']),
+        ({'info': 'rack temperature *'}, []),
+        ({'info': 'ba?', 'device_type': 'thermistor'}, ['rack-1-board-3', 'rack-1-vec-1']),
+    ]
+)
+async def test_select_devices(device_view, selectors, expected):
+    """Select the devices which match all of the given selectors."""
+
+    assert sorted(await cache.select_devices(**selectors)) == expected
+
+
+def test_device_view_encoded(no_pretty_json):
+    """Cache the encodings of the device view until it changes."""
+
+    view = cache._DeviceView()
+    data = {'rack-1-vec-1': make_device_info_response('rack-1', 'vec', '1')}
+    view.update(cache._Partition('foo', data, fingerprint='abc'))
+    generation = view.generation
+
+    scan_cache = view.scan()
+    body, tag = view.encoded(('scan',), scan_cache)
+    assert ujson.loads(body) == scan_cache
+    assert view.encoded(('scan',), scan_cache) == (body, tag)
+    assert view.encoded(('scan',), scan_cache)[0] is body
+
+    # rendered from the source
+    rendered = view.encoded(('racks',), scan_cache, lambda s: [r['id'] for r in s['racks']])
+    assert rendered[0] == b'["rack-1"]'
+
+    # unchanged devices keep the generation and encodings
+    view.update(cache._Partition('foo', dict(data), fingerprint='abc'))
+    assert view.generation == generation
+    assert view.encoded(('scan',), view.scan())[0] is body
+
+    # changed devices start a new generation
+    view.update(cache._Partition('foo', {
+        'rack-2-vec-1': make_device_info_response('rack-2', 'vec', '1'),
+    }, fingerprint='def'))
+    assert view.generation == generation + 1
+    new_body, new_tag = view.encoded(('scan',), view.scan())
+    assert new_body != body
+    assert new_tag != tag
+
+
+def test_device_view_encoded_pretty():
+    """Re-encode a view when pretty printing is toggled."""
+
+    view = cache._DeviceView()
+    source = {'racks': []}
+
+    config.options.set('pretty_json', False)
+    body, _ = view.encoded(('scan',), source)
+
+    config.options.set('pretty_json', True)
+    assert view.encoded(('scan',), source)[0] != body
+
+
+def test_capabilities_view_generation():
+    """Start a new generation of the capabilities view only when they change."""
+
+    view = cache._CapabilitiesView()
+    view.update(cache._Partition('foo', {'plugin': 'foo', 'devices': []}))
+    generation = view.generation
+
+    caps = view.capabilities(['foo'])
+    assert view.capabilities(['foo']) is caps
+
+    view.update(cache._Partition('foo', {'plugin': 'foo', 'devices': []}))
+    assert view.generation == generation
+    assert view.capabilities(['foo']) is caps
+
+    view.update(cache._Partition('foo', {'plugin': 'foo', 'devices': [{'kind': 'led'}]}))
+    assert view.generation == generation + 1
+    assert view.capabilities(['foo']) is not caps
+
+    view.remove('foo')
+    assert view.generation == generation + 2
+    assert view.capabilities(['foo']) == []
+
+
 def test_build_scan_cache_ok():
     """Build the scan cache."""
 
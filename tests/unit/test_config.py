@@ -17,16 +17,54 @@ def test_defaults():
         'plugin': {
             'tcp': [],
             'unix': [],
+            'reconcile_interval': 30,
+            'socket_poll_interval': 5,
+            'health': {
+                'interval': 15,
+            },
+            'backoff': {
+                'initial': 5,
+                'max': 300,
+            },
         },
         'cache': {
             'meta': {
-                'ttl': 20
+                'ttl': 20,
+                'budget': 5,
+                'stale_ttl': 0,
+                'refresh_ahead': 0,
+                'last_known_good': False
             },
             'transaction': {
                 'ttl': 300
+            },
+            'readings': {
+                'ttl': 0
             }
         },
+        'read': {
+            'dump_window': 10,
+            'dump_ratio': 0.5,
+            'dump_min_targets': 4,
+            'batch_window': 0,
+        },
+        'deadline': {
+            'default': 0,
+            'routes': {},
+        },
         'grpc': {
-            'timeout': 3
+            'timeout': 3,
+            'executor': {
+                'workers': 32,
+                'plugin_limit': 8,
+                'plugins': {},
+            },
+            'channel': {
+                'pool_size': 1,
+            },
+            'circuit_breaker': {
+                'threshold': 5,
+                'probe_interval': 10,
+            },
         },
     }
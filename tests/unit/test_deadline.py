@@ -0,0 +1,65 @@
+"""Test the 'synse.deadline' Synse Server module."""
+# pylint: disable=redefined-outer-name,unused-argument
+
+import asyncio
+
+import pytest
+
+from synse import config, deadline, errors
+from tests import utils
+
+
+def timeout(d):
+    """Helper to get the timeout, in seconds, that a deadline was set with."""
+    return round(d - asyncio.get_event_loop().time())
+
+
+def test_from_request_none():
+    """A request has no deadline by default."""
+    assert deadline.from_request(utils.make_request('/synse/read'), 'read') is None
+
+
+def test_from_request_header():
+    """The deadline is set from the header."""
+    r = utils.make_request('/synse/read', headers={deadline.HEADER: '5'})
+    assert timeout(deadline.from_request(r, 'read')) == 5
+
+
+def test_from_request_query_param():
+    """The deadline is set from the query parameter."""
+    r = utils.make_request('/synse/read?timeout=2.5')
+    d = deadline.from_request(r, 'read')
+    assert 2 < d - asyncio.get_event_loop().time() <= 2.5
+
+
+def test_from_request_header_precedence():
+    """The header takes precedence over the query parameter."""
+    r = utils.make_request('/synse/read?timeout=2', headers={deadline.HEADER: '7'})
+    assert timeout(deadline.from_request(r, 'read')) == 7
+
+
+def test_from_request_route_default():
+    """The configured default for the route applies if none is given."""
+    config.options.set('deadline.default', 10)
+    config.options.set('deadline.routes', {'read': 3})
+
+    r = utils.make_request('/synse/read')
+    assert timeout(deadline.from_request(r, 'read')) == 3
+    assert timeout(deadline.from_request(r, 'write')) == 10
+
+
+@pytest.mark.parametrize('value', ['abc', '0', '-1', 'nan', 'inf'])
+def test_from_request_invalid(value):
+    """A timeout which is not a positive number of seconds is rejected."""
+    r = utils.make_request('/synse/read', headers={deadline.HEADER: value})
+    with pytest.raises(errors.InvalidArgumentsError):
+        deadline.from_request(r, 'read')
+
+
+def test_remaining():
+    """Get the time remaining until a deadline."""
+    now = asyncio.get_event_loop().time()
+
+    assert deadline.remaining(None) is None
+    assert deadline.remaining(now - 1) == 0
+    assert 4 < deadline.remaining(now + 5) <= 5
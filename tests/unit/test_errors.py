@@ -202,6 +202,19 @@ def test_synse_error_plugin_state():
     assert e.args[0] == 'message'
 
 
+def test_synse_error_plugin_circuit_open():
+    """Check for PLUGIN_CIRCUIT_OPEN error"""
+    e = errors.PluginCircuitOpenError('message')
+
+    assert isinstance(e, exceptions.ServerError)
+    assert isinstance(e, errors.SynseError)
+    assert isinstance(e, errors.SynseServerError)
+
+    assert e.status_code == 500
+    assert e.error_id == errors.PLUGIN_CIRCUIT_OPEN
+    assert e.args[0] == 'message'
+
+
 def test_synse_error_request_url_not_found():
     """Check for URL_NOT_FOUND error"""
     e = errors.SynseNotFoundError('message', errors.URL_NOT_FOUND)
@@ -1,6 +1,7 @@
 """Test the 'synse.factory' Synse Server module."""
 # pylint: disable=redefined-outer-name,unused-argument
 
+import asyncio
 import os
 
 import pytest
@@ -33,6 +34,27 @@ def test_make_app(make_config):
     assert 'synse.routes.aliases' in app.blueprints
 
 
+@pytest.mark.asyncio
+async def test_protocol_cancels_on_disconnect():
+    """The request handler is cancelled when the client disconnects."""
+    loop = asyncio.get_event_loop()
+    protocol = factory.SynseHttpProtocol(loop=loop, request_handler=None, error_handler=None)
+
+    handler = loop.create_future()
+    protocol._request_handler_task = handler
+
+    protocol.connection_lost(None)
+    assert handler.cancelled()
+
+    # a handler which has completed is left alone
+    done = loop.create_future()
+    done.set_result(None)
+    protocol._request_handler_task = done
+
+    protocol.connection_lost(None)
+    assert not done.cancelled()
+
+
 def test_disable_favicon(app):
     """Check empty response when looking for favicon"""
     _, response = app.test_client.get('/favicon.ico')
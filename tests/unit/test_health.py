@@ -0,0 +1,165 @@
+"""Test the 'synse.health' Synse Server module."""
+# pylint: disable=redefined-outer-name,unused-argument,line-too-long
+
+import asyncio
+
+import grpc
+import pytest
+from synse_grpc import api
+
+from synse import health, plugin
+from synse.proto import client
+
+
+class MockClient(client.PluginTCPClient):
+    """A plugin client whose health requests are counted and controllable."""
+
+    def __init__(self, address):
+        super(MockClient, self).__init__(address)
+        self.calls = 0
+        self.fail = False
+
+    async def health(self):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        if self.fail:
+            raise grpc.RpcError('plugin unreachable')
+        return api.PluginHealth(
+            timestamp='2018-06-14T16:45:50Z',
+            status=api.PluginHealth.OK,
+            checks=[api.HealthCheck(name='read buffer health', status=api.PluginHealth.OK, type='periodic')],
+        )
+
+
+def make_plugin(tag, port):
+    """Helper to register a plugin with a mock client."""
+    address = 'localhost:{}'.format(port)
+    return plugin.Plugin(
+        metadata=api.Metadata(name=tag, tag='vaporio/{}'.format(tag)),
+        address=address,
+        plugin_client=MockClient(address),
+    )
+
+
+def test_state_unknown():
+    """The health of a plugin which has not been probed is unknown."""
+    data = health.PluginHealthState().to_dict()
+    assert data['status'] == 'unknown'
+    assert data['checks'] == []
+    assert data['last_checked'] is None
+    assert data['last_ok'] is None
+    assert data['latency_ms'] is None
+    assert data['consecutive_failures'] == 0
+
+
+def test_state_succeeded():
+    """Record a successful probe."""
+    state = health.PluginHealthState()
+    state.succeeded(api.PluginHealth(timestamp='now', status=api.PluginHealth.OK), 0.0012)
+
+    data = state.to_dict()
+    assert data['timestamp'] == 'now'
+    assert data['status'] == 'ok'
+    assert data['message'] == ''
+    assert data['last_checked'] == data['last_ok']
+    assert data['latency_ms'] == 1.2
+    assert data['consecutive_failures'] == 0
+
+
+def test_state_failed():
+    """Record failed probes, keeping the time of the last successful one."""
+    state = health.PluginHealthState()
+    state.succeeded(api.PluginHealth(timestamp='now', status=api.PluginHealth.OK), 0.001)
+    last_ok = state.last_ok
+
+    state.failed(ValueError('unreachable'), 0.25)
+    state.failed(asyncio.TimeoutError(), 0.25)
+
+    data = state.to_dict()
+    assert data['status'] == 'error'
+    assert data['message'] == 'health check timed out'
+    assert data['last_ok'] == last_ok
+    assert data['latency_ms'] == 250
+    assert data['consecutive_failures'] == 2
+    assert state.probes == 3
+
+    # a success resets the consecutive failures
+    state.succeeded(api.PluginHealth(timestamp='later', status=api.PluginHealth.OK), 0.001)
+    assert state.to_dict()['consecutive_failures'] == 0
+
+
+@pytest.mark.asyncio
+async def test_monitor_probe():
+    """Probe the health of all registered plugins."""
+    ok = make_plugin('ok', 5001)
+    bad = make_plugin('bad', 5002)
+    bad.client.fail = True
+
+    monitor = health.PluginHealthMonitor()
+    await monitor.probe()
+
+    assert monitor.get(ok.id()).to_dict()['status'] == 'ok'
+    assert monitor.get(ok.id()).to_dict()['checks'][0]['name'] == 'read buffer health'
+    assert monitor.get(bad.id()).to_dict()['status'] == 'error'
+    assert monitor.get(bad.id()).failures == 1
+
+    await monitor.probe()
+    assert monitor.get(bad.id()).failures == 2
+    assert ok.client.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_monitor_probe_timeout():
+    """A plugin which does not respond in time fails its probe."""
+    p = make_plugin('slow', 5001)
+
+    async def slow():
+        await asyncio.sleep(1)
+    p.client.health = slow
+
+    plugin.config.options.set('grpc.timeout', 0.01)
+
+    monitor = health.PluginHealthMonitor()
+    await monitor.probe()
+    assert monitor.get(p.id()).to_dict()['status'] == 'error'
+
+
+@pytest.mark.asyncio
+async def test_monitor_probe_shared():
+    """Concurrent probes share a single probe of the plugins."""
+    p = make_plugin('ok', 5001)
+
+    monitor = health.PluginHealthMonitor()
+    await asyncio.gather(monitor.probe(), monitor.probe(), monitor.probe())
+    assert p.client.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_monitor_probe_drops_removed():
+    """Plugins which are no longer registered are dropped from the monitor."""
+    p = make_plugin('ok', 5001)
+
+    monitor = health.PluginHealthMonitor()
+    await monitor.probe()
+    assert monitor.get(p.id()) is not None
+
+    plugin.Plugin.manager.remove(p.id())
+    await monitor.probe()
+    assert monitor.get(p.id()) is None
+    assert monitor.states == {}
+
+
+@pytest.mark.asyncio
+async def test_monitor_ready():
+    """Only probe when a registered plugin has not yet been probed."""
+    first = make_plugin('first', 5001)
+
+    monitor = health.PluginHealthMonitor()
+    await monitor.ready()
+    await monitor.ready()
+    assert first.client.calls == 1
+
+    second = make_plugin('second', 5002)
+    await monitor.ready()
+    assert first.client.calls == 2
+    assert second.client.calls == 1
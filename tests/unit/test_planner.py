@@ -0,0 +1,153 @@
+"""Test the 'synse.planner' Synse Server module."""
+# pylint: disable=redefined-outer-name
+
+import pytest
+
+from synse import config
+from synse.planner import DUMP, READ, ReadPlan, ReadPlanner
+
+
+class MockClient:
+    """A mock plugin client."""
+
+    def __init__(self):
+        self.address = 'tmp/foo'
+        self.read_cached_supported = True
+
+
+class MockPlugin:
+    """A mock plugin."""
+
+    def __init__(self):
+        self.client = MockClient()
+
+    @staticmethod
+    def id():
+        """Get the id of the plugin."""
+        return 'vaporio/foo+unix@tmp/foo'
+
+
+@pytest.fixture()
+def plugin_handler():
+    """Fixture to get a mock plugin."""
+    return MockPlugin()
+
+
+@pytest.fixture(autouse=True)
+def readings_ttl():
+    """Fixture to allow readings as old as the dump window to be served
+    when no maximum age is given."""
+    config.options.set('cache.readings.ttl', 10)
+
+
+def test_record():
+    """Latencies are recorded as a moving average."""
+    p = ReadPlanner()
+
+    p.record('foo', READ, 1)
+    assert p.latencies == {'foo': {READ: 1}}
+
+    p.record('foo', READ, 2)
+    p.record('foo', DUMP, 3)
+    assert p.latencies == {'foo': {READ: 1.2, DUMP: 3}}
+
+
+@pytest.mark.parametrize(
+    'targets,devices,strategy', [
+        (0, 10, READ),
+        (1, 1, READ),
+        (2, 3, READ),
+        (3, 3, READ),
+        (4, 10, READ),
+        (5, 10, DUMP),
+        (10, 10, DUMP),
+    ]
+)
+def test_plan_ratio(plugin_handler, targets, devices, strategy):
+    """Without observed latencies, the share of devices read picks the strategy."""
+    plan = ReadPlanner().plan(plugin_handler, targets, devices)
+
+    assert plan.strategy == strategy
+    assert plan.targets == targets
+    assert plan.devices == devices
+    assert plan.read_cost is None
+    assert plan.dump_cost is None
+
+
+def test_plan_ratio_configured(plugin_handler):
+    """The share of devices which are dumped can be configured."""
+    config.options.set('read.dump_ratio', 0.1)
+
+    assert ReadPlanner().plan(plugin_handler, 4, 10).strategy == DUMP
+
+
+def test_plan_min_targets(plugin_handler):
+    """The minimum number of devices which are dumped can be configured."""
+    config.options.set('read.dump_min_targets', 2)
+
+    assert ReadPlanner().plan(plugin_handler, 2, 3).strategy == DUMP
+
+
+@pytest.mark.parametrize(
+    'max_age,window,strategy', [
+        (None, 10, DUMP),
+        (0, 10, READ),
+        (5, 10, READ),
+        (10, 10, DUMP),
+        (30, 10, DUMP),
+        (30, 0, READ),
+    ]
+)
+def test_plan_max_age(plugin_handler, max_age, window, strategy):
+    """Readings are only dumped when they are fresh enough to serve."""
+    config.options.set('read.dump_window', window)
+
+    assert ReadPlanner().plan(plugin_handler, 10, 10, max_age=max_age).strategy == strategy
+
+
+def test_plan_default_ttl(plugin_handler):
+    """Without a maximum age, readings are not dumped with the default
+    readings cache TTL, which serves only live readings."""
+    config.options.set('cache.readings.ttl', 0)
+
+    assert ReadPlanner().plan(plugin_handler, 10, 10).strategy == READ
+
+
+def test_plan_unsupported(plugin_handler):
+    """A plugin which does not support ReadCached has its devices read."""
+    plugin_handler.client.read_cached_supported = False
+
+    assert ReadPlanner().plan(plugin_handler, 10, 10).strategy == READ
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    'targets,strategy,read_cost', [
+        # with the default plugin limit, 8 reads are in flight at once
+        (4, READ, 0.1),
+        (8, READ, 0.1),
+        (9, DUMP, 0.2),
+    ]
+)
+async def test_plan_latencies(plugin_handler, targets, strategy, read_cost):
+    """Observed latencies pick the strategy with the lowest estimated cost."""
+    p = ReadPlanner()
+    p.record(plugin_handler.id(), READ, 0.1)
+    p.record(plugin_handler.id(), DUMP, 0.15)
+
+    plan = p.plan(plugin_handler, targets, 100, cached=3)
+
+    assert plan.strategy == strategy
+    assert plan.read_cost == pytest.approx(read_cost)
+    assert plan.dump_cost == 0.15
+    assert plan.cached == 3
+
+
+def test_plan_str():
+    """The plan is summarized for the read plan header."""
+    assert str(ReadPlan('foo', DUMP, 10, 12, 2)) == (
+        'foo strategy=dump targets=10 devices=12 cached=2'
+    )
+    assert str(ReadPlan('foo', READ, 2, 12, 0, 0.1, 1.23456)) == (
+        'foo strategy=read targets=2 devices=12 cached=0 read_cost=0.100 dump_cost=1.235'
+    )
@@ -1,8 +1,12 @@
 """Test the 'synse.plugin' Synse Server module."""
 # pylint: disable=redefined-outer-name,unused-argument,line-too-long
 
+import asyncio
 import os
+import threading
+import time
 
+import grpc
 import pytest
 from synse_grpc import api
 
@@ -14,7 +18,7 @@ from synse.proto.client import PluginClient, PluginTCPClient, PluginUnixClient
 @pytest.fixture()
 def mock_client_test_ok(monkeypatch):
     """Fixture to mock a PluginClient's 'test' method with a good response."""
-    def patch(self):
+    async def patch(self):
         """Patch function for the client 'test' method."""
         return api.Status(ok=True)
     monkeypatch.setattr(synse.proto.client.PluginClient, 'test', patch)
@@ -24,7 +28,7 @@ def mock_client_test_ok(monkeypatch):
 @pytest.fixture()
 def mock_client_test_error(monkeypatch):
     """Fixture to mock a PluginClient's 'test' method with a bad response."""
-    def patch(self):
+    async def patch(self):
         """Patch function for the client 'test' method."""
         return api.Status(ok=False)
     monkeypatch.setattr(PluginClient, 'test', patch)
@@ -34,7 +38,7 @@ def mock_client_test_error(monkeypatch):
 @pytest.fixture()
 def mock_client_meta_ok(monkeypatch):
     """Fixture to mock a PluginClient's 'metainfo' method with a good response."""
-    def patch(self):
+    async def patch(self):
         """Patch function for the client 'metainfo' method."""
         return api.Metadata(
             name='test-plugin',
@@ -49,7 +53,7 @@ def mock_client_meta_ok(monkeypatch):
 @pytest.fixture()
 def mock_client_meta_error(monkeypatch):
     """Fixture to mock a PluginClient's 'metainfo' method with a bad response."""
-    def patch(self):
+    async def patch(self):
         """Patch function for the client 'metainfo' method."""
         raise ValueError('test error')
 
@@ -129,6 +133,20 @@ def test_plugin_manager_remove(mock_plugin):
     assert 'test-plug' not in pm.plugins
 
 
+def test_plugin_manager_snapshot(mock_plugin):
+    """Adding and removing plugins does not modify a previous snapshot of them."""
+    pm = plugin.PluginManager()
+    snapshot = pm.plugins
+
+    pm.add(mock_plugin)
+    assert snapshot == {}
+
+    snapshot = pm.plugins
+    pm.purge([mock_plugin.id()])
+    assert pm.plugins == {}
+    assert list(snapshot) == [mock_plugin.id()]
+
+
 def test_plugin_manager_remove_nonexistent():
     """Remove a plugin from the Manager that is not there."""
     pm = plugin.PluginManager()
@@ -225,14 +243,16 @@ async def test_get_plugins2(mock_plugin):
     assert p.protocol == 'tcp'
 
 
-def test_register_plugins_no_default_socks(grpc_timeout):
+@pytest.mark.asyncio
+async def test_register_plugins_no_default_socks(grpc_timeout):
     """Register plugins when the plugin path doesn't exist."""
     assert len(plugin.Plugin.manager.plugins) == 0
-    plugin.register_plugins()
+    await plugin.register_plugins()
     assert len(plugin.Plugin.manager.plugins) == 0
 
 
-def test_register_plugins_no_socks(tmpdir, grpc_timeout):
+@pytest.mark.asyncio
+async def test_register_plugins_no_socks(tmpdir, grpc_timeout):
     """Register plugins when no sockets are in the plugin path."""
     sockdir = tmpdir.mkdir('socks')
     const.SOCKET_DIR = str(sockdir)
@@ -242,11 +262,12 @@ def test_register_plugins_no_socks(tmpdir, grpc_timeout):
     open(path, 'w').close()
 
     assert len(plugin.Plugin.manager.plugins) == 0
-    plugin.register_plugins()
+    await plugin.register_plugins()
     assert len(plugin.Plugin.manager.plugins) == 0
 
 
-def test_register_plugins_ok(tmpsocket, grpc_timeout, mock_client_test_ok, mock_client_meta_ok):
+@pytest.mark.asyncio
+async def test_register_plugins_ok(tmpsocket, grpc_timeout, mock_client_test_ok, mock_client_meta_ok):
     """Register plugins successfully."""
 
     # create the socket
@@ -257,7 +278,7 @@ def test_register_plugins_ok(tmpsocket, grpc_timeout, mock_client_test_ok, mock_
     # the plugin is not yet in the config
     assert config.options.get('plugin.unix') is None
 
-    plugin.register_plugins()
+    await plugin.register_plugins()
 
     # the plugin has been added to the config (because it was
     # in the default socket directory)
@@ -272,7 +293,8 @@ def test_register_plugins_ok(tmpsocket, grpc_timeout, mock_client_test_ok, mock_
     assert p.protocol == 'unix'
 
 
-def test_register_plugins_already_exists(tmpsocket, grpc_timeout, mock_client_test_ok, mock_client_meta_ok):
+@pytest.mark.asyncio
+async def test_register_plugins_already_exists(tmpsocket, grpc_timeout, mock_client_test_ok, mock_client_meta_ok):
     """Register plugins when the plugins were already registered."""
 
     # create the socket
@@ -280,7 +302,7 @@ def test_register_plugins_already_exists(tmpsocket, grpc_timeout, mock_client_te
 
     assert len(plugin.Plugin.manager.plugins) == 0
 
-    plugin.register_plugins()
+    await plugin.register_plugins()
 
     assert len(plugin.Plugin.manager.plugins) == 1
     assert 'vaporio/test-plugin+unix@' + path in plugin.Plugin.manager.plugins
@@ -293,7 +315,7 @@ def test_register_plugins_already_exists(tmpsocket, grpc_timeout, mock_client_te
     # now, re-register
     assert len(plugin.Plugin.manager.plugins) == 1
 
-    plugin.register_plugins()
+    await plugin.register_plugins()
 
     assert len(plugin.Plugin.manager.plugins) == 1
     assert 'vaporio/test-plugin+unix@' + path in plugin.Plugin.manager.plugins
@@ -304,7 +326,8 @@ def test_register_plugins_already_exists(tmpsocket, grpc_timeout, mock_client_te
     assert p.protocol == 'unix'
 
 
-def test_register_plugins_new(tmpsocket, grpc_timeout, mock_client_test_ok, mock_client_meta_ok):
+@pytest.mark.asyncio
+async def test_register_plugins_new(tmpsocket, grpc_timeout, mock_client_test_ok, mock_client_meta_ok):
     """Re-register, adding a new plugin."""
 
     # create the socket
@@ -312,7 +335,7 @@ def test_register_plugins_new(tmpsocket, grpc_timeout, mock_client_test_ok, mock
 
     assert len(plugin.Plugin.manager.plugins) == 0
 
-    plugin.register_plugins()
+    await plugin.register_plugins()
 
     assert len(plugin.Plugin.manager.plugins) == 1
     assert 'vaporio/test-plugin+unix@' + path1 in plugin.Plugin.manager.plugins
@@ -327,7 +350,7 @@ def test_register_plugins_new(tmpsocket, grpc_timeout, mock_client_test_ok, mock
 
     assert len(plugin.Plugin.manager.plugins) == 1
 
-    plugin.register_plugins()
+    await plugin.register_plugins()
 
     assert len(plugin.Plugin.manager.plugins) == 2
     assert 'vaporio/test-plugin+unix@' + path1 in plugin.Plugin.manager.plugins
@@ -344,7 +367,8 @@ def test_register_plugins_new(tmpsocket, grpc_timeout, mock_client_test_ok, mock
     assert p.protocol == 'unix'
 
 
-def test_register_plugins_old(tmpsocket, grpc_timeout, mock_client_test_ok, mock_client_meta_ok):
+@pytest.mark.asyncio
+async def test_register_plugins_old(tmpsocket, grpc_timeout, mock_client_test_ok, mock_client_meta_ok):
     """Re-register, removing an old plugin."""
 
     # create the socket
@@ -353,7 +377,7 @@ def test_register_plugins_old(tmpsocket, grpc_timeout, mock_client_test_ok, mock
 
     assert len(plugin.Plugin.manager.plugins) == 0
 
-    plugin.register_plugins()
+    await plugin.register_plugins()
 
     assert len(plugin.Plugin.manager.plugins) == 2
     assert 'vaporio/test-plugin+unix@' + path1 in plugin.Plugin.manager.plugins
@@ -377,7 +401,7 @@ def test_register_plugins_old(tmpsocket, grpc_timeout, mock_client_test_ok, mock
 
     assert len(plugin.Plugin.manager.plugins) == 2
 
-    plugin.register_plugins()
+    await plugin.register_plugins()
 
     assert len(plugin.Plugin.manager.plugins) == 1
     assert 'vaporio/test-plugin+unix@' + path2 in plugin.Plugin.manager.plugins
@@ -388,14 +412,15 @@ def test_register_plugins_old(tmpsocket, grpc_timeout, mock_client_test_ok, mock
     assert p.protocol == 'unix'
 
 
-def test_register_plugins_from_discovery(grpc_timeout, monkeypatch, mock_client_test_ok, mock_client_meta_ok):
+@pytest.mark.asyncio
+async def test_register_plugins_from_discovery(grpc_timeout, monkeypatch, mock_client_test_ok, mock_client_meta_ok):
     """Register plugins that we get back from discovery."""
 
     assert len(plugin.Plugin.manager.plugins) == 0
 
     monkeypatch.setattr(plugin.kubernetes, 'discover', lambda: ['10.0.0.1:5001', '10.0.0.2:5001'])
 
-    plugin.register_plugins()
+    await plugin.register_plugins()
 
     assert len(plugin.Plugin.manager.plugins) == 2
 
@@ -412,18 +437,56 @@ def test_register_plugins_from_discovery(grpc_timeout, monkeypatch, mock_client_
     assert p.protocol == 'tcp'
 
 
-def test_register_unix_plugin_none_defined(grpc_timeout):
+@pytest.mark.asyncio
+async def test_register_plugins_discovery_off_loop(monkeypatch):
+    """Discovery, which blocks on the kubernetes API, is run off of the event loop thread."""
+    threads = []
+
+    def _discover():
+        threads.append(threading.get_ident())
+        return []
+
+    monkeypatch.setattr(plugin.kubernetes, 'discover', _discover)
+
+    await plugin.register_plugins()
+
+    assert len(threads) == 1
+    assert threads[0] != threading.get_ident()
+
+
+@pytest.mark.asyncio
+async def test_register_plugins_keeps_new(monkeypatch, mock_plugin):
+    """A plugin registered while a registration pass is running is not
+    purged by the pass."""
+    known = plugin.Plugin.manager.plugins
+    plugin.Plugin.manager.plugins = {}
+
+    def _discover():
+        # e.g. the socket watcher registers a plugin while discovery runs
+        plugin.Plugin.manager.plugins = known
+        return []
+
+    monkeypatch.setattr(plugin.kubernetes, 'discover', _discover)
+
+    await plugin.register_plugins()
+
+    assert list(plugin.Plugin.manager.plugins) == [mock_plugin.id()]
+
+
+@pytest.mark.asyncio
+async def test_register_unix_plugin_none_defined(grpc_timeout):
     """Test registering unix based plugins when none is specified."""
     assert len(plugin.Plugin.manager.plugins) == 0
 
-    registered = plugin.register_unix()
+    registered = await plugin.register_unix()
 
     assert len(plugin.Plugin.manager.plugins) == 0
     assert isinstance(registered, list)
     assert len(registered) == 0
 
 
-def test_register_unix_plugin(tmpsocket, grpc_timeout, mock_client_test_ok, mock_client_meta_ok):
+@pytest.mark.asyncio
+async def test_register_unix_plugin(tmpsocket, grpc_timeout, mock_client_test_ok, mock_client_meta_ok):
     """Test registering unix plugin when a configuration is specified"""
 
     # create the socket
@@ -434,7 +497,7 @@ def test_register_unix_plugin(tmpsocket, grpc_timeout, mock_client_test_ok, mock
     # set a configuration
     config.options.set('plugin.unix', ['tmp'])
 
-    registered = plugin.register_unix()
+    registered = await plugin.register_unix()
 
     assert len(plugin.Plugin.manager.plugins) == 1
     assert isinstance(registered, list)
@@ -449,7 +512,8 @@ def test_register_unix_plugin(tmpsocket, grpc_timeout, mock_client_test_ok, mock
     assert p.address == path
 
 
-def test_register_unix_plugins(tmpsocket, grpc_timeout, mock_client_test_ok, mock_client_meta_ok):
+@pytest.mark.asyncio
+async def test_register_unix_plugins(tmpsocket, grpc_timeout, mock_client_test_ok, mock_client_meta_ok):
     """Test registering unix plugins when multiple configurations are specified"""
 
     # create the socket
@@ -461,7 +525,7 @@ def test_register_unix_plugins(tmpsocket, grpc_timeout, mock_client_test_ok, moc
     # set configurations
     config.options.set('plugin.unix', ['foo', 'bar'])
 
-    registered = plugin.register_unix()
+    registered = await plugin.register_unix()
 
     assert len(plugin.Plugin.manager.plugins) == 2
     assert isinstance(registered, list)
@@ -483,7 +547,8 @@ def test_register_unix_plugins(tmpsocket, grpc_timeout, mock_client_test_ok, moc
     assert p2.address == path2
 
 
-def test_register_unix_plugin_already_exists(tmpsocket, grpc_timeout, mock_client_test_ok, mock_client_meta_ok):
+@pytest.mark.asyncio
+async def test_register_unix_plugin_already_exists(tmpsocket, grpc_timeout, mock_client_test_ok, mock_client_meta_ok):
     """Test registering unix plugin when the plugin was already registered."""
 
     # create the socket
@@ -491,7 +556,7 @@ def test_register_unix_plugin_already_exists(tmpsocket, grpc_timeout, mock_clien
 
     assert len(plugin.Plugin.manager.plugins) == 0
 
-    registered = plugin.register_unix()
+    registered = await plugin.register_unix()
 
     assert len(plugin.Plugin.manager.plugins) == 1
     assert isinstance(registered, list)
@@ -511,7 +576,7 @@ def test_register_unix_plugin_already_exists(tmpsocket, grpc_timeout, mock_clien
     # set the same configuration
     config.options.set('plugin.unix', [str(tmpsocket.socket_dir)])
 
-    registered = plugin.register_unix()
+    registered = await plugin.register_unix()
 
     assert len(plugin.Plugin.manager.plugins) == 1
     assert isinstance(registered, list)
@@ -526,7 +591,8 @@ def test_register_unix_plugin_already_exists(tmpsocket, grpc_timeout, mock_clien
     assert p.protocol == 'unix'
 
 
-def test_register_unix_plugin_no_socket(tmpdir, grpc_timeout):
+@pytest.mark.asyncio
+async def test_register_unix_plugin_no_socket(tmpdir, grpc_timeout):
     """Test registering unix plugin when no socket is bound"""
     sockdir = tmpdir.mkdir('socks')
     const.SOCKET_DIR = str(sockdir)
@@ -535,27 +601,29 @@ def test_register_unix_plugin_no_socket(tmpdir, grpc_timeout):
 
     config.options.set('plugin.unix', [sockdir])
 
-    registered = plugin.register_unix()
+    registered = await plugin.register_unix()
 
     assert len(plugin.Plugin.manager.plugins) == 0
     assert isinstance(registered, list)
     assert len(registered) == 0
 
 
-def test_register_unix_plugin_no_socket_no_path(grpc_timeout):
+@pytest.mark.asyncio
+async def test_register_unix_plugin_no_socket_no_path(grpc_timeout):
     """Test registering unix plugin when the path does not exist"""
     assert len(plugin.Plugin.manager.plugins) == 0
 
     config.options.set('plugin.unix', [os.path.join('some', 'nonexistent', 'other', 'path')])
 
-    registered = plugin.register_unix()
+    registered = await plugin.register_unix()
 
     assert len(plugin.Plugin.manager.plugins) == 0
     assert isinstance(registered, list)
     assert len(registered) == 0
 
 
-def test_register_unix_plugin_no_config_path(tmpsocket, grpc_timeout, mock_client_test_ok, mock_client_meta_ok):
+@pytest.mark.asyncio
+async def test_register_unix_plugin_no_config_path(tmpsocket, grpc_timeout, mock_client_test_ok, mock_client_meta_ok):
     """Test registering unix plugin when a configuration without a path is specified"""
 
     # create the socket
@@ -563,7 +631,7 @@ def test_register_unix_plugin_no_config_path(tmpsocket, grpc_timeout, mock_clien
 
     assert len(plugin.Plugin.manager.plugins) == 0
 
-    registered = plugin.register_unix()
+    registered = await plugin.register_unix()
 
     assert len(plugin.Plugin.manager.plugins) == 1
     assert isinstance(registered, list)
@@ -578,24 +646,26 @@ def test_register_unix_plugin_no_config_path(tmpsocket, grpc_timeout, mock_clien
     assert p.address == path
 
 
-def test_register_tcp_plugin_none_defined(grpc_timeout):
+@pytest.mark.asyncio
+async def test_register_tcp_plugin_none_defined(grpc_timeout):
     """Test registering TCP based plugins when none is specified."""
     assert len(plugin.Plugin.manager.plugins) == 0
 
-    registered = plugin.register_tcp()
+    registered = await plugin.register_tcp()
 
     assert len(plugin.Plugin.manager.plugins) == 0
     assert isinstance(registered, list)
     assert len(registered) == 0
 
 
-def test_register_tcp_plugin(grpc_timeout, mock_client_test_ok, mock_client_meta_ok):
+@pytest.mark.asyncio
+async def test_register_tcp_plugin(grpc_timeout, mock_client_test_ok, mock_client_meta_ok):
     """Test registering TCP based plugin when a configuration is specified"""
     assert len(plugin.Plugin.manager.plugins) == 0
 
     config.options.set('plugin.tcp', ['localhost:5000'])
 
-    registered = plugin.register_tcp()
+    registered = await plugin.register_tcp()
 
     assert len(plugin.Plugin.manager.plugins) == 1
     assert isinstance(registered, list)
@@ -610,13 +680,126 @@ def test_register_tcp_plugin(grpc_timeout, mock_client_test_ok, mock_client_meta
     assert p.address == 'localhost:5000'
 
 
-def test_register_tcp_plugins(grpc_timeout, mock_client_test_ok, mock_client_meta_ok):
+@pytest.mark.asyncio
+async def test_register_tcp_plugins_concurrent(grpc_timeout, monkeypatch, mock_client_meta_ok):
+    """Test that TCP plugins are registered concurrently."""
+    active = []
+    peak = []
+
+    async def patch(self):
+        """Patch function for the client 'test' method."""
+        active.append(self.address)
+        peak.append(len(active))
+        await asyncio.sleep(0.05)
+        active.remove(self.address)
+        return api.Status(ok=True)
+    monkeypatch.setattr(PluginClient, 'test', patch)
+
+    config.options.set('plugin.tcp', ['localhost:5000', 'localhost:5001', 'localhost:5000'])
+
+    registered = await plugin.register_tcp()
+
+    assert max(peak) == 2
+    assert registered == [
+        'vaporio/test-plugin+tcp@localhost:5000',
+        'vaporio/test-plugin+tcp@localhost:5001',
+    ]
+
+
+@pytest.mark.asyncio
+async def test_register_plugin_backoff(grpc_timeout, monkeypatch, mock_client_meta_ok):
+    """Test that registration of an address which failed is backed off."""
+    calls = []
+
+    async def patch(self):
+        """Patch function for the client 'test' method."""
+        calls.append(self.address)
+        return api.Status(ok=len(calls) > 2)
+    monkeypatch.setattr(PluginClient, 'test', patch)
+
+    config.options.set('plugin.backoff.initial', 10)
+    config.options.set('plugin.backoff.max', 15)
+
+    assert await plugin.register_plugin('localhost:5000', 'tcp') is None
+    failures, retry_at = plugin._backoff['localhost:5000']
+    assert failures == 1
+    assert 9 < retry_at - time.monotonic() <= 10
+
+    # not retried while backing off
+    assert await plugin.register_plugin('localhost:5000', 'tcp') is None
+    assert len(calls) == 1
+
+    # retried after the backoff passes, and backed off for longer (up to the max)
+    plugin._backoff['localhost:5000'] = (failures, time.monotonic() - 1)
+    assert await plugin.register_plugin('localhost:5000', 'tcp') is None
+    assert len(calls) == 2
+    failures, retry_at = plugin._backoff['localhost:5000']
+    assert failures == 2
+    assert 14 < retry_at - time.monotonic() <= 15
+
+    # cleared once registration succeeds
+    plugin.clear_backoff()
+    assert await plugin.register_plugin('localhost:5000', 'tcp') == 'vaporio/test-plugin+tcp@localhost:5000'
+    assert 'localhost:5000' not in plugin._backoff
+
+
+@pytest.mark.asyncio
+async def test_register_plugin_backoff_metainfo(grpc_timeout, mock_client_test_ok, mock_client_meta_error):
+    """Test that registration of an address which failed to get metainfo is backed off."""
+    assert await plugin.register_plugin('localhost:5000', 'tcp') is None
+    assert plugin._backoff['localhost:5000'][0] == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('test,meta', [
+    (api.Status(ok=False), None),
+    (grpc.RpcError(), None),
+    (api.Status(ok=True), ValueError('test error')),
+])
+async def test_register_plugin_failed_closes_client(grpc_timeout, monkeypatch, test, meta):
+    """Test that the client of a plugin which failed to register is closed."""
+    closed = []
+
+    async def patch_test(self):
+        """Patch function for the client 'test' method."""
+        if isinstance(test, Exception):
+            raise test
+        return test
+
+    async def patch_meta(self):
+        """Patch function for the client 'metainfo' method."""
+        raise meta
+
+    def patch_close(self):
+        """Patch function for the client 'close' method."""
+        closed.append(self.address)
+
+    monkeypatch.setattr(PluginClient, 'test', patch_test)
+    monkeypatch.setattr(PluginClient, 'metainfo', patch_meta)
+    monkeypatch.setattr(PluginClient, 'close', patch_close)
+
+    assert await plugin.register_plugin('localhost:5000', 'tcp') is None
+    assert closed == ['localhost:5000']
+
+
+@pytest.mark.asyncio
+async def test_register_plugin_ok_keeps_client(grpc_timeout, monkeypatch, mock_client_test_ok, mock_client_meta_ok):
+    """Test that the client of a registered plugin is not closed."""
+    closed = []
+    monkeypatch.setattr(PluginClient, 'close', lambda self: closed.append(self.address))
+
+    assert await plugin.register_plugin('localhost:5000', 'tcp') == 'vaporio/test-plugin+tcp@localhost:5000'
+    assert closed == []
+
+
+@pytest.mark.asyncio
+async def test_register_tcp_plugins(grpc_timeout, mock_client_test_ok, mock_client_meta_ok):
     """Test registering TCP based plugins when multiple configurations are specified"""
     assert len(plugin.Plugin.manager.plugins) == 0
 
     config.options.set('plugin.tcp', ['localhost:5000', 'localhost:5001'])
 
-    registered = plugin.register_tcp()
+    registered = await plugin.register_tcp()
 
     assert len(plugin.Plugin.manager.plugins) == 2
     assert isinstance(registered, list)
@@ -638,14 +821,15 @@ def test_register_tcp_plugins(grpc_timeout, mock_client_test_ok, mock_client_met
     assert p.address == 'localhost:5001'
 
 
-def test_register_tcp_plugin_already_exists(grpc_timeout, mock_client_test_ok, mock_client_meta_ok):
+@pytest.mark.asyncio
+async def test_register_tcp_plugin_already_exists(grpc_timeout, mock_client_test_ok, mock_client_meta_ok):
     """Test registering TCP plugin when the plugin was already registered."""
     assert len(plugin.Plugin.manager.plugins) == 0
 
     config.options.set('plugin.tcp', ['localhost:5000'])
 
     # register the first time
-    registered = plugin.register_tcp()
+    registered = await plugin.register_tcp()
 
     assert len(plugin.Plugin.manager.plugins) == 1
     assert isinstance(registered, list)
@@ -660,7 +844,7 @@ def test_register_tcp_plugin_already_exists(grpc_timeout, mock_client_test_ok, m
     assert p.address == 'localhost:5000'
 
     # register the second time
-    registered = plugin.register_tcp()
+    registered = await plugin.register_tcp()
 
     assert len(plugin.Plugin.manager.plugins) == 1
     assert isinstance(registered, list)
@@ -675,14 +859,15 @@ def test_register_tcp_plugin_already_exists(grpc_timeout, mock_client_test_ok, m
     assert p.address == 'localhost:5000'
 
 
-def test_register_tcp_plugin_env(grpc_timeout, mock_client_test_ok, mock_client_meta_ok):
+@pytest.mark.asyncio
+async def test_register_tcp_plugin_env(grpc_timeout, mock_client_test_ok, mock_client_meta_ok):
     """Test registering TCP based plugin when an environment variable is set"""
     assert len(plugin.Plugin.manager.plugins) == 0
 
     os.environ['SYNSE_PLUGIN_TCP'] = 'localhost:5000'
     config.options.parse()
 
-    registered = plugin.register_tcp()
+    registered = await plugin.register_tcp()
 
     assert len(plugin.Plugin.manager.plugins) == 1
     assert isinstance(registered, list)
@@ -697,14 +882,15 @@ def test_register_tcp_plugin_env(grpc_timeout, mock_client_test_ok, mock_client_
     assert p.address == 'localhost:5000'
 
 
-def test_register_tcp_plugins_env(grpc_timeout, mock_client_test_ok, mock_client_meta_ok):
+@pytest.mark.asyncio
+async def test_register_tcp_plugins_env(grpc_timeout, mock_client_test_ok, mock_client_meta_ok):
     """Test registering TCP based plugins when multiple environment variables are specified"""
     assert len(plugin.Plugin.manager.plugins) == 0
 
     os.environ['SYNSE_PLUGIN_TCP'] = 'localhost:5000,localhost:5001'
     config.options.parse()
 
-    registered = plugin.register_tcp()
+    registered = await plugin.register_tcp()
 
     assert len(plugin.Plugin.manager.plugins) == 2
     assert isinstance(registered, list)
@@ -724,3 +910,274 @@ def test_register_tcp_plugins_env(grpc_timeout, mock_client_test_ok, mock_client
     assert p.name == 'test-plugin'
     assert p.protocol == 'tcp'
     assert p.address == 'localhost:5001'
+
+
+def _make_plugins(*tags):
+    """Helper to create and register TCP plugins with the given tags."""
+    plugins = []
+    for i, tag in enumerate(tags):
+        address = 'localhost:{}'.format(5000 + i)
+        plugins.append(plugin.Plugin(
+            metadata=api.Metadata(name=tag, tag=tag),
+            address=address,
+            plugin_client=PluginTCPClient(address=address)
+        ))
+    return plugins
+
+
+@pytest.mark.asyncio
+async def test_fan_out_no_plugins():
+    """Fan out a request when there are no plugins registered."""
+    results, failures = await plugin.fan_out(lambda p: p.client.test())
+    assert results == {}
+    assert failures == {}
+
+
+@pytest.mark.asyncio
+async def test_fan_out_concurrent():
+    """Fan out a request to all plugins; requests should not be serialized."""
+    _make_plugins('foo', 'bar', 'baz')
+
+    event = asyncio.Event()
+    started = []
+
+    async def fn(p):
+        started.append(p.tag)
+        if len(started) == 3:
+            event.set()
+        # every request waits on all of the others to have started
+        await event.wait()
+        return p.tag
+
+    results, failures = await plugin.fan_out(fn, timeout=1)
+
+    assert failures == {}
+    assert results == {
+        'foo+tcp@localhost:5000': 'foo',
+        'bar+tcp@localhost:5001': 'bar',
+        'baz+tcp@localhost:5002': 'baz',
+    }
+
+
+@pytest.mark.asyncio
+async def test_fan_out_partial_failure():
+    """Fan out a request where some plugins fail or time out."""
+    _make_plugins('foo', 'bar', 'baz')
+
+    async def fn(p):
+        if p.tag == 'bar':
+            raise grpc.RpcError('test error')
+        if p.tag == 'baz':
+            await asyncio.sleep(5)
+        return p.tag
+
+    results, failures = await plugin.fan_out(fn, timeout=0.1)
+
+    assert results == {'foo+tcp@localhost:5000': 'foo'}
+    assert len(failures) == 2
+    assert isinstance(failures['bar+tcp@localhost:5001'], grpc.RpcError)
+    assert isinstance(failures['baz+tcp@localhost:5002'], asyncio.TimeoutError)
+
+
+@pytest.mark.asyncio
+async def test_fan_out_unexpected_error():
+    """Fan out a request where a plugin raises an unexpected error."""
+    _make_plugins('foo')
+
+    async def fn(p):
+        raise ValueError('test error')
+
+    with pytest.raises(ValueError):
+        await plugin.fan_out(fn)
+
+
+@pytest.mark.asyncio
+async def test_reconciler_reconcile(monkeypatch):
+    """Concurrent reconciliations share a single registration pass."""
+    calls = []
+
+    async def register():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+
+    monkeypatch.setattr(plugin, 'register_plugins', register)
+    reconciler = plugin.PluginReconciler()
+
+    await asyncio.gather(reconciler.reconcile(), reconciler.reconcile())
+    assert len(calls) == 1
+    assert reconciler.passes == 1
+
+    # once the pass completes, the next reconciliation starts a new one
+    await reconciler.reconcile()
+    assert len(calls) == 2
+    assert reconciler.passes == 2
+
+
+@pytest.mark.asyncio
+async def test_reconciler_reconcile_failure(monkeypatch):
+    """A failed registration pass is raised to the callers waiting on it."""
+
+    async def register():
+        raise ValueError('test error')
+
+    monkeypatch.setattr(plugin, 'register_plugins', register)
+    reconciler = plugin.PluginReconciler()
+
+    with pytest.raises(ValueError):
+        await reconciler.reconcile()
+    assert reconciler.passes == 0
+    assert reconciler.failures == 1
+
+
+@pytest.mark.asyncio
+async def test_reconciler_ready(monkeypatch):
+    """Only wait on registration if no pass has completed yet."""
+    calls = []
+
+    async def register():
+        calls.append(1)
+
+    monkeypatch.setattr(plugin, 'register_plugins', register)
+    reconciler = plugin.PluginReconciler()
+
+    await reconciler.ready()
+    await reconciler.ready()
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_register_plugin_shared(grpc_timeout, monkeypatch, mock_client_meta_ok):
+    """Concurrent registrations of the same address share a single attempt."""
+    calls = []
+
+    async def patch(self):
+        """Patch function for the client 'test' method."""
+        calls.append(self.address)
+        await asyncio.sleep(0.05)
+        return api.Status(ok=True)
+    monkeypatch.setattr(PluginClient, 'test', patch)
+
+    ids = await asyncio.gather(
+        plugin.register_plugin('localhost:5000', 'tcp'),
+        plugin.register_plugin('localhost:5000', 'tcp'),
+    )
+    assert ids == ['vaporio/test-plugin+tcp@localhost:5000'] * 2
+    assert calls == ['localhost:5000']
+    assert 'localhost:5000' not in plugin._registering
+
+
+@pytest.mark.asyncio
+async def test_socket_added(tmpsocket, grpc_timeout, mock_client_test_ok, mock_client_meta_ok):
+    """A new socket in the socket directory registers its plugin."""
+    _, path = tmpsocket.add('test')
+    plugin._backoff[path] = (3, time.monotonic() + 100)
+
+    plugin._socket_added(path)
+    assert path not in plugin._backoff
+
+    # registration happens in the background
+    for _ in range(100):
+        if config.options.get('plugin.unix'):
+            break
+        await asyncio.sleep(0.01)
+
+    assert 'vaporio/test-plugin+unix@' + path in plugin.Plugin.manager.plugins
+    assert path in config.options.get('plugin.unix')
+
+
+@pytest.mark.asyncio
+async def test_socket_added_not_listening(tmpsocket, grpc_timeout, mock_client_meta_ok, monkeypatch):
+    """A new socket whose plugin is not yet listening is retried without backoff."""
+    _, path = tmpsocket.add('test')
+    plugin.socket_watcher.sockets = [path]
+    monkeypatch.setattr(plugin, '_SOCKET_RETRY_DELAYS', (0, 0, 0))
+
+    attempts = []
+
+    async def _test(self):
+        attempts.append(self.address)
+        if len(attempts) < 3:
+            raise grpc.RpcError('not listening')
+        return api.Status(ok=True)
+    monkeypatch.setattr(synse.proto.client.PluginClient, 'test', _test)
+
+    await plugin._register_socket(path)
+
+    assert len(attempts) == 3
+    assert 'vaporio/test-plugin+unix@' + path in plugin.Plugin.manager.plugins
+    assert path not in plugin._backoff
+
+
+@pytest.mark.asyncio
+async def test_socket_added_retries_exhausted(tmpsocket, grpc_timeout, mock_client_test_error, monkeypatch):
+    """A new socket whose plugin never becomes ready is put into backoff."""
+    _, path = tmpsocket.add('test')
+    plugin.socket_watcher.sockets = [path]
+    monkeypatch.setattr(plugin, '_SOCKET_RETRY_DELAYS', (0, 0))
+
+    await plugin._register_socket(path)
+
+    assert len(plugin.Plugin.manager.plugins) == 0
+    assert plugin._backoff[path][0] == 1
+
+
+@pytest.mark.asyncio
+async def test_socket_added_removed(tmpsocket, grpc_timeout, mock_client_test_error, monkeypatch):
+    """Registration is not retried once the socket has gone away."""
+    _, path = tmpsocket.add('test')
+    monkeypatch.setattr(plugin, '_SOCKET_RETRY_DELAYS', (10,))
+
+    await asyncio.wait_for(plugin._register_socket(path), 1)
+    assert len(plugin.Plugin.manager.plugins) == 0
+
+
+@pytest.mark.asyncio
+async def test_socket_removed(grpc_timeout, mock_client_test_ok, mock_client_meta_ok):
+    """A socket removed from the socket directory removes its plugin."""
+    path = os.path.join(const.SOCKET_DIR, 'test')
+    await plugin.register_plugin(path, 'unix')
+    assert len(plugin.Plugin.manager.plugins) == 1
+
+    plugin._socket_removed(path)
+    assert len(plugin.Plugin.manager.plugins) == 0
+
+    # removing a socket with no plugin does nothing
+    plugin._socket_removed(path)
+
+
+@pytest.mark.asyncio
+async def test_register_unix_from_watcher(grpc_timeout, mock_client_test_ok, mock_client_meta_ok, monkeypatch):
+    """Register unix plugins from the sockets tracked by the socket watcher."""
+    monkeypatch.setattr(plugin.socket_watcher, 'running', True)
+    monkeypatch.setattr(plugin.socket_watcher, 'path', '/does/not/exist')
+
+    # these are not on disk; only the watcher knows about them
+    path = '/does/not/exist/test'
+    plugin.socket_watcher.sockets = [path]
+    config.options.set('plugin.unix', [path, '/does/not/exist/gone'])
+
+    registered = await plugin.register_unix()
+    assert registered == ['vaporio/test-plugin+unix@' + path]
+    assert config.options.get('plugin.unix') == [path, '/does/not/exist/gone']
+
+
+def test_plugin_manager_closes_removed_clients():
+    """Clients of plugins removed from the manager stop watching their channel."""
+    a = plugin.Plugin(
+        metadata=api.Metadata(name='a', tag='vaporio/a'),
+        address='localhost:5001',
+        plugin_client=PluginTCPClient('localhost:5001'),
+    )
+    b = plugin.Plugin(
+        metadata=api.Metadata(name='b', tag='vaporio/b'),
+        address='localhost:5002',
+        plugin_client=PluginTCPClient('localhost:5002'),
+    )
+    assert a.client._watching
+    assert b.client._watching
+
+    plugin.Plugin.manager.remove(a.id())
+    assert not a.client._watching
+
+    plugin.Plugin.manager.purge([b.id()])
+    assert not b.client._watching
@@ -4,6 +4,7 @@ import pytest
 from sanic.response import HTTPResponse
 
 from synse import config, response
+from tests import utils
 
 
 @pytest.mark.parametrize(
@@ -40,3 +41,74 @@ def test_json_pretty(data, expected):
 
     assert isinstance(actual, HTTPResponse)
     assert expected == actual.body
+
+
+@pytest.mark.parametrize('pretty', [True, False])
+def test_encode(pretty):
+    """Test that encoding matches the body of a JSON response."""
+    config.options.set('pretty_json', pretty)
+
+    data = {'test': ['value', 1, None]}
+    assert response.encode(data) == response.json(data).body
+
+
+def test_etag():
+    """Test creating an ETag for an encoded body."""
+    tag = response.etag(b'{"test":"value"}')
+
+    assert tag.startswith('"') and tag.endswith('"')
+    assert tag == response.etag(b'{"test":"value"}')
+    assert tag != response.etag(b'{"test":"other"}')
+
+
+@pytest.mark.parametrize(
+    'header,expected', [
+        (None, False),
+        ('', False),
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"def"', False),
+        ('"def", "abc"', True),
+        ('"def",W/"abc"', True),
+        ('*', True),
+    ]
+)
+def test_etag_matches(header, expected):
+    """Test matching If-None-Match header values against an ETag."""
+    assert response._etag_matches(header, '"abc"') is expected
+
+
+def test_json_encoded():
+    """Test creating a response from an encoded body."""
+    actual = response.json_encoded(b'{"test":"value"}', '"abc"')
+
+    assert isinstance(actual, HTTPResponse)
+    assert actual.status == 200
+    assert actual.body == b'{"test":"value"}'
+    assert actual.content_type == 'application/json'
+    assert actual.headers['ETag'] == '"abc"'
+
+
+def test_json_encoded_not_modified():
+    """Test creating a response from an encoded body for a request which
+    already has it.
+    """
+    r = utils.make_request('/synse/scan', headers={'If-None-Match': '"abc"'})
+
+    actual = response.json_encoded(b'{"test":"value"}', '"abc"', r)
+
+    assert actual.status == 304
+    assert actual.body == b''
+    assert actual.headers['ETag'] == '"abc"'
+
+
+def test_json_encoded_modified():
+    """Test creating a response from an encoded body for a request which
+    has an out of date copy of it.
+    """
+    r = utils.make_request('/synse/scan', headers={'If-None-Match': '"def"'})
+
+    actual = response.json_encoded(b'{"test":"value"}', '"abc"', r)
+
+    assert actual.status == 200
+    assert actual.body == b'{"test":"value"}'
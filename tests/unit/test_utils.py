@@ -32,3 +32,34 @@ def test_type_from_kind(kind, expected):
     """Test getting the device type from the device kind."""
     actual = utils.type_from_kind(kind)
     assert expected == actual
+
+
+def test_rfc3339now_offset():
+    """Test offsetting an RFC3339 timestamp from the current time."""
+    assert utils.rfc3339now(-60) < utils.rfc3339now() < utils.rfc3339now(60)
+    assert utils.rfc3339now().endswith('Z')
+
+
+@pytest.mark.parametrize(
+    'timestamp', [
+        '2018-02-01T14:45:13Z',
+        '2018-02-01T14:45:13.123456789Z',
+        '2018-02-01T09:45:13.5-05:00',
+        '2018-02-01T15:45:13+01:00',
+    ]
+)
+def test_rfc3339age_past(timestamp):
+    """Test getting the age of a timestamp in the past."""
+    assert utils.rfc3339age(timestamp) > 60 * 60 * 24 * 365
+
+
+def test_rfc3339age():
+    """Test getting the age of recent and future timestamps."""
+    assert 9 < utils.rfc3339age(utils.rfc3339now(-10)) < 11
+    assert utils.rfc3339age(utils.rfc3339now(60)) == 0.0
+
+
+@pytest.mark.parametrize('timestamp', ['', None, 'october', '2018-02-01', '2018-13-01T14:45:13Z'])
+def test_rfc3339age_invalid(timestamp):
+    """Test getting the age of timestamps which can not be parsed."""
+    assert utils.rfc3339age(timestamp) is None
@@ -11,8 +11,6 @@ from tests import utils
 
 async def make_device_info_response(rack, board, device):
     """Helper method to make a new Device object."""
-    await cache._plugins_cache.set(cache.PLUGINS_CACHE_KEY, {device: 'test-plugin'})
-
     return api.Device(
         timestamp='october',
         uid=device,
@@ -43,10 +41,16 @@ async def make_device_info_response(rack, board, device):
 
 
 async def mock_get_device_info_cache():
-    """Mock method for get_device_info_cache - returns a single device."""
-    return {
+    """Mock method for get_device_info_cache - returns a single device.
+
+    The device is also added to the cache's device view so that it is
+    in the cache's indexes.
+    """
+    devices = {
         'rack-1-vec-12345': await make_device_info_response('rack-1', 'vec', '12345')
     }
+    cache._devices.update(cache._Partition('foo', devices))
+    return devices
 
 
 @pytest.fixture()
@@ -122,6 +126,68 @@ def test_validate_query_params_invalid(params, valid):
         validate.validate_query_params(params, *valid)
 
 
+@pytest.mark.parametrize(
+    'value,expected', [
+        (None, None),
+        ('0', 0.0),
+        ('1', 1.0),
+        ('0.25', 0.25),
+    ]
+)
+def test_validate_max_age(value, expected):
+    """Test validating the max age query parameter successfully."""
+    assert validate.validate_max_age(value) == expected
+
+
+@pytest.mark.parametrize('value', ['-1', 'abc', 'nan', 'inf', ''])
+def test_validate_max_age_invalid(value):
+    """Test validating an invalid max age query parameter."""
+    with pytest.raises(errors.InvalidArgumentsError):
+        validate.validate_max_age(value)
+
+
+@pytest.mark.parametrize(
+    'data,expected', [
+        ({'rack': 'rack-1'}, (None, {'rack': 'rack-1'})),
+        ({'rack': 'rack-1', 'board': 'vec'}, (None, {'rack': 'rack-1', 'board': 'vec'})),
+        ({'type': 'led', 'rack': None}, (None, {'type': 'led'})),
+        (
+            {'kind': 'foo.led', 'model': 'x', 'info': 'Rack *'},
+            (None, {'kind': 'foo.led', 'model': 'x', 'info': 'Rack *'})
+        ),
+        ({'devices': []}, ([], {})),
+        (
+            {'devices': [{'rack': 'rack-1', 'board': 'vec', 'device': '1'}]},
+            ([('rack-1', 'vec', '1')], {})
+        ),
+    ]
+)
+def test_validate_bulk_read(data, expected):
+    """Test validating bulk read data successfully."""
+    assert validate.validate_bulk_read(data) == expected
+
+
+@pytest.mark.parametrize(
+    'data', [
+        [],
+        {},
+        {'foo': 'bar'},
+        {'board': 'vec'},
+        {'rack': 1},
+        {'rack': ''},
+        {'devices': {}},
+        {'devices': [], 'type': 'led'},
+        {'devices': [], 'model': 'x'},
+        {'devices': ['rack-1/vec/1']},
+        {'devices': [{'rack': 'rack-1', 'board': 'vec', 'device': ''}]},
+    ]
+)
+def test_validate_bulk_read_invalid(data):
+    """Test validating invalid bulk read data."""
+    with pytest.raises(errors.InvalidArgumentsError):
+        validate.validate_bulk_read(data)
+
+
 @pytest.mark.asyncio
 async def test_validate_no_query_params():
     """Test validating that an incoming request has no query params, when there
@@ -4,19 +4,20 @@ import ujson
 from sanic.request import Request
 
 
-def make_request(url, data=None):
+def make_request(url, data=None, headers=None):
     """Create a Sanic request object.
 
     Args:
         url (str): The URL of the request.
         data (dict): [optional] Any data to dump into the request body.
+        headers (dict): [optional] The headers of the request.
 
     Returns:
         sanic.request.Request: A simple Request object.
     """
     r = Request(
         url_bytes=url.encode('ascii'),
-        headers={},
+        headers=headers or {},
         version=None,
         method=None,
         transport=None